@@ -0,0 +1,6 @@
+"""
+RESTFly benchmark suite.
+
+The benchmarks drive the library through an in-process ``httpx.MockTransport`` so
+that the results measure RESTFly's own overhead rather than the network.
+"""
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pydantic
+
+from restfly import __version__ as RESTFLY_VERSION
+
+
+@dataclass
+class BenchmarkResult:
+    """
+    The timing results of a single benchmark case.  All timings are the per-operation
+    time in seconds.
+
+    Parameters:
+        name: The name of the benchmark case.
+        group: The group the benchmark case belongs to.
+        rounds: The number of timed rounds that were run.
+        iterations: The number of operations that were run within each round.
+        min: The fastest per-operation time of all of the rounds.
+        median: The median per-operation time of all of the rounds.
+        mean: The mean per-operation time of all of the rounds.
+        stdev: The standard deviation of the per-operation times.
+        extra: Any additional information that the case wished to report.
+    """
+
+    name: str
+    group: str
+    rounds: int
+    iterations: int
+    min: float
+    median: float
+    mean: float
+    stdev: float
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def ops(self) -> float:
+        """
+        Operations per second based on the median time.
+        """
+        return 1 / self.median if self.median else 0.0
+
+
+@dataclass
+class Benchmark:
+    """
+    A registered benchmark case.  Sync cases are called directly and async cases are
+    awaited within the event loop of the runner.
+
+    Parameters:
+        name: The name of the benchmark case.
+        group: The group the benchmark case belongs to.
+        func: The callable performing a single operation.
+        iterations: The default number of operations within each round.
+        extra: Any additional information to report alongside the timings.
+    """
+
+    name: str
+    group: str
+    func: Callable[[], Any] | Callable[[], Awaitable[Any]]
+    iterations: int = 1000
+    extra: dict[str, Any] = field(default_factory=dict)
+    is_async: bool = False
+
+
+def _summarize(
+    case: Benchmark, timings: list[float], iterations: int
+) -> BenchmarkResult:
+    per_op = [t / iterations for t in timings]
+    return BenchmarkResult(
+        name=case.name,
+        group=case.group,
+        rounds=len(per_op),
+        iterations=iterations,
+        min=min(per_op),
+        median=statistics.median(per_op),
+        mean=statistics.fmean(per_op),
+        stdev=statistics.stdev(per_op) if len(per_op) > 1 else 0.0,
+        extra=case.extra,
+    )
+
+
+def run_sync(case: Benchmark, rounds: int, iterations: int) -> BenchmarkResult:
+    """
+    Times a synchronous benchmark case.
+    """
+    func = case.func
+    func()
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        timings.append(time.perf_counter() - start)
+    return _summarize(case, timings, iterations)
+
+
+async def run_async(case: Benchmark, rounds: int, iterations: int) -> BenchmarkResult:
+    """
+    Times an asynchronous benchmark case.
+    """
+    func = case.func
+    await func()  # type: ignore[misc]
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await func()  # type: ignore[misc]
+        timings.append(time.perf_counter() - start)
+    return _summarize(case, timings, iterations)
+
+
+def run(
+    cases: list[Benchmark],
+    *,
+    rounds: int = 5,
+    scale: float = 1.0,
+    pattern: str | None = None,
+) -> list[BenchmarkResult]:
+    """
+    Runs the benchmark cases and returns the results.
+
+    Args:
+        cases: The benchmark cases to run.
+        rounds: The number of timed rounds to run for each case.
+        scale: Multiplier applied to each case's iteration count.
+        pattern: If set, only cases whose name contains the pattern are run.
+    """
+    results = []
+    for case in cases:
+        if pattern and pattern not in case.name:
+            continue
+        iterations = max(1, int(case.iterations * scale))
+        if case.is_async:
+            result = asyncio.run(run_async(case, rounds, iterations))
+        else:
+            result = run_sync(case, rounds, iterations)
+        results.append(result)
+    return results
+
+
+def environment() -> dict[str, str]:
+    """
+    Returns the versions of everything that may impact the results.
+    """
+    return {
+        "restfly": RESTFLY_VERSION,
+        "httpx": httpx.__version__,
+        "pydantic": pydantic.VERSION,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": f"{platform.system()}/{platform.machine()}",
+    }
+
+
+def save(results: list[BenchmarkResult], path: Path) -> None:
+    """
+    Saves the results as JSON alongside the environment information.
+    """
+    document = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "environment": environment(),
+        "results": [asdict(r) | {"ops": r.ops} for r in results],
+    }
+    path.write_text(json.dumps(document, indent=2))
+
+
+def load(path: Path) -> dict[str, dict[str, Any]]:
+    """
+    Loads a previously saved results file keyed by the case name.
+    """
+    document = json.loads(path.read_text())
+    return {r["name"]: r for r in document["results"]}
+
+
+def _fmt(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def report(
+    results: list[BenchmarkResult],
+    baseline: dict[str, dict[str, Any]] | None = None,
+) -> str:
+    """
+    Renders the results as a table.  If a baseline is provided, then the relative
+    change of the median against the baseline is included as well.
+    """
+    width = max([len(r.name) for r in results] + [4])
+    lines = [f"{'case':<{width}}  {'median':>10}  {'min':>10}  {'ops/s':>12}  change"]
+    for r in results:
+        change = ""
+        if baseline and r.name in baseline and baseline[r.name]["median"]:
+            delta = r.median / baseline[r.name]["median"] - 1
+            change = f"{delta:+.1%}"
+        lines.append(
+            f"{r.name:<{width}}  {_fmt(r.median):>10}  {_fmt(r.min):>10}  "
+            f"{r.ops:>12,.0f}  {change}"
+        )
+    return "\n".join(lines)
+
+
+def main(
+    cases: list[Benchmark], argv: list[str] | None = None
+) -> list[BenchmarkResult]:
+    """
+    Command-line entry point shared by the benchmark modules.
+    """
+    parser = argparse.ArgumentParser(description="Run the RESTFly benchmarks.")
+    parser.add_argument("-o", "--output", type=Path, help="Save the results as JSON.")
+    parser.add_argument(
+        "-c", "--compare", type=Path, help="Compare against a saved results file."
+    )
+    parser.add_argument("-k", "--filter", help="Only run cases containing this.")
+    parser.add_argument("-r", "--rounds", type=int, default=5)
+    parser.add_argument(
+        "-s", "--scale", type=float, default=1.0, help="Iteration multiplier."
+    )
+    args = parser.parse_args(argv)
+
+    results = run(cases, rounds=args.rounds, scale=args.scale, pattern=args.filter)
+    baseline = load(args.compare) if args.compare else None
+    print(report(results, baseline))
+    if args.output:
+        save(results, args.output)
+    return results
@@ -0,0 +1,234 @@
+"""
+HTTP/1.1 pooling vs HTTP/2 multiplexing.
+
+Fans out batches of concurrent requests from the async client (``asyncio.gather``)
+against a local server, once over HTTP/1.1 with a connection pool and once over
+HTTP/2 (with prior knowledge, as the server doesn't use TLS) using an
+``HTTP2Profile``, and reports the wall time, throughput, and the number of connections
+each protocol opened.  The server waits ``--delay`` seconds before each response to
+stand in for the remote service, so that requests actually overlap.
+
+Usage:
+    python -m benchmarks.http2 --requests 500 --delay 0.02
+    python -m benchmarks.http2 --requests 1000 --max-connections 50 --rounds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+
+from h2.config import H2Configuration
+from h2.connection import H2Connection
+from h2.events import ConnectionTerminated, StreamEnded
+from h2.exceptions import StreamClosedError
+from h2.settings import SettingCodes
+
+from restfly import AsyncAPIClient, HTTP2Profile
+from restfly.types import Limits
+
+BODY = b'{"id": 1, "name": "item-1", "tags": ["a", "b"]}'
+
+
+@dataclass(slots=True)
+class Result:
+    """
+    The outcome of fanning out the requests over one of the protocols.
+    """
+
+    protocol: str
+    requests: int
+    elapsed: float
+    connections: int
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def report(self) -> str:
+        return (
+            f"{self.protocol:<9} {self.elapsed:>8.3f}s {self.throughput:>10.0f} req/s"
+            f" {self.connections:>6} connections"
+        )
+
+
+class Server:
+    """
+    Base of the local servers, counting the connections opened by the client.
+    """
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.connections = 0
+        self.server: asyncio.Server | None = None
+
+    @property
+    def url(self) -> str:
+        assert self.server is not None
+        return f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+
+class HTTP1Server(Server):
+    """
+    Minimal keep-alive HTTP/1.1 server answering every GET request with ``BODY``.
+    """
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                await asyncio.sleep(self.delay)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: %d\r\n\r\n%s" % (len(BODY), BODY)
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+class HTTP2Server(Server):
+    """
+    Minimal cleartext HTTP/2 (h2c) server answering every request with ``BODY``.
+    """
+
+    def __init__(self, delay: float, max_streams: int) -> None:
+        super().__init__(delay)
+        self.max_streams = max_streams
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self.server = await loop.create_server(
+            lambda: HTTP2Protocol(self), "127.0.0.1", 0
+        )
+
+
+class HTTP2Protocol(asyncio.Protocol):
+    def __init__(self, server: HTTP2Server) -> None:
+        self.server = server
+        self.conn = H2Connection(H2Configuration(client_side=False))
+        self.transport: asyncio.Transport | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.server.connections += 1
+        self.transport = transport  # type: ignore[assignment]
+        self.conn.initiate_connection()
+        self.conn.update_settings(
+            {SettingCodes.MAX_CONCURRENT_STREAMS: self.server.max_streams}
+        )
+        self.flush()
+
+    def data_received(self, data: bytes) -> None:
+        loop = asyncio.get_running_loop()
+        for event in self.conn.receive_data(data):
+            if isinstance(event, StreamEnded):
+                loop.call_later(self.server.delay, self.respond, event.stream_id)
+            elif isinstance(event, ConnectionTerminated):
+                assert self.transport is not None
+                self.transport.close()
+        self.flush()
+
+    def respond(self, stream_id: int) -> None:
+        headers = [
+            (":status", "200"),
+            ("content-type", "application/json"),
+            ("content-length", str(len(BODY))),
+        ]
+        try:
+            self.conn.send_headers(stream_id, headers)
+            self.conn.send_data(stream_id, BODY, end_stream=True)
+        except StreamClosedError:
+            return
+        self.flush()
+
+    def flush(self) -> None:
+        if self.transport is not None and not self.transport.is_closing():
+            self.transport.write(self.conn.data_to_send())
+
+
+async def fan_out(
+    server: HTTP1Server | HTTP2Server,
+    protocol: str,
+    requests: int,
+    rounds: int,
+    **options,
+) -> Result:
+    """
+    Sends the requests concurrently in a number of rounds, returning the result.
+    The remaining keyword arguments are passed to the client.
+    """
+    await server.start()
+    client = AsyncAPIClient(base_url=server.url, **options)
+    try:
+        # A single request to warm up the pool outside of the timings.
+        await client._get("/items")
+        server.connections = 0
+        start = time.perf_counter()
+        for _ in range(rounds):
+            await asyncio.gather(*(client._get("/items") for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+    finally:
+        await client._client.aclose()
+        await server.close()
+    return Result(protocol, requests * rounds, elapsed, server.connections + 1)
+
+
+async def run(args: argparse.Namespace) -> list[Result]:
+    """
+    Runs the comparison described by the command-line arguments.
+    """
+    profile = HTTP2Profile(concurrency=args.requests, max_streams=args.max_streams)
+    return [
+        await fan_out(
+            HTTP1Server(args.delay),
+            "HTTP/1.1",
+            args.requests,
+            args.rounds,
+            limits=Limits(max_connections=args.max_connections),
+        ),
+        await fan_out(
+            HTTP2Server(args.delay, args.max_streams),
+            "HTTP/2",
+            args.requests,
+            args.rounds,
+            http1=False,
+            http2=profile,
+        ),
+    ]
+
+
+def main(argv: list[str] | None = None) -> list[Result]:
+    """
+    Command-line entry point of the HTTP/2 comparison.
+    """
+    parser = argparse.ArgumentParser(
+        description="Compare HTTP/1.1 pooling with HTTP/2 multiplexing."
+    )
+    parser.add_argument("-n", "--requests", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--delay", type=float, default=0.02, help="Server delay.")
+    parser.add_argument("--max-connections", type=int, default=100)
+    parser.add_argument("--max-streams", type=int, default=100)
+    args = parser.parse_args(argv)
+    results = asyncio.run(run(args))
+    for result in results:
+        print(result.report())
+    return results
+
+
+if __name__ == "__main__":
+    main()
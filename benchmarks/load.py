@@ -0,0 +1,169 @@
+"""
+Load tests.
+
+Drives an endpoint of the sync or async client at a target rate or concurrency
+against a local HTTP server, and reports the throughput, latency percentiles, retries,
+connection pool wait, and memory growth.  Unlike the pipeline benchmarks, requests go
+through the real HTTPX transports (over loopback), so that connection pooling is
+exercised as well.
+
+Usage:
+    python -m benchmarks.load --concurrency 50 --duration 10
+    python -m benchmarks.load --async --rate 2000 --duration 10 --max-connections 20
+    python -m benchmarks.load --fail-rate 0.1 --delay 0.005 --operations 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pydantic import BaseModel
+
+from restfly import (
+    APIClient,
+    APIEndpoint,
+    AsyncAPIClient,
+    AsyncAPIEndpoint,
+    ErrorStatus,
+    LoadReport,
+    async_load_test,
+    load_test,
+)
+from restfly.types import Limits
+
+ITEMS = json.dumps(
+    [{"id": idx, "name": f"item-{idx}", "tags": ["a", "b"]} for idx in range(20)]
+).encode()
+
+RETRY = {503: ErrorStatus(retry=True, backoff=0.001, jitter=0.001, log_level=None)}
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+    tags: list[str]
+
+
+class Items(APIEndpoint):
+    _path = "/items"
+
+    def list(self) -> list[Item]:
+        return self._get(response_model=list[Item])  # type: ignore[return-value]
+
+
+class AsyncItems(AsyncAPIEndpoint):
+    _path = "/items"
+
+    async def list(self) -> list[Item]:
+        return await self._get(response_model=list[Item])  # type: ignore[return-value]
+
+
+class LoadClient(APIClient):
+    items: Items
+
+
+class AsyncLoadClient(AsyncAPIClient):
+    items: AsyncItems
+
+
+@contextmanager
+def serve(delay: float = 0.0, fail_rate: float = 0.0) -> Iterator[str]:
+    """
+    Runs a local HTTP server within a background thread, yielding its base URL.
+
+    Args:
+        delay: The number of seconds to wait before responding.
+        fail_rate: The fraction of requests to respond to with a 503.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self) -> None:
+            if delay:
+                time.sleep(delay)
+            failed = random.random() < fail_rate
+            body = b"" if failed else ITEMS
+            self.send_response(503 if failed else 200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def run(args: argparse.Namespace) -> LoadReport:
+    """
+    Runs the load test described by the command-line arguments.
+    """
+    limits = Limits(max_connections=args.max_connections)
+    options = {
+        "concurrency": args.concurrency,
+        "rate": args.rate,
+        "operations": args.operations,
+        "duration": args.duration,
+        "trace_memory": not args.no_memory,
+    }
+    with serve(args.delay, args.fail_rate) as url:
+        if args.use_async:
+
+            async def main() -> LoadReport:
+                client = AsyncLoadClient(base_url=url, limits=limits, error_map=RETRY)
+                try:
+                    return await async_load_test(client, client.items.list, **options)
+                finally:
+                    await client._client.aclose()
+
+            return asyncio.run(main())
+        client = LoadClient(base_url=url, limits=limits, error_map=RETRY)
+        try:
+            return load_test(client, client.items.list, **options)
+        finally:
+            client._client.close()
+
+
+def main(argv: list[str] | None = None) -> LoadReport:
+    """
+    Command-line entry point of the load tests.
+    """
+    parser = argparse.ArgumentParser(description="Run a RESTFly load test.")
+    parser.add_argument("--async", dest="use_async", action="store_true")
+    parser.add_argument("-c", "--concurrency", type=int, default=10)
+    parser.add_argument("-r", "--rate", type=float, help="Operations per second.")
+    parser.add_argument("-n", "--operations", type=int)
+    parser.add_argument("-d", "--duration", type=float)
+    parser.add_argument("--max-connections", type=int, default=100)
+    parser.add_argument("--delay", type=float, default=0.0, help="Server delay.")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--no-memory", action="store_true")
+    args = parser.parse_args(argv)
+    if args.operations is None and args.duration is None:
+        args.duration = 10.0
+    report = run(args)
+    print(report.report())
+    return report
+
+
+if __name__ == "__main__":
+    main()
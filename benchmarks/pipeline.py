@@ -0,0 +1,329 @@
+"""
+Request pipeline benchmarks.
+
+Measures the per-request overhead of each stage of the RESTFly request pipeline
+(pre-processing, request building, the retry loop, and unmarshalling) along with
+iterator throughput and client construction.  All requests are served from an
+in-process ``httpx.MockTransport``.
+
+Usage:
+    python -m benchmarks.pipeline --output results.json
+    python -m benchmarks.pipeline --compare results.json
+"""
+
+from __future__ import annotations
+
+import json
+from itertools import count
+
+from httpx import MockTransport, Request, Response
+from pydantic import BaseModel
+from pydantic_xml import BaseXmlModel, attr, element
+
+from restfly import (
+    APIClient,
+    APIIterator,
+    AsyncAPIClient,
+    AsyncAPIIterator,
+    ErrorStatus,
+    projection,
+)
+from restfly._utils import unmarshal
+
+from ._harness import Benchmark, main
+
+SIZES = (1, 10, 100, 1000)
+""" The number of items within the list payloads. """
+
+PAGE_SIZE = 100
+""" The number of items returned for each page of the iterator benchmarks. """
+
+PAGE_TOTAL = 1000
+""" The total number of items the iterator benchmarks walk through. """
+
+
+class Owner(BaseModel):
+    id: int
+    email: str
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+    tags: list[str]
+    attributes: dict[str, int]
+    owner: Owner
+
+
+class XmlItem(BaseXmlModel, tag="item"):
+    id: int = attr()
+    name: str = element()
+    email: str = element()
+
+
+class XmlItems(BaseXmlModel, tag="items"):
+    items: list[XmlItem] = element(tag="item", default=[])
+
+
+def make_items(size: int, offset: int = 0) -> list[dict]:
+    return [
+        {
+            "id": i,
+            "name": f"item-{i}",
+            "tags": ["alpha", "beta", "gamma"],
+            "attributes": {"size": i, "weight": i * 2},
+            "owner": {"id": i % 7, "email": f"user{i % 7}@example.com"},
+        }
+        for i in range(offset, offset + size)
+    ]
+
+
+def make_xml(size: int) -> bytes:
+    items = "".join(
+        f'<item id="{i}"><name>item-{i}</name><email>u{i}@example.com</email></item>'
+        for i in range(size)
+    )
+    return f"<items>{items}</items>".encode()
+
+
+JSON_BODIES = {size: json.dumps(make_items(size)).encode() for size in SIZES}
+XML_BODIES = {size: make_xml(size) for size in SIZES}
+ITEM_BODY = json.dumps(make_items(1)[0]).encode()
+
+
+def make_transport() -> MockTransport:
+    """
+    Builds the mock transport serving the benchmark endpoints.  The ``/flaky``
+    endpoint fails every other call with a 503 in order to exercise the retry loop.
+    """
+    flaky = count()
+
+    def handler(request: Request) -> Response:
+        path = request.url.path
+        headers = {"Content-Type": "application/json"}
+        if path == "/item":
+            return Response(200, content=ITEM_BODY, headers=headers)
+        if path.startswith("/items/"):
+            return Response(200, content=JSON_BODIES[int(path[7:])], headers=headers)
+        if path.startswith("/xml/"):
+            return Response(200, content=XML_BODIES[int(path[5:])])
+        if path == "/page":
+            offset = int(request.url.params["offset"])
+            size = max(0, min(PAGE_SIZE, PAGE_TOTAL - offset))
+            return Response(200, json=make_items(size, offset))
+        if path == "/flaky":
+            if next(flaky) % 2 == 0:
+                return Response(503)
+            return Response(200, content=ITEM_BODY, headers=headers)
+        return Response(404)
+
+    return MockTransport(handler)
+
+
+NO_WAIT = {503: ErrorStatus(retry=True, backoff=0, jitter=0, log_level=None)}
+
+
+class BenchClient(APIClient):
+    _base_url = "https://bench.restfly.local"
+    _lib_name = "RESTFlyBench"
+
+
+class AsyncBenchClient(AsyncAPIClient):
+    _base_url = "https://bench.restfly.local"
+    _lib_name = "RESTFlyBench"
+
+
+class ItemIterator(APIIterator):
+    offset: int = 0
+    _client: BenchClient
+
+    def _get_page(self) -> None:
+        self.total = PAGE_TOTAL
+        self.page = self._client._get(
+            "/page",
+            params={"offset": self.offset, "limit": PAGE_SIZE},
+            response_model=list[Item],
+        )
+        self.offset += PAGE_SIZE
+
+
+class AsyncItemIterator(AsyncAPIIterator):
+    offset: int = 0
+    _client: AsyncBenchClient
+
+    async def _get_page(self) -> None:
+        self.total = PAGE_TOTAL
+        self.page = await self._client._get(
+            "/page",
+            params={"offset": self.offset, "limit": PAGE_SIZE},
+            response_model=list[Item],
+        )
+        self.offset += PAGE_SIZE
+
+
+def build_cases() -> list[Benchmark]:
+    """
+    Constructs every benchmark case within the pipeline suite.
+    """
+    transport = make_transport()
+    client = BenchClient(transport=transport, error_map=NO_WAIT)
+    aclient = AsyncBenchClient(transport=transport, error_map=NO_WAIT)
+    item = Item.model_validate(make_items(1)[0])
+    xml_item = XmlItem(id=1, name="item-1", email="u1@example.com")
+    payload = make_items(1)[0]
+    cases = [
+        Benchmark(
+            "construct/APIClient",
+            "construct",
+            lambda: BenchClient(transport=transport),
+            iterations=200,
+        ),
+        Benchmark(
+            "construct/AsyncAPIClient",
+            "construct",
+            lambda: AsyncBenchClient(transport=transport),
+            iterations=200,
+        ),
+        Benchmark(
+            "pre_process/json-model",
+            "pre_process",
+            lambda: client._request_pre_process("POST", "/item", json=item),
+            iterations=5000,
+        ),
+        Benchmark(
+            "pre_process/json-dict",
+            "pre_process",
+            lambda: client._request_pre_process("POST", "/item", json=payload),
+            iterations=5000,
+        ),
+        Benchmark(
+            "pre_process/xml-model",
+            "pre_process",
+            lambda: client._request_pre_process("POST", "/item", xml=xml_item),
+            iterations=2000,
+        ),
+        Benchmark(
+            "build_request/json-model",
+            "build_request",
+            lambda: client._client.build_request(
+                **client._request_pre_process("POST", "/item", json=item)
+            ),
+            iterations=2000,
+        ),
+        Benchmark(
+            "request/raw",
+            "request",
+            lambda: client._get("/item"),
+            iterations=1000,
+        ),
+        Benchmark(
+            "request/model",
+            "request",
+            lambda: client._get("/item", response_model=Item),
+            iterations=1000,
+        ),
+        Benchmark(
+            "request/retry",
+            "request",
+            lambda: client._get("/flaky", response_model=Item),
+            iterations=500,
+        ),
+        Benchmark(
+            "iterator/sync",
+            "iterator",
+            lambda: sum(1 for _ in ItemIterator(client)),
+            iterations=5,
+            extra={"items": PAGE_TOTAL, "page_size": PAGE_SIZE},
+        ),
+        Benchmark(
+            "async/request/raw",
+            "request",
+            lambda: aclient._get("/item"),
+            iterations=1000,
+            is_async=True,
+        ),
+        Benchmark(
+            "async/request/model",
+            "request",
+            lambda: aclient._get("/item", response_model=Item),
+            iterations=1000,
+            is_async=True,
+        ),
+        Benchmark(
+            "async/iterator",
+            "iterator",
+            lambda: _drain(AsyncItemIterator(aclient)),
+            iterations=5,
+            extra={"items": PAGE_TOTAL, "page_size": PAGE_SIZE},
+            is_async=True,
+        ),
+    ]
+
+    # Unmarshalling cases are run against pre-built responses so that only the
+    # decoding and validation is being measured.
+    for size in SIZES:
+        json_resp = Response(200, content=JSON_BODIES[size])
+        xml_resp = Response(200, content=XML_BODIES[size])
+        iterations = max(5, 5000 // size)
+        cases.append(
+            Benchmark(
+                f"unmarshal/json-list-{size}",
+                "unmarshal",
+                _unmarshaller(json_resp, list[Item], client),
+                iterations=iterations,
+                extra={"bytes": len(JSON_BODIES[size]), "items": size},
+            )
+        )
+        cases.append(
+            Benchmark(
+                f"unmarshal/json-list-{size}-raw",
+                "unmarshal",
+                _unmarshaller(json_resp, list, client),
+                iterations=iterations,
+                extra={"bytes": len(JSON_BODIES[size]), "items": size},
+            )
+        )
+        cases.append(
+            Benchmark(
+                f"unmarshal/xml-list-{size}",
+                "unmarshal",
+                _unmarshaller(xml_resp, XmlItems, client),
+                iterations=iterations,
+                extra={"bytes": len(XML_BODIES[size]), "items": size},
+            )
+        )
+    cases.append(
+        Benchmark(
+            "unmarshal/json-list-1000-projected",
+            "unmarshal",
+            _unmarshaller(
+                Response(200, content=JSON_BODIES[1000]),
+                projection("[*].{id,name}"),
+                client,
+            ),
+            iterations=5,
+            extra={"bytes": len(JSON_BODIES[1000]), "items": 1000},
+        )
+    )
+    cases.append(
+        Benchmark(
+            "unmarshal/json-model",
+            "unmarshal",
+            _unmarshaller(Response(200, content=ITEM_BODY), Item, client),
+            iterations=5000,
+            extra={"bytes": len(ITEM_BODY), "items": 1},
+        )
+    )
+    return cases
+
+
+def _unmarshaller(response: Response, model, client: APIClient):
+    return lambda: unmarshal(response, model=model, client=client)
+
+
+async def _drain(iterator: AsyncAPIIterator) -> int:
+    return sum([1 async for _ in iterator])
+
+
+if __name__ == "__main__":
+    main(build_cases())
@@ -3,10 +3,51 @@ RESTFly Library Package
 """
 
 from ._async import AsyncAPIClient, AsyncAPIEndpoint
-from ._errors import APIError, ErrorStatus, RetryError
+from ._balancer import URLBalancer
+from ._bodies import (
+    AsyncFileUpload,
+    AsyncReplayableBody,
+    FileUpload,
+    ReplayableBody,
+)
+from ._cassette import AsyncCassetteTransport, CassetteTransport
+from ._chunked import AsyncChunkedUpload, ChunkedUpload, UploadPart
+from ._codecs import (
+    JSONCodec,
+    MsgspecCodec,
+    OrjsonCodec,
+    PydanticJSONCodec,
+    StdlibJSONCodec,
+    default_json_codec,
+)
+from ._compression import Compression
+from ._deadline import deadline, time_remaining
+from ._dns import (
+    AsyncDNSCachingTransport,
+    DNSCache,
+    DNSCachingTransport,
+    Resolver,
+    SystemResolver,
+)
+from ._errors import (
+    APIError,
+    CassetteError,
+    DeadlineExceeded,
+    DownloadError,
+    ErrorMap,
+    ErrorStatus,
+    ReplayError,
+    RetryError,
+)
+from ._http2 import HTTP2Profile
 from ._iterator import APIIterator, AsyncAPIIterator
+from ._load import LoadReport, async_load_test, load_test
+from ._metrics import HistogramMetrics, MetricsHook, RequestMetrics
 from ._models import APIModel
+from ._profiling import ModelProfile, Profiler
+from ._projection import projection
 from ._sync import APIClient, APIEndpoint
+from ._tracing import OpenTelemetryTracer, Span, Tracer
 from ._version import version as __version__
 
 __author__ = "Steven McGrath <steve@mcgrath.sh>"
@@ -14,12 +55,54 @@ __all__ = [
     "AsyncAPIClient",
     "AsyncAPIEndpoint",
     "AsyncAPIIterator",
+    "AsyncCassetteTransport",
+    "AsyncChunkedUpload",
+    "AsyncDNSCachingTransport",
+    "AsyncFileUpload",
+    "AsyncReplayableBody",
     "APIClient",
     "APIEndpoint",
     "APIIterator",
     "APIError",
     "APIModel",
+    "CassetteError",
+    "CassetteTransport",
+    "ChunkedUpload",
+    "Compression",
+    "DeadlineExceeded",
+    "DNSCache",
+    "DNSCachingTransport",
+    "DownloadError",
+    "ErrorMap",
     "ErrorStatus",
+    "FileUpload",
+    "HistogramMetrics",
+    "HTTP2Profile",
+    "JSONCodec",
+    "LoadReport",
+    "MetricsHook",
+    "MsgspecCodec",
+    "ModelProfile",
+    "OpenTelemetryTracer",
+    "OrjsonCodec",
+    "Profiler",
+    "PydanticJSONCodec",
+    "projection",
+    "ReplayableBody",
+    "ReplayError",
+    "RequestMetrics",
+    "Resolver",
     "RetryError",
+    "Span",
+    "StdlibJSONCodec",
+    "SystemResolver",
+    "Tracer",
+    "UploadPart",
+    "URLBalancer",
+    "async_load_test",
+    "deadline",
+    "default_json_codec",
+    "load_test",
+    "time_remaining",
     "__version__",
 ]
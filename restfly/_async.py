@@ -1,18 +1,51 @@
 from __future__ import annotations
 
 import random
-from asyncio import sleep
+from asyncio import Task, create_task, gather, sleep, to_thread
+from collections.abc import Container
 from contextlib import asynccontextmanager
+from os import PathLike
+from pathlib import Path
 from ssl import SSLContext
-from typing import Any, AsyncIterator, Callable, Literal, overload, override
+from time import perf_counter
+from typing import (
+    IO,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Literal,
+    overload,
+    override,
+)
+
+from httpx import AsyncHTTPTransport
 
+from ._balancer import BalancePolicy
 from ._base import APIBaseEndpoint, APIClientBase, APIError
+from ._bodies import (
+    CHUNK_SIZE,
+    AsyncFileUpload,
+    AsyncReplayableBody,
+    ProgressCallback,
+    ReplayableBody,
+)
+from ._chunked import PART_BACKOFF, PART_JITTER, AsyncChunkedUpload, UploadPart
+from ._codecs import JSONCodec
+from ._compression import Compression
+from ._deadline import cap_timeout, check_deadline
+from ._dns import AsyncDNSCachingTransport, DNSCache
+from ._download import RESUME_BACKOFF, RESUME_JITTER, Download, Segment
 from ._errors import ErrorStatus, RetryError
+from ._http2 import HTTP2Profile
+from ._metrics import MetricsHook, RequestTracker
+from ._tracing import Tracer
 from ._utils import assign_annotations, unmarshal
 from .types import (
     DEFAULT_LIMITS,
     DEFAULT_MAX_REDIRECTS,
     DEFAULT_TIMEOUT_CONFIG,
+    URL,
     USE_CLIENT_DEFAULT,
     AsyncBaseTransport,
     AsyncClient,
@@ -26,13 +59,17 @@ from .types import (
     Model,
     ProxyTypes,
     QueryParamTypes,
+    RawModel,
+    RawResponse,
     Request,
     RequestContent,
     RequestData,
     RequestExtensions,
     RequestFiles,
     Response,
+    TimeoutException,
     TimeoutTypes,
+    TransportError,
     UseClientDefault,
     XMLModel,
     codes,
@@ -40,12 +77,16 @@ from .types import (
 
 
 class AsyncHTTPClientVerbs:
+    @property
+    def _retry_max(self) -> int:
+        raise NotImplementedError
+
     async def _request(
         self,
         method: HTTPMethods,
         path: str = "",
         *,
-        response_model: type[Model] | type[list[Model]] | None = None,
+        response_model: type[Model] | type[list[Model]] | RawModel | None = None,
         params: QueryParamTypes | None = None,
         content: RequestContent | None = None,
         data: RequestData | None = None,
@@ -62,8 +103,11 @@ class AsyncHTTPClientVerbs:
         extensions: RequestExtensions | None = None,
         max_retries: int | None = None,
         error_map: dict[int, ErrorStatus] | None = None,
+        success_codes: Container[int] | None = None,
+        endpoint: str | None = None,
         stream: bool = False,
-    ) -> Model | list[Model] | Response:
+        compression: Compression | Literal[False] | None = None,
+    ) -> Model | list[Model] | RawResponse | Response | None:
         raise NotImplementedError
 
     @asynccontextmanager
@@ -163,6 +207,245 @@ class AsyncHTTPClientVerbs:
         finally:
             await response.aclose()
 
+    async def _download(
+        self,
+        path: str,
+        dest: str | PathLike[str],
+        *,
+        params: QueryParamTypes | None = None,
+        headers: dict[str, str] | None = None,
+        cookies: CookieTypes | None = None,
+        auth: AuthTypes | UseClientDefault | None = USE_CLIENT_DEFAULT,
+        follow_redirects: bool | UseClientDefault = USE_CLIENT_DEFAULT,
+        timeout: TimeoutTypes | UseClientDefault = USE_CLIENT_DEFAULT,
+        extensions: RequestExtensions | None = None,
+        max_retries: int | None = None,
+        error_map: dict[int, ErrorStatus] | None = None,
+        chunk_size: int = CHUNK_SIZE,
+        checksum: str | None = None,
+        segments: int = 1,
+    ) -> Path:
+        """
+        Downloads the response body of a GET request into a file.  The body is streamed
+        to disk in chunks, and if the connection is interrupted part-way through, the
+        download is resumed from where it left off using a ``Range`` request (made
+        conditional with ``If-Range`` on the resource not having changed).  Status
+        codes are handled by the error map as with any other request.
+
+        Args:
+            path:
+                URL to query.
+            dest:
+                The path of the file to write the body into.  Any existing file is
+                overwritten, and the file is removed if the download fails.
+            params:
+                Request query parameters.
+            headers:
+                Request-specific headers.
+            cookies:
+                Request-specific cookies.
+            auth:
+                Request-specific authentication.
+            follow_redirects:
+                Should the client follow any redirects?
+            timeout:
+                Request-specific timeout settings.
+            extensions:
+                Any additional httpx extensions to pass to the client.
+            max_retries:
+                The maximum number of retries to attempt before giving up. Overloads
+                the client default.  Applies both to retries from the error map and to
+                resuming interrupted transfers.
+            error_map:
+                Replaces the client error map with this one instead.
+            chunk_size:
+                The number of bytes to buffer before writing them to the file.
+            checksum:
+                The expected checksum of the file as ``algorithm:hexdigest``.
+            segments:
+                The number of byte ranges to split the download into.  Ranges are
+                fetched concurrently (each within its own task) and resumed
+                independently.  Servers that don't support ranges are downloaded as a
+                single stream.
+
+        Returns:
+            The path of the downloaded file.
+
+        Example:
+            >>> await client._download("/reports/1", "report.csv")
+            >>> await client._download("/exports/1", "export.tar", segments=8)
+        """
+        retries = max_retries if max_retries else self._retry_max
+
+        async def send(extra: dict[str, str]) -> Response:
+            return await self._request(  # type: ignore[return-value] # ty: ignore[invalid-return-type]
+                "GET",
+                path,
+                params=params,
+                headers=(headers or {}) | extra,
+                cookies=cookies,
+                auth=auth,
+                follow_redirects=follow_redirects,
+                timeout=timeout,
+                extensions=extensions,
+                max_retries=max_retries,
+                error_map=error_map,
+                success_codes=(codes.OK, codes.PARTIAL_CONTENT),
+                stream=True,
+            )
+
+        with Download(dest, checksum, chunk_size) as download:
+            # For segmented downloads, we first probe the first byte of the resource to
+            # learn the size of it and whether ranges are supported at all.  Each
+            # segment is then fetched within its own task.  If ranges aren't
+            # supported, the resource is downloaded as a single stream instead.
+            if segments > 1:
+                response = await send(download.probe_headers)
+                await response.aclose()
+                if parts := await to_thread(download.split, response, segments):
+                    tasks = [
+                        create_task(_transfer(send, part, retries)) for part in parts
+                    ]
+                    try:
+                        await gather(*tasks)
+                    except BaseException:
+                        for task in tasks:
+                            task.cancel()
+                        await gather(*tasks, return_exceptions=True)
+                        raise
+                    return await to_thread(download.finish)
+            await _transfer(send, download, retries)
+            return await to_thread(download.finish)
+
+    async def _upload(
+        self,
+        path: str,
+        source: str | PathLike[str] | IO[bytes],
+        *,
+        method: HTTPMethods = "POST",
+        params: QueryParamTypes | None = None,
+        headers: dict[str, str] | None = None,
+        cookies: CookieTypes | None = None,
+        auth: AuthTypes | UseClientDefault | None = USE_CLIENT_DEFAULT,
+        follow_redirects: bool | UseClientDefault = USE_CLIENT_DEFAULT,
+        timeout: TimeoutTypes | UseClientDefault = USE_CLIENT_DEFAULT,
+        extensions: RequestExtensions | None = None,
+        max_retries: int | None = None,
+        error_map: dict[int, ErrorStatus] | None = None,
+        chunk_size: int = CHUNK_SIZE,
+        progress: ProgressCallback | None = None,
+    ) -> Response:
+        """
+        Uploads a file as the raw body of the request.  The file is streamed from disk
+        in chunks (memory-mapping files given as a path), and is re-opened or seeked
+        back to the start whenever the request is retried.  The ``Content-Type``
+        defaults to ``application/octet-stream``.
+
+        Args:
+            path:
+                URL to query.
+            source:
+                The path of the file or the binary file object to upload.
+            method:
+                The HTTP method used to make the call.
+            params:
+                Request query parameters.
+            headers:
+                Request-specific headers.
+            cookies:
+                Request-specific cookies.
+            auth:
+                Request-specific authentication.
+            follow_redirects:
+                Should the client follow any redirects?
+            timeout:
+                Request-specific timeout settings.
+            extensions:
+                Any additional httpx extensions to pass to the client.
+            max_retries:
+                The maximum number of retries to attempt before giving up. Overloads
+                the client default.
+            error_map:
+                Replaces the client error map with this one instead.
+            chunk_size:
+                The number of bytes to send at a time.
+            progress:
+                Callback called after each chunk is sent with the number of bytes sent
+                so far and the total size of the file.
+
+        Returns:
+            The HTTPX Response object.
+
+        Example:
+            >>> await client._upload("/files", "export.tar", method="PUT")
+        """
+        headers = {"Content-Type": "application/octet-stream"} | (headers or {})
+        response: Response = await self._request(  # type: ignore[assignment] # ty: ignore[invalid-assignment]
+            method,
+            path,
+            content=AsyncFileUpload(source, chunk_size, progress=progress),
+            params=params,
+            headers=headers,
+            cookies=cookies,
+            auth=auth,
+            follow_redirects=follow_redirects,
+            timeout=timeout,
+            extensions=extensions,
+            max_retries=max_retries,
+            error_map=error_map,
+        )
+        return response
+
+    async def _chunked_upload(
+        self,
+        upload: AsyncChunkedUpload,
+        *,
+        max_retries: int | None = None,
+    ) -> Any:
+        """
+        Runs a chunked upload.  The upload is started (unless it's being resumed from
+        its state file), the pending parts are uploaded concurrently (each within its
+        own task), and the upload is then completed with the results of every part.
+        Parts that fail to send due to a connection error are retried individually.
+
+        Args:
+            upload:
+                The chunked upload to run.
+            max_retries:
+                The maximum number of times to retry each part before giving up.
+                Overloads the client default.
+
+        Returns:
+            The return value of the complete step of the upload.
+
+        Example:
+            >>> upload = VendorUpload("export.tar", state="upload.json")
+            >>> await client._chunked_upload(upload)
+        """
+        retries = max_retries if max_retries else self._retry_max
+        if upload.session is None:
+            upload.begin(await upload.start(self))
+
+        # Each worker task takes the next pending part until none are left, so at most
+        # the configured number of parts are in flight at once.
+        parts = iter(upload.pending)
+
+        async def worker() -> None:
+            for part in parts:
+                await _send_part(self, upload, part, retries)
+
+        tasks = [create_task(worker()) for _ in range(upload.workers)]
+        try:
+            await gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await gather(*tasks, return_exceptions=True)
+            raise
+        result = await upload.complete(self, upload.completed)
+        upload.finish()
+        return result
+
     @overload
     async def _get(
         self,
@@ -180,6 +463,7 @@ class AsyncHTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
     ) -> Response: ...
 
     @overload
@@ -199,7 +483,8 @@ class AsyncHTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
-    ) -> Model: ...
+        success_codes: Container[int] | None = ...,
+    ) -> Model | None: ...
 
     @overload
     async def _get(
@@ -218,13 +503,34 @@ class AsyncHTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
-    ) -> list[Model]: ...
+        success_codes: Container[int] | None = ...,
+    ) -> list[Model] | None: ...
+
+    @overload
+    async def _get(
+        self,
+        path: str = ...,
+        *,
+        response_model: RawModel,
+        response_model_kwargs: dict[str, Any] | None = ...,
+        request_model_kwargs: dict[str, Any] | None = ...,
+        params: QueryParamTypes | None = ...,
+        headers: dict[str, str] | None = ...,
+        cookies: CookieTypes | None = ...,
+        auth: AuthTypes | UseClientDefault | None = ...,
+        follow_redirects: bool | UseClientDefault = ...,
+        timeout: TimeoutTypes | UseClientDefault = ...,
+        extensions: RequestExtensions | None = ...,
+        max_retries: int | None = ...,
+        error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+    ) -> Any: ...
 
     async def _get(
         self,
         path: str = "",
         *,
-        response_model: type[Model] | type[list[Model]] | None = None,
+        response_model: type[Model] | type[list[Model]] | RawModel | None = None,
         response_model_kwargs: dict[str, Any] | None = None,
         request_model_kwargs: dict[str, Any] | None = None,
         params: QueryParamTypes | None = None,
@@ -236,7 +542,8 @@ class AsyncHTTPClientVerbs:
         extensions: RequestExtensions | None = None,
         max_retries: int | None = None,
         error_map: dict[int, ErrorStatus] | None = None,
-    ) -> Model | list[Model] | Response:
+        success_codes: Container[int] | None = None,
+    ) -> Model | list[Model] | RawResponse | Response | None:
         """
         Construct and send an HTTP GET request.
 
@@ -244,7 +551,9 @@ class AsyncHTTPClientVerbs:
             path:
                 URL to query.
             response_model:
-                Pydantic model to coerce the response into.
+                Pydantic model to coerce the response into.  Passing ``dict`` or
+                ``list`` returns the decoded JSON data and ``memoryview`` returns the
+                response body, skipping model construction entirely.
             response_model_kwargs:
                 Keyword arguments to pass to Pydantic/Pydantic-XML as part of
                 un-marshalling the response data.
@@ -267,11 +576,15 @@ class AsyncHTTPClientVerbs:
                 the client default.
             error_map:
                 Replaces the client error map with this one instead.
+            success_codes:
+                The status codes to consider a successful response. Overloads the
+                endpoint and client defaults.
 
         Returns:
             Returns the HTTPX Response object if no response_model is specified. If a
             response_model _is_ specified, then the response will be coerced into the
-            response model and the instance of the model will be returned.
+            response model and the instance of the model will be returned. Successful
+            responses without any content (such as a 204) will return None instead.
         """
         return await self._request(  # ty: ignore[invalid-return-type]
             method="GET",
@@ -288,6 +601,7 @@ class AsyncHTTPClientVerbs:
             request_model_kwargs=request_model_kwargs,
             max_retries=max_retries,
             error_map=error_map,
+            success_codes=success_codes,
         )
 
     @overload
@@ -312,6 +626,8 @@ class AsyncHTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
     ) -> Response: ...
 
     @overload
@@ -336,7 +652,9 @@ class AsyncHTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
-    ) -> Model: ...
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Model | None: ...
 
     @overload
     async def _post(
@@ -360,7 +678,35 @@ class AsyncHTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
-    ) -> list[Model]: ...
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> list[Model] | None: ...
+
+    @overload
+    async def _post(
+        self,
+        path: str = ...,
+        *,
+        response_model: RawModel,
+        params: QueryParamTypes | None = ...,
+        content: RequestContent | None = ...,
+        data: RequestData | None = ...,
+        files: RequestFiles | None = ...,
+        json: Model | Any | None = ...,
+        xml: XMLModel | str | bytes | None = ...,
+        response_model_kwargs: dict[str, Any] | None = ...,
+        request_model_kwargs: dict[str, Any] | None = ...,
+        headers: dict[str, str] | None = ...,
+        cookies: CookieTypes | None = ...,
+        auth: AuthTypes | UseClientDefault | None = ...,
+        follow_redirects: bool | UseClientDefault = ...,
+        timeout: TimeoutTypes | UseClientDefault = ...,
+        extensions: RequestExtensions | None = ...,
+        max_retries: int | None = ...,
+        error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Any: ...
 
     async def _post(
         self,
@@ -373,7 +719,7 @@ class AsyncHTTPClientVerbs:
         json: Model | Any | None = None,
         xml: XMLModel | str | bytes | None = None,
         headers: dict[str, str] | None = None,
-        response_model: type[Model] | type[list[Model]] | None = None,
+        response_model: type[Model] | type[list[Model]] | RawModel | None = None,
         response_model_kwargs: dict[str, Any] | None = None,
         request_model_kwargs: dict[str, Any] | None = None,
         cookies: CookieTypes | None = None,
@@ -383,7 +729,9 @@ class AsyncHTTPClientVerbs:
         extensions: RequestExtensions | None = None,
         max_retries: int | None = None,
         error_map: dict[int, ErrorStatus] | None = None,
-    ) -> Model | list[Model] | Response:
+        success_codes: Container[int] | None = None,
+        compression: Compression | Literal[False] | None = None,
+    ) -> Model | list[Model] | RawResponse | Response | None:
         """
         Construct and send an HTTP POST request.
 
@@ -391,7 +739,9 @@ class AsyncHTTPClientVerbs:
             path:
                 URL to query.
             response_model:
-                Pydantic model to coerce the response into.
+                Pydantic model to coerce the response into.  Passing ``dict`` or
+                ``list`` returns the decoded JSON data and ``memoryview`` returns the
+                response body, skipping model construction entirely.
             response_model_kwargs:
                 Keyword arguments to pass to Pydantic/Pydantic-XML as part of
                 un-marshalling the response data.
@@ -429,11 +779,18 @@ class AsyncHTTPClientVerbs:
                 the client default.
             error_map:
                 Replaces the client error map with this one instead.
+            success_codes:
+                The status codes to consider a successful response. Overloads the
+                endpoint and client defaults.
+            compression:
+                The compression settings for the request body.  Overloads the client
+                default, and False disables compression for the request.
 
         Returns:
             Returns the HTTPX Response object if no response_model is specified. If a
             response_model _is_ specified, then the response will be coerced into the
-            response model and the instance of the model will be returned.
+            response model and the instance of the model will be returned. Successful
+            responses without any content (such as a 204) will return None instead.
         """
         return await self._request(  # ty: ignore[invalid-return-type]
             method="POST",
@@ -455,6 +812,8 @@ class AsyncHTTPClientVerbs:
             request_model_kwargs=request_model_kwargs,
             max_retries=max_retries,
             error_map=error_map,
+            success_codes=success_codes,
+            compression=compression,
         )
 
     @overload
@@ -479,6 +838,8 @@ class AsyncHTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
     ) -> Response: ...
 
     @overload
@@ -503,7 +864,9 @@ class AsyncHTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
-    ) -> Model: ...
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Model | None: ...
 
     @overload
     async def _put(
@@ -527,7 +890,35 @@ class AsyncHTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
-    ) -> list[Model]: ...
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> list[Model] | None: ...
+
+    @overload
+    async def _put(
+        self,
+        path: str = ...,
+        *,
+        response_model: RawModel,
+        params: QueryParamTypes | None = ...,
+        content: RequestContent | None = ...,
+        data: RequestData | None = ...,
+        files: RequestFiles | None = ...,
+        json: Model | Any | None = ...,
+        xml: XMLModel | str | bytes | None = ...,
+        response_model_kwargs: dict[str, Any] | None = ...,
+        request_model_kwargs: dict[str, Any] | None = ...,
+        headers: dict[str, str] | None = ...,
+        cookies: CookieTypes | None = ...,
+        auth: AuthTypes | UseClientDefault | None = ...,
+        follow_redirects: bool | UseClientDefault = ...,
+        timeout: TimeoutTypes | UseClientDefault = ...,
+        extensions: RequestExtensions | None = ...,
+        max_retries: int | None = ...,
+        error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Any: ...
 
     async def _put(
         self,
@@ -540,7 +931,7 @@ class AsyncHTTPClientVerbs:
         json: Model | Any | None = None,
         xml: XMLModel | str | bytes | None = None,
         headers: dict[str, str] | None = None,
-        response_model: type[Model] | type[list[Model]] | None = None,
+        response_model: type[Model] | type[list[Model]] | RawModel | None = None,
         response_model_kwargs: dict[str, Any] | None = None,
         request_model_kwargs: dict[str, Any] | None = None,
         cookies: CookieTypes | None = None,
@@ -550,7 +941,9 @@ class AsyncHTTPClientVerbs:
         extensions: RequestExtensions | None = None,
         max_retries: int | None = None,
         error_map: dict[int, ErrorStatus] | None = None,
-    ) -> Model | list[Model] | Response:
+        success_codes: Container[int] | None = None,
+        compression: Compression | Literal[False] | None = None,
+    ) -> Model | list[Model] | RawResponse | Response | None:
         """
         Construct and send an HTTP PUT request.
 
@@ -558,7 +951,9 @@ class AsyncHTTPClientVerbs:
             path:
                 URL to query.
             response_model:
-                Pydantic model to coerce the response into.
+                Pydantic model to coerce the response into.  Passing ``dict`` or
+                ``list`` returns the decoded JSON data and ``memoryview`` returns the
+                response body, skipping model construction entirely.
             response_model_kwargs:
                 Keyword arguments to pass to Pydantic/Pydantic-XML as part of
                 un-marshalling the response data.
@@ -596,11 +991,18 @@ class AsyncHTTPClientVerbs:
                 the client default.
             error_map:
                 Replaces the client error map with this one instead.
+            success_codes:
+                The status codes to consider a successful response. Overloads the
+                endpoint and client defaults.
+            compression:
+                The compression settings for the request body.  Overloads the client
+                default, and False disables compression for the request.
 
         Returns:
             Returns the HTTPX Response object if no response_model is specified. If a
             response_model _is_ specified, then the response will be coerced into the
-            response model and the instance of the model will be returned.
+            response model and the instance of the model will be returned. Successful
+            responses without any content (such as a 204) will return None instead.
         """
         return await self._request(  # ty: ignore[invalid-return-type]
             method="PUT",
@@ -622,6 +1024,8 @@ class AsyncHTTPClientVerbs:
             request_model_kwargs=request_model_kwargs,
             max_retries=max_retries,
             error_map=error_map,
+            success_codes=success_codes,
+            compression=compression,
         )
 
     @overload
@@ -646,6 +1050,8 @@ class AsyncHTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
     ) -> Response: ...
 
     @overload
@@ -670,7 +1076,9 @@ class AsyncHTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
-    ) -> Model: ...
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Model | None: ...
 
     @overload
     async def _patch(
@@ -694,7 +1102,35 @@ class AsyncHTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
-    ) -> list[Model]: ...
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> list[Model] | None: ...
+
+    @overload
+    async def _patch(
+        self,
+        path: str = ...,
+        *,
+        response_model: RawModel,
+        params: QueryParamTypes | None = ...,
+        content: RequestContent | None = ...,
+        data: RequestData | None = ...,
+        files: RequestFiles | None = ...,
+        json: Model | Any | None = ...,
+        xml: XMLModel | str | bytes | None = ...,
+        response_model_kwargs: dict[str, Any] | None = ...,
+        request_model_kwargs: dict[str, Any] | None = ...,
+        headers: dict[str, str] | None = ...,
+        cookies: CookieTypes | None = ...,
+        auth: AuthTypes | UseClientDefault | None = ...,
+        follow_redirects: bool | UseClientDefault = ...,
+        timeout: TimeoutTypes | UseClientDefault = ...,
+        extensions: RequestExtensions | None = ...,
+        max_retries: int | None = ...,
+        error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Any: ...
 
     async def _patch(
         self,
@@ -707,7 +1143,7 @@ class AsyncHTTPClientVerbs:
         json: Model | Any | None = None,
         xml: XMLModel | str | bytes | None = None,
         headers: dict[str, str] | None = None,
-        response_model: type[Model] | type[list[Model]] | None = None,
+        response_model: type[Model] | type[list[Model]] | RawModel | None = None,
         response_model_kwargs: dict[str, Any] | None = None,
         request_model_kwargs: dict[str, Any] | None = None,
         cookies: CookieTypes | None = None,
@@ -717,7 +1153,9 @@ class AsyncHTTPClientVerbs:
         extensions: RequestExtensions | None = None,
         max_retries: int | None = None,
         error_map: dict[int, ErrorStatus] | None = None,
-    ) -> Model | list[Model] | Response:
+        success_codes: Container[int] | None = None,
+        compression: Compression | Literal[False] | None = None,
+    ) -> Model | list[Model] | RawResponse | Response | None:
         """
         Construct and send an HTTP PATCH request.
 
@@ -725,7 +1163,9 @@ class AsyncHTTPClientVerbs:
             path:
                 URL to query.
             response_model:
-                Pydantic model to coerce the response into.
+                Pydantic model to coerce the response into.  Passing ``dict`` or
+                ``list`` returns the decoded JSON data and ``memoryview`` returns the
+                response body, skipping model construction entirely.
             response_model_kwargs:
                 Keyword arguments to pass to Pydantic/Pydantic-XML as part of
                 un-marshalling the response data.
@@ -763,11 +1203,18 @@ class AsyncHTTPClientVerbs:
                 the client default.
             error_map:
                 Replaces the client error map with this one instead.
+            success_codes:
+                The status codes to consider a successful response. Overloads the
+                endpoint and client defaults.
+            compression:
+                The compression settings for the request body.  Overloads the client
+                default, and False disables compression for the request.
 
         Returns:
             Returns the HTTPX Response object if no response_model is specified. If a
             response_model _is_ specified, then the response will be coerced into the
-            response model and the instance of the model will be returned.
+            response model and the instance of the model will be returned. Successful
+            responses without any content (such as a 204) will return None instead.
         """
         return await self._request(  # ty: ignore[invalid-return-type]
             method="PATCH",
@@ -789,6 +1236,8 @@ class AsyncHTTPClientVerbs:
             request_model_kwargs=request_model_kwargs,
             max_retries=max_retries,
             error_map=error_map,
+            success_codes=success_codes,
+            compression=compression,
         )
 
     @overload
@@ -813,6 +1262,8 @@ class AsyncHTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
     ) -> Response: ...
 
     @overload
@@ -837,7 +1288,9 @@ class AsyncHTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
-    ) -> Model: ...
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Model | None: ...
 
     @overload
     async def _delete(
@@ -861,7 +1314,35 @@ class AsyncHTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
-    ) -> list[Model]: ...
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> list[Model] | None: ...
+
+    @overload
+    async def _delete(
+        self,
+        path: str = ...,
+        *,
+        response_model: RawModel,
+        params: QueryParamTypes | None = ...,
+        content: RequestContent | None = ...,
+        data: RequestData | None = ...,
+        files: RequestFiles | None = ...,
+        json: Model | Any | None = ...,
+        xml: XMLModel | str | bytes | None = ...,
+        response_model_kwargs: dict[str, Any] | None = ...,
+        request_model_kwargs: dict[str, Any] | None = ...,
+        headers: dict[str, str] | None = ...,
+        cookies: CookieTypes | None = ...,
+        auth: AuthTypes | UseClientDefault | None = ...,
+        follow_redirects: bool | UseClientDefault = ...,
+        timeout: TimeoutTypes | UseClientDefault = ...,
+        extensions: RequestExtensions | None = ...,
+        max_retries: int | None = ...,
+        error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Any: ...
 
     async def _delete(
         self,
@@ -874,7 +1355,7 @@ class AsyncHTTPClientVerbs:
         json: Model | Any | None = None,
         xml: XMLModel | str | bytes | None = None,
         headers: dict[str, str] | None = None,
-        response_model: type[Model] | type[list[Model]] | None = None,
+        response_model: type[Model] | type[list[Model]] | RawModel | None = None,
         response_model_kwargs: dict[str, Any] | None = None,
         request_model_kwargs: dict[str, Any] | None = None,
         cookies: CookieTypes | None = None,
@@ -884,7 +1365,9 @@ class AsyncHTTPClientVerbs:
         extensions: RequestExtensions | None = None,
         max_retries: int | None = None,
         error_map: dict[int, ErrorStatus] | None = None,
-    ) -> Model | list[Model] | Response:
+        success_codes: Container[int] | None = None,
+        compression: Compression | Literal[False] | None = None,
+    ) -> Model | list[Model] | RawResponse | Response | None:
         """
         Construct and send an HTTP DELETE request.
 
@@ -892,7 +1375,9 @@ class AsyncHTTPClientVerbs:
             path:
                 URL to query.
             response_model:
-                Pydantic model to coerce the response into.
+                Pydantic model to coerce the response into.  Passing ``dict`` or
+                ``list`` returns the decoded JSON data and ``memoryview`` returns the
+                response body, skipping model construction entirely.
             response_model_kwargs:
                 Keyword arguments to pass to Pydantic/Pydantic-XML as part of
                 un-marshalling the response data.
@@ -930,11 +1415,18 @@ class AsyncHTTPClientVerbs:
                 the client default.
             error_map:
                 Replaces the client error map with this one instead.
+            success_codes:
+                The status codes to consider a successful response. Overloads the
+                endpoint and client defaults.
+            compression:
+                The compression settings for the request body.  Overloads the client
+                default, and False disables compression for the request.
 
         Returns:
             Returns the HTTPX Response object if no response_model is specified. If a
             response_model _is_ specified, then the response will be coerced into the
-            response model and the instance of the model will be returned.
+            response model and the instance of the model will be returned. Successful
+            responses without any content (such as a 204) will return None instead.
         """
         return await self._request(  # ty: ignore[invalid-return-type]
             method="DELETE",
@@ -956,6 +1448,8 @@ class AsyncHTTPClientVerbs:
             request_model_kwargs=request_model_kwargs,
             max_retries=max_retries,
             error_map=error_map,
+            success_codes=success_codes,
+            compression=compression,
         )
 
 
@@ -988,7 +1482,10 @@ class AsyncAPIEndpoint(APIBaseEndpoint, AsyncHTTPClientVerbs):
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        endpoint: str | None = ...,
         stream: bool = ...,
+        compression: Compression | Literal[False] | None = ...,
     ) -> Response: ...
 
     @overload
@@ -1014,8 +1511,11 @@ class AsyncAPIEndpoint(APIBaseEndpoint, AsyncHTTPClientVerbs):
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        endpoint: str | None = ...,
         stream: bool = False,
-    ) -> Model: ...
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Model | None: ...
 
     @overload
     async def _request(
@@ -1040,8 +1540,11 @@ class AsyncAPIEndpoint(APIBaseEndpoint, AsyncHTTPClientVerbs):
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        endpoint: str | None = ...,
         stream: bool = False,
-    ) -> list[Model]: ...
+        compression: Compression | Literal[False] | None = ...,
+    ) -> list[Model] | None: ...
 
     @overload
     async def _request(
@@ -1049,7 +1552,7 @@ class AsyncAPIEndpoint(APIBaseEndpoint, AsyncHTTPClientVerbs):
         method: HTTPMethods,
         path: str = "",
         *,
-        response_model: type[Model] | type[list[Model]] | None = ...,
+        response_model: RawModel,
         params: QueryParamTypes | None = ...,
         content: RequestContent | None = ...,
         data: RequestData | None = ...,
@@ -1066,8 +1569,40 @@ class AsyncAPIEndpoint(APIBaseEndpoint, AsyncHTTPClientVerbs):
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        endpoint: str | None = ...,
+        stream: bool = False,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Any: ...
+
+    @overload
+    async def _request(
+        self,
+        method: HTTPMethods,
+        path: str = "",
+        *,
+        response_model: type[Model] | type[list[Model]] | RawModel | None = ...,
+        params: QueryParamTypes | None = ...,
+        content: RequestContent | None = ...,
+        data: RequestData | None = ...,
+        files: RequestFiles | None = ...,
+        json: Model | Any | None = ...,
+        xml: XMLModel | str | bytes | None = ...,
+        response_model_kwargs: dict[str, Any] | None = ...,
+        request_model_kwargs: dict[str, Any] | None = ...,
+        headers: dict[str, str] | None = ...,
+        cookies: CookieTypes | None = ...,
+        auth: AuthTypes | UseClientDefault | None = ...,
+        follow_redirects: bool | UseClientDefault = ...,
+        timeout: TimeoutTypes | UseClientDefault = ...,
+        extensions: RequestExtensions | None = ...,
+        max_retries: int | None = ...,
+        error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        endpoint: str | None = ...,
         stream: bool = ...,
-    ) -> Model | list[Model] | Response: ...
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Model | list[Model] | RawResponse | Response | None: ...
 
     @override
     async def _request(
@@ -1082,7 +1617,7 @@ class AsyncAPIEndpoint(APIBaseEndpoint, AsyncHTTPClientVerbs):
         headers: dict[str, str] | None = None,
         json: Model | Any | None = None,
         xml: XMLModel | str | bytes | None = None,
-        response_model: type[Model] | type[list[Model]] | None = None,
+        response_model: type[Model] | type[list[Model]] | RawModel | None = None,
         response_model_kwargs: dict[str, Any] | None = None,
         request_model_kwargs: dict[str, Any] | None = None,
         cookies: CookieTypes | None = None,
@@ -1092,8 +1627,11 @@ class AsyncAPIEndpoint(APIBaseEndpoint, AsyncHTTPClientVerbs):
         extensions: RequestExtensions | None = None,
         max_retries: int | None = None,
         error_map: dict[int, ErrorStatus] | None = None,
+        success_codes: Container[int] | None = None,
+        endpoint: str | None = None,
         stream: bool = False,
-    ) -> Model | list[Model] | Response:
+        compression: Compression | Literal[False] | None = None,
+    ) -> Model | list[Model] | RawResponse | Response | None:
         """
         Construct and send an HTTP request.
 
@@ -1103,7 +1641,9 @@ class AsyncAPIEndpoint(APIBaseEndpoint, AsyncHTTPClientVerbs):
             path:
                 URL to query.
             response_model:
-                Pydantic model to coerce the response into.
+                Pydantic model to coerce the response into.  Passing ``dict`` or
+                ``list`` returns the decoded JSON data and ``memoryview`` returns the
+                response body, skipping model construction entirely.
             response_model_kwargs:
                 Keyword arguments to pass to Pydantic/Pydantic-XML as part of
                 un-marshalling the response data.
@@ -1141,11 +1681,22 @@ class AsyncAPIEndpoint(APIBaseEndpoint, AsyncHTTPClientVerbs):
                 the client default.
             error_map:
                 Replaces the client error map with this one instead.
+            success_codes:
+                The status codes to consider a successful response. Overloads the
+                endpoint and client defaults.
+            endpoint:
+                Label of the endpoint making the request, used when reporting metrics
+                and traces.
+                Endpoints will pass their path.
+            compression:
+                The compression settings for the request body.  Overloads the client
+                default, and False disables compression for the request.
 
         Returns:
             Returns the HTTPX Response object if no response_model is specified. If a
             response_model _is_ specified, then the response will be coerced into the
-            response model and the instance of the model will be returned.
+            response model and the instance of the model will be returned. Successful
+            responses without any content (such as a 204) will return None instead.
         """
         if self._path is not None:
             path = f"{self._path}{path}"
@@ -1170,15 +1721,25 @@ class AsyncAPIEndpoint(APIBaseEndpoint, AsyncHTTPClientVerbs):
             response_model_kwargs=response_model_kwargs,
             request_model_kwargs=request_model_kwargs,
             error_map=error_map,
+            success_codes=(
+                self._success_codes if success_codes is None else success_codes
+            ),
+            endpoint=self._path if endpoint is None else endpoint,
             stream=stream,
+            compression=compression,
         )
 
 
 class AsyncAPIClient(APIClientBase, AsyncHTTPClientVerbs):
     __client_class__: type[AsyncClient] = AsyncClient
     __endpoint_class__: type[AsyncAPIEndpoint] = AsyncAPIEndpoint
+    __transport_class__: type[AsyncHTTPTransport] = AsyncHTTPTransport  # ty: ignore[invalid-mutable-override]
+    __dns_transport_class__: type[AsyncDNSCachingTransport] = AsyncDNSCachingTransport  # ty: ignore[invalid-mutable-override]
     _client: AsyncClient
 
+    _keepalive: Task[None] | None = None
+    """ The background keep-alive task started by ``_warmup()``. """
+
     @override
     def __assign_annotations__(self) -> None:
         """
@@ -1197,6 +1758,7 @@ class AsyncAPIClient(APIClientBase, AsyncHTTPClientVerbs):
         """
         Async Context Manager __aexit__ dunder. See PEP-343 for more details.
         """
+        self._stop_keepalive()
         return self._deauthenticate()
 
     def __init__(
@@ -1209,7 +1771,7 @@ class AsyncAPIClient(APIClientBase, AsyncHTTPClientVerbs):
         verify: SSLContext | str | bool = True,
         cert: CertTypes | None = None,
         http1: bool = True,
-        http2: bool = False,
+        http2: bool | HTTP2Profile | None = None,
         proxy: ProxyTypes | None = None,
         mounts: (dict[str, AsyncBaseTransport | None]) | None = None,
         timeout: TimeoutTypes = DEFAULT_TIMEOUT_CONFIG,
@@ -1217,7 +1779,7 @@ class AsyncAPIClient(APIClientBase, AsyncHTTPClientVerbs):
         limits: Limits = DEFAULT_LIMITS,
         max_redirects: int = DEFAULT_MAX_REDIRECTS,
         event_hooks: (dict[str, list[EventHook]]) | None = None,
-        base_url: str | None = None,
+        base_url: str | URL | list[str] | tuple[str, ...] | None = None,
         transport: AsyncBaseTransport | None = None,
         trust_env: bool = True,
         default_encoding: str | Callable[[bytes], str] = "utf-8",
@@ -1231,6 +1793,13 @@ class AsyncAPIClient(APIClientBase, AsyncHTTPClientVerbs):
         xml_dump_kwargs: dict[str, Any] | None = None,
         error_map: dict[int, ErrorStatus] | None = None,
         error_class: type[APIError] | None = None,
+        metrics: MetricsHook | None = None,
+        tracer: Tracer | None = None,
+        json_codec: JSONCodec | None = None,
+        compression: Compression | None = None,
+        keepalive_expiry: float | None = None,
+        dns_cache: DNSCache | bool | None = None,
+        balance_policy: BalancePolicy | None = None,
     ) -> None:
         # Add the class event hooks to loop in the logging facilities.
         event_hooks = {} if event_hooks is None else event_hooks
@@ -1268,8 +1837,19 @@ class AsyncAPIClient(APIClientBase, AsyncHTTPClientVerbs):
             xml_dump_kwargs=xml_dump_kwargs,
             error_map=error_map,
             error_class=error_class,
+            metrics=metrics,
+            tracer=tracer,
+            json_codec=json_codec,
+            compression=compression,
+            keepalive_expiry=keepalive_expiry,
+            dns_cache=dns_cache,
+            balance_policy=balance_policy,
         )
 
+        # Watch for servers not negotiating HTTP/2 when an HTTP/2 profile is in use.
+        if self._http2 is not None and not self._http2_fallback:
+            self._client.event_hooks["response"].append(self._protocol_hook)
+
     async def _deauthenticate(self):
         """
         De-authentication stub.  De-authentication is automatically run as part
@@ -1288,7 +1868,16 @@ class AsyncAPIClient(APIClientBase, AsyncHTTPClientVerbs):
         Args:
             request: The request object.
         """
-        self._logger.debug(f"REQUESTING {request.method}: {request.url}")
+        self._logger.debug("REQUESTING %s: %s", request.method, request.url)
+
+    async def _protocol_hook(self, response: Response) -> None:
+        """
+        The Response hook detecting servers not negotiating HTTP/2.
+
+        Args:
+            response: The response object.
+        """
+        self._check_protocol(response)
 
     async def _response_hook(self, response: Response) -> None:
         """
@@ -1298,7 +1887,10 @@ class AsyncAPIClient(APIClientBase, AsyncHTTPClientVerbs):
             response: The response object.
         """
         self._logger.info(
-            f"[{response.status_code}] {response.request.method}: {response.request.url}"
+            "[%s] %s: %s",
+            response.status_code,
+            response.request.method,
+            response.request.url,
         )
 
     async def _retry_request(self, response: Response) -> Request:
@@ -1310,6 +1902,102 @@ class AsyncAPIClient(APIClientBase, AsyncHTTPClientVerbs):
         """
         return response.request
 
+    async def _warmup(
+        self,
+        n_connections: int = 1,
+        *,
+        path: str | None = None,
+        method: HTTPMethods = "HEAD",
+        keepalive: float | None = None,
+    ) -> int:
+        """
+        Opens pooled connections ahead of time, so that the first requests made through
+        the client land on connections that have already paid for the DNS lookup and
+        the TCP and TLS handshakes.  The warm-up requests are sent concurrently and
+        held open until all of them have been answered, so that each takes a connection
+        of its own, which is then returned to the pool.  When the client balances its
+        requests across several base URLs, the connections are spread across all of
+        them.  Failed connections are logged rather than raised.
+
+        The pool only keeps ``max_keepalive_connections`` idle connections (20 by
+        default) for ``keepalive_expiry`` seconds, so the limits may need raising along
+        with ``n_connections``.
+
+        Args:
+            n_connections: The number of connections to open.
+            path: The path to request.  Defaults to the ``_warmup_path`` of the client.
+            method: The HTTP method of the warm-up requests.
+            keepalive:
+                If set, the connections are warmed up again every ``keepalive`` seconds
+                from a background task, keeping idle connections from expiring until
+                ``_stop_keepalive()`` is called or the client context is left.
+
+        Returns:
+            The number of connections opened.
+
+        Example:
+            >>> client = AsyncAPIClient(base_url="https://example.com")
+            >>> await client._warmup(10, path="/health", keepalive=30)
+            10
+        """
+        if n_connections < 1:
+            raise ValueError("n_connections must be >= 1.")
+        path = self._warmup_path if path is None else path
+        self._stop_keepalive()
+        opened = await self._open_connections(n_connections, path, method)
+        if keepalive:
+            self._keepalive = create_task(
+                self._keepalive_loop(keepalive, n_connections, path, method)
+            )
+        return opened
+
+    def _stop_keepalive(self) -> None:
+        """
+        Cancels the background keep-alive task started by ``_warmup()`` (if any).
+        """
+        if self._keepalive is not None:
+            self._keepalive.cancel()
+            self._keepalive = None
+
+    async def _open_connections(
+        self, count: int, path: str, method: HTTPMethods
+    ) -> int:
+        """
+        Sends the warm-up requests concurrently, returning the number answered.
+        """
+        responses: list[Response] = []
+
+        async def send(url: str) -> None:
+            try:
+                request = self._client.build_request(method, url)
+                responses.append(await self._client.send(request, stream=True))
+            except TransportError as err:
+                self._logger.warning("Warm-up request to %r failed: %s", url, err)
+
+        try:
+            await gather(*(send(url) for url in self._warmup_urls(count, path)))
+        finally:
+            # Reading the (empty) bodies completes the exchanges, so that the
+            # connections are returned to the pool rather than discarded.
+            for response in responses:
+                try:
+                    await response.aread()
+                finally:
+                    await response.aclose()
+        return len(responses)
+
+    async def _keepalive_loop(
+        self, interval: float, count: int, path: str, method: HTTPMethods
+    ) -> None:
+        """
+        Warms up the connections every interval until cancelled.
+        """
+        while True:
+            await sleep(interval)
+            if self._client.is_closed:
+                return
+            await self._open_connections(count, path, method)
+
     @overload
     async def _request(
         self,
@@ -1333,7 +2021,10 @@ class AsyncAPIClient(APIClientBase, AsyncHTTPClientVerbs):
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        endpoint: str | None = ...,
         stream: bool = ...,
+        compression: Compression | Literal[False] | None = ...,
     ) -> Response: ...
 
     @overload
@@ -1359,8 +2050,11 @@ class AsyncAPIClient(APIClientBase, AsyncHTTPClientVerbs):
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        endpoint: str | None = ...,
         stream: bool = False,
-    ) -> Model: ...
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Model | None: ...
 
     @overload
     async def _request(
@@ -1385,8 +2079,40 @@ class AsyncAPIClient(APIClientBase, AsyncHTTPClientVerbs):
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        endpoint: str | None = ...,
+        stream: bool = False,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> list[Model] | None: ...
+
+    @overload
+    async def _request(
+        self,
+        method: HTTPMethods,
+        path: str = "",
+        *,
+        response_model: RawModel,
+        params: QueryParamTypes | None = ...,
+        content: RequestContent | None = ...,
+        data: RequestData | None = ...,
+        files: RequestFiles | None = ...,
+        json: Model | Any | None = ...,
+        xml: XMLModel | str | bytes | None = ...,
+        response_model_kwargs: dict[str, Any] | None = ...,
+        request_model_kwargs: dict[str, Any] | None = ...,
+        headers: dict[str, str] | None = ...,
+        cookies: CookieTypes | None = ...,
+        auth: AuthTypes | UseClientDefault | None = ...,
+        follow_redirects: bool | UseClientDefault = ...,
+        timeout: TimeoutTypes | UseClientDefault = ...,
+        extensions: RequestExtensions | None = ...,
+        max_retries: int | None = ...,
+        error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        endpoint: str | None = ...,
         stream: bool = False,
-    ) -> list[Model]: ...
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Any: ...
 
     @overload
     async def _request(
@@ -1394,7 +2120,7 @@ class AsyncAPIClient(APIClientBase, AsyncHTTPClientVerbs):
         method: HTTPMethods,
         path: str = "",
         *,
-        response_model: type[Model] | type[list[Model]] | None = ...,
+        response_model: type[Model] | type[list[Model]] | RawModel | None = ...,
         params: QueryParamTypes | None = ...,
         content: RequestContent | None = ...,
         data: RequestData | None = ...,
@@ -1411,8 +2137,11 @@ class AsyncAPIClient(APIClientBase, AsyncHTTPClientVerbs):
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        endpoint: str | None = ...,
         stream: bool = ...,
-    ) -> Model | list[Model] | Response: ...
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Model | list[Model] | RawResponse | Response | None: ...
 
     @override
     async def _request(
@@ -1420,7 +2149,7 @@ class AsyncAPIClient(APIClientBase, AsyncHTTPClientVerbs):
         method: HTTPMethods,
         path: str = "",
         *,
-        response_model: type[Model] | type[list[Model]] | None = None,
+        response_model: type[Model] | type[list[Model]] | RawModel | None = None,
         params: QueryParamTypes | None = None,
         content: RequestContent | None = None,
         data: RequestData | None = None,
@@ -1437,8 +2166,11 @@ class AsyncAPIClient(APIClientBase, AsyncHTTPClientVerbs):
         extensions: RequestExtensions | None = None,
         max_retries: int | None = None,
         error_map: dict[int, ErrorStatus] | None = None,
+        success_codes: Container[int] | None = None,
+        endpoint: str | None = None,
         stream: bool = False,
-    ) -> Model | list[Model] | Response:
+        compression: Compression | Literal[False] | None = None,
+    ) -> Model | list[Model] | RawResponse | Response | None:
         """
         Construct and send an HTTP request.
 
@@ -1448,7 +2180,9 @@ class AsyncAPIClient(APIClientBase, AsyncHTTPClientVerbs):
             path:
                 URL to query.
             response_model:
-                Pydantic model to coerce the response into.
+                Pydantic model to coerce the response into.  Passing ``dict`` or
+                ``list`` returns the decoded JSON data and ``memoryview`` returns the
+                response body, skipping model construction entirely.
             response_model_kwargs:
                 Keyword arguments to pass to Pydantic/Pydantic-XML as part of
                 un-marshalling the response data.
@@ -1486,84 +2220,253 @@ class AsyncAPIClient(APIClientBase, AsyncHTTPClientVerbs):
                 the client default.
             error_map:
                 Replaces the client error map with this one instead.
+            success_codes:
+                The status codes to consider a successful response. Overloads the
+                endpoint and client defaults.
+            endpoint:
+                Label of the endpoint making the request, used when reporting metrics
+                and traces.
+                Endpoints will pass their path.
+            compression:
+                The compression settings for the request body.  Overloads the client
+                default, and False disables compression for the request.
 
         Returns:
             Returns the HTTPX Response object if no response_model is specified. If a
             response_model _is_ specified, then the response will be coerced into the
-            response model and the instance of the model will be returned.
+            response model and the instance of the model will be returned. Successful
+            responses without any content (such as a 204) will return None instead.
         """
         max_retries = max_retries if max_retries else self._retry_max
-        error_map = self._error_map if error_map is None else error_map
+        status_map = self._select_error_map(error_map)
+        success_codes = self._success_codes if success_codes is None else success_codes
         response_model_kwargs = (
             {} if response_model_kwargs is None else response_model_kwargs
         )
 
-        # Perform any pre-processing necessary on the request.
-        kwargs = self._request_pre_process(
-            method=method,
-            url=path,
-            params=params,
-            content=content,
-            data=data,
-            files=files,
-            json=json,
-            xml=xml,
-            headers=headers,
-            cookies=cookies,
-            timeout=timeout,
-            extensions=extensions,
-            request_model_kwargs=request_model_kwargs,
-        )
-
-        # Build the initial request and initialize the counter.
-        request = self._client.build_request(**kwargs)
-        request_counter = 0
-
-        # While the number of requests being performed is less than or equal to the
-        # maximum number allowed, then keep calling the API.
-        while request_counter <= max_retries:
-            request_counter += 1
-            response = await self._client.send(
-                request, auth=auth, follow_redirects=follow_redirects, stream=stream
+        # Metrics and spans are only collected when a metrics hook or a tracer has
+        # been assigned to the client.  Otherwise the tracker is None and every
+        # measurement is skipped.
+        tracker = (
+            None
+            if self._metrics is None and self._tracer is None
+            else RequestTracker(
+                self._metrics,
+                method,
+                path,
+                endpoint,
+                tracer=self._tracer,
+                model=response_model,
             )
+        )
 
-            # If the response is ok, then we should return the response.  If a model is
-            # presented to us, then we will pass the model to the unmarshal utility to
-            # handle transitioning the data into the expected class.
-            if response.status_code == codes.OK and response_model:
-                return unmarshal(
-                    response=response,
-                    model=response_model,
-                    json_model_kwargs=self._json_load_kwargs | response_model_kwargs,
-                    xml_model_kwargs=self._xml_load_kwargs | response_model_kwargs,
-                    client=self,
-                )
-
-            # If no model was passed, then simply return the response object.
-            elif response.status_code == codes.OK:
-                return response
-
-            # As the response wasn't ok, let's grab the ErrorStatus object that relates
-            # to the status code that we got and determine the next steps.
-            status = error_map[response.status_code]
-
-            # If the status code is retryable, then pass the response to the retry
-            # handler to perform any optional transformation.  Then sleep the amount
-            # if time determined by the status code and then continue to the next
-            # iteration.
-            if status.retry:
-                request = await self._retry_request(response)
-                timer = random.uniform(0, status.jitter) + (
-                    request_counter * status.backoff
-                )
-                await sleep(timer)
-                continue
-
-            # Otherwise we will want to raise the error as specified by the error map
-            error_obj = None
-            raise status.exception(
-                response=response, template=status.template, obj=error_obj
+        body: Any = None
+        try:
+            # Perform any pre-processing necessary on the request.
+            kwargs = self._request_pre_process(
+                method=method,
+                url=path,
+                params=params,
+                content=content,
+                data=data,
+                files=files,
+                json=json,
+                xml=xml,
+                headers=headers,
+                cookies=cookies,
+                timeout=timeout,
+                extensions=extensions,
+                request_model_kwargs=request_model_kwargs,
+                compression=compression,
             )
 
-        # If too many attempts were made, then raise a retry error.
-        raise RetryError(url=str(path), method=method, attempts=request_counter)
+            # Streamed bodies wrapped for replaying are released once the request has
+            # finished.
+            if kwargs["content"] is not content:
+                body = kwargs["content"]
+
+            # Build the initial request and initialize the counter.  When balancing
+            # across several base URLs, the base URL that failed the last attempt is
+            # excluded from the next one.
+            request = self._client.build_request(**kwargs)
+            request_counter = 0
+            balancer = self._balancer
+            failed: int | None = None
+            if tracker is not None:
+                tracker.lap("pre_process")
+
+            # While the number of requests being performed is less than or equal to
+            # the maximum number allowed, then keep calling the API.
+            while request_counter <= max_retries:
+                request_counter += 1
+                upstream = None
+
+                # If a deadline has been set, then the timeouts of the attempt are
+                # shrunk to the time remaining until it.  The deadline is checked
+                # before routing, as the balancer counts routed attempts as outstanding.
+                cap_timeout(request, check_deadline(method=method, url=request.url))
+                if balancer is not None:
+                    request, upstream = balancer.route(request, exclude=failed)
+                    started = perf_counter()
+                if tracker is not None:
+                    tracker.attempt(request, is_async=True)
+                try:
+                    response = await self._client.send(
+                        request,
+                        auth=auth,
+                        follow_redirects=follow_redirects,
+                        stream=stream,
+                    )
+                except BaseException as err:
+                    if balancer is not None and upstream is not None:
+                        balancer.release(upstream)
+
+                    # A timeout caused by the deadline passing ends the request.
+                    if isinstance(err, TimeoutException):
+                        check_deadline(method=method, url=request.url)
+
+                    # Transport failures are only retried when there is another base
+                    # URL to send the request to, and it's safe to resend it.
+                    if (
+                        balancer is None
+                        or upstream is None
+                        or not isinstance(err, TransportError)
+                    ):
+                        raise
+                    balancer.failed(upstream)
+                    if request_counter > max_retries or not balancer.can_failover(
+                        method, err
+                    ):
+                        raise
+                    self._logger.warning(
+                        "%s %s failed (%s), retrying on another base URL",
+                        method,
+                        request.url,
+                        err.__class__.__name__,
+                    )
+                    failed = upstream
+                    continue
+                if balancer is not None and upstream is not None:
+                    balancer.release(upstream, perf_counter() - started)
+                if tracker is not None:
+                    tracker.sent(response)
+
+                # If the response is successful and no model was passed, then simply
+                # return the response object.  If a model is presented to us, then we
+                # will pass the model to the unmarshal utility to handle transitioning
+                # the data into the expected class.  Responses without a body (such as
+                # 204 No Content) have nothing to unmarshal and return None instead.
+                if response.status_code in success_codes:
+                    if not response_model:
+                        return response
+                    if response.status_code == codes.NO_CONTENT or not response.content:
+                        return None
+                    obj = unmarshal(
+                        response=response,
+                        model=response_model,
+                        client=self,
+                        json_model_kwargs=self._json_load_kwargs
+                        | response_model_kwargs,
+                        xml_model_kwargs=self._xml_load_kwargs | response_model_kwargs,
+                    )
+                    if tracker is not None:
+                        tracker.unmarshalled(response, obj)
+                    return obj
+
+                # As the response wasn't ok, let's grab the ErrorStatus object that
+                # relates to the status code that we got and determine the next steps.
+                status = status_map[response.status_code]
+
+                # If the status code is retryable, then pass the response to the retry
+                # handler to perform any optional transformation.  Then sleep the
+                # amount if time determined by the status code and then continue to
+                # the next iteration.
+                if status.retry:
+                    if balancer is not None and upstream is not None:
+                        balancer.failed(upstream)
+                        failed = upstream
+                    request = await self._retry_request(response)
+                    timer = random.uniform(0, status.jitter) + (
+                        request_counter * status.backoff
+                    )
+                    check_deadline(timer, method=method, url=request.url)
+                    if tracker is not None:
+                        tracker.backoff(timer)
+                    await sleep(timer)
+                    continue
+
+                # Otherwise we will want to raise the error as specified by the error
+                # map.  The error model is passed along so that the body is only
+                # decoded if the caller actually inspects the exception object.
+                raise status.error(response)
+
+            # If too many attempts were made, then raise a retry error.
+            raise RetryError(url=str(path), method=method, attempts=request_counter)
+        except BaseException as err:
+            if tracker is not None:
+                tracker.fail(err)
+            raise
+        finally:
+            if isinstance(body, (ReplayableBody, AsyncReplayableBody)):
+                body.close()
+            if tracker is not None:
+                tracker.finish()
+
+
+async def _transfer(
+    send: Callable[[dict[str, str]], Awaitable[Response]],
+    transfer: Download | Segment,
+    retries: int,
+) -> None:
+    """
+    Streams the response body into the transfer, resuming the transfer from its
+    current offset whenever the connection is interrupted.  The file operations are
+    made within a worker thread so that they don't block the event loop.
+    """
+    attempt = 0
+    while True:
+        try:
+            response = await send(transfer.headers)
+            try:
+                await to_thread(transfer.begin, response)
+                async for chunk in response.aiter_raw():
+                    if transfer.buffer(chunk):
+                        await to_thread(transfer.flush)
+            finally:
+                await to_thread(transfer.flush)
+                await response.aclose()
+        except TransportError:
+            if attempt >= retries:
+                raise
+        else:
+            if transfer.complete or attempt >= retries:
+                return
+
+        # The transfer was interrupted, so we will wait before resuming the transfer
+        # from the current offset.
+        attempt += 1
+        delay = random.uniform(0, RESUME_JITTER) + attempt * RESUME_BACKOFF
+        check_deadline(delay)
+        await sleep(delay)
+
+
+async def _send_part(
+    client: Any, upload: AsyncChunkedUpload, part: UploadPart, retries: int
+) -> None:
+    """
+    Uploads the part, retrying the part whenever the connection fails.
+    """
+    attempt = 0
+    while True:
+        try:
+            result = await upload.upload_part(client, part)
+        except TransportError:
+            if attempt >= retries:
+                raise
+        else:
+            upload.record(part, result)
+            return
+        attempt += 1
+        delay = random.uniform(0, PART_JITTER) + attempt * PART_BACKOFF
+        check_deadline(delay)
+        await sleep(delay)
@@ -0,0 +1,245 @@
+"""
+Load balancing and failover across several base URLs.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Literal
+
+from httpx import ConnectError, ConnectTimeout, PoolTimeout
+
+from .types import URL, Request, TransportError
+
+BalancePolicy = Literal["round_robin", "least_outstanding", "latency"]
+""" The policies for selecting the base URL of each request. """
+
+POLICIES: tuple[BalancePolicy, ...] = ("round_robin", "least_outstanding", "latency")
+
+COOLDOWN = 30.0
+""" The default number of seconds a failing base URL is avoided for. """
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+""" The methods that may be resent after the request may have reached the server. """
+
+
+@dataclass(slots=True)
+class Upstream:
+    """
+    The state of one of the base URLs of a balancer.
+    """
+
+    url: str
+    """ The base URL (always ending with a slash). """
+
+    outstanding: int = 0
+    """ The number of requests currently waiting on a response. """
+
+    latency: float | None = None
+    """ The moving average of the seconds taken to receive a response. """
+
+    failures: int = 0
+    """ The number of attempts that failed. """
+
+    down_until: float = 0.0
+    """ The monotonic time until which the base URL is avoided. """
+
+
+class URLBalancer:
+    """
+    Spreads the requests of a client across several base URLs (such as the regional
+    endpoints of an API), and sends retries to a different base URL than the failed
+    attempt.  Base URLs that returned a retryable status or couldn't be reached are
+    avoided for ``cooldown`` seconds, unless every base URL is failing.
+
+    The policies for selecting the base URL of each request are:
+
+    * ``round_robin``: each base URL in turn.
+    * ``least_outstanding``: the base URL with the fewest requests in flight.
+    * ``latency``: the base URL with the lowest moving average of response times,
+      weighted by the number of requests in flight (the "peak EWMA" of Finagle), so
+      that a faster region isn't sent more than it can handle.  Base URLs that haven't
+      been measured yet are tried first.
+
+    Clients create the balancer when given a list of base URLs.
+
+    Args:
+        urls: The base URLs.
+        policy: The selection policy.
+        decay: The weight of each new response time within the moving average.
+        cooldown: The number of seconds a failing base URL is avoided for.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str | URL],
+        policy: BalancePolicy = "round_robin",
+        decay: float = 0.3,
+        cooldown: float = COOLDOWN,
+    ) -> None:
+        if not urls:
+            raise ValueError("At least one base URL is required.")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown balance policy {policy!r}.")
+        self.policy = policy
+        self.decay = decay
+        self.cooldown = cooldown
+        self.upstreams = [Upstream(_base(url)) for url in urls]
+        self._cursor = 0
+        self._lock = threading.Lock()
+
+    @property
+    def urls(self) -> list[str]:
+        """
+        The base URLs of the balancer.
+        """
+        return [upstream.url for upstream in self.upstreams]
+
+    def match(self, url: URL) -> int | None:
+        """
+        Returns the index of the base URL the URL is under, or None if it isn't under
+        any of them.
+
+        Args:
+            url: The URL of the request.
+        """
+        text = str(url)
+        for idx, upstream in enumerate(self.upstreams):
+            if text.startswith(upstream.url):
+                return idx
+        return None
+
+    def select(self, exclude: int | None = None) -> int:
+        """
+        Selects the base URL of the next attempt according to the policy and counts
+        the attempt as outstanding until :meth:`release` is called.
+
+        Args:
+            exclude: The index of a base URL to avoid (such as the one that failed).
+
+        Returns:
+            The index of the selected base URL.
+        """
+        with self._lock:
+            count = len(self.upstreams)
+            order = [(self._cursor + offset) % count for offset in range(count)]
+            now = time.monotonic()
+            candidates = (
+                [
+                    idx
+                    for idx in order
+                    if idx != exclude and self.upstreams[idx].down_until <= now
+                ]
+                or [idx for idx in order if idx != exclude]
+                or order
+            )
+            if self.policy == "least_outstanding":
+                selected = min(candidates, key=self._outstanding)
+            elif self.policy == "latency":
+                selected = min(candidates, key=self._load)
+            else:
+                selected = candidates[0]
+            self.upstreams[selected].outstanding += 1
+            self._cursor = selected + 1
+            return selected
+
+    def release(self, index: int, elapsed: float | None = None) -> None:
+        """
+        Marks an attempt sent to the base URL as no longer outstanding.
+
+        Args:
+            index: The index of the base URL.
+            elapsed:
+                The number of seconds taken to receive the response, if one was
+                received.
+        """
+        with self._lock:
+            upstream = self.upstreams[index]
+            upstream.outstanding -= 1
+            if elapsed is not None:
+                upstream.latency = (
+                    elapsed
+                    if upstream.latency is None
+                    else self.decay * elapsed + (1 - self.decay) * upstream.latency
+                )
+
+    def failed(self, index: int) -> None:
+        """
+        Marks the base URL as failing, so that it's avoided for the cooldown.
+
+        Args:
+            index: The index of the base URL.
+        """
+        with self._lock:
+            upstream = self.upstreams[index]
+            upstream.failures += 1
+            upstream.down_until = time.monotonic() + self.cooldown
+
+    def route(
+        self, request: Request, exclude: int | None = None
+    ) -> tuple[Request, int | None]:
+        """
+        Selects the base URL of the next attempt of the request and moves the request
+        onto it.  Requests that aren't under any of the base URLs are returned as-is.
+
+        Args:
+            request: The request to route.
+            exclude: The index of a base URL to avoid.
+
+        Returns:
+            The routed request and the index of its base URL (or None if the request
+            wasn't routed).
+        """
+        source = self.match(request.url)
+        if source is None:
+            return request, None
+        target = self.select(exclude)
+        if target == source:
+            return request, target
+        prefix = len(self.upstreams[source].url)
+        url = URL(self.upstreams[target].url + str(request.url)[prefix:])
+        headers = request.headers.copy()
+        headers["Host"] = url.netloc.decode("ascii")
+        return (
+            Request(
+                request.method,
+                url,
+                headers=headers,
+                stream=request.stream,
+                extensions=request.extensions,
+            ),
+            target,
+        )
+
+    @staticmethod
+    def can_failover(method: str, error: TransportError) -> bool:
+        """
+        Can the request be resent to another base URL after the transport error?
+        Requests that were never sent (as the connection couldn't be established) can
+        always be resent, while others only when the method is idempotent.
+
+        Args:
+            method: The HTTP method of the request.
+            error: The transport error of the attempt.
+        """
+        if isinstance(error, (ConnectError, ConnectTimeout, PoolTimeout)):
+            return True
+        return method.upper() in IDEMPOTENT_METHODS
+
+    def _outstanding(self, index: int) -> int:
+        return self.upstreams[index].outstanding
+
+    def _load(self, index: int) -> float:
+        upstream = self.upstreams[index]
+        return (upstream.latency or 0.0) * (upstream.outstanding + 1)
+
+
+def _base(url: str | URL) -> str:
+    """
+    Returns the base URL with a trailing slash, as HTTPX does for its base URL.
+    """
+    text = str(URL(url))
+    return text if text.endswith("/") else f"{text}/"
@@ -2,14 +2,31 @@ from __future__ import annotations
 
 import logging
 import platform
-from collections import defaultdict
+from collections.abc import Container, Iterator, Mapping
+from contextlib import contextmanager
 from ssl import SSLContext
-from typing import Any, Callable
+from typing import Any, Callable, Literal
 
+from httpx import AsyncHTTPTransport, HTTPTransport
 from pydantic import BaseModel
 from pydantic_xml import BaseXmlModel
 
-from ._errors import APIError, ErrorStatus, build_error_map
+from ._balancer import BalancePolicy, URLBalancer
+from ._bodies import (
+    DEFAULT_SPOOL_LIMIT,
+    DEFAULT_SPOOL_SIZE,
+    AsyncReplayableBody,
+    ReplayableBody,
+    replayable,
+)
+from ._codecs import JSONCodec, StdlibJSONCodec
+from ._compression import Compression
+from ._dns import AsyncDNSCachingTransport, DNSCache, DNSCachingTransport
+from ._errors import APIError, ErrorMap, ErrorStatus, build_error_map
+from ._http2 import HTTP2Profile, h2_available
+from ._metrics import MetricsHook
+from ._profiling import Profiler
+from ._tracing import Tracer
 from ._utils import assign_annotations
 from ._version import version as RESTFLY_VERSION
 from .types import (
@@ -17,6 +34,7 @@ from .types import (
     DEFAULT_MAX_REDIRECTS,
     DEFAULT_TIMEOUT_CONFIG,
     HTTPX_VERSION,
+    URL,
     USE_CLIENT_DEFAULT,
     AsyncBaseTransport,
     AsyncClient,
@@ -36,6 +54,7 @@ from .types import (
     RequestData,
     RequestExtensions,
     RequestFiles,
+    Response,
     TimeoutTypes,
     UseClientDefault,
     XMLModel,
@@ -45,9 +64,25 @@ from .types import (
 class APIClientBase:
     __client_class__: type[Client] | type[AsyncClient]
     __endpoint_class__: type[APIBaseEndpoint]
+    __transport_class__: type[HTTPTransport] | type[AsyncHTTPTransport]
+    __dns_transport_class__: type[DNSCachingTransport] | type[AsyncDNSCachingTransport]
+
+    _base_url: str | URL | list[str] | tuple[str, ...] = ""
+    """
+    The base URL fragment to prefix all API calls with.  If a list of base URLs is
+    given (such as the regional endpoints of an API), then the requests are balanced
+    across them according to the ``_balance_policy``, with retries sent to a different
+    base URL than the failed attempt.  Once initialized, this is the first base URL.
+    """
 
-    _base_url: str = ""
-    """ The base URL fragment to prefix all API calls with. """
+    _balance_policy: BalancePolicy = "round_robin"
+    """
+    The policy selecting the base URL of each request when several base URLs are
+    given.  Either ``round_robin``, ``least_outstanding``, or ``latency``.
+    """
+
+    _balancer: URLBalancer | None = None
+    """ The balancer of the base URLs.  If None, then a single base URL is used. """
 
     _client: Client | AsyncClient
     """ HTTPX Client Session object """
@@ -58,6 +93,18 @@ class APIClientBase:
     _json_dump_kwargs: dict[str, Any]
     """ Client-level Pydantic BaseModel.model_dump kwargs """
 
+    _json_codec: JSONCodec | None = None
+    """
+    JSON codec used to encode non-model JSON request bodies and to decode raw JSON
+    responses.  If None, then HTTPX's encoder and Pydantic-Core's decoder are used.
+    """
+
+    _compression: Compression | None = None
+    """
+    Compression settings used to compress the request bodies sent through the client.
+    If None, then request bodies are sent uncompressed.
+    """
+
     _xml_load_kwargs: dict[str, Any]
     """ Client-level Pydantic-XML BaseXmlModel.from_xml kwargs """
 
@@ -73,23 +120,87 @@ class APIClientBase:
     _retry_max: int = 5
     """ Maximum number of retries to attempt before giving up. """
 
+    _replay_buffer_size: int | None = DEFAULT_SPOOL_SIZE
+    """
+    The number of bytes of a streamed request body that is buffered in memory so that
+    the body can be replayed on retries, after which the buffer is spooled into a
+    temporary file.  Set to 0 or None to disable buffering.
+    """
+
+    _replay_spool_limit: int | None = DEFAULT_SPOOL_LIMIT
+    """
+    The number of bytes of a streamed request body that is buffered in total (in
+    memory and on disk).  Larger bodies aren't buffered and can't be retried once sent.
+    Set to 0 or None to only buffer bodies in memory.
+    """
+
+    _success_codes: Container[int] = range(200, 300)
+    """
+    The status codes that are considered to be a successful response. Defaults to the
+    entire 2xx class.  Any other status code is handled through the error map.
+    """
+
+    _keepalive_expiry: float | None = None
+    """
+    The number of seconds idle pooled connections are kept open.  If None, then the
+    ``keepalive_expiry`` of the connection pool limits is used.
+    """
+
+    _warmup_path: str = ""
+    """
+    The path requested by ``_warmup()`` to open connections ahead of time.  Any
+    response will do, so a cheap endpoint (such as a health check) is best.
+    """
+
+    _dns_cache: DNSCache | None = None
+    """
+    DNS cache used to connect to the resolved addresses of the host, rotating and
+    falling over across them.  A cache assigned to the class is shared by all of its
+    clients.  If None, then every new connection resolves the host name.
+    """
+
+    _http2: HTTP2Profile | None = None
+    """
+    HTTP/2 profile sizing the connection pool for multiplexing requests over HTTP/2.
+    If None, then the ``http2`` and ``limits`` arguments are passed to HTTPX as-is.
+    """
+
+    _http2_fallback: bool = False
+    """
+    Set when an HTTP/2 profile is in use but the client has fallen back to HTTP/1.1,
+    either as the h2 package isn't installed or as the server didn't negotiate HTTP/2.
+    """
+
     _logger: logging.Logger
     """ Logger for the client """
 
+    _metrics: MetricsHook | None = None
+    """
+    Metrics hook that receives the metrics of every request made through the client.
+    If None, then no metrics are collected.
+    """
+
+    _tracer: Tracer | None = None
+    """
+    Tracer used to create the spans of every request made through the client.  If None,
+    then no spans are created.
+    """
+
     _error_class: type[APIError] = APIError
     """ API Exception Class to use for all API Errors/Exceptions """
 
     __error_map__: dict[int, ErrorStatus] | None = None
     """ The default built-in error map. If None the library default is used. """
 
-    _error_map: defaultdict[int, ErrorStatus]
+    _error_map: ErrorMap
     """
     The error map determining how to handle non-OK status codes. Represented by the
     integer status code along with an ErrorStatus data-class object detailing how to
     handle the response. Any overloads to the base error map should be provided here
     and this attribute will be then be replaced at initialization with the merging of
     the default map, this attribute, and anything passed to the constructor. The
-    resulting error map will be used during operation of the APIClass object.
+    resulting error map is immutable and will be used during operation of the
+    APIClass object.
     """
 
     def __init__(
@@ -102,7 +213,7 @@ class APIClientBase:
         verify: SSLContext | str | bool = True,
         cert: CertTypes | None = None,
         http1: bool = True,
-        http2: bool = False,
+        http2: bool | HTTP2Profile | None = None,
         proxy: ProxyTypes | None = None,
         mounts: (dict[str, Any]) | None = None,
         timeout: TimeoutTypes = DEFAULT_TIMEOUT_CONFIG,
@@ -110,7 +221,7 @@ class APIClientBase:
         limits: Limits = DEFAULT_LIMITS,
         max_redirects: int = DEFAULT_MAX_REDIRECTS,
         event_hooks: (dict[str, list[EventHook]]) | None = None,
-        base_url: str | None = None,
+        base_url: str | URL | list[str] | tuple[str, ...] | None = None,
         transport: AsyncBaseTransport | BaseTransport | None = None,
         trust_env: bool = True,
         default_encoding: str | Callable[[bytes], str] = "utf-8",
@@ -124,16 +235,41 @@ class APIClientBase:
         xml_dump_kwargs: dict[str, Any] | None = None,
         error_map: dict[int, ErrorStatus] | None = None,
         error_class: type[APIError] | None = None,
+        metrics: MetricsHook | None = None,
+        tracer: Tracer | None = None,
+        json_codec: JSONCodec | None = None,
+        compression: Compression | None = None,
+        keepalive_expiry: float | None = None,
+        dns_cache: DNSCache | bool | None = None,
+        balance_policy: BalancePolicy | None = None,
     ) -> None:
         # Initialize mutables.
         headers = {} if headers is None else headers
         error_map = {} if error_map is None else error_map
         error_class = self._error_class if error_class is None else error_class
 
-        # Initialize the private attributes for the client object.
-        self._base_url = base_url if base_url else self._base_url
+        # Initialize the private attributes for the client object.  If several base
+        # URLs were provided, then the requests are balanced across them and the first
+        # is used as the base URL of the HTTPX client.
+        base_url = base_url if base_url else self._base_url
+        if isinstance(base_url, (list, tuple)):
+            self._balancer = URLBalancer(
+                base_url, policy=balance_policy or self._balance_policy
+            )
+            base_url = self._balancer.urls[0]
+        self._base_url = base_url
         self._logger = logging.getLogger(__name__)
         self._retry_max = retry_max if retry_max else self._retry_max
+        self._metrics = metrics if metrics is not None else self._metrics
+        self._tracer = tracer if tracer is not None else self._tracer
+        self._json_codec = json_codec if json_codec is not None else self._json_codec
+        self._compression = (
+            compression if compression is not None else self._compression
+        )
+        if isinstance(dns_cache, DNSCache):
+            self._dns_cache = dns_cache
+        elif dns_cache is not None:
+            self._dns_cache = DNSCache() if dns_cache else None
         self._json_load_kwargs = (
             json_load_kwargs
             if json_load_kwargs
@@ -155,19 +291,67 @@ class APIClientBase:
             else getattr(self, "_xml_dump_kwargs", {})
         )
 
-        # Construct the error map default dict using the built-in error_map as well as
-        # the over loadable _error_map extension and then lastly update with any
-        # error_map provided at initialization.  Lastly store the resulting defaultdict
-        # over the _error_map private attribute.
+        # Construct the error map using the built-in error_map and then update it with
+        # any error_map provided at initialization.  The resulting ErrorMap is cached
+        # by the builder, so clients sharing the same definitions share the same map.
+        # Lastly store the resulting map over the _error_map private attribute.
         self._error_map = build_error_map(
             base_map=self.__error_map__, overloads=error_map, error_class=error_class
         )
 
+        # If an HTTP/2 profile was provided (or is set on the class), then the profile
+        # decides the protocol and the connection pool limits.  Without the h2 package
+        # we fall back to HTTP/1.1 with a pool sized for the expected concurrency.  An
+        # explicit http2=False turns the class profile off, while http2=True keeps it.
+        if isinstance(http2, HTTP2Profile):
+            self._http2 = http2
+        elif http2 is False:
+            self._http2 = None
+        use_http2 = bool(http2)
+        if self._http2 is not None:
+            use_http2 = h2_available()
+            if not use_http2:
+                self._http2_fallback = True
+                self._logger.warning(
+                    "HTTP/2 requested but the h2 package is not installed, "
+                    "falling back to HTTP/1.1"
+                )
+            if limits is DEFAULT_LIMITS:
+                limits = self._http2.limits(use_http2)
+
+        # An explicit keep-alive expiry overrides the one of the pool limits.
+        if keepalive_expiry is not None:
+            self._keepalive_expiry = keepalive_expiry
+        if self._keepalive_expiry is not None:
+            limits = Limits(
+                max_connections=limits.max_connections,
+                max_keepalive_connections=limits.max_keepalive_connections,
+                keepalive_expiry=self._keepalive_expiry,
+            )
+
         # If we had received a pydantic model for the client params, then we will first
         # coerce them into a python dictionary.
         if isinstance(params, BaseModel):
             params = params.model_dump(mode="json", exclude_none=True)
 
+        # Connect to the addresses cached by the DNS cache if one is in use.  Unless a
+        # transport was passed, the wrapped transport is built with the settings HTTPX
+        # would have built its own default transport with.
+        if self._dns_cache is not None:
+            if transport is None:
+                transport = self.__transport_class__(
+                    verify=verify,
+                    cert=cert,
+                    trust_env=trust_env,
+                    http1=http1,
+                    http2=use_http2,
+                    limits=limits,
+                )
+            transport = self.__dns_transport_class__(
+                transport,  # type: ignore[arg-type] # ty: ignore[invalid-argument-type]
+                self._dns_cache,
+            )
+
         # Instantiate the HTTPX Client with the arguments we have.
         self._client = self.__client_class__(
             auth=auth,
@@ -177,7 +361,7 @@ class APIClientBase:
             verify=verify,
             cert=cert,
             http1=http1,
-            http2=http2,
+            http2=use_http2,
             proxy=proxy,
             mounts=mounts,
             timeout=timeout,
@@ -185,7 +369,7 @@ class APIClientBase:
             limits=limits,
             max_redirects=max_redirects,
             event_hooks=event_hooks,
-            base_url=self._base_url,
+            base_url=base_url,
             transport=transport,  # type: ignore[arg-type] #ty: ignore[invalid-argument-type]
             trust_env=trust_env,
             default_encoding=default_encoding,
@@ -221,6 +405,7 @@ class APIClientBase:
         cookies: CookieTypes | None = None,
         timeout: TimeoutTypes | UseClientDefault = USE_CLIENT_DEFAULT,
         extensions: RequestExtensions | None = None,
+        compression: Compression | Literal[False] | None = None,
     ) -> dict[str, Any]:
         """
         Performs preflight pre-processing of the request in preparation to be sent to
@@ -244,12 +429,17 @@ class APIClientBase:
             cookies: The cookies to pass to the request.
             timeout: The HTTP request timeout.
             extensions: Any request extensions passed as part of the request.
+            compression:
+                The compression settings for the request body.  If None, then the
+                client compression settings are used, and if False, then the body is
+                never compressed.
 
         Returns:
             The kwargs dictionary to be passed to the request builder.
         """
-        # Initialize mutables
-        headers = {} if headers is None else headers
+        # Initialize mutables.  The headers are copied so that the computed headers
+        # never leak into the dictionary of the caller.
+        headers = dict(headers or {})
         request_model_kwargs = (
             {} if request_model_kwargs is None else request_model_kwargs
         )
@@ -290,6 +480,50 @@ class APIClientBase:
             headers["Content-Type"] = "application/json"
             json = None
 
+        # If a JSON codec is assigned to the client, then any other JSON payload is
+        # encoded with the codec instead of HTTPX's standard library encoder.
+        elif json is not None and self._json_codec is not None:
+            content = self._json_codec.dumps(json)
+            headers["Content-Type"] = "application/json"
+            json = None
+
+        # Compress the request body if compression is enabled.  JSON payloads that
+        # HTTPX would encode are encoded here so that they can be compressed as well.
+        # Form data and multipart bodies are left alone.
+        compression = self._compression if compression is None else compression
+        if (
+            compression
+            and data is None
+            and files is None
+            and not any(k.lower() == "content-encoding" for k in headers)
+        ):
+            if json is not None:
+                codec = self._json_codec or StdlibJSONCodec()
+                content = codec.dumps(json)
+                headers["Content-Type"] = "application/json"
+                json = None
+            if content is not None:
+                compressed = compression.encode(content)
+                if compressed is not None:
+                    content = compressed
+                    headers["Content-Encoding"] = compression.encoding
+
+        # Streamed content (iterators, generators, and file objects) can only be read
+        # once, so it is wrapped into a replayable body to allow the request to be
+        # retried without having to re-generate the body.
+        if content is not None:
+            content = replayable(
+                content,
+                max_size=self._replay_buffer_size,
+                spool_limit=self._replay_spool_limit,
+            )
+            if (
+                isinstance(content, (ReplayableBody, AsyncReplayableBody))
+                and content.length is not None
+                and not any(k.lower() == "content-length" for k in headers)
+            ):
+                headers["Content-Length"] = str(content.length)
+
         # Return the kwargs to the caller.
         return {
             "method": method,
@@ -305,6 +539,97 @@ class APIClientBase:
             "extensions": extensions,
         }
 
+    def _select_error_map(
+        self, error_map: Mapping[int, ErrorStatus] | None = None
+    ) -> ErrorMap:
+        """
+        Returns the error map to use for a request.  If no error map was passed, then
+        the client error map is used.  A plain mapping replaces the client error map,
+        with any unknown codes resolving to the client's fallbacks and default.
+
+        Args:
+            error_map: The request-specific error map (if any).
+
+        Returns:
+            The ErrorMap object to use for the request.
+        """
+        if error_map is None:
+            return self._error_map
+        if isinstance(error_map, ErrorMap):
+            return error_map
+        return ErrorMap(
+            error_map,
+            fallbacks=self._error_map.fallbacks,
+            default=self._error_map.default,
+        )
+
+    def _warmup_urls(self, count: int, path: str) -> list[str]:
+        """
+        Returns the URLs of the warm-up requests.  When the requests are balanced
+        across several base URLs, then the warm-up requests are spread across all of
+        them, so that every base URL has connections opened ahead of time.
+
+        Args:
+            count: The number of warm-up requests.
+            path: The path to request.
+
+        Returns:
+            The URL (or path) of each warm-up request.
+        """
+        if self._balancer is None:
+            return [path] * count
+        urls = self._balancer.urls
+        return [urls[idx % len(urls)] + path.lstrip("/") for idx in range(count)]
+
+    def _check_protocol(self, response: Response) -> None:
+        """
+        Logs a warning (once) if the server didn't negotiate HTTP/2 when an HTTP/2
+        profile is in use, as every request in flight then needs its own connection.
+        The connection pool of the profile is already sized for the HTTP/1.1 fallback.
+
+        Args:
+            response: The response object.
+        """
+        if response.http_version != "HTTP/2" and not self._http2_fallback:
+            self._http2_fallback = True
+            self._logger.warning(
+                "HTTP/2 requested but %s negotiated %s, requests are limited to "
+                "one per connection",
+                response.request.url.host,
+                response.http_version,
+            )
+
+    @contextmanager
+    def _profile(self, report: bool = True) -> Iterator[Profiler]:
+        """
+        Profiles every request made through the client within the context.  The wall
+        and CPU time of each request is attributed to the pre-processing, network,
+        unmarshalling, backoff, and library overhead phases, along with the time spent
+        and bytes decoded by each response model.  Any metrics hook already assigned
+        to the client continues to receive the metrics events.
+
+        Args:
+            report: Should the summary table be printed when leaving the context?
+
+        Yields:
+            The profiler collecting the statistics.
+
+        Example:
+            >>> with client._profile():
+            ...     for item in client.items.list():
+            ...         pass
+            RESTFly profile: 10 requests, 0 retries, 0 errors
+            ...
+        """
+        profiler = Profiler(forward=self._metrics)
+        self._metrics = profiler
+        try:
+            yield profiler
+        finally:
+            self._metrics = profiler.forward
+            if report:
+                print(profiler.report())
+
     def __assign_annotations__(self) -> None:
         """
         Handles Annotation assignment for API Endpoints.
@@ -316,6 +641,12 @@ class APIBaseEndpoint:
     _path: str | None = None
     """ Path fragment to append to the base url already stored within the client. """
 
+    _success_codes: Container[int] | None = None
+    """
+    The status codes that are considered to be a successful response for requests made
+    through this endpoint.  If None, the client's success codes are used.
+    """
+
     _logger: logging.Logger
     """
     The same logging handler that the client has, it also exists here for convenience.
@@ -327,6 +658,14 @@ class APIBaseEndpoint:
     interact with other endpoints that may be grafted to the client.
     """
 
+    @property
+    def _retry_max(self) -> int:
+        """
+        Maximum number of retries to attempt before giving up.  Endpoints use the
+        client's setting.
+        """
+        return self._client._retry_max
+
     def __init__(self, client: APIClientBase | APIBaseEndpoint) -> None:
         match client:
             case APIClientBase():
@@ -0,0 +1,454 @@
+"""
+Replayable request bodies.
+"""
+
+from __future__ import annotations
+
+import io
+import mmap
+import os
+from asyncio import to_thread
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+)
+from os import PathLike
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
+from typing import IO, Any, cast
+
+from ._errors import ReplayError
+
+CHUNK_SIZE = 65_536
+""" The number of bytes read from files and spooled bodies at a time. """
+
+DEFAULT_SPOOL_SIZE = 1024 * 1024
+"""
+The number of bytes of a streamed body that is buffered in memory before the buffer is
+spooled into a temporary file.
+"""
+
+DEFAULT_SPOOL_LIMIT = 1024 * 1024 * 1024
+"""
+The number of bytes of a streamed body that is buffered (in memory and on disk) so that
+the body can be replayed.
+"""
+
+ProgressCallback = Callable[[int, int | None], None]
+""" Upload progress callback receiving the bytes sent and the total length. """
+
+
+class _ReplayBuffer:
+    """
+    Buffer of the chunks of a streamed body.  The chunks are kept in memory up to
+    ``max_size`` bytes, after which they're spooled into a temporary file (created on
+    demand) up to ``spool_limit`` bytes.  Buffering stops (and the buffer is released)
+    once the body grows larger than both.
+    """
+
+    def __init__(self, max_size: int | None, spool_limit: int | None) -> None:
+        self.max_size = max_size or 0
+        self.limit = max(self.max_size, spool_limit or 0) if self.max_size else 0
+        self.chunks: list[bytes] | None = [] if self.max_size else None
+        self.spool: SpooledTemporaryFile[bytes] | None = None
+        self.size = 0
+        self.started = False
+
+    @property
+    def buffering(self) -> bool:
+        """
+        Is the body still being buffered?
+        """
+        return self.chunks is not None or self.spool is not None
+
+    def start(self) -> Iterator[bytes]:
+        """
+        Returns the buffered chunks to replay for a new send of the body.
+        """
+        if self.started and not self.buffering:
+            raise ReplayError(self.limit)
+        self.started = True
+        if self.spool is not None:
+            return self._replay(self.spool, self.size)
+        return iter(list(self.chunks or ()))
+
+    def spools(self, chunk: bytes) -> bool:
+        """
+        Will buffering the chunk write into the temporary file?
+        """
+        return self.buffering and self.size + len(chunk) > self.max_size
+
+    def add(self, chunk: bytes) -> None:
+        """
+        Buffers the chunk, unless the body has grown too large to be buffered.
+        """
+        if not self.buffering:
+            return
+        self.size += len(chunk)
+        if self.size > self.limit:
+            self.close()
+            return
+        if self.chunks is not None and self.size > self.max_size:
+            self.spool = SpooledTemporaryFile(max_size=self.max_size)  # noqa: SIM115 - closed by close()
+            self.spool.writelines(self.chunks)
+            self.chunks = None
+        if self.spool is not None:
+            self.spool.seek(0, io.SEEK_END)
+            self.spool.write(chunk)
+        else:
+            assert self.chunks is not None
+            self.chunks.append(chunk)
+
+    def close(self) -> None:
+        self.chunks = None
+        if self.spool is not None:
+            self.spool.close()
+            self.spool = None
+
+    @staticmethod
+    def _replay(spool: SpooledTemporaryFile[bytes], end: int) -> Iterator[bytes]:
+        # Chunks buffered while replaying are written to the end of the file, so each
+        # read seeks back to the replay position first.
+        offset = 0
+        while offset < end:
+            spool.seek(offset)
+            chunk = spool.read(min(CHUNK_SIZE, end - offset))
+            offset += len(chunk)
+            yield chunk
+
+
+class ReplayableBody:
+    """
+    Request body that can be sent any number of times.  Generators and other one-shot
+    iterators can only be consumed once, so any retry of a request using them would
+    fail.  The replayable body records the chunks as they are first sent, in memory up
+    to ``max_size`` bytes and then spooled into a temporary file up to ``spool_limit``
+    bytes, and replays them on every subsequent send before continuing with whatever
+    the source has left.  Larger bodies are streamed without being buffered, and
+    :class:`~restfly.ReplayError` is raised if they have to be sent again.  Seekable
+    files are not buffered, but instead are seeked back to their starting position for
+    every send.
+
+    Request bodies passed to the client as ``content`` are wrapped automatically, and
+    the buffer is released once the request has finished.
+
+    Args:
+        source: The iterator or file object providing the body.
+        max_size:
+            The number of bytes to buffer in memory.  If 0 or None, then streamed
+            bodies are never buffered.
+        spool_limit:
+            The number of bytes to buffer in total, spooling the buffer into a
+            temporary file past ``max_size``.  If 0 or None, then the buffer is only
+            kept in memory.
+
+    Example:
+        >>> body = ReplayableBody(generate_records())
+        >>> client._post("/ingest", content=body)
+    """
+
+    length: int | None = None
+    """ The length of the body (if known ahead of time). """
+
+    chunk_size: int = CHUNK_SIZE
+    """ The number of bytes read from files and the buffer at a time. """
+
+    _buffer: _ReplayBuffer | None = None
+
+    def __init__(
+        self,
+        source: Iterable[bytes] | IO[bytes],
+        max_size: int | None = DEFAULT_SPOOL_SIZE,
+        spool_limit: int | None = DEFAULT_SPOOL_LIMIT,
+    ) -> None:
+        self._file: IO[bytes] | None = None
+        self._start = 0
+        if not hasattr(source, "read"):
+            self._source: Iterator[bytes] = iter(source)
+        elif _seekable(source):
+            self._file = cast(IO[bytes], source)
+            self._start = self._file.tell()
+            self.length = _remaining(self._file, self._start)
+            return
+        else:
+            fobj = cast(IO[bytes], source)
+            self._source = iter(lambda: fobj.read(self.chunk_size), b"")
+        self._buffer = _ReplayBuffer(max_size, spool_limit)
+
+    def __iter__(self) -> Iterator[bytes]:
+        if self._buffer is None:
+            assert self._file is not None
+            self._file.seek(self._start)
+            while chunk := self._file.read(self.chunk_size):
+                yield chunk
+            return
+
+        # Replay everything that has already been buffered, then continue with the
+        # remainder of the source, buffering each chunk before it is sent.
+        yield from self._buffer.start()
+        for chunk in self._source:
+            self._buffer.add(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        """
+        Releases the buffered chunks, after which the body can no longer be replayed.
+        """
+        if self._buffer is not None:
+            self._buffer.close()
+
+
+class AsyncReplayableBody:
+    """
+    Async variant of :class:`ReplayableBody` for async iterators.  Seekable files and
+    sync iterators are also accepted.
+
+    Args:
+        source: The async iterator, iterator, or file object providing the body.
+        max_size:
+            The number of bytes to buffer in memory.  If 0 or None, then streamed
+            bodies are never buffered.
+        spool_limit:
+            The number of bytes to buffer in total, spooling the buffer into a
+            temporary file past ``max_size``.  If 0 or None, then the buffer is only
+            kept in memory.
+    """
+
+    length: int | None = None
+    """ The length of the body (if known ahead of time). """
+
+    _body: ReplayableBody | None = None
+    _buffer: _ReplayBuffer | None = None
+
+    def __init__(
+        self,
+        source: AsyncIterable[bytes] | Iterable[bytes] | IO[bytes],
+        max_size: int | None = DEFAULT_SPOOL_SIZE,
+        spool_limit: int | None = DEFAULT_SPOOL_LIMIT,
+    ) -> None:
+        if not isinstance(source, AsyncIterable):
+            self._body = ReplayableBody(
+                source, max_size=max_size, spool_limit=spool_limit
+            )
+            self.length = self._body.length
+            return
+        self._source: AsyncIterator[bytes] = aiter(source)
+        self._buffer = _ReplayBuffer(max_size, spool_limit)
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        if self._body is not None:
+            for chunk in self._body:
+                yield chunk
+            return
+
+        # Once the buffer has been spooled into a temporary file, it's read and
+        # written within a worker thread so that the disk never blocks the event loop.
+        buffer = self._buffer
+        assert buffer is not None
+        spooled = buffer.spool is not None
+        replay = buffer.start()
+        while chunk := (await to_thread(_next, replay) if spooled else _next(replay)):
+            yield chunk
+        async for chunk in self._source:
+            if buffer.spools(chunk):
+                await to_thread(buffer.add, chunk)
+            else:
+                buffer.add(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        """
+        Releases the buffered chunks, after which the body can no longer be replayed.
+        """
+        for body in (self._body, self._buffer):
+            if body is not None:
+                body.close()
+
+
+class FileUpload(ReplayableBody):
+    """
+    Request body streaming a file in chunks, so that uploading a file never requires
+    reading the whole file into memory.  Files given as a path are memory-mapped and
+    re-opened for every send, while file objects are seeked back to their starting
+    position, so that retried uploads always resend the whole file.  Non-seekable file
+    objects are buffered as with :class:`ReplayableBody`.
+
+    Args:
+        source: The path of the file or the binary file object to upload.
+        chunk_size: The number of bytes to send at a time.
+        progress:
+            Callback called after each chunk is sent with the number of bytes sent
+            so far and the total length of the body (if known).  Retries restart the
+            count from zero.
+        use_mmap:
+            Should files given as a path be memory-mapped instead of being read?
+        offset:
+            The offset within the file to start the body at.  Only supported for files
+            given as a path.
+        length:
+            The number of bytes of the file to send from the offset.  If None, the rest
+            of the file is sent.  Only supported for files given as a path.
+
+    Example:
+        >>> body = FileUpload("export.tar", progress=print)
+        >>> client._put("/files/export.tar", content=body)
+    """
+
+    def __init__(
+        self,
+        source: str | PathLike[str] | IO[bytes],
+        chunk_size: int = CHUNK_SIZE,
+        progress: ProgressCallback | None = None,
+        use_mmap: bool = True,
+        offset: int = 0,
+        length: int | None = None,
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self._use_mmap = use_mmap
+        self._path: Path | None = None
+        self._offset = offset
+        if isinstance(source, (str, PathLike)):
+            self._path = Path(source)
+            remaining = max(self._path.stat().st_size - offset, 0)
+            self.length = remaining if length is None else min(length, remaining)
+        elif offset or length is not None:
+            raise ValueError("Ranges can only be uploaded from files given as a path.")
+        else:
+            super().__init__(source)
+
+    def chunks(self) -> Generator[bytes]:
+        """
+        Yields the chunks of the file from the start, without reporting progress.
+        """
+        if self._path is None:
+            yield from super().__iter__()
+            return
+        assert self.length is not None
+        end = self._offset + self.length
+        with self._path.open("rb") as fobj:
+            if self._use_mmap and self.length:
+                with mmap.mmap(fobj.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                    for offset in range(self._offset, end, self.chunk_size):
+                        yield view[offset : min(offset + self.chunk_size, end)]
+            else:
+                fobj.seek(self._offset)
+                remaining = self.length
+                while remaining and (
+                    chunk := fobj.read(min(self.chunk_size, remaining))
+                ):
+                    remaining -= len(chunk)
+                    yield chunk
+
+    def __iter__(self) -> Iterator[bytes]:
+        sent = 0
+        for chunk in self.chunks():
+            yield chunk
+            sent += len(chunk)
+            if self.progress is not None:
+                self.progress(sent, self.length)
+
+
+class AsyncFileUpload(AsyncReplayableBody):
+    """
+    Async variant of :class:`FileUpload`.  The chunks are read from disk within a worker
+    thread so that reading the file never blocks the event loop.
+
+    Args:
+        source: The path of the file or the binary file object to upload.
+        chunk_size: The number of bytes to send at a time.
+        progress:
+            Callback called after each chunk is sent with the number of bytes sent
+            so far and the total length of the body (if known).
+        use_mmap:
+            Should files given as a path be memory-mapped instead of being read?
+        offset: The offset within the file to start the body at.
+        length: The number of bytes of the file to send from the offset.
+    """
+
+    def __init__(
+        self,
+        source: str | PathLike[str] | IO[bytes],
+        chunk_size: int = CHUNK_SIZE,
+        progress: ProgressCallback | None = None,
+        use_mmap: bool = True,
+        offset: int = 0,
+        length: int | None = None,
+    ) -> None:
+        self._upload = FileUpload(
+            source, chunk_size, use_mmap=use_mmap, offset=offset, length=length
+        )
+        self.length = self._upload.length
+        self.progress = progress
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        chunks = self._upload.chunks()
+        sent = 0
+        try:
+            while chunk := await to_thread(_next, chunks):
+                yield chunk
+                sent += len(chunk)
+                if self.progress is not None:
+                    self.progress(sent, self.length)
+        finally:
+            chunks.close()
+
+
+def replayable(
+    content: Any,
+    max_size: int | None = DEFAULT_SPOOL_SIZE,
+    spool_limit: int | None = DEFAULT_SPOOL_LIMIT,
+) -> Any:
+    """
+    Wraps request content that can only be consumed once (iterators, generators, and
+    file objects) within a replayable body.  Any other content is returned as-is.
+
+    Args:
+        content: The request content.
+        max_size:
+            The number of bytes to buffer in memory.  If 0 or None, then streamed
+            bodies are never buffered.
+        spool_limit:
+            The number of bytes to buffer in total, spooling the buffer into a
+            temporary file past ``max_size``.
+
+    Returns:
+        The replayable content.
+    """
+    if isinstance(content, (ReplayableBody, AsyncReplayableBody)):
+        return content
+    if isinstance(content, AsyncIterator):
+        return AsyncReplayableBody(content, max_size=max_size, spool_limit=spool_limit)
+    if hasattr(content, "read") or isinstance(content, Iterator):
+        return ReplayableBody(content, max_size=max_size, spool_limit=spool_limit)
+    return content
+
+
+def _next(chunks: Iterator[bytes]) -> bytes:
+    """
+    Returns the next chunk of the iterator, or an empty chunk once it's exhausted.
+    """
+    return next(chunks, b"")
+
+
+def _seekable(source: Any) -> bool:
+    try:
+        return bool(source.seekable())
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+def _remaining(source: IO[bytes], start: int) -> int:
+    """
+    The number of bytes from the start position to the end of the file.
+    """
+    try:
+        size = os.fstat(source.fileno()).st_size
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        size = source.seek(0, io.SEEK_END)
+        source.seek(start)
+    return max(size - start, 0)
@@ -0,0 +1,383 @@
+"""
+Record and replay transports.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass
+from os import PathLike
+from pathlib import Path
+from typing import Any, Literal, cast
+
+from httpx import (
+    AsyncByteStream,
+    AsyncHTTPTransport,
+    HTTPTransport,
+    SyncByteStream,
+)
+
+from ._bodies import CHUNK_SIZE
+from ._errors import CassetteError
+from .types import AsyncBaseTransport, BaseTransport, Request, Response
+
+CassetteMode = Literal["record", "replay"]
+""" The modes of a cassette transport. """
+
+
+@dataclass(frozen=True, slots=True)
+class Interaction:
+    """
+    A recorded request and the response that was returned for it.
+    """
+
+    method: str
+    """ The method of the request. """
+
+    url: str
+    """ The URL of the request. """
+
+    digest: str
+    """ The digest of the request body (empty if the request had no body). """
+
+    status: int
+    """ The status code of the response. """
+
+    headers: list[tuple[str, str]]
+    """ The headers of the response. """
+
+    body: bytes
+    """ The raw (still content-encoded) body of the response. """
+
+    elapsed: float
+    """ The number of seconds it took to receive the response. """
+
+    def dump(self) -> dict[str, Any]:
+        """
+        Returns the interaction as a JSON-serializable dictionary.  Bodies are stored
+        as text where possible, and base64-encoded otherwise.
+        """
+        data: dict[str, Any] = {
+            "method": self.method,
+            "url": self.url,
+            "digest": self.digest,
+            "status": self.status,
+            "headers": self.headers,
+            "elapsed": round(self.elapsed, 6),
+        }
+        try:
+            data["body"] = self.body.decode("utf-8")
+        except UnicodeDecodeError:
+            data["body64"] = base64.b64encode(self.body).decode("ascii")
+        return data
+
+    @classmethod
+    def load(cls, data: dict[str, Any]) -> Interaction:
+        """
+        Builds the interaction from a dictionary returned by :meth:`dump`.
+        """
+        if "body64" in data:
+            body = base64.b64decode(data["body64"])
+        else:
+            body = data["body"].encode("utf-8")
+        return cls(
+            method=data["method"],
+            url=data["url"],
+            digest=data["digest"],
+            status=data["status"],
+            headers=[(key, value) for key, value in data["headers"]],
+            body=body,
+            elapsed=data["elapsed"],
+        )
+
+
+class Cassette:
+    """
+    A recording of HTTP interactions stored as gzip-compressed JSON lines, one
+    interaction per line.
+
+    Requests are matched to the recorded interactions by their method, URL, and a
+    digest of their body.  Requests that were recorded several times (such as polling
+    the same URL) are served the recorded responses in the order they were recorded,
+    starting over once every response has been served, so that a recording can be
+    replayed any number of times.
+
+    Args:
+        path: The path of the cassette file.
+    """
+
+    def __init__(self, path: str | PathLike[str]) -> None:
+        self.path = Path(path)
+        self.interactions: list[Interaction] = []
+        self._index: dict[tuple[str, str, str], list[Interaction]] = {}
+        self._served: dict[tuple[str, str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> Cassette:
+        """
+        Reads the interactions from the cassette file.
+        """
+        with gzip.open(self.path, "rt", encoding="utf-8") as fobj:
+            for line in fobj:
+                self.add(Interaction.load(json.loads(line)))
+        return self
+
+    def save(self) -> None:
+        """
+        Writes the interactions to the cassette file.
+        """
+        with gzip.open(self.path, "wt", encoding="utf-8") as fobj:
+            for interaction in self.interactions:
+                fobj.write(json.dumps(interaction.dump(), separators=(",", ":")))
+                fobj.write("\n")
+
+    def add(self, interaction: Interaction) -> None:
+        """
+        Adds an interaction to the cassette.
+        """
+        with self._lock:
+            self.interactions.append(interaction)
+            key = (interaction.method, interaction.url, interaction.digest)
+            self._index.setdefault(key, []).append(interaction)
+
+    def play(self, request: Request) -> Interaction:
+        """
+        Returns the next recorded interaction matching the request.
+
+        Args:
+            request: The request to match.  The body must have been read.
+        """
+        key = (request.method, str(request.url), _digest(request.content))
+        with self._lock:
+            if not (recorded := self._index.get(key)):
+                raise CassetteError(request.method, str(request.url))
+            served = self._served.get(key, 0)
+            self._served[key] = served + 1
+        return recorded[served % len(recorded)]
+
+
+class ReplayStream(SyncByteStream, AsyncByteStream):
+    """
+    The body of a replayed response, sent in chunks at the simulated bandwidth.
+    """
+
+    def __init__(self, body: bytes, bandwidth: int | None) -> None:
+        self.body = body
+        self.bandwidth = bandwidth
+
+    def _chunks(self) -> Iterator[tuple[bytes, float]]:
+        for offset in range(0, len(self.body), CHUNK_SIZE):
+            chunk = self.body[offset : offset + CHUNK_SIZE]
+            yield chunk, len(chunk) / self.bandwidth if self.bandwidth else 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk, delay in self._chunks():
+            if delay:
+                time.sleep(delay)
+            yield chunk
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for chunk, delay in self._chunks():
+            if delay:
+                await asyncio.sleep(delay)
+            yield chunk
+
+
+class CassetteTransport(BaseTransport):
+    """
+    Transport recording the interactions with a real service into a cassette file,
+    or replaying them from it, so that SDKs can be tested and benchmarked without the
+    service.  Pass it as the ``transport`` of the client.
+
+    In record mode, requests are sent through the wrapped transport and the
+    interactions are written to the cassette when the transport (or the client using
+    it) is closed, or when :meth:`save` is called.  In replay mode, requests are
+    served from the cassette and never leave the process.  Responses can be delayed
+    by a fixed latency (or the latency observed while recording) and their bodies
+    throttled to a bandwidth, to reproduce the shape of production traffic.
+
+    Args:
+        path: The path of the cassette file.
+        mode: Either ``record`` or ``replay``.
+        transport:
+            The transport to record the interactions of.  Defaults to a new
+            ``httpx.HTTPTransport``.
+        latency:
+            The number of seconds to wait before returning each replayed response, or
+            ``recorded`` to wait as long as the response originally took.
+        bandwidth: The number of bytes per second to send replayed bodies at.
+
+    Example:
+        >>> client = APIClient(transport=CassetteTransport("api.cassette", "record"))
+        >>> replay = CassetteTransport("api.cassette", latency=0.05)
+        >>> client = APIClient(transport=replay)
+    """
+
+    def __init__(
+        self,
+        path: str | PathLike[str],
+        mode: CassetteMode = "replay",
+        transport: BaseTransport | None = None,
+        latency: float | Literal["recorded"] = 0.0,
+        bandwidth: int | None = None,
+    ) -> None:
+        self.mode = mode
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.cassette = Cassette(path)
+        self._transport: BaseTransport | None = None
+        if mode == "record":
+            self._transport = transport or HTTPTransport()
+        elif mode == "replay":
+            self.cassette.load()
+        else:
+            raise ValueError(f"Unknown cassette mode {mode!r}.")
+
+    def handle_request(self, request: Request) -> Response:
+        request.read()
+        if self._transport is not None:
+            start = time.perf_counter()
+            response = self._transport.handle_request(request)
+            # The stream is read directly as any response built from bytes (such as
+            # those of mock transports) has already been marked as consumed.
+            try:
+                body = b"".join(cast(SyncByteStream, response.stream))
+            finally:
+                response.close()
+            return _record(self.cassette, request, response, body, start)
+        interaction = self.cassette.play(request)
+        if delay := _latency(self.latency, interaction):
+            time.sleep(delay)
+        return _replay(interaction, self.bandwidth)
+
+    def save(self) -> None:
+        """
+        Writes the recorded interactions to the cassette file.
+        """
+        self.cassette.save()
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self.save()
+
+
+class AsyncCassetteTransport(AsyncBaseTransport):
+    """
+    Async variant of :class:`CassetteTransport`, for use with the async clients.
+
+    Args:
+        path: The path of the cassette file.
+        mode: Either ``record`` or ``replay``.
+        transport:
+            The transport to record the interactions of.  Defaults to a new
+            ``httpx.AsyncHTTPTransport``.
+        latency:
+            The number of seconds to wait before returning each replayed response, or
+            ``recorded`` to wait as long as the response originally took.
+        bandwidth: The number of bytes per second to send replayed bodies at.
+    """
+
+    def __init__(
+        self,
+        path: str | PathLike[str],
+        mode: CassetteMode = "replay",
+        transport: AsyncBaseTransport | None = None,
+        latency: float | Literal["recorded"] = 0.0,
+        bandwidth: int | None = None,
+    ) -> None:
+        self.mode = mode
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.cassette = Cassette(path)
+        self._transport: AsyncBaseTransport | None = None
+        if mode == "record":
+            self._transport = transport or AsyncHTTPTransport()
+        elif mode == "replay":
+            self.cassette.load()
+        else:
+            raise ValueError(f"Unknown cassette mode {mode!r}.")
+
+    async def handle_async_request(self, request: Request) -> Response:
+        await request.aread()
+        if self._transport is not None:
+            start = time.perf_counter()
+            response = await self._transport.handle_async_request(request)
+            stream = cast(AsyncByteStream, response.stream)
+            try:
+                body = b"".join([chunk async for chunk in stream])
+            finally:
+                await response.aclose()
+            return _record(self.cassette, request, response, body, start)
+        interaction = self.cassette.play(request)
+        if delay := _latency(self.latency, interaction):
+            await asyncio.sleep(delay)
+        return _replay(interaction, self.bandwidth)
+
+    def save(self) -> None:
+        """
+        Writes the recorded interactions to the cassette file.
+        """
+        self.cassette.save()
+
+    async def aclose(self) -> None:
+        if self._transport is not None:
+            await self._transport.aclose()
+            self.save()
+
+
+def _digest(body: bytes) -> str:
+    """
+    Returns the digest used to match request bodies.
+    """
+    return hashlib.sha256(body).hexdigest()[:32] if body else ""
+
+
+def _latency(latency: float | Literal["recorded"], interaction: Interaction) -> float:
+    """
+    Returns the number of seconds to delay the replayed response by.
+    """
+    return interaction.elapsed if latency == "recorded" else latency
+
+
+def _record(
+    cassette: Cassette, request: Request, response: Response, body: bytes, start: float
+) -> Response:
+    """
+    Adds the interaction to the cassette and returns a copy of the response, as the
+    body of the original response has been consumed.
+    """
+    interaction = Interaction(
+        method=request.method,
+        url=str(request.url),
+        digest=_digest(request.content),
+        status=response.status_code,
+        headers=[(key, value) for key, value in response.headers.multi_items()],
+        body=body,
+        elapsed=time.perf_counter() - start,
+    )
+    cassette.add(interaction)
+    return _replay(interaction, None, response.extensions)
+
+
+def _replay(
+    interaction: Interaction,
+    bandwidth: int | None,
+    extensions: dict[str, Any] | None = None,
+) -> Response:
+    """
+    Builds the response of the interaction.
+    """
+    return Response(
+        interaction.status,
+        headers=interaction.headers,
+        stream=ReplayStream(interaction.body, bandwidth),
+        extensions=extensions,
+    )
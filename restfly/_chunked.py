@@ -0,0 +1,338 @@
+"""
+Chunked (multi-part) uploads.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from os import PathLike
+from pathlib import Path
+from typing import Any
+
+from ._bodies import CHUNK_SIZE, AsyncFileUpload, FileUpload
+
+PART_SIZE = 8 * 1024 * 1024
+""" The default size of each part of a chunked upload. """
+
+PART_BACKOFF = 1.0
+""" The number of seconds to wait (multiplied by the attempt) before resending. """
+
+PART_JITTER = 0.5
+""" The maximum number of seconds of random jitter added to the part backoff. """
+
+
+@dataclass(frozen=True, slots=True)
+class UploadPart:
+    """
+    A byte range of the file uploaded as a single part.
+    """
+
+    number: int
+    """ The number of the part, starting from 1. """
+
+    offset: int
+    """ The offset of the first byte of the part within the file. """
+
+    length: int
+    """ The number of bytes in the part. """
+
+
+class ChunkedUploadBase(ABC):
+    """
+    The state and the persistence of a chunked upload, shared by
+    :class:`ChunkedUpload` and :class:`AsyncChunkedUpload`.
+    """
+
+    part_size: int = PART_SIZE
+    """ The size of each part in bytes. """
+
+    workers: int = 4
+    """ The number of parts to upload at once. """
+
+    def __init__(
+        self,
+        source: str | PathLike[str],
+        state: str | PathLike[str] | None = None,
+        part_size: int | None = None,
+        workers: int | None = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> None:
+        self.path = Path(source)
+        self.state = Path(state) if state is not None else None
+        if part_size is not None:
+            self.part_size = part_size
+        if workers is not None:
+            self.workers = workers
+        if self.part_size < 1 or self.workers < 1:
+            raise ValueError("The part size and number of workers must be positive.")
+        self.chunk_size = chunk_size
+        stat = self.path.stat()
+        self.size = stat.st_size
+        self._mtime = stat.st_mtime_ns
+        self.session: dict[str, Any] | None = None
+        self.results: dict[int, Any] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def parts(self) -> list[UploadPart]:
+        """
+        Every part of the file.  Empty files are uploaded as a single empty part.
+        """
+        count = max(1, math.ceil(self.size / self.part_size))
+        return [
+            UploadPart(
+                number + 1,
+                number * self.part_size,
+                min(self.part_size, self.size - number * self.part_size),
+            )
+            for number in range(count)
+        ]
+
+    @property
+    def pending(self) -> list[UploadPart]:
+        """
+        The parts that have yet to be uploaded.
+        """
+        return [part for part in self.parts if part.number not in self.results]
+
+    def begin(self, session: dict[str, Any]) -> None:
+        """
+        Stores the session returned by the start step, discarding any uploaded parts.
+
+        Args:
+            session: The session information of the upload.
+        """
+        with self._lock:
+            self.session = session
+            self.results = {}
+            self._save()
+
+    def record(self, part: UploadPart, result: Any) -> None:
+        """
+        Stores the result of an uploaded part.
+
+        Args:
+            part: The uploaded part.
+            result: The result returned by the upload step of the part.
+        """
+        with self._lock:
+            self.results[part.number] = result
+            self._save()
+
+    @property
+    def completed(self) -> list[Any]:
+        """
+        The results of every part in order.
+        """
+        return [self.results[part.number] for part in self.parts]
+
+    def finish(self) -> None:
+        """
+        Removes the state file once the upload has been completed.
+        """
+        if self.state is not None:
+            self.state.unlink(missing_ok=True)
+
+    def _load(self) -> None:
+        """
+        Restores the state of a previous attempt of the upload.  The state is only
+        used if it describes the same file split into the same parts.
+        """
+        if self.state is None or not self.state.exists():
+            return
+        state = json.loads(self.state.read_text())
+        if [state.get(k) for k in ("size", "mtime", "part_size")] == [
+            self.size,
+            self._mtime,
+            self.part_size,
+        ]:
+            self.session = state["session"]
+            self.results = {int(num): result for num, result in state["parts"].items()}
+
+    def _save(self) -> None:
+        """
+        Atomically writes the state of the upload to the state file.
+        """
+        if self.state is None:
+            return
+        tmp = self.state.with_name(f"{self.state.name}.tmp")
+        tmp.write_text(
+            json.dumps(
+                {
+                    "size": self.size,
+                    "mtime": self._mtime,
+                    "part_size": self.part_size,
+                    "session": self.session,
+                    "parts": self.results,
+                }
+            )
+        )
+        os.replace(tmp, self.state)
+
+
+class ChunkedUpload(ChunkedUploadBase):
+    """
+    A file uploaded through an "initiate / upload part / complete" workflow, such as
+    S3-style multipart uploads or tus.  The file is split into parts of ``part_size``
+    bytes, which are uploaded concurrently by ``workers`` threads (or tasks for
+    :class:`AsyncChunkedUpload`) and retried individually whenever the connection
+    fails.  Pass the upload to the ``_chunked_upload`` method of the client or
+    endpoint to run it.
+
+    Subclasses implement the steps of the vendor workflow using the client passed to
+    each of them:
+
+    * ``start`` initiates the upload, returning the session information (such as the
+      upload id) needed by the other steps.
+    * ``upload_part`` uploads a single part (sending :meth:`body` as the content),
+      returning whatever the complete step needs to know about the part (such as the
+      ETag of the part).
+    * ``complete`` finalizes the upload with the results of every part.
+
+    If a state file is given, the session and the results of the uploaded parts are
+    saved to it as each part completes, so that an interrupted upload can be resumed
+    by running a new upload of the same file with the same state file.  Only the parts
+    that haven't been uploaded are then sent.  The session and part results must
+    therefore be JSON serializable.  The state file is removed once the upload has
+    been completed.
+
+    Args:
+        source: The path of the file to upload.
+        state: The path of the file to persist the state of the upload within.
+        part_size: The size of each part in bytes.  Overloads the class default.
+        workers: The number of parts to upload at once.  Overloads the class default.
+        chunk_size: The number of bytes of each part to send at a time.
+
+    Example:
+        >>> class VendorUpload(ChunkedUpload):
+        ...     part_size = 16 * 1024 * 1024
+        ...
+        ...     def start(self, client):
+        ...         return client._post("/uploads", json={"size": self.size}).json()
+        ...
+        ...     def upload_part(self, client, part):
+        ...         resp = client._put(
+        ...             f"/uploads/{self.session['id']}/parts/{part.number}",
+        ...             content=self.body(part),
+        ...         )
+        ...         return resp.headers["ETag"]
+        ...
+        ...     def complete(self, client, results):
+        ...         return client._post(
+        ...             f"/uploads/{self.session['id']}/complete",
+        ...             json={"parts": results},
+        ...         )
+        >>> client._chunked_upload(VendorUpload("export.tar", state="export.json"))
+    """
+
+    def body(self, part: UploadPart) -> FileUpload:
+        """
+        Returns the request body streaming the part from the file.
+
+        Args:
+            part: The part to send.
+        """
+        return FileUpload(
+            self.path, self.chunk_size, offset=part.offset, length=part.length
+        )
+
+    @abstractmethod
+    def start(self, client: Any) -> dict[str, Any]:
+        """
+        Initiates the upload.
+
+        Args:
+            client: The client or endpoint running the upload.
+
+        Returns:
+            The session information of the upload.
+        """
+
+    @abstractmethod
+    def upload_part(self, client: Any, part: UploadPart) -> Any:
+        """
+        Uploads a part of the file.
+
+        Args:
+            client: The client or endpoint running the upload.
+            part: The part to upload.
+
+        Returns:
+            The result of the part needed by the complete step.
+        """
+
+    @abstractmethod
+    def complete(self, client: Any, results: list[Any]) -> Any:
+        """
+        Completes the upload once every part has been uploaded.
+
+        Args:
+            client: The client or endpoint running the upload.
+            results: The results of every part in order.
+
+        Returns:
+            The return value of the ``_chunked_upload`` call.
+        """
+
+
+class AsyncChunkedUpload(ChunkedUploadBase):
+    """
+    Async variant of :class:`ChunkedUpload`, for use with the async clients.  The
+    ``start``, ``upload_part``, and ``complete`` steps are coroutines, and the parts
+    are uploaded concurrently by ``workers`` tasks.
+    """
+
+    def body(self, part: UploadPart) -> AsyncFileUpload:
+        """
+        Returns the request body streaming the part from the file.
+
+        Args:
+            part: The part to send.
+        """
+        return AsyncFileUpload(
+            self.path, self.chunk_size, offset=part.offset, length=part.length
+        )
+
+    @abstractmethod
+    async def start(self, client: Any) -> dict[str, Any]:
+        """
+        Initiates the upload.
+
+        Args:
+            client: The client or endpoint running the upload.
+
+        Returns:
+            The session information of the upload.
+        """
+
+    @abstractmethod
+    async def upload_part(self, client: Any, part: UploadPart) -> Any:
+        """
+        Uploads a part of the file.
+
+        Args:
+            client: The client or endpoint running the upload.
+            part: The part to upload.
+
+        Returns:
+            The result of the part needed by the complete step.
+        """
+
+    @abstractmethod
+    async def complete(self, client: Any, results: list[Any]) -> Any:
+        """
+        Completes the upload once every part has been uploaded.
+
+        Args:
+            client: The client or endpoint running the upload.
+            results: The results of every part in order.
+
+        Returns:
+            The return value of the ``_chunked_upload`` call.
+        """
@@ -0,0 +1,124 @@
+"""
+Pluggable JSON codecs.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Protocol
+
+from pydantic_core import from_json, to_json
+
+
+class JSONCodec(Protocol):
+    """
+    Interface for encoding JSON request bodies and decoding raw JSON responses.
+    """
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Encodes the object into JSON.
+
+        Args:
+            obj: The object to encode.
+
+        Returns:
+            The UTF-8 encoded JSON document.
+        """
+        ...
+
+    def loads(self, data: bytes) -> Any:
+        """
+        Decodes the JSON document.
+
+        Args:
+            data: The UTF-8 encoded JSON document.
+
+        Returns:
+            The decoded object.
+        """
+        ...
+
+
+class StdlibJSONCodec:
+    """
+    JSON codec using the standard library ``json`` module, encoding the same way
+    that HTTPX does.
+    """
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(
+            obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False
+        ).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class PydanticJSONCodec:
+    """
+    JSON codec using Pydantic-Core.  As Pydantic-Core is already a dependency, this
+    codec is always available.
+    """
+
+    def dumps(self, obj: Any) -> bytes:
+        return to_json(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return from_json(data)
+
+
+class OrjsonCodec:
+    """
+    JSON codec using orjson.  Requires the ``orjson`` package.
+
+    Args:
+        option: The orjson option flags to use when encoding.
+    """
+
+    def __init__(self, option: int | None = None) -> None:
+        try:
+            import orjson
+        except ImportError as err:  # pragma: no cover
+            raise ImportError("OrjsonCodec requires the orjson package.") from err
+        self._orjson = orjson
+        self._option = option
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, option=self._option)
+
+    def loads(self, data: bytes) -> Any:
+        return self._orjson.loads(data)
+
+
+class MsgspecCodec:
+    """
+    JSON codec using msgspec.  Requires the ``msgspec`` package.
+    """
+
+    def __init__(self) -> None:
+        try:
+            import msgspec
+        except ImportError as err:  # pragma: no cover
+            raise ImportError("MsgspecCodec requires the msgspec package.") from err
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return self._decoder.decode(data)
+
+
+def default_json_codec() -> JSONCodec:
+    """
+    Returns the fastest JSON codec that is installed.  orjson is preferred, then
+    msgspec, falling back to Pydantic-Core.
+    """
+    for codec in (OrjsonCodec, MsgspecCodec):
+        try:
+            return codec()
+        except ImportError:  # pragma: no cover
+            continue
+    return PydanticJSONCodec()  # pragma: no cover
@@ -0,0 +1,217 @@
+"""
+Request body compression.
+"""
+
+from __future__ import annotations
+
+import zlib
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any, Literal, Protocol
+
+from ._bodies import CHUNK_SIZE, ReplayableBody, _remaining, _seekable
+
+ENCODINGS = ("gzip", "zstd")
+""" The supported content encodings. """
+
+
+class Compressor(Protocol):
+    """
+    Interface of the incremental compressor objects for each encoding.
+    """
+
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes: ...
+
+
+@dataclass(frozen=True, slots=True)
+class Compression:
+    """
+    Request body compression settings.  Bodies are compressed before being sent and
+    the ``Content-Encoding`` header is set accordingly.  Only bodies passed as
+    ``content``, ``json``, or ``xml`` are compressed, form data and multipart uploads
+    are sent as-is.
+
+    Streamed bodies (iterators and non-seekable files) are compressed as they are sent,
+    and as the size of the stream isn't known ahead of time, are always compressed.
+    Bodies that can be read again (such as seekable files and file uploads) are
+    compressed again for every send rather than having their output buffered, so that
+    retries never need to buffer them.
+
+    Parameters:
+        encoding:
+            The content encoding to use, either ``gzip`` or ``zstd``.  zstd requires
+            either Python 3.14 or the ``zstandard`` package.
+        level:
+            The compression level.  If None, the default level of the encoding is used
+            (6 for gzip and 3 for zstd).
+        threshold:
+            The minimum body size in bytes to compress.  Smaller bodies are sent as-is.
+
+    Example:
+        >>> client = APIClient(compression=Compression("zstd", threshold=16384))
+        >>> client._post("/ingest", content=records(), compression=Compression())
+    """
+
+    encoding: Literal["gzip", "zstd"] = "gzip"
+    level: int | None = None
+    threshold: int = 1024
+
+    def __post_init__(self) -> None:
+        if self.encoding not in ENCODINGS:
+            raise ValueError(f"Unsupported content encoding {self.encoding!r}.")
+        if self.threshold < 0:
+            raise ValueError("The compression threshold cannot be negative.")
+
+        # Build a compressor to ensure that the encoding is actually available.
+        self.compressor()
+
+    def compressor(self) -> Compressor:
+        """
+        Returns a new incremental compressor for the encoding.
+        """
+        if self.encoding == "zstd":
+            return _zstd_compressor(3 if self.level is None else self.level)
+        level = zlib.Z_DEFAULT_COMPRESSION if self.level is None else self.level
+        return zlib.compressobj(level, zlib.DEFLATED, 31)  # ty: ignore[invalid-return-type]
+
+    def compress(self, data: bytes) -> bytes:
+        """
+        Compresses the data.
+
+        Args:
+            data: The data to compress.
+
+        Returns:
+            The compressed data.
+        """
+        compressor = self.compressor()
+        return compressor.compress(data) + compressor.flush()
+
+    def stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Compresses the chunks as they are iterated over.
+
+        Args:
+            chunks: The chunks of data to compress.
+
+        Yields:
+            The compressed chunks.
+        """
+        compressor = self.compressor()
+        for chunk in chunks:
+            if compressed := compressor.compress(chunk):
+                yield compressed
+        yield compressor.flush()
+
+    async def astream(self, chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        """
+        Compresses the chunks as they are asynchronously iterated over.
+
+        Args:
+            chunks: The chunks of data to compress.
+
+        Yields:
+            The compressed chunks.
+        """
+        compressor = self.compressor()
+        async for chunk in chunks:
+            if compressed := compressor.compress(chunk):
+                yield compressed
+        yield compressor.flush()
+
+    def encode(self, content: Any) -> Any | None:
+        """
+        Compresses the request content if it's over the size threshold.
+
+        Args:
+            content: The request content.
+
+        Returns:
+            The compressed content, or None if the content should be sent as-is.
+        """
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            if len(content) < self.threshold:
+                return None
+            return self.compress(bytes(content))
+        if hasattr(content, "read"):
+            fobj = content
+            if not _seekable(fobj):
+                return self.stream(iter(lambda: fobj.read(CHUNK_SIZE), b""))
+            if _remaining(fobj, fobj.tell()) < self.threshold:
+                return None
+            content = ReplayableBody(fobj)
+        length = getattr(content, "length", None)
+        if isinstance(length, int) and length < self.threshold:
+            return None
+
+        # One-shot iterators are compressed as they are sent, while bodies that can be
+        # iterated over again are compressed again for every send.
+        if isinstance(content, AsyncIterator):
+            return self.astream(content)
+        if isinstance(content, AsyncIterable):
+            return AsyncCompressedBody(self, content)
+        if isinstance(content, Iterator):
+            return self.stream(content)
+        if isinstance(content, Iterable):
+            return CompressedBody(self, content)
+        return None
+
+
+class CompressedBody:
+    """
+    Request body compressing a source that can be iterated over more than once (such
+    as a :class:`~restfly.FileUpload`).  The source is compressed again for every send,
+    so the body stays replayable without its compressed output being buffered.
+
+    Args:
+        compression: The compression settings.
+        source: The re-iterable body to compress.
+    """
+
+    def __init__(self, compression: Compression, source: Iterable[bytes]) -> None:
+        self.compression = compression
+        self.source = source
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self.compression.stream(self.source)
+
+
+class AsyncCompressedBody:
+    """
+    Async variant of :class:`CompressedBody` for async iterables (such as an
+    :class:`~restfly.AsyncFileUpload`).
+
+    Args:
+        compression: The compression settings.
+        source: The re-iterable body to compress.
+    """
+
+    def __init__(self, compression: Compression, source: AsyncIterable[bytes]) -> None:
+        self.compression = compression
+        self.source = source
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self.compression.astream(self.source)
+
+
+def _zstd_compressor(level: int) -> Compressor:
+    """
+    Returns a zstd compressor, preferring the standard library implementation.
+    """
+    try:
+        from compression import zstd  # type: ignore[import-not-found] # ty: ignore[unresolved-import]
+    except ImportError:
+        pass
+    else:  # pragma: no cover
+        return zstd.ZstdCompressor(level=level)
+    try:
+        import zstandard
+    except ImportError as err:  # pragma: no cover
+        raise ImportError(
+            "zstd compression requires Python 3.14+ or the zstandard package."
+        ) from err
+    return zstandard.ZstdCompressor(level=level).compressobj()
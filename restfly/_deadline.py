@@ -0,0 +1,98 @@
+"""
+Deadlines bounding the total time spent on the requests made within a block of code.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from ._errors import DeadlineExceeded
+from .types import URL, Request
+
+_deadline: ContextVar[float | None] = ContextVar("restfly_deadline", default=None)
+""" The monotonic time of the current deadline (if any). """
+
+TIMEOUTS = ("connect", "read", "write", "pool")
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[float]:
+    """
+    Sets a deadline for every request made within the block, including the retries
+    and backoff of each request, the pages fetched by the API iterators, and any
+    requests made by nested endpoint calls.  The timeouts of each attempt are shrunk
+    to the time remaining, backing off is skipped when the deadline would pass before
+    the retry, and :class:`DeadlineExceeded` is raised once the deadline has passed.
+
+    The deadline is held within a context variable, so that it's local to the current
+    thread (or asyncio task), and is inherited by the tasks created within the block.
+    Nested deadlines can only shorten the deadline, never extend it.
+
+    Args:
+        seconds: The number of seconds from now until the deadline.
+
+    Returns:
+        The monotonic time of the deadline.
+
+    Example:
+        >>> with restfly.deadline(2.5):
+        ...     user = client.users.details(1)
+        ...     groups = list(client.groups.list())
+    """
+    expires = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None and current < expires:
+        expires = current
+    token = _deadline.set(expires)
+    try:
+        yield expires
+    finally:
+        _deadline.reset(token)
+
+
+def time_remaining() -> float | None:
+    """
+    Returns the number of seconds until the current deadline, or None if there isn't a
+    deadline.  Once the deadline has passed, the number is zero or negative.
+    """
+    expires = _deadline.get()
+    return None if expires is None else expires - time.monotonic()
+
+
+def check_deadline(
+    delay: float = 0.0,
+    *,
+    method: str | None = None,
+    url: str | URL | None = None,
+) -> float | None:
+    """
+    Raises :class:`DeadlineExceeded` if the current deadline has passed, or would pass
+    within ``delay`` seconds.
+
+    Returns:
+        The number of seconds until the deadline, or None if there isn't a deadline.
+    """
+    remaining = time_remaining()
+    if remaining is not None and remaining <= delay:
+        raise DeadlineExceeded(method, None if url is None else str(url))
+    return remaining
+
+
+def cap_timeout(request: Request, remaining: float | None) -> None:
+    """
+    Shrinks the timeouts of the request to the number of seconds remaining until the
+    deadline.  Timeouts that are disabled are set to the remaining time.
+    """
+    if remaining is None:
+        return
+    timeout = request.extensions.get("timeout", {})
+    request.extensions = {
+        **request.extensions,
+        "timeout": {
+            key: remaining if timeout.get(key) is None else min(timeout[key], remaining)
+            for key in TIMEOUTS
+        },
+    }
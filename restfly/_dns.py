@@ -0,0 +1,359 @@
+"""
+DNS caching and multi-address failover transports.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import socket
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from httpx import (
+    AsyncHTTPTransport,
+    ConnectError,
+    ConnectTimeout,
+    HTTPTransport,
+)
+
+from .types import AsyncBaseTransport, BaseTransport, Request, Response
+
+DNS_TTL = 60.0
+""" The default number of seconds resolved addresses are cached for. """
+
+FAILURE_TTL = 30.0
+""" The default number of seconds an unreachable address is tried last for. """
+
+FALLBACK_DELAY = 1.0
+""" The default connect timeout of each address before falling over to the next. """
+
+
+class Resolver(Protocol):
+    """
+    Interface for resolving host names into the addresses to connect to.
+    """
+
+    def resolve(self, host: str, port: int) -> Sequence[str]:
+        """
+        Resolves the host name.
+
+        Args:
+            host: The host name to resolve.
+            port: The port that will be connected to.
+
+        Returns:
+            The IP addresses of the host, in order of preference.
+
+        Raises:
+            OSError: If the host name can't be resolved.
+        """
+        ...
+
+
+class SystemResolver:
+    """
+    Resolver using the system resolver (``getaddrinfo``).  The addresses are ordered
+    as recommended by RFC 8305 (Happy Eyeballs), alternating between the address
+    families starting with the family of the first address returned.
+    """
+
+    def resolve(self, host: str, port: int) -> list[str]:
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        families: dict[int, list[str]] = {}
+        for family, _, _, _, sockaddr in infos:
+            addresses = families.setdefault(family, [])
+            if sockaddr[0] not in addresses:
+                addresses.append(str(sockaddr[0]))
+        ordered: list[str] = []
+        groups = list(families.values())
+        for idx in range(max(map(len, groups), default=0)):
+            ordered.extend(group[idx] for group in groups if idx < len(group))
+        return ordered
+
+
+@dataclass(slots=True)
+class _Entry:
+    """
+    The cached addresses of a host.
+    """
+
+    addresses: list[str]
+    expires: float
+    cursor: int = 0
+    failures: dict[str, float] = field(default_factory=dict)
+
+
+class DNSCache:
+    """
+    Cache of resolved host names shared by the DNS caching transports, so that new
+    connections skip the resolver until the TTL of the host has passed.  Requests are
+    rotated across every address of the host, and an address that can't be connected
+    to is tried last until ``failure_ttl`` seconds have passed.  The cache is thread
+    safe, and may be shared between clients.
+
+    As ``getaddrinfo`` doesn't return the TTL of the records, every host is cached for
+    the same number of seconds.  If the resolver fails once the TTL has passed, then
+    the stale addresses continue to be used until it succeeds again.
+
+    Args:
+        resolver: The resolver to use.  Defaults to the system resolver.
+        ttl: The number of seconds the addresses of a host are cached for.
+        failure_ttl: The number of seconds an unreachable address is tried last for.
+        fallback_delay:
+            The connect timeout of each address (other than the last one tried) before
+            falling over to the next address, much like the connection attempt delay
+            of Happy Eyeballs.
+        rotate:
+            Should requests be rotated across the addresses?  If not, then the first
+            reachable address is always used.
+
+    Example:
+        >>> client = APIClient(base_url="https://example.com", dns_cache=DNSCache())
+    """
+
+    def __init__(
+        self,
+        resolver: Resolver | None = None,
+        ttl: float = DNS_TTL,
+        failure_ttl: float = FAILURE_TTL,
+        fallback_delay: float = FALLBACK_DELAY,
+        rotate: bool = True,
+    ) -> None:
+        self.resolver = resolver or SystemResolver()
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.fallback_delay = fallback_delay
+        self.rotate = rotate
+        self._entries: dict[tuple[str, int], _Entry] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, host: str, port: int) -> list[str] | None:
+        """
+        Returns the cached addresses of the host in the order they should be tried,
+        or None if the host isn't cached or its TTL has passed.
+
+        Args:
+            host: The host name.
+            port: The port that will be connected to.
+        """
+        with self._lock:
+            entry = self._entries.get((host, port))
+            if entry is None or entry.expires <= time.monotonic():
+                return None
+            return self._order(entry)
+
+    def resolve(self, host: str, port: int) -> list[str]:
+        """
+        Resolves the host (regardless of whether it's cached) and returns the addresses
+        in the order they should be tried.
+
+        Args:
+            host: The host name.
+            port: The port that will be connected to.
+
+        Raises:
+            OSError: If the host can't be resolved and no stale addresses are cached.
+        """
+        try:
+            addresses = list(self.resolver.resolve(host, port))
+            if not addresses:
+                raise OSError(f"No addresses found for {host}")
+        except OSError:
+            with self._lock:
+                entry = self._entries.get((host, port))
+                if entry is None:
+                    raise
+                return self._order(entry)
+        with self._lock:
+            entry = self._entries.get((host, port))
+            expires = time.monotonic() + self.ttl
+            if entry is None or entry.addresses != addresses:
+                entry = self._entries[(host, port)] = _Entry(addresses, expires)
+            entry.expires = expires
+            return self._order(entry)
+
+    def addresses(self, host: str, port: int) -> list[str]:
+        """
+        Returns the addresses of the host in the order they should be tried, resolving
+        the host if it isn't cached.
+
+        Args:
+            host: The host name.
+            port: The port that will be connected to.
+        """
+        addresses = self.lookup(host, port)
+        return self.resolve(host, port) if addresses is None else addresses
+
+    def failed(self, host: str, port: int, address: str) -> None:
+        """
+        Marks the address as unreachable, so that it's tried last for a while.
+
+        Args:
+            host: The host name.
+            port: The port that couldn't be connected to.
+            address: The address that couldn't be connected to.
+        """
+        with self._lock:
+            if entry := self._entries.get((host, port)):
+                entry.failures[address] = time.monotonic() + self.failure_ttl
+
+    def clear(self) -> None:
+        """
+        Removes every cached host.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _order(self, entry: _Entry) -> list[str]:
+        """
+        Returns the addresses of the entry rotated to the next address (if rotating),
+        with the addresses that recently failed moved to the end.
+        """
+        addresses = entry.addresses
+        if self.rotate:
+            start = entry.cursor % len(addresses)
+            entry.cursor += 1
+            addresses = addresses[start:] + addresses[:start]
+        now = time.monotonic()
+        failed = {addr for addr, until in entry.failures.items() if until > now}
+        if not failed:
+            return addresses
+        return [a for a in addresses if a not in failed] + [
+            a for a in addresses if a in failed
+        ]
+
+
+class DNSCachingTransport(BaseTransport):
+    """
+    Transport connecting to the addresses cached by a :class:`DNSCache` rather than
+    resolving the host name for every new connection.  Each request is sent to the
+    next address of the host, falling over to the remaining addresses if the
+    connection can't be established.  As nothing has been sent when a connection fails,
+    any request may safely fall over.  The ``Host`` header and the TLS server name (and
+    certificate verification) still use the host name.
+
+    Clients wrap their default transport with it when passed ``dns_cache``.  Requests
+    to IP addresses are passed through as-is.
+
+    Args:
+        transport:
+            The transport to send the requests with.  Defaults to a new
+            ``httpx.HTTPTransport``.
+        cache: The DNS cache to use.  Defaults to a new cache.
+    """
+
+    def __init__(
+        self, transport: BaseTransport | None = None, cache: DNSCache | None = None
+    ) -> None:
+        self._transport = transport or HTTPTransport()
+        self.cache = cache or DNSCache()
+
+    def handle_request(self, request: Request) -> Response:
+        if (origin := _origin(request)) is None:
+            return self._transport.handle_request(request)
+        try:
+            addresses = self.cache.addresses(*origin)
+        except OSError as err:
+            raise ConnectError(str(err), request=request) from err
+        *fallbacks, last = addresses
+        for address in fallbacks:
+            pinned = _pin(request, address, self.cache.fallback_delay)
+            try:
+                return self._transport.handle_request(pinned)
+            except (ConnectError, ConnectTimeout):
+                self.cache.failed(*origin, address)
+        try:
+            return self._transport.handle_request(_pin(request, last, None))
+        except (ConnectError, ConnectTimeout):
+            self.cache.failed(*origin, last)
+            raise
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class AsyncDNSCachingTransport(AsyncBaseTransport):
+    """
+    Async variant of :class:`DNSCachingTransport`, for use with the async clients.
+    Hosts that aren't cached are resolved within a worker thread.
+
+    Args:
+        transport:
+            The transport to send the requests with.  Defaults to a new
+            ``httpx.AsyncHTTPTransport``.
+        cache: The DNS cache to use.  Defaults to a new cache.
+    """
+
+    def __init__(
+        self,
+        transport: AsyncBaseTransport | None = None,
+        cache: DNSCache | None = None,
+    ) -> None:
+        self._transport = transport or AsyncHTTPTransport()
+        self.cache = cache or DNSCache()
+
+    async def handle_async_request(self, request: Request) -> Response:
+        if (origin := _origin(request)) is None:
+            return await self._transport.handle_async_request(request)
+        addresses = self.cache.lookup(*origin)
+        if addresses is None:
+            try:
+                addresses = await asyncio.to_thread(self.cache.resolve, *origin)
+            except OSError as err:
+                raise ConnectError(str(err), request=request) from err
+        *fallbacks, last = addresses
+        for address in fallbacks:
+            pinned = _pin(request, address, self.cache.fallback_delay)
+            try:
+                return await self._transport.handle_async_request(pinned)
+            except (ConnectError, ConnectTimeout):
+                self.cache.failed(*origin, address)
+        try:
+            return await self._transport.handle_async_request(_pin(request, last, None))
+        except (ConnectError, ConnectTimeout):
+            self.cache.failed(*origin, last)
+            raise
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def _origin(request: Request) -> tuple[str, int] | None:
+    """
+    Returns the host and port of the request, or None if the host is an IP address.
+    """
+    host = request.url.host
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        port = request.url.port or (443 if request.url.scheme == "https" else 80)
+        return host, port
+    return None
+
+
+def _pin(request: Request, address: str, connect_timeout: float | None) -> Request:
+    """
+    Returns a copy of the request sent to the address rather than the host name,
+    with the connect timeout capped if given.
+    """
+    extensions = dict(request.extensions)
+    if request.url.scheme == "https":
+        extensions["sni_hostname"] = request.url.host
+    if connect_timeout is not None:
+        timeout = dict(extensions.get("timeout", {}))
+        connect = timeout.get("connect")
+        timeout["connect"] = (
+            connect_timeout if connect is None else min(connect, connect_timeout)
+        )
+        extensions["timeout"] = timeout
+    return Request(
+        request.method,
+        request.url.copy_with(host=address),
+        headers=request.headers,
+        stream=request.stream,
+        extensions=extensions,
+    )
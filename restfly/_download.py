@@ -0,0 +1,375 @@
+"""
+Resumable file downloads.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import re
+from io import BufferedRandom
+from pathlib import Path
+from typing import Any, Self
+
+from ._bodies import CHUNK_SIZE
+from ._errors import DownloadError
+from .types import Response, codes
+
+CONTENT_RANGE = re.compile(r"^bytes (?P<start>\d+)-(?P<end>\d+)/(?P<total>\d+|\*)$")
+""" Pattern matching the Content-Range header of a partial response. """
+
+RESUME_BACKOFF = 1.0
+""" The number of seconds to wait (multiplied by the attempt) before resuming. """
+
+RESUME_JITTER = 0.5
+""" The maximum number of seconds of random jitter added to the resume backoff. """
+
+MIN_SEGMENT_SIZE = 1024 * 1024
+""" The smallest segment that a segmented download is split into. """
+
+
+class Transfer:
+    """
+    A stream of the response body written into the destination file.  Received chunks
+    are buffered and written at the current offset of the transfer once the buffer
+    reaches the chunk size.
+    """
+
+    offset: int = 0
+    """ The file offset that the next chunk is written to. """
+
+    def __init__(self, chunk_size: int = CHUNK_SIZE) -> None:
+        self.chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._file: BufferedRandom | None = None
+
+    def write(self, chunk: bytes) -> None:
+        """
+        Writes the chunk at the current offset.
+
+        Args:
+            chunk: The chunk of the response body.
+        """
+        if self.buffer(chunk):
+            self.flush()
+
+    def buffer(self, chunk: bytes) -> bool:
+        """
+        Buffers the chunk without writing it, so that the file writes can be made
+        elsewhere (such as within a worker thread).
+
+        Args:
+            chunk: The chunk of the response body.
+
+        Returns:
+            Whether the buffer has reached the chunk size and should be flushed.
+        """
+        self._buffer += chunk
+        self.offset += len(chunk)
+        return len(self._buffer) >= self.chunk_size
+
+    def flush(self) -> None:
+        """
+        Writes any buffered data to the file.  Must be called once the response has
+        been read (or interrupted) so that everything received is kept.
+        """
+        assert self._file is not None
+        if self._buffer:
+            self._file.seek(self.offset - len(self._buffer))
+            self._file.write(self._buffer)
+            self._buffer.clear()
+
+
+class Download(Transfer):
+    """
+    The destination file and progress of a download.  Tracks the offset that has been
+    written so far along with the validator of the resource, so that an interrupted
+    download can be resumed from where it left off with a ``Range`` request, and
+    verifies the length and checksum of the file once the download is complete.
+
+    Args:
+        dest: The path of the file to write.
+        checksum:
+            The expected checksum of the file as ``algorithm:hexdigest`` (for example
+            ``sha256:9f86d0...``).  Any algorithm supported by hashlib may be used.
+        chunk_size: The number of bytes to buffer before writing them to the file.
+    """
+
+    total: int | None = None
+    """ The total size of the resource (if known). """
+
+    def __init__(
+        self,
+        dest: str | os.PathLike[str],
+        checksum: str | None = None,
+        chunk_size: int = CHUNK_SIZE,
+    ):
+        super().__init__(chunk_size)
+        self.path = Path(dest)
+        self.url = str(self.path)
+        self.segments: list[Segment] = []
+        self.cancelled = False
+        self._expected: str | None = None
+        self._hash: Any = None
+        if checksum is not None:
+            algorithm, _, digest = checksum.partition(":")
+            if not digest:
+                raise ValueError("Checksums must be formatted as algorithm:hexdigest.")
+            self._algorithm = algorithm.lower()
+            self._expected = digest.lower()
+            self._hash = hashlib.new(self._algorithm)
+        self._end: int | None = None
+        self._validator: str | None = None
+
+    def __enter__(self) -> Self:
+        self._file = self.path.open("wb+")
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback) -> None:
+        self.cancelled = exc_type is not None
+        for segment in self.segments:
+            segment.close()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if exc_type is not None:
+            self.path.unlink(missing_ok=True)
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """
+        The headers to send for the next attempt.  Once data has been written, the
+        remainder of the resource is requested with ``Range``, made conditional on the
+        resource not having changed with ``If-Range``.
+        """
+        headers = {"Accept-Encoding": "identity"}
+        if self.offset:
+            headers["Range"] = f"bytes={self.offset}-"
+            if self._validator is not None:
+                headers["If-Range"] = self._validator
+        return headers
+
+    @property
+    def probe_headers(self) -> dict[str, str]:
+        """
+        The headers of the request probing whether the server supports ranges.  Only
+        the first byte of the resource is requested.
+        """
+        return {"Accept-Encoding": "identity", "Range": "bytes=0-0"}
+
+    @property
+    def complete(self) -> bool:
+        """
+        Has the entire resource been received?
+        """
+        target = self.total if self.total is not None else self._end
+        return target is None or self.offset >= target
+
+    def begin(self, response: Response) -> None:
+        """
+        Prepares the file for the response body.  Partial responses continue at the
+        current offset, while full responses restart the download from the beginning
+        (as the resource changed or the server doesn't support ranges).
+
+        Args:
+            response: The streamed response.
+        """
+        self.url = str(response.request.url)
+        length = response.headers.get("Content-Length")
+        if response.status_code == codes.PARTIAL_CONTENT:
+            match = _content_range(response, self.url, self.offset)
+            self._end = int(match["end"]) + 1
+            if match["total"] != "*":
+                self.total = int(match["total"])
+        else:
+            self.restart()
+            self.total = int(length) if length is not None else None
+            self._end = self.total
+            self._validator = _validator(response)
+            if self.total:
+                self._preallocate(self.total)
+        if (
+            length is not None
+            and self._end is not None
+            and self.offset + int(length) != self._end
+        ):
+            raise DownloadError(
+                self.url, "Content-Length does not match the content range"
+            )
+
+    def split(self, response: Response, count: int) -> list[Segment]:
+        """
+        Splits the resource into segments using the response of the probing request.
+        If the server doesn't support ranges, or doesn't report the size of the
+        resource, then no segments are returned and the resource must be downloaded as
+        a single stream instead.
+
+        Args:
+            response: The response of the probing request.
+            count: The maximum number of segments.
+
+        Returns:
+            The segments of the resource.
+        """
+        self.url = str(response.request.url)
+        match = CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+        if (
+            response.status_code != codes.PARTIAL_CONTENT
+            or not match
+            or match["total"] == "*"
+        ):
+            return []
+        self.total = int(match["total"])
+        self._validator = _validator(response)
+        self._preallocate(self.total)
+        count = max(1, min(count, math.ceil(self.total / MIN_SEGMENT_SIZE)))
+        size = math.ceil(self.total / count)
+        self.segments = [
+            Segment(self, start, min(start + size, self.total) - 1)
+            for start in range(0, self.total, size)
+        ]
+        return self.segments
+
+    def restart(self) -> None:
+        """
+        Discards everything written so far.
+        """
+        assert self._file is not None
+        self.offset = 0
+        self._buffer.clear()
+        self._file.seek(0)
+        self._file.truncate()
+        if self._hash is not None:
+            self._hash = hashlib.new(self._algorithm)
+
+    def flush(self) -> None:
+        # The chunks are received in order, so the checksum is updated with each
+        # flushed buffer rather than with each chunk.
+        if self._hash is not None:
+            self._hash.update(self._buffer)
+        super().flush()
+
+    def finish(self) -> Path:
+        """
+        Verifies the length and the checksum of the downloaded file.
+
+        Returns:
+            The path of the downloaded file.
+        """
+        assert self._file is not None
+        if self.segments:
+            # Segments are received out of order, so the checksum can only be computed
+            # once the file is complete.
+            self.offset = sum(s.offset - s.start for s in self.segments)
+            if self._hash is not None:
+                self._file.seek(0)
+                self._hash = hashlib.file_digest(self._file, self._algorithm)
+        if self.total is not None and self.offset != self.total:
+            raise DownloadError(
+                self.url, f"received {self.offset} of {self.total} bytes"
+            )
+        self._file.truncate(self.offset)
+        self._file.flush()
+        if self._hash is not None and self._hash.hexdigest() != self._expected:
+            raise DownloadError(self.url, f"{self._algorithm} checksum mismatch")
+        return self.path
+
+    def _preallocate(self, size: int) -> None:
+        """
+        Reserves the space for the file, falling back to extending the file where the
+        filesystem doesn't support allocation.
+        """
+        assert self._file is not None
+        self._file.flush()
+        try:
+            os.posix_fallocate(self._file.fileno(), 0, size)
+        except (AttributeError, OSError):  # pragma: no cover
+            self._file.truncate(size)
+
+
+class Segment(Transfer):
+    """
+    A byte range of a segmented download.  Each segment is fetched with its own range
+    request and written through its own file handle at its offset within the file, so
+    that segments can be fetched concurrently and resumed independently.
+
+    Args:
+        download: The download the segment is part of.
+        start: The offset of the first byte of the segment.
+        end: The offset of the last byte of the segment.
+    """
+
+    def __init__(self, download: Download, start: int, end: int) -> None:
+        super().__init__(download.chunk_size)
+        self.download = download
+        self.start = start
+        self.end = end
+        self.offset = start
+        self._file = download.path.open("r+b")
+
+    @property
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "Accept-Encoding": "identity",
+            "Range": f"bytes={self.offset}-{self.end}",
+        }
+        if self.download._validator is not None:
+            headers["If-Range"] = self.download._validator
+        return headers
+
+    @property
+    def complete(self) -> bool:
+        return self.offset > self.end
+
+    def begin(self, response: Response) -> None:
+        if response.status_code != codes.PARTIAL_CONTENT:
+            raise DownloadError(
+                self.download.url, "resource changed during the segmented download"
+            )
+        match = _content_range(response, self.download.url, self.offset)
+        if int(match["end"]) > self.end:
+            raise DownloadError(
+                self.download.url,
+                "partial response does not match the requested range",
+            )
+        length = response.headers.get("Content-Length")
+        if length is not None and int(length) != int(match["end"]) - self.offset + 1:
+            raise DownloadError(
+                self.download.url, "Content-Length does not match the content range"
+            )
+
+    def buffer(self, chunk: bytes) -> bool:
+        # Stop fetching as soon as any other segment has failed.
+        if self.download.cancelled:
+            raise DownloadError(self.download.url, "download cancelled")
+        return super().buffer(chunk)
+
+    def close(self) -> None:
+        """
+        Closes the file handle of the segment.
+        """
+        assert self._file is not None
+        self._file.close()
+
+
+def _content_range(response: Response, url: str, offset: int) -> re.Match[str]:
+    """
+    Returns the Content-Range of the partial response, ensuring that it starts at the
+    requested offset.
+    """
+    match = CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+    if not match or int(match["start"]) != offset:
+        raise DownloadError(url, "partial response does not match the requested range")
+    return match
+
+
+def _validator(response: Response) -> str | None:
+    """
+    Returns the validator to use within If-Range.  Only strong entity tags may be used,
+    otherwise the Last-Modified date is used.
+    """
+    etag = response.headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return response.headers.get("Last-Modified")
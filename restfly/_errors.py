@@ -3,11 +3,17 @@ Error handling classes and data-classes.
 """
 
 import logging
-from collections import defaultdict
+from collections.abc import Iterator, Mapping
 from dataclasses import dataclass, replace
+from functools import cached_property, lru_cache
+from types import MappingProxyType
+from typing import Any
 
-from httpx import Response
-from pydantic import BaseModel
+from httpx import Response, ResponseNotRead
+from pydantic import BaseModel, TypeAdapter
+from pydantic_xml import BaseXmlModel
+
+logger = logging.getLogger(__name__)
 
 
 class RetryError(Exception):
@@ -20,6 +26,55 @@ class RetryError(Exception):
         super().__init__(f"Too many attempts ({attempts}) to {method} {url}")
 
 
+class DeadlineExceeded(TimeoutError):
+    """
+    DeadlineExceeded is thrown when the deadline set with :func:`restfly.deadline` has
+    passed (or would pass while backing off) before the work could be completed.
+    """
+
+    def __init__(self, method: str | None = None, url: str | None = None):
+        self.method = method
+        self.url = url
+        target = f" for {method} {url}" if method and url else ""
+        super().__init__(f"Deadline exceeded{target}")
+
+
+class ReplayError(RuntimeError):
+    """
+    ReplayError is thrown when a streamed request body has to be sent again (such as
+    when the request is retried), but was too large to be buffered for replaying.
+    """
+
+    def __init__(self, max_size: int):
+        limit = f"larger than {max_size} bytes" if max_size else "not buffered"
+        super().__init__(
+            f"The streamed request body can't be sent again, as it was {limit}"
+        )
+
+
+class DownloadError(Exception):
+    """
+    DownloadError is thrown when a downloaded file fails verification, either as the
+    number of bytes received doesn't match the length reported by the server or as the
+    checksum of the file doesn't match the expected checksum.
+    """
+
+    def __init__(self, url: str, message: str):
+        self.url = url
+        super().__init__(f"Download of {url} failed: {message}")
+
+
+class CassetteError(Exception):
+    """
+    CassetteError is thrown when a replaying cassette transport receives a request
+    that doesn't match any of the recorded interactions.
+    """
+
+    def __init__(self, method: str, url: str):
+        self.url = url
+        super().__init__(f"No recorded interaction for {method} {url}")
+
+
 class APIError(Exception):
     """
     The Base API Error class to be thrown in the event that a non-OK status code is
@@ -32,25 +87,89 @@ class APIError(Exception):
     response: Response
     """ HTTPX Response object of the exception """
 
-    obj: BaseModel | None
-    """ Coerced data obj of the response (if any) """
+    template: str
+    """ The message template that will be formatted with the response and request """
+
+    model: type[BaseModel] | None
+    """ Pydantic model (if any) to coerce the response body into """
+
+    log_level: int | None
+    """ The logging level the error is logged at when raised by the client """
 
     def __init__(
         self,
         response: Response,
         template: str,
         obj: BaseModel | None = None,
+        model: type[BaseModel] | None = None,
+        log_level: int | None = logging.WARNING,
     ):
         self.status_code = response.status_code
-        self.obj = obj
         self.response = response
-        msg = template.format(response=response, request=response.request)
-        logger = logging.getLogger(__name__)
-        logger.warning(msg)
-        super().__init__(msg)
+        self.template = template
+        self.model = model
+        self.log_level = log_level
+        if obj is not None:
+            self.obj = obj
+        super().__init__(template)
+
+    def __str__(self) -> str:
+        return self.message
 
+    @property
+    def args(self) -> tuple[str]:  # type: ignore[override]  # ty: ignore[invalid-property-type-override]
+        """
+        The exception arguments, holding the formatted message rather than the raw
+        template.
+        """
+        return (self.message,)
+
+    @cached_property
+    def message(self) -> str:
+        """
+        The formatted error message.  The template is only formatted on first access
+        (when the error is logged or converted into a string), so errors that are
+        caught and handled never pay for formatting it.
+        """
+        return self.template.format(
+            response=self.response, request=self.response.request
+        )
+
+    def log(self) -> None:
+        """
+        Logs the error message at the log level of the error (if any).
+        """
+        if self.log_level is not None and logger.isEnabledFor(self.log_level):
+            logger.log(self.log_level, "%s", self.message)
+
+    @cached_property
+    def obj(self) -> BaseModel | None:
+        """
+        Coerced data obj of the response (if any).  The response body is only
+        validated against the model the first time this attribute is accessed, so
+        error handling that never inspects the body never pays for parsing it.  If
+        the body cannot be read or coerced into the model, then None is returned.
+        """
+        if self.model is None:
+            return None
+        try:
+            content = self.response.content
+            if isinstance(self.model, type) and issubclass(self.model, BaseXmlModel):
+                return self.model.from_xml(content)
+            return _error_validator(self.model).validate_json(content)
+        except (ResponseNotRead, ValueError, SyntaxError):
+            return None
+
+
+@lru_cache(maxsize=256)
+def _error_validator(model: type[BaseModel]) -> TypeAdapter[Any]:
+    """
+    Returns the cached validator for the error model.
+    """
+    return TypeAdapter(model)
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class ErrorStatus:
     """
     Defines the attributes associated to each non-OK status code.
@@ -75,6 +194,9 @@ class ErrorStatus:
             value and append it to the wait before retying. Normally we will want this
             set to something in order to ensure that we stagger retries to the API to
             prevent overwhelming it.
+        log_level:
+            The logging level to log the error at when the exception is constructed.
+            If set to None, then the exception will not be logged at all.
     """
 
     retry: bool = False
@@ -85,34 +207,131 @@ class ErrorStatus:
     exception: type[APIError] = APIError
     backoff: float = 1.0
     jitter: float = 0.5
+    log_level: int | None = logging.WARNING
+
+    def error(self, response: Response) -> APIError:
+        """
+        Constructs (and logs) the exception for the response.  The exception class is
+        only passed the response and template, so that subclasses of APIError with
+        the original constructor signature keep working, and the model and log level
+        are assigned afterwards.
+
+        Args:
+            response: The response object.
+        """
+        err = self.exception(response=response, template=self.template)
+        err.model = self.model
+        err.log_level = self.log_level
+        err.log()
+        return err
+
+
+class ErrorMap(Mapping[int, ErrorStatus]):
+    """
+    Immutable mapping of status codes to the ErrorStatus objects detailing how to
+    handle them.  Codes that are not explicitly mapped resolve to the fallback for
+    their status class (4xx, 5xx, etc.) and then to the default status, without
+    ever modifying the map itself.  As nothing is mutated after construction, a
+    single map may safely be shared between clients and threads.
+
+    As every status code resolves to an ErrorStatus, indexing, membership checks, and
+    ``get()`` agree for every code, while iterating over the map (and its length) only
+    covers the explicitly mapped codes.
+
+    Parameters:
+        statuses:
+            The explicit status code to ErrorStatus mapping.
+        fallbacks:
+            ErrorStatus objects keyed by the status class (e.g. ``4`` for 4xx) to
+            use for codes not present within the statuses.
+        default:
+            The ErrorStatus to use if neither a status nor a fallback exists.
+    """
+
+    __slots__ = ("_default", "_fallbacks", "_statuses")
+
+    def __init__(
+        self,
+        statuses: Mapping[int, ErrorStatus],
+        fallbacks: Mapping[int, ErrorStatus] | None = None,
+        default: ErrorStatus | None = None,
+    ) -> None:
+        self._statuses = MappingProxyType(dict(statuses))
+        self._fallbacks = MappingProxyType(dict(fallbacks or {}))
+        self._default = ErrorStatus() if default is None else default
+
+    def __getitem__(self, code: int) -> ErrorStatus:
+        try:
+            return self._statuses[code]
+        except KeyError:
+            if not isinstance(code, int):
+                raise
+            return self._fallbacks.get(code // 100, self._default)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._statuses)
+
+    def __len__(self) -> int:
+        return len(self._statuses)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self._statuses)!r})"
+
+    @property
+    def default(self) -> ErrorStatus:
+        """
+        The ErrorStatus returned for codes without a status or fallback.
+        """
+        return self._default
+
+    @property
+    def fallbacks(self) -> Mapping[int, ErrorStatus]:
+        """
+        The ErrorStatus objects used for each status class.
+        """
+        return self._fallbacks
 
 
 def build_error_map(
-    base_map: dict[int, ErrorStatus] | None = None,
-    overloads: dict[int, ErrorStatus] | None = None,
+    base_map: Mapping[int, ErrorStatus] | None = None,
+    overloads: Mapping[int, ErrorStatus] | None = None,
     error_class: type[APIError] | None = None,
-) -> defaultdict[int, ErrorStatus]:
+) -> ErrorMap:
     """
-    Error map builder.
+    Error map builder.  Merges the overloads on top of the base map and assigns the
+    error class to every status.  The resulting map is cached, so every client
+    sharing the same combination of inputs will share the same ErrorMap object.
     """
-    if base_map is None:
-        base_map = ERROR_MAP
-    if overloads is None:
-        overloads = {}
-    if error_class is None:
-        error_class = APIError
+    base_map = ERROR_MAP if base_map is None else base_map
+    overloads = {} if overloads is None else overloads
+    error_class = APIError if error_class is None else error_class
+    return _compile_error_map(
+        tuple(sorted(base_map.items())),
+        tuple(sorted(overloads.items())),
+        error_class,  # type: ignore[arg-type]
+    )
 
-    def error_status() -> ErrorStatus:
-        return ErrorStatus(exception=error_class if error_class else APIError)
 
-    error_map = defaultdict(
-        error_status,
-        {k: replace(v, exception=error_class) for k, v in base_map.items()},
-    )
-    error_map.update(
-        {k: replace(v, exception=error_class) for k, v in overloads.items()}
+@lru_cache(maxsize=128)
+def _compile_error_map(
+    base_items: tuple[tuple[int, ErrorStatus], ...],
+    overload_items: tuple[tuple[int, ErrorStatus], ...],
+    error_class: type[APIError],
+) -> ErrorMap:
+    """
+    Constructs the ErrorMap for the hashable representation of the base map and
+    overloads.  Split out from build_error_map so that the construction is only
+    ever performed once for each combination.
+    """
+    statuses = {k: replace(v, exception=error_class) for k, v in base_items}
+    statuses.update({k: replace(v, exception=error_class) for k, v in overload_items})
+    return ErrorMap(
+        statuses=statuses,
+        fallbacks={
+            k: replace(v, exception=error_class) for k, v in ERROR_FALLBACKS.items()
+        },
+        default=ErrorStatus(exception=error_class),
     )
-    return error_map
 
 
 ERROR_MAP = {
@@ -211,3 +430,19 @@ ERROR_MAP = {
         template=r"[511] Network Authentication Required {request.method} {request.url}"
     ),
 }
+
+
+ERROR_FALLBACKS = {
+    5: ErrorStatus(
+        template=(
+            r"[{response.status_code}] Server Error {request.method} {request.url}"
+        ),
+    ),
+}
+"""
+The fallback ErrorStatus for each status class, used for any code of the class that
+isn't explicitly defined within the error map.  Unknown server errors (such as those
+returned by proxies and CDNs) are reported as server errors and, as with the explicit
+5xx codes other than 502-504, aren't retried.  Any other unknown code resolves to the
+default status.
+"""
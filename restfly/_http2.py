@@ -0,0 +1,94 @@
+"""
+HTTP/2 connection profile.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from importlib.util import find_spec
+
+from .types import Limits
+
+
+def h2_available() -> bool:
+    """
+    Is the ``h2`` package needed by HTTPX for HTTP/2 support installed?
+    """
+    return find_spec("h2") is not None
+
+
+@dataclass(frozen=True, slots=True)
+class HTTP2Profile:
+    """
+    Connection settings for multiplexing many concurrent requests over a few HTTP/2
+    connections.  HTTP/1.1 needs a connection for every request in flight, so fanning
+    out hundreds of requests from an async client opens hundreds of sockets (and TLS
+    handshakes), while HTTP/2 carries up to the server's ``SETTINGS_MAX_CONCURRENT_
+    STREAMS`` requests over each connection.  The profile enables HTTP/2 and keeps the
+    connections alive for longer as each is far more valuable.
+
+    The connection pool is sized for the worst case, the HTTP/1.1 fallback, as the
+    protocol is only known once the server has negotiated it.  This doesn't open more
+    connections over HTTP/2, where HTTPX multiplexes the requests over the open
+    connections (and queues those beyond the stream limit) before opening new ones, but
+    means that a server negotiating HTTP/1.1 still gets a connection per request in
+    flight rather than a pool sized for multiplexing.
+
+    Pass the profile as the ``http2`` argument of the client (or assign it to the
+    ``_http2`` attribute of a client subclass).  If the ``h2`` package isn't installed
+    the client falls back to HTTP/1.1, and if the server doesn't negotiate HTTP/2 a
+    warning is logged once.  In either case the client's ``_http2_fallback``
+    attribute is set.  Explicitly passed ``limits`` always take precedence over those
+    of the profile.
+
+    HTTP/2 is negotiated with ALPN during the TLS handshake, so it's only used with
+    ``https`` URLs unless ``http1=False`` is passed (HTTP/2 with prior knowledge).
+
+    Parameters:
+        concurrency:
+            The number of requests expected to be in flight at once.
+        max_streams:
+            The number of concurrent streams the server allows on each connection.
+            Most servers allow 100 or 128.
+        keepalive_expiry:
+            The number of seconds an idle connection is kept open.
+        http1_max_connections:
+            The maximum size of the connection pool when falling back to HTTP/1.1.
+
+    Example:
+        >>> client = AsyncAPIClient(http2=HTTP2Profile(concurrency=500))
+    """
+
+    concurrency: int = 200
+    max_streams: int = 100
+    keepalive_expiry: float = 60.0
+    http1_max_connections: int = 100
+
+    def __post_init__(self) -> None:
+        if min(self.concurrency, self.max_streams, self.http1_max_connections) < 1:
+            raise ValueError("The concurrency, streams, and connections must be >= 1.")
+
+    @property
+    def connections(self) -> int:
+        """
+        The number of HTTP/2 connections needed for the expected concurrency.
+        """
+        return math.ceil(self.concurrency / self.max_streams)
+
+    def limits(self, http2: bool = True) -> Limits:
+        """
+        Returns the connection pool limits of the profile.  The HTTP/2 limits allow for
+        the HTTP/1.1 fallback as well.
+
+        Args:
+            http2: Are the limits for HTTP/2 (or for the HTTP/1.1 fallback)?
+        """
+        connections = min(self.concurrency, self.http1_max_connections)
+        if http2:
+            connections = max(connections, self.connections)
+        return Limits(
+            max_connections=connections,
+            max_keepalive_connections=connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
@@ -4,7 +4,9 @@ import logging
 from typing import Any, Self
 
 from ._async import AsyncAPIClient
+from ._deadline import check_deadline
 from ._sync import APIClient
+from ._tracing import traced
 
 
 class APIIterator:
@@ -91,8 +93,21 @@ class APIIterator:
             if self.max_pages and self.num_pages + 1 > self.max_pages:
                 raise StopIteration()
 
-            # Perform the _get_page call.
-            self._get_page()
+            # Perform the _get_page call, unless the deadline (if any) has already
+            # passed.  If the client has a tracer assigned, then the page fetch (and
+            # any requests made within it) is wrapped in a span.
+            check_deadline()
+            with traced(
+                getattr(self._client, "_tracer", None),
+                "restfly.page",
+                {
+                    "restfly.iterator": type(self).__name__,
+                    "restfly.page": self.num_pages + 1,
+                },
+            ) as span:
+                self._get_page()
+                if span is not None:
+                    span.set_attribute("restfly.page.items", len(self.page))
             self.page_count = 0
             self.num_pages += 1
 
@@ -239,8 +254,21 @@ class AsyncAPIIterator:
             if self.max_pages and self.num_pages + 1 > self.max_pages:
                 raise StopAsyncIteration()
 
-            # Perform the _get_page call.
-            await self._get_page()
+            # Perform the _get_page call, unless the deadline (if any) has already
+            # passed.  If the client has a tracer assigned, then the page fetch (and
+            # any requests made within it) is wrapped in a span.
+            check_deadline()
+            with traced(
+                getattr(self._client, "_tracer", None),
+                "restfly.page",
+                {
+                    "restfly.iterator": type(self).__name__,
+                    "restfly.page": self.num_pages + 1,
+                },
+            ) as span:
+                await self._get_page()
+                if span is not None:
+                    span.set_attribute("restfly.page.items", len(self.page))
             self.page_count = 0
             self.num_pages += 1
 
@@ -0,0 +1,381 @@
+"""
+Load generation.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gc
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Self
+
+from ._metrics import MetricsHook, RequestMetrics, _percentile
+
+if TYPE_CHECKING:
+    from ._base import APIClientBase
+
+QUANTILES = (50, 90, 95, 99)
+""" The latency percentiles included within the load test report. """
+
+
+@dataclass(slots=True)
+class LoadReport:
+    """
+    The results of a load test.
+
+    Parameters:
+        operations:
+            The number of operations (calls of the operation function) that were run.
+        errors:
+            The number of operations that raised an exception.
+        requests:
+            The number of logical requests made through the client.
+        retries:
+            The number of retries performed by those requests.
+        elapsed:
+            The number of seconds the load test ran for.
+        latencies:
+            The number of seconds each operation took.  When running at a target rate,
+            the latency is measured from when the operation was scheduled to start, so
+            that operations delayed by slow ones are accounted for.
+        pool_wait:
+            The number of seconds each request spent waiting for a connection from the
+            connection pool.  Only transports emitting HTTPCore trace events (the
+            default HTTPX transports) report the pool wait.
+        error_types:
+            The number of operations that failed with each exception class.
+        memory_growth:
+            The number of bytes of memory allocated during the test that were still
+            held once it finished (if memory was traced).
+        memory_peak:
+            The peak number of bytes allocated during the test (if memory was traced).
+    """
+
+    operations: int = 0
+    errors: int = 0
+    requests: int = 0
+    retries: int = 0
+    elapsed: float = 0.0
+    latencies: list[float] = field(default_factory=list, repr=False)
+    pool_wait: list[float] = field(default_factory=list, repr=False)
+    error_types: Counter[str] = field(default_factory=Counter)
+    memory_growth: int | None = None
+    memory_peak: int | None = None
+
+    @property
+    def throughput(self) -> float:
+        """
+        The number of operations completed per second.
+        """
+        return self.operations / self.elapsed if self.elapsed else 0.0
+
+    def percentiles(
+        self, samples: str = "latencies", quantiles: tuple[float, ...] = QUANTILES
+    ) -> dict[str, float]:
+        """
+        Returns the percentiles of the operation latencies or the pool wait times.
+
+        Args:
+            samples: Either ``latencies`` or ``pool_wait``.
+            quantiles: The percentiles to compute.
+
+        Returns:
+            Dictionary of the percentile names (e.g. ``p95``) and the seconds.
+        """
+        ordered = sorted(getattr(self, samples))
+        return {f"p{q:g}": _percentile(ordered, q) for q in quantiles}
+
+    def report(self) -> str:
+        """
+        Returns the load test summary table.
+        """
+        lines = [
+            (
+                f"RESTFly load test: {self.operations} operations in "
+                f"{self.elapsed:.2f}s ({self.throughput:,.1f} ops/s), "
+                f"{self.requests} requests, {self.retries} retries, "
+                f"{self.errors} errors"
+            ),
+            "",
+            f"{'Percentile':<12} {'Latency (ms)':>14} {'Pool wait (ms)':>16}",
+        ]
+        latency = self.percentiles()
+        wait = self.percentiles("pool_wait")
+        for name in latency:
+            lines.append(
+                f"{name:<12} {latency[name] * 1000:>14.3f} {wait[name] * 1000:>16.3f}"
+            )
+        if self.error_types:
+            lines += ["", "Errors:"]
+            lines += [f"  {name}: {count}" for name, count in self.error_types.items()]
+        if self.memory_growth is not None and self.memory_peak is not None:
+            lines += [
+                "",
+                (
+                    f"Memory growth: {self.memory_growth / 1024:,.1f} KiB "
+                    f"(peak {self.memory_peak / 1024:,.1f} KiB)"
+                ),
+            ]
+        return "\n".join(lines)
+
+
+class LoadRecorder:
+    """
+    Metrics hook collecting the request counts, retries, and pool wait times of the
+    requests made during a load test, along with the latency of each operation.
+
+    Args:
+        forward:
+            A metrics hook to forward every metrics event to once recorded.
+    """
+
+    def __init__(self, forward: MetricsHook | None = None) -> None:
+        self.forward = forward
+        self.result = LoadReport()
+        self._lock = Lock()
+
+    def record(self, metrics: RequestMetrics) -> None:
+        with self._lock:
+            self.result.requests += 1
+            self.result.retries += metrics.retries
+            self.result.pool_wait.append(metrics.phases.get("queue", 0.0))
+        if self.forward is not None:
+            self.forward.record(metrics)
+
+    def operation(self, latency: float, error: BaseException | None) -> None:
+        """
+        Records the outcome of an operation.
+
+        Args:
+            latency: The number of seconds the operation took.
+            error: The exception raised by the operation (if any).
+        """
+        with self._lock:
+            self.result.operations += 1
+            self.result.latencies.append(latency)
+            if error is not None:
+                self.result.errors += 1
+                self.result.error_types[error.__class__.__name__] += 1
+
+
+class Schedule:
+    """
+    Hands out the start times of the operations of a load test until either the
+    number of operations or the duration has been reached.  With a target rate, the
+    operations are spaced evenly regardless of how long each takes (an open-loop
+    test), otherwise each worker starts its next operation immediately.
+    """
+
+    def __init__(
+        self, rate: float | None, operations: int | None, duration: float | None
+    ) -> None:
+        if operations is None and duration is None:
+            raise ValueError("Either the number of operations or duration is required.")
+        if rate is not None and rate <= 0:
+            raise ValueError("The target rate must be positive.")
+        self.rate = rate
+        self.operations = operations
+        self.duration = duration
+        self.start = 0.0
+        self.end: float | None = None
+        self._issued = 0
+        self._lock = Lock()
+
+    def begin(self) -> None:
+        """
+        Starts the clock of the load test.
+        """
+        self.start = time.perf_counter()
+        if self.duration is not None:
+            self.end = self.start + self.duration
+
+    def next(self) -> float | None:
+        """
+        Returns the time the next operation should start at, or None once the test is
+        complete.
+        """
+        with self._lock:
+            if self.operations is not None and self._issued >= self.operations:
+                return None
+            now = time.perf_counter()
+            start = now if self.rate is None else self.start + self._issued / self.rate
+            if self.end is not None and start >= self.end:
+                return None
+            self._issued += 1
+            return start
+
+
+class MemoryTracker:
+    """
+    Measures the memory allocated over a load test with tracemalloc.
+    """
+
+    def __init__(self, enabled: bool) -> None:
+        self.enabled = enabled
+        self.growth = 0
+        self.peak = 0
+        self._started = False
+        self._baseline = 0
+
+    def __enter__(self) -> Self:
+        if self.enabled:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started = True
+            gc.collect()
+            self._baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        if not self.enabled:
+            return
+        self.peak = tracemalloc.get_traced_memory()[1] - self._baseline
+        gc.collect()
+        self.growth = tracemalloc.get_traced_memory()[0] - self._baseline
+        if self._started:
+            tracemalloc.stop()
+
+
+def load_test(
+    client: APIClientBase,
+    operation: Callable[[], Any],
+    *,
+    concurrency: int = 10,
+    rate: float | None = None,
+    operations: int | None = None,
+    duration: float | None = None,
+    trace_memory: bool = True,
+) -> LoadReport:
+    """
+    Runs an operation (typically a call of an endpoint method) repeatedly through a
+    pool of worker threads and reports the throughput, latency percentiles, retries,
+    connection pool wait, and memory growth.  Use a mock or cassette transport on the
+    client to test against a local server.
+
+    Args:
+        client:
+            The client that the operation makes its requests through.
+        operation:
+            The function to run, called without any arguments.
+        concurrency:
+            The number of operations to run at once.
+        rate:
+            The target number of operations to start per second.  If None, then each
+            worker starts the next operation as soon as the last one finished.
+        operations:
+            The number of operations to run.
+        duration:
+            The number of seconds to run the test for.
+        trace_memory:
+            Should the memory growth be measured?  Tracing allocations slows the
+            client down, so disable it when measuring the maximum throughput.
+
+    Returns:
+        The load test report.
+
+    Example:
+        >>> report = load_test(client, client.items.list, rate=500, duration=30)
+        >>> print(report.report())
+    """
+    schedule = Schedule(rate, operations, duration)
+    recorder = LoadRecorder(forward=client._metrics)
+
+    def worker() -> None:
+        while (start := schedule.next()) is not None:
+            if (delay := start - time.perf_counter()) > 0:
+                time.sleep(delay)
+            error = None
+            try:
+                operation()
+            except Exception as err:  # noqa: BLE001 - failures are counted, not raised
+                error = err
+            recorder.operation(time.perf_counter() - start, error)
+
+    client._metrics = recorder
+    try:
+        with MemoryTracker(trace_memory) as memory:
+            schedule.begin()
+            with ThreadPoolExecutor(concurrency) as pool:
+                for future in [pool.submit(worker) for _ in range(concurrency)]:
+                    future.result()
+            elapsed = time.perf_counter() - schedule.start
+    finally:
+        client._metrics = recorder.forward
+    return _finish(recorder.result, elapsed, memory)
+
+
+async def async_load_test(
+    client: APIClientBase,
+    operation: Callable[[], Awaitable[Any]],
+    *,
+    concurrency: int = 10,
+    rate: float | None = None,
+    operations: int | None = None,
+    duration: float | None = None,
+    trace_memory: bool = True,
+) -> LoadReport:
+    """
+    Async variant of :func:`load_test`, running the operation within ``concurrency``
+    tasks on the event loop.
+
+    Args:
+        client:
+            The async client that the operation makes its requests through.
+        operation:
+            The coroutine function to run, called without any arguments.
+        concurrency:
+            The number of operations to run at once.
+        rate:
+            The target number of operations to start per second.
+        operations:
+            The number of operations to run.
+        duration:
+            The number of seconds to run the test for.
+        trace_memory:
+            Should the memory growth be measured?
+
+    Returns:
+        The load test report.
+
+    Example:
+        >>> report = await async_load_test(client, client.items.get_all, rate=2000,
+        ...                                duration=30, concurrency=200)
+    """
+    schedule = Schedule(rate, operations, duration)
+    recorder = LoadRecorder(forward=client._metrics)
+
+    async def worker() -> None:
+        while (start := schedule.next()) is not None:
+            if (delay := start - time.perf_counter()) > 0:
+                await asyncio.sleep(delay)
+            error = None
+            try:
+                await operation()
+            except Exception as err:  # noqa: BLE001 - failures are counted, not raised
+                error = err
+            recorder.operation(time.perf_counter() - start, error)
+
+    client._metrics = recorder
+    try:
+        with MemoryTracker(trace_memory) as memory:
+            schedule.begin()
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+            elapsed = time.perf_counter() - schedule.start
+    finally:
+        client._metrics = recorder.forward
+    return _finish(recorder.result, elapsed, memory)
+
+
+def _finish(result: LoadReport, elapsed: float, memory: MemoryTracker) -> LoadReport:
+    result.elapsed = elapsed
+    if memory.enabled:
+        result.memory_growth = memory.growth
+        result.memory_peak = memory.peak
+    return result
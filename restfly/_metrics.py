@@ -0,0 +1,443 @@
+"""
+Request metrics instrumentation.
+"""
+
+from __future__ import annotations
+
+import inspect
+import math
+from collections import Counter, deque
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from threading import Lock
+from time import perf_counter, thread_time
+from typing import Any, Protocol
+
+from httpx import Request, Response
+
+from ._tracing import AttributeValue, Span, Tracer
+
+PHASES = ("pre_process", "queue", "connect", "send", "ttfb", "read", "unmarshal")
+"""
+The phases of a request that are timed.
+
+- ``pre_process``: Marshalling the request and building the HTTPX request.
+- ``queue``: Waiting for a connection from the connection pool.
+- ``connect``: Establishing a new connection (TCP and TLS) if one was needed.
+- ``send``: Sending the request headers and body.
+- ``ttfb``: Waiting for the response headers (time to first byte).
+- ``read``: Reading the response body.
+- ``unmarshal``: Coercing the response body into the response model.
+
+The network phases are derived from the HTTPCore trace events.  Transports that
+don't emit trace events (such as a mock transport) have the entire exchange recorded
+within the ``send`` phase.
+"""
+
+CPU_PHASES = ("pre_process", "network", "unmarshal")
+"""
+The phases of a request that the CPU time is recorded for.  The ``network`` phase
+covers the queue, connect, send, ttfb, and read phases, as the time is measured per
+attempt.
+"""
+
+
+@dataclass(slots=True)
+class RequestMetrics:
+    """
+    The metrics event emitted for each logical request (including any retries).
+
+    Parameters:
+        method:
+            The HTTP method of the request.
+        path:
+            The path that was requested.
+        endpoint:
+            The path of the endpoint that made the request (if any).
+        status_code:
+            The status code of the last response received (if any).
+        attempts:
+            The number of attempts made to complete the request.
+        backoff:
+            The number of seconds spent sleeping between retries.
+        duration:
+            The total number of seconds the request took.
+        phases:
+            The number of seconds spent within each phase of the request, summed
+            across all attempts.
+        error:
+            The class name of the exception raised (if any).
+        model:
+            The name of the response model (if any).
+        cpu:
+            The number of seconds of CPU time spent within each of the CPU phases.
+        cpu_time:
+            The total number of seconds of CPU time the request took.
+        bytes_decoded:
+            The number of response bytes that were unmarshalled into the model.
+        models:
+            The number of model objects returned from unmarshalling.
+    """
+
+    method: str
+    path: str
+    endpoint: str | None = None
+    status_code: int | None = None
+    attempts: int = 0
+    backoff: float = 0.0
+    duration: float = 0.0
+    phases: dict[str, float] = field(default_factory=dict)
+    error: str | None = None
+    model: str | None = None
+    cpu: dict[str, float] = field(default_factory=dict)
+    cpu_time: float = 0.0
+    bytes_decoded: int = 0
+    models: int = 0
+
+    @property
+    def retries(self) -> int:
+        """
+        The number of retries that were performed.
+        """
+        return max(self.attempts - 1, 0)
+
+    @property
+    def label(self) -> str:
+        """
+        The label used for aggregating the metrics (the endpoint or the path).
+        """
+        return self.endpoint if self.endpoint is not None else self.path
+
+
+class MetricsHook(Protocol):
+    """
+    Interface for receiving the metrics of every request made through a client.
+    """
+
+    def record(self, metrics: RequestMetrics) -> None:
+        """
+        Called once each request has completed (either successfully or not).
+
+        Args:
+            metrics: The metrics event of the request.
+        """
+
+
+class RequestTracker:
+    """
+    Collects the metrics for a single request as it progresses through the request
+    pipeline and emits the metrics event to the hook once finished.  If a tracer is
+    assigned, then a span is created for the request along with a child span for each
+    attempt and each backoff between attempts.  A tracker is only created when the
+    client has a metrics hook or a tracer assigned.
+    """
+
+    __slots__ = (
+        "_child",
+        "_cpu_mark",
+        "_cpu_start",
+        "_events",
+        "_hook",
+        "_mark",
+        "_span",
+        "_start",
+        "_trace",
+        "_tracer",
+        "metrics",
+    )
+
+    def __init__(
+        self,
+        hook: MetricsHook | None,
+        method: str,
+        path: str,
+        endpoint: str | None,
+        tracer: Tracer | None = None,
+        model: Any | None = None,
+    ) -> None:
+        self.metrics = RequestMetrics(
+            method=method,
+            path=path,
+            endpoint=endpoint,
+            model=None if model is None else _model_name(model),
+        )
+        self._hook = hook
+        self._start = self._mark = perf_counter()
+        self._cpu_start = self._cpu_mark = thread_time()
+        self._events: dict[str, float] = {}
+        self._trace: Callable[[str, dict[str, Any]], Any] | None = None
+        self._tracer = tracer
+        self._span: Span | None = None
+        self._child: Span | None = None
+        if tracer is not None:
+            attributes: dict[str, AttributeValue] = {
+                "http.request.method": method,
+                "url.path": path,
+            }
+            if endpoint is not None:
+                attributes["restfly.endpoint"] = endpoint
+            if self.metrics.model is not None:
+                attributes["restfly.model"] = self.metrics.model
+            self._span = tracer.start_span("restfly.request", attributes)
+
+    def lap(self, phase: str) -> None:
+        """
+        Adds the wall and CPU time since the last mark to the phase and resets the
+        marks.
+        """
+        now = perf_counter()
+        self._add(phase, now - self._mark)
+        self._mark = now
+        self._add_cpu(phase)
+
+    def unmarshalled(self, response: Response, obj: Any) -> None:
+        """
+        Records the time spent unmarshalling the response, the number of bytes that
+        were decoded, and the number of models returned.
+        """
+        self.lap("unmarshal")
+        self.metrics.bytes_decoded += len(response.content)
+        self.metrics.models += len(obj) if isinstance(obj, list) else 1
+
+    def attempt(self, request: Request, is_async: bool = False) -> None:
+        """
+        Marks the start of an attempt and attaches the trace extension to the
+        request.  Any trace extension already on the request is still called.
+        """
+        trace = self.atrace if is_async else self.trace
+        current = request.extensions.get("trace")
+        if current is not None and current != trace:
+            self._trace = current
+        request.extensions["trace"] = trace
+        self.metrics.attempts += 1
+        self._events.clear()
+        if self._tracer is not None:
+            self._end_child()
+            attributes: dict[str, AttributeValue] = {
+                "restfly.attempt": self.metrics.attempts
+            }
+            if "Content-Length" in request.headers:
+                attributes["http.request.body.size"] = int(
+                    request.headers["Content-Length"]
+                )
+            self._child = self._tracer.start_span("restfly.attempt", attributes)
+        self._mark = perf_counter()
+        self._cpu_mark = thread_time()
+
+    def trace(self, name: str, info: dict[str, Any]) -> None:
+        """
+        HTTPCore trace extension callback recording when each event occurred.
+        """
+        self._events.setdefault(name.split(".", 1)[-1], perf_counter())
+        if self._trace is not None:
+            self._trace(name, info)
+
+    async def atrace(self, name: str, info: dict[str, Any]) -> None:
+        """
+        Async HTTPCore trace extension callback.
+        """
+        self._events.setdefault(name.split(".", 1)[-1], perf_counter())
+        if self._trace is not None:
+            result = self._trace(name, info)
+            if inspect.isawaitable(result):
+                await result
+
+    def sent(self, response: Response) -> None:
+        """
+        Attributes the time spent sending the request to the network phases based on
+        the trace events that were collected and records the status code.
+        """
+        now = perf_counter()
+        events = self._events
+        self.metrics.status_code = response.status_code
+        if not events:
+            self._add("send", now - self._mark)
+        else:
+            headers_sent = events.get("send_request_headers.started", now)
+            body_sent = events.get("send_request_body.complete", headers_sent)
+            received = events.get("receive_response_headers.complete", body_sent)
+            self._add("queue", min(events.values()) - self._mark)
+            if "connect_tcp.started" in events:
+                connected = events.get(
+                    "start_tls.complete",
+                    events.get("connect_tcp.complete", headers_sent),
+                )
+                self._add("connect", connected - events["connect_tcp.started"])
+            self._add("send", body_sent - headers_sent)
+            self._add("ttfb", received - body_sent)
+            self._add("read", now - received)
+        if self._span is not None:
+            self._span.set_attribute("http.response.status_code", response.status_code)
+        if self._child is not None:
+            self._child.set_attribute("http.response.status_code", response.status_code)
+            self._child.set_attribute(
+                "http.response.body.size", response.num_bytes_downloaded
+            )
+            self._end_child()
+        self._mark = now
+        self._add_cpu("network")
+
+    def backoff(self, seconds: float) -> None:
+        """
+        Records the time spent sleeping before the next attempt.
+        """
+        self.metrics.backoff += seconds
+        if self._tracer is not None:
+            self._end_child()
+            self._child = self._tracer.start_span(
+                "restfly.backoff", {"restfly.backoff": seconds}
+            )
+
+    def fail(self, error: BaseException) -> None:
+        """
+        Records the exception that terminated the request.
+        """
+        self.metrics.error = error.__class__.__name__
+        if self._child is not None:
+            self._child.record_exception(error)
+        if self._span is not None:
+            self._span.record_exception(error)
+
+    def finish(self) -> None:
+        """
+        Finalizes the metrics and emits them to the hook and ends any open spans.
+        """
+        self.metrics.duration = perf_counter() - self._start
+        self.metrics.cpu_time = thread_time() - self._cpu_start
+        if self._span is not None:
+            self._end_child()
+            self._span.set_attribute("restfly.attempts", self.metrics.attempts)
+            self._span.end()
+        if self._hook is not None:
+            self._hook.record(self.metrics)
+
+    def _end_child(self) -> None:
+        if self._child is not None:
+            self._child.end()
+            self._child = None
+
+    def _add(self, phase: str, seconds: float) -> None:
+        phases = self.metrics.phases
+        phases[phase] = phases.get(phase, 0.0) + max(seconds, 0.0)
+
+    def _add_cpu(self, phase: str) -> None:
+        now = thread_time()
+        cpu = self.metrics.cpu
+        cpu[phase] = cpu.get(phase, 0.0) + max(now - self._cpu_mark, 0.0)
+        self._cpu_mark = now
+
+
+class HistogramMetrics:
+    """
+    In-memory metrics aggregator.  Keeps the most recent samples of the total request
+    duration and of every phase for each endpoint, from which percentiles can be
+    scraped.
+
+    Args:
+        size: The maximum number of samples to keep for each endpoint and phase.
+
+    Example:
+        >>> metrics = HistogramMetrics()
+        >>> client = APIClient(metrics=metrics)
+        >>> client._get("/status/200")
+        >>> metrics.percentiles("/status/200")
+        {'p50': 0.0012, 'p95': 0.0012, 'p99': 0.0012}
+    """
+
+    def __init__(self, size: int = 10000) -> None:
+        self._size = size
+        self._lock = Lock()
+        self._samples: dict[str, dict[str, deque[float]]] = {}
+        self._counts: dict[str, Counter[str]] = {}
+        self._statuses: dict[str, Counter[int]] = {}
+
+    def record(self, metrics: RequestMetrics) -> None:
+        label = metrics.label
+        with self._lock:
+            samples = self._samples.setdefault(label, {})
+            for phase, seconds in (
+                ("total", metrics.duration),
+                ("backoff", metrics.backoff),
+                *metrics.phases.items(),
+            ):
+                if phase not in samples:
+                    samples[phase] = deque(maxlen=self._size)
+                samples[phase].append(seconds)
+            counts = self._counts.setdefault(label, Counter())
+            counts["requests"] += 1
+            counts["retries"] += metrics.retries
+            counts["errors"] += metrics.error is not None
+            if metrics.status_code is not None:
+                self._statuses.setdefault(label, Counter())[metrics.status_code] += 1
+
+    @property
+    def endpoints(self) -> list[str]:
+        """
+        The endpoints that have been recorded.
+        """
+        with self._lock:
+            return list(self._samples)
+
+    def percentiles(
+        self,
+        endpoint: str,
+        phase: str = "total",
+        quantiles: tuple[float, ...] = (50, 95, 99),
+    ) -> dict[str, float]:
+        """
+        Returns the percentiles of the samples for the endpoint and phase.
+
+        Args:
+            endpoint: The endpoint label (the endpoint path or the request path).
+            phase: The phase to compute the percentiles for.
+            quantiles: The percentiles to compute.
+
+        Returns:
+            Dictionary of the percentile names (e.g. ``p95``) and the seconds.
+        """
+        with self._lock:
+            samples = sorted(self._samples.get(endpoint, {}).get(phase, ()))
+        return {f"p{q:g}": _percentile(samples, q) for q in quantiles}
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        Returns the aggregated metrics for every endpoint, including the request,
+        retry, and error counts, status code counts, and the p50/p95/p99 of each phase.
+        """
+        result = {}
+        for endpoint in self.endpoints:
+            with self._lock:
+                phases = list(self._samples[endpoint])
+                counts = dict(self._counts[endpoint])
+                statuses = dict(self._statuses.get(endpoint, {}))
+            result[endpoint] = counts | {
+                "status_codes": statuses,
+                "phases": {p: self.percentiles(endpoint, p) for p in phases},
+            }
+        return result
+
+    def reset(self) -> None:
+        """
+        Removes all of the recorded samples.
+        """
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+            self._statuses.clear()
+
+
+def _percentile(samples: list[float], quantile: float) -> float:
+    """
+    Nearest-rank percentile of the sorted samples.
+    """
+    if not samples:
+        return 0.0
+    rank = math.ceil(quantile / 100 * len(samples))
+    return samples[min(max(rank, 1), len(samples)) - 1]
+
+
+def _model_name(model: Any) -> str:
+    """
+    Name of the response model (generic aliases such as ``list[Model]`` are kept).
+    """
+    return model.__name__ if isinstance(model, type) else str(model)
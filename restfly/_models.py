@@ -41,7 +41,7 @@ class APIModel(BaseModel):
             raise TypeError(
                 f"Cannot perform synchronous save using {self.__api_client__}."
             )
-        return self.__api_client__._request(
+        obj = self.__api_client__._request(
             method=self.__api_save_method__,
             path=path,
             json=self,
@@ -49,6 +49,10 @@ class APIModel(BaseModel):
             response_model=self.__class__,
         )
 
+        # APIs answering the save without a body (such as a 204) leave the object
+        # as it was sent.
+        return self if obj is None else obj
+
     def remove(self) -> None:
         """
         Removes (deletes) the object from the API.
@@ -75,7 +79,7 @@ class APIModel(BaseModel):
             raise TypeError(
                 f"Cannot perform synchronous save using {self.__api_client__}."
             )
-        return await self.__api_client__._request(
+        obj = await self.__api_client__._request(
             method=self.__api_save_method__,
             path=path,
             json=self,
@@ -83,6 +87,10 @@ class APIModel(BaseModel):
             response_model=self.__class__,
         )
 
+        # APIs answering the save without a body (such as a 204) leave the object
+        # as it was sent.
+        return self if obj is None else obj
+
     async def async_remove(self) -> None:
         """
         Removes (deletes) the object from the API.
@@ -0,0 +1,144 @@
+"""
+Request profiling.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from threading import Lock
+
+from ._metrics import CPU_PHASES, MetricsHook, RequestMetrics
+
+PROFILE_PHASES = ("pre_process", "network", "unmarshal", "backoff", "overhead")
+"""
+The phases that the profiler attributes the time of each request to.
+
+- ``pre_process``: Marshalling the request and building the HTTPX request.
+- ``network``: The HTTPX exchange (queue, connect, send, ttfb, and read phases).
+- ``unmarshal``: Validating the response into the response model.
+- ``backoff``: Sleeping between retries.
+- ``overhead``: Everything else within the request pipeline (error handling, hooks,
+  and RESTFly's own glue code).
+"""
+
+NETWORK_PHASES = ("queue", "connect", "send", "ttfb", "read")
+
+
+@dataclass(slots=True)
+class ModelProfile:
+    """
+    The cumulative unmarshalling statistics for a single response model.
+
+    Parameters:
+        requests: The number of responses unmarshalled into the model.
+        wall: The number of seconds spent unmarshalling.
+        cpu: The number of seconds of CPU time spent unmarshalling.
+        bytes_decoded: The number of response bytes that were unmarshalled.
+        models: The number of model objects that were returned.
+    """
+
+    requests: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+    bytes_decoded: int = 0
+    models: int = 0
+
+
+class Profiler:
+    """
+    Metrics hook that accumulates the wall and CPU time spent within each phase of
+    every request, along with the unmarshalling statistics of each response model.
+    Typically used through the client's ``_profile`` context manager.
+
+    CPU time is measured for the thread making the request.  For async clients the CPU
+    time of other tasks running concurrently on the event loop may be included.
+
+    Args:
+        forward:
+            A metrics hook to forward every metrics event to once recorded.
+
+    Example:
+        >>> with client._profile() as profiler:
+        ...     client.items.list()
+    """
+
+    def __init__(self, forward: MetricsHook | None = None) -> None:
+        self.forward = forward
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.wall = dict.fromkeys(PROFILE_PHASES, 0.0)
+        self.cpu = dict.fromkeys(PROFILE_PHASES, 0.0)
+        self.models: dict[str, ModelProfile] = {}
+        self._lock = Lock()
+
+    def record(self, metrics: RequestMetrics) -> None:
+        phases = metrics.phases
+        wall = {
+            "pre_process": phases.get("pre_process", 0.0),
+            "network": sum(phases.get(p, 0.0) for p in NETWORK_PHASES),
+            "unmarshal": phases.get("unmarshal", 0.0),
+            "backoff": metrics.backoff,
+        }
+        wall["overhead"] = max(metrics.duration - sum(wall.values()), 0.0)
+        cpu = {p: metrics.cpu.get(p, 0.0) for p in CPU_PHASES}
+        cpu["overhead"] = max(metrics.cpu_time - sum(cpu.values()), 0.0)
+        with self._lock:
+            self.requests += 1
+            self.retries += metrics.retries
+            self.errors += metrics.error is not None
+            for phase, seconds in wall.items():
+                self.wall[phase] += seconds
+            for phase, seconds in cpu.items():
+                self.cpu[phase] += seconds
+            if metrics.model is not None and "unmarshal" in phases:
+                model = self.models.setdefault(metrics.model, ModelProfile())
+                model.requests += 1
+                model.wall += wall["unmarshal"]
+                model.cpu += cpu["unmarshal"]
+                model.bytes_decoded += metrics.bytes_decoded
+                model.models += metrics.models
+        if self.forward is not None:
+            self.forward.record(metrics)
+
+    def report(self) -> str:
+        """
+        Returns the profiling summary table.
+        """
+        with self._lock:
+            total = sum(self.wall.values())
+            lines = [
+                (
+                    f"RESTFly profile: {self.requests} requests, "
+                    f"{self.retries} retries, {self.errors} errors"
+                ),
+                "",
+                f"{'Phase':<24} {'Wall (s)':>10} {'CPU (s)':>10} {'Wall %':>8}",
+            ]
+            for phase in PROFILE_PHASES:
+                share = self.wall[phase] / total * 100 if total else 0.0
+                lines.append(
+                    f"{phase:<24} {self.wall[phase]:>10.4f} "
+                    f"{self.cpu[phase]:>10.4f} {share:>7.1f}%"
+                )
+            lines.append(
+                f"{'total':<24} {total:>10.4f} {sum(self.cpu.values()):>10.4f} "
+                f"{100.0 if total else 0.0:>7.1f}%"
+            )
+            if self.models:
+                lines += [
+                    "",
+                    (
+                        f"{'Model':<24} {'Requests':>10} {'Wall (s)':>10} "
+                        f"{'CPU (s)':>10} {'Bytes':>12} {'Models':>10}"
+                    ),
+                ]
+                for name, model in sorted(
+                    self.models.items(), key=lambda item: item[1].wall, reverse=True
+                ):
+                    lines.append(
+                        f"{name:<24} {model.requests:>10} {model.wall:>10.4f} "
+                        f"{model.cpu:>10.4f} {model.bytes_decoded:>12} "
+                        f"{model.models:>10}"
+                    )
+        return "\n".join(lines)
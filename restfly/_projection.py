@@ -0,0 +1,122 @@
+"""
+Projected decoding of JSON responses.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, TypedDict
+
+SEGMENT = re.compile(r"^(?P<name>[^\[\]{}.,]*)(?P<list>\[\*\])?$")
+""" Pattern matching a single segment of a projection path. """
+
+
+def projection(*paths: str) -> type[Any]:
+    """
+    Compiles the projection paths into a response model that only decodes the fields
+    within the paths.  The returned model can be passed as the ``response_model`` of
+    any request and returns plain python dictionaries and lists.
+
+    The JSON is parsed and validated by Pydantic-Core, so any fields outside of the
+    projection are skipped without ever being turned into python objects.  On large
+    envelopes where only a few fields are needed this avoids the time and memory spent
+    building the full python structure only to discard most of it.
+
+    Paths are dot-separated field names.  A field name suffixed with ``[*]`` is a list
+    of objects, and the last segment may select multiple fields with ``{a,b}``.  A
+    path starting with ``[*]`` denotes a response body that is a list.  Fields that are
+    missing from the response are omitted from the result.
+
+    Args:
+        *paths: The projection paths.
+
+    Returns:
+        The compiled response model.  Compiled models are cached, so the same paths
+        return the same model.
+
+    Example:
+        >>> model = projection("data.items[*].{id,name}", "meta.total")
+        >>> client._get("/items", response_model=model)
+        {'data': {'items': [{'id': 1, 'name': 'a'}]}, 'meta': {'total': 1}}
+    """
+    if not paths:
+        raise ValueError("At least one projection path is required.")
+    return _compile(tuple(paths))
+
+
+@lru_cache(maxsize=128)
+def _compile(paths: tuple[str, ...]) -> type[Any]:
+    """
+    Compiles the paths into a tree of nodes and then into the model.
+    """
+    root: dict[str, Any] = {}
+    root_list: bool | None = None
+    for path in paths:
+        segments = _split(path)
+        is_list = segments[0] == ("", True)
+        if segments[0][0] == "" and not is_list:
+            raise ValueError(f"Invalid projection path {path!r}.")
+        if root_list is not None and root_list != is_list:
+            raise ValueError("Projection paths must all either be lists or objects.")
+        root_list = is_list
+        node = root
+        if is_list:
+            segments = segments[1:]
+            if not segments:
+                raise ValueError(f"Invalid projection path {path!r}.")
+        for index, (name, is_array) in enumerate(segments):
+            last = index == len(segments) - 1
+            for field in name.split(","):
+                if not field:
+                    raise ValueError(f"Invalid projection path {path!r}.")
+                child = node.setdefault(field, {"list": is_array, "fields": {}})
+                if child["list"] != is_array:
+                    raise ValueError(f"Conflicting projection for {field!r}.")
+                if last:
+                    child["leaf"] = True
+            node = child["fields"]
+    model = _build(root, "Projection")
+    return list[model] if root_list else model  # type: ignore[valid-type] # ty: ignore[invalid-type-form]
+
+
+def _split(path: str) -> list[tuple[str, bool]]:
+    """
+    Splits the path into a list of the field names and whether they're lists.
+    """
+    path = path.strip()
+    segments: list[tuple[str, bool]] = []
+    if path.endswith("}"):
+        start = path.rfind("{")
+        if start < 0 or (start > 0 and path[start - 1] != "."):
+            raise ValueError(f"Invalid projection path {path!r}.")
+        fields = path[start + 1 : -1].replace(" ", "")
+        path = path[: max(start - 1, 0)]
+    else:
+        fields = None
+    if path:
+        for segment in path.split("."):
+            match = SEGMENT.match(segment)
+            if not match or (not match["name"] and segments):
+                raise ValueError(f"Invalid projection path {path!r}.")
+            segments.append((match["name"], match["list"] is not None))
+    if fields is not None:
+        segments.append((fields, False))
+    if not segments:
+        raise ValueError(f"Invalid projection path {path!r}.")
+    return segments
+
+
+def _build(fields: dict[str, Any], name: str) -> type[Any]:
+    """
+    Builds the TypedDict model of the node.  Leaf fields (and fields that aren't
+    objects) are typed as Any so that the value is returned as-is.
+    """
+    annotations: dict[str, Any] = {}
+    for field, node in fields.items():
+        if node["fields"] and not node.get("leaf"):
+            value: Any = _build(node["fields"], f"{name}_{field}")
+        else:
+            value = Any
+        annotations[field] = list[value] if node["list"] else value
+    return TypedDict(name, annotations, total=False)  # type: ignore[operator] # ty: ignore[invalid-argument-type]
@@ -1,18 +1,38 @@
 from __future__ import annotations
 
 import random
+from collections.abc import Container
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from contextlib import contextmanager
+from contextvars import copy_context
+from os import PathLike
+from pathlib import Path
 from ssl import SSLContext
-from time import sleep
-from typing import Any, Callable, Iterator, Literal, Self, overload, override
+from threading import Event, Thread
+from time import perf_counter, sleep
+from typing import IO, Any, Callable, Iterator, Literal, Self, overload, override
 
+from httpx import HTTPTransport
+
+from ._balancer import BalancePolicy
 from ._base import APIBaseEndpoint, APIClientBase
+from ._bodies import CHUNK_SIZE, FileUpload, ProgressCallback, ReplayableBody
+from ._chunked import PART_BACKOFF, PART_JITTER, ChunkedUpload, UploadPart
+from ._codecs import JSONCodec
+from ._compression import Compression
+from ._deadline import cap_timeout, check_deadline
+from ._dns import DNSCache, DNSCachingTransport
+from ._download import RESUME_BACKOFF, RESUME_JITTER, Download, Segment
 from ._errors import APIError, ErrorStatus, RetryError
+from ._http2 import HTTP2Profile
+from ._metrics import MetricsHook, RequestTracker
+from ._tracing import Tracer
 from ._utils import assign_annotations, unmarshal
 from .types import (
     DEFAULT_LIMITS,
     DEFAULT_MAX_REDIRECTS,
     DEFAULT_TIMEOUT_CONFIG,
+    URL,
     USE_CLIENT_DEFAULT,
     AuthTypes,
     BaseTransport,
@@ -26,13 +46,17 @@ from .types import (
     Model,
     ProxyTypes,
     QueryParamTypes,
+    RawModel,
+    RawResponse,
     Request,
     RequestContent,
     RequestData,
     RequestExtensions,
     RequestFiles,
     Response,
+    TimeoutException,
     TimeoutTypes,
+    TransportError,
     UseClientDefault,
     XMLModel,
     codes,
@@ -40,12 +64,16 @@ from .types import (
 
 
 class HTTPClientVerbs:
+    @property
+    def _retry_max(self) -> int:
+        raise NotImplementedError
+
     def _request(
         self,
         method: HTTPMethods,
         path: str = "",
         *,
-        response_model: type[Model] | type[list[Model]] | None = None,
+        response_model: type[Model] | type[list[Model]] | RawModel | None = None,
         params: QueryParamTypes | None = None,
         content: RequestContent | None = None,
         data: RequestData | None = None,
@@ -62,8 +90,11 @@ class HTTPClientVerbs:
         extensions: RequestExtensions | None = None,
         max_retries: int | None = None,
         error_map: dict[int, ErrorStatus] | None = None,
+        success_codes: Container[int] | None = None,
+        endpoint: str | None = None,
         stream: bool = False,
-    ) -> Model | list[Model] | Response:
+        compression: Compression | Literal[False] | None = None,
+    ) -> Model | list[Model] | RawResponse | Response | None:
         raise NotImplementedError
 
     @contextmanager
@@ -163,6 +194,248 @@ class HTTPClientVerbs:
         finally:
             response.close()
 
+    def _download(
+        self,
+        path: str,
+        dest: str | PathLike[str],
+        *,
+        params: QueryParamTypes | None = None,
+        headers: dict[str, str] | None = None,
+        cookies: CookieTypes | None = None,
+        auth: AuthTypes | UseClientDefault | None = USE_CLIENT_DEFAULT,
+        follow_redirects: bool | UseClientDefault = USE_CLIENT_DEFAULT,
+        timeout: TimeoutTypes | UseClientDefault = USE_CLIENT_DEFAULT,
+        extensions: RequestExtensions | None = None,
+        max_retries: int | None = None,
+        error_map: dict[int, ErrorStatus] | None = None,
+        chunk_size: int = CHUNK_SIZE,
+        checksum: str | None = None,
+        segments: int = 1,
+    ) -> Path:
+        """
+        Downloads the response body of a GET request into a file.  The body is streamed
+        to disk in chunks, and if the connection is interrupted part-way through, the
+        download is resumed from where it left off using a ``Range`` request (made
+        conditional with ``If-Range`` on the resource not having changed).  Status
+        codes are handled by the error map as with any other request.
+
+        Args:
+            path:
+                URL to query.
+            dest:
+                The path of the file to write the body into.  Any existing file is
+                overwritten, and the file is removed if the download fails.
+            params:
+                Request query parameters.
+            headers:
+                Request-specific headers.
+            cookies:
+                Request-specific cookies.
+            auth:
+                Request-specific authentication.
+            follow_redirects:
+                Should the client follow any redirects?
+            timeout:
+                Request-specific timeout settings.
+            extensions:
+                Any additional httpx extensions to pass to the client.
+            max_retries:
+                The maximum number of retries to attempt before giving up. Overloads
+                the client default.  Applies both to retries from the error map and to
+                resuming interrupted transfers.
+            error_map:
+                Replaces the client error map with this one instead.
+            chunk_size:
+                The number of bytes to buffer before writing them to the file.
+            checksum:
+                The expected checksum of the file as ``algorithm:hexdigest``.
+            segments:
+                The number of byte ranges to split the download into.  Ranges are
+                fetched concurrently (each within its own thread) and resumed
+                independently.  Servers that don't support ranges are downloaded as a
+                single stream.
+
+        Returns:
+            The path of the downloaded file.
+
+        Example:
+            >>> client._download("/reports/1", "report.csv")
+            >>> client._download("/exports/1", "export.tar", segments=8)
+        """
+        retries = max_retries if max_retries else self._retry_max
+
+        def send(extra: dict[str, str]) -> Response:
+            return self._request(  # type: ignore[return-value] # ty: ignore[invalid-return-type]
+                "GET",
+                path,
+                params=params,
+                headers=(headers or {}) | extra,
+                cookies=cookies,
+                auth=auth,
+                follow_redirects=follow_redirects,
+                timeout=timeout,
+                extensions=extensions,
+                max_retries=max_retries,
+                error_map=error_map,
+                success_codes=(codes.OK, codes.PARTIAL_CONTENT),
+                stream=True,
+            )
+
+        with Download(dest, checksum, chunk_size) as download:
+            # For segmented downloads, we first probe the first byte of the resource to
+            # learn the size of it and whether ranges are supported at all.  Each
+            # segment is then fetched within its own thread (carrying over the current
+            # context, so that any deadline still applies).  If ranges aren't
+            # supported, the resource is downloaded as a single stream instead.
+            if segments > 1:
+                response = send(download.probe_headers)
+                response.close()
+                if parts := download.split(response, segments):
+                    error: BaseException | None = None
+                    with ThreadPoolExecutor(len(parts)) as pool:
+                        futures = [
+                            pool.submit(
+                                copy_context().run, _transfer, send, part, retries
+                            )
+                            for part in parts
+                        ]
+                        for future in as_completed(futures):
+                            if error is None and future.exception() is not None:
+                                error = future.exception()
+                                download.cancelled = True
+                    if error is not None:
+                        raise error
+                    return download.finish()
+            _transfer(send, download, retries)
+            return download.finish()
+
+    def _upload(
+        self,
+        path: str,
+        source: str | PathLike[str] | IO[bytes],
+        *,
+        method: HTTPMethods = "POST",
+        params: QueryParamTypes | None = None,
+        headers: dict[str, str] | None = None,
+        cookies: CookieTypes | None = None,
+        auth: AuthTypes | UseClientDefault | None = USE_CLIENT_DEFAULT,
+        follow_redirects: bool | UseClientDefault = USE_CLIENT_DEFAULT,
+        timeout: TimeoutTypes | UseClientDefault = USE_CLIENT_DEFAULT,
+        extensions: RequestExtensions | None = None,
+        max_retries: int | None = None,
+        error_map: dict[int, ErrorStatus] | None = None,
+        chunk_size: int = CHUNK_SIZE,
+        progress: ProgressCallback | None = None,
+    ) -> Response:
+        """
+        Uploads a file as the raw body of the request.  The file is streamed from disk
+        in chunks (memory-mapping files given as a path), and is re-opened or seeked
+        back to the start whenever the request is retried.  The ``Content-Type``
+        defaults to ``application/octet-stream``.
+
+        Args:
+            path:
+                URL to query.
+            source:
+                The path of the file or the binary file object to upload.
+            method:
+                The HTTP method used to make the call.
+            params:
+                Request query parameters.
+            headers:
+                Request-specific headers.
+            cookies:
+                Request-specific cookies.
+            auth:
+                Request-specific authentication.
+            follow_redirects:
+                Should the client follow any redirects?
+            timeout:
+                Request-specific timeout settings.
+            extensions:
+                Any additional httpx extensions to pass to the client.
+            max_retries:
+                The maximum number of retries to attempt before giving up. Overloads
+                the client default.
+            error_map:
+                Replaces the client error map with this one instead.
+            chunk_size:
+                The number of bytes to send at a time.
+            progress:
+                Callback called after each chunk is sent with the number of bytes sent
+                so far and the total size of the file.
+
+        Returns:
+            The HTTPX Response object.
+
+        Example:
+            >>> client._upload("/files", "export.tar", method="PUT")
+        """
+        headers = {"Content-Type": "application/octet-stream"} | (headers or {})
+        response: Response = self._request(  # type: ignore[assignment] # ty: ignore[invalid-assignment]
+            method,
+            path,
+            content=FileUpload(source, chunk_size, progress=progress),
+            params=params,
+            headers=headers,
+            cookies=cookies,
+            auth=auth,
+            follow_redirects=follow_redirects,
+            timeout=timeout,
+            extensions=extensions,
+            max_retries=max_retries,
+            error_map=error_map,
+        )
+        return response
+
+    def _chunked_upload(
+        self,
+        upload: ChunkedUpload,
+        *,
+        max_retries: int | None = None,
+    ) -> Any:
+        """
+        Runs a chunked upload.  The upload is started (unless it's being resumed from
+        its state file), the pending parts are uploaded concurrently (each within its
+        own thread), and the upload is then completed with the results of every part.
+        Parts that fail to send due to a connection error are retried individually.
+
+        Args:
+            upload:
+                The chunked upload to run.
+            max_retries:
+                The maximum number of times to retry each part before giving up.
+                Overloads the client default.
+
+        Returns:
+            The return value of the complete step of the upload.
+
+        Example:
+            >>> upload = VendorUpload("export.tar", state="upload.json")
+            >>> client._chunked_upload(upload)
+        """
+        retries = max_retries if max_retries else self._retry_max
+        if upload.session is None:
+            upload.begin(upload.start(self))
+        error: BaseException | None = None
+        with ThreadPoolExecutor(upload.workers) as pool:
+            futures = [
+                pool.submit(copy_context().run, _send_part, self, upload, part, retries)
+                for part in upload.pending
+            ]
+            for future in as_completed(futures):
+                if error is None and future.exception() is not None:
+                    # Stop sending any parts that haven't been started.  Parts that are
+                    # in flight are still recorded so that they needn't be resent.
+                    error = future.exception()
+                    for other in futures:
+                        other.cancel()
+        if error is not None:
+            raise error
+        result = upload.complete(self, upload.completed)
+        upload.finish()
+        return result
+
     @overload
     def _get(
         self,
@@ -179,6 +452,7 @@ class HTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
     ) -> Response: ...
 
     @overload
@@ -197,7 +471,8 @@ class HTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
-    ) -> Model: ...
+        success_codes: Container[int] | None = ...,
+    ) -> Model | None: ...
 
     @overload
     def _get(
@@ -215,13 +490,33 @@ class HTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
-    ) -> list[Model]: ...
+        success_codes: Container[int] | None = ...,
+    ) -> list[Model] | None: ...
+
+    @overload
+    def _get(
+        self,
+        path: str = ...,
+        *,
+        response_model: RawModel,
+        response_model_kwargs: dict[str, Any] | None = ...,
+        params: QueryParamTypes | None = ...,
+        headers: dict[str, str] | None = ...,
+        cookies: CookieTypes | None = ...,
+        auth: AuthTypes | UseClientDefault | None = ...,
+        follow_redirects: bool | UseClientDefault = ...,
+        timeout: TimeoutTypes | UseClientDefault = ...,
+        extensions: RequestExtensions | None = ...,
+        max_retries: int | None = ...,
+        error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+    ) -> Any: ...
 
     def _get(
         self,
         path: str = "",
         *,
-        response_model: type[Model] | type[list[Model]] | None = None,
+        response_model: type[Model] | type[list[Model]] | RawModel | None = None,
         response_model_kwargs: dict[str, Any] | None = None,
         params: QueryParamTypes | None = None,
         headers: dict[str, str] | None = None,
@@ -232,7 +527,8 @@ class HTTPClientVerbs:
         extensions: RequestExtensions | None = None,
         max_retries: int | None = None,
         error_map: dict[int, ErrorStatus] | None = None,
-    ) -> Model | list[Model] | Response:
+        success_codes: Container[int] | None = None,
+    ) -> Model | list[Model] | RawResponse | Response | None:
         """
         Construct and send an HTTP GET request.
 
@@ -240,7 +536,9 @@ class HTTPClientVerbs:
             path:
                 URL to query.
             response_model:
-                Pydantic model to coerce the response into.
+                Pydantic model to coerce the response into.  Passing ``dict`` or
+                ``list`` returns the decoded JSON data and ``memoryview`` returns the
+                response body, skipping model construction entirely.
             response_model_kwargs:
                 Keyword arguments to pass to Pydantic/Pydantic-XML as part of
                 un-marshalling the response data.
@@ -263,11 +561,15 @@ class HTTPClientVerbs:
                 the client default.
             error_map:
                 Replaces the client error map with this one instead.
+            success_codes:
+                The status codes to consider a successful response. Overloads the
+                endpoint and client defaults.
 
         Returns:
             Returns the HTTPX Response object if no response_model is specified. If a
             response_model _is_ specified, then the response will be coerced into the
-            response model and the instance of the model will be returned.
+            response model and the instance of the model will be returned. Successful
+            responses without any content (such as a 204) will return None instead.
         """
         return self._request(  # ty: ignore[invalid-return-type]
             method="GET",
@@ -283,6 +585,7 @@ class HTTPClientVerbs:
             response_model_kwargs=response_model_kwargs,
             max_retries=max_retries,
             error_map=error_map,
+            success_codes=success_codes,
         )
 
     @overload
@@ -307,6 +610,8 @@ class HTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
     ) -> Response: ...
 
     @overload
@@ -331,7 +636,9 @@ class HTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
-    ) -> Model: ...
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Model | None: ...
 
     @overload
     def _post(
@@ -355,7 +662,35 @@ class HTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
-    ) -> list[Model]: ...
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> list[Model] | None: ...
+
+    @overload
+    def _post(
+        self,
+        path: str = ...,
+        *,
+        response_model: RawModel,
+        params: QueryParamTypes | None = ...,
+        content: RequestContent | None = ...,
+        data: RequestData | None = ...,
+        files: RequestFiles | None = ...,
+        json: Model | Any | None = ...,
+        xml: XMLModel | str | bytes | None = ...,
+        response_model_kwargs: dict[str, Any] | None = ...,
+        request_model_kwargs: dict[str, Any] | None = ...,
+        headers: dict[str, str] | None = ...,
+        cookies: CookieTypes | None = ...,
+        auth: AuthTypes | UseClientDefault | None = ...,
+        follow_redirects: bool | UseClientDefault = ...,
+        timeout: TimeoutTypes | UseClientDefault = ...,
+        extensions: RequestExtensions | None = ...,
+        max_retries: int | None = ...,
+        error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Any: ...
 
     def _post(
         self,
@@ -368,7 +703,7 @@ class HTTPClientVerbs:
         json: Model | Any | None = None,
         xml: XMLModel | str | bytes | None = None,
         headers: dict[str, str] | None = None,
-        response_model: type[Model] | type[list[Model]] | None = None,
+        response_model: type[Model] | type[list[Model]] | RawModel | None = None,
         response_model_kwargs: dict[str, Any] | None = None,
         request_model_kwargs: dict[str, Any] | None = None,
         cookies: CookieTypes | None = None,
@@ -378,7 +713,9 @@ class HTTPClientVerbs:
         extensions: RequestExtensions | None = None,
         max_retries: int | None = None,
         error_map: dict[int, ErrorStatus] | None = None,
-    ) -> Model | list[Model] | Response:
+        success_codes: Container[int] | None = None,
+        compression: Compression | Literal[False] | None = None,
+    ) -> Model | list[Model] | RawResponse | Response | None:
         """
         Construct and send an HTTP POST request.
 
@@ -386,7 +723,9 @@ class HTTPClientVerbs:
             path:
                 URL to query.
             response_model:
-                Pydantic model to coerce the response into.
+                Pydantic model to coerce the response into.  Passing ``dict`` or
+                ``list`` returns the decoded JSON data and ``memoryview`` returns the
+                response body, skipping model construction entirely.
             response_model_kwargs:
                 Keyword arguments to pass to Pydantic/Pydantic-XML as part of
                 un-marshalling the response data.
@@ -424,11 +763,18 @@ class HTTPClientVerbs:
                 the client default.
             error_map:
                 Replaces the client error map with this one instead.
+            success_codes:
+                The status codes to consider a successful response. Overloads the
+                endpoint and client defaults.
+            compression:
+                The compression settings for the request body.  Overloads the client
+                default, and False disables compression for the request.
 
         Returns:
             Returns the HTTPX Response object if no response_model is specified. If a
             response_model _is_ specified, then the response will be coerced into the
-            response model and the instance of the model will be returned.
+            response model and the instance of the model will be returned. Successful
+            responses without any content (such as a 204) will return None instead.
         """
         return self._request(  # ty: ignore[invalid-return-type]
             method="POST",
@@ -450,6 +796,8 @@ class HTTPClientVerbs:
             request_model_kwargs=request_model_kwargs,
             max_retries=max_retries,
             error_map=error_map,
+            success_codes=success_codes,
+            compression=compression,
         )
 
     @overload
@@ -474,6 +822,8 @@ class HTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
     ) -> Response: ...
 
     @overload
@@ -498,7 +848,9 @@ class HTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
-    ) -> Model: ...
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Model | None: ...
 
     @overload
     def _put(
@@ -522,7 +874,35 @@ class HTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
-    ) -> list[Model]: ...
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> list[Model] | None: ...
+
+    @overload
+    def _put(
+        self,
+        path: str = ...,
+        *,
+        response_model: RawModel,
+        params: QueryParamTypes | None = ...,
+        content: RequestContent | None = ...,
+        data: RequestData | None = ...,
+        files: RequestFiles | None = ...,
+        json: Model | Any | None = ...,
+        xml: XMLModel | str | bytes | None = ...,
+        response_model_kwargs: dict[str, Any] | None = ...,
+        request_model_kwargs: dict[str, Any] | None = ...,
+        headers: dict[str, str] | None = ...,
+        cookies: CookieTypes | None = ...,
+        auth: AuthTypes | UseClientDefault | None = ...,
+        follow_redirects: bool | UseClientDefault = ...,
+        timeout: TimeoutTypes | UseClientDefault = ...,
+        extensions: RequestExtensions | None = ...,
+        max_retries: int | None = ...,
+        error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Any: ...
 
     def _put(
         self,
@@ -535,7 +915,7 @@ class HTTPClientVerbs:
         json: Model | Any | None = None,
         xml: XMLModel | str | bytes | None = None,
         headers: dict[str, str] | None = None,
-        response_model: type[Model] | type[list[Model]] | None = None,
+        response_model: type[Model] | type[list[Model]] | RawModel | None = None,
         response_model_kwargs: dict[str, Any] | None = None,
         request_model_kwargs: dict[str, Any] | None = None,
         cookies: CookieTypes | None = None,
@@ -545,7 +925,9 @@ class HTTPClientVerbs:
         extensions: RequestExtensions | None = None,
         max_retries: int | None = None,
         error_map: dict[int, ErrorStatus] | None = None,
-    ) -> Model | list[Model] | Response:
+        success_codes: Container[int] | None = None,
+        compression: Compression | Literal[False] | None = None,
+    ) -> Model | list[Model] | RawResponse | Response | None:
         """
         Construct and send an HTTP PUT request.
 
@@ -553,7 +935,9 @@ class HTTPClientVerbs:
             path:
                 URL to query.
             response_model:
-                Pydantic model to coerce the response into.
+                Pydantic model to coerce the response into.  Passing ``dict`` or
+                ``list`` returns the decoded JSON data and ``memoryview`` returns the
+                response body, skipping model construction entirely.
             response_model_kwargs:
                 Keyword arguments to pass to Pydantic/Pydantic-XML as part of
                 un-marshalling the response data.
@@ -591,11 +975,18 @@ class HTTPClientVerbs:
                 the client default.
             error_map:
                 Replaces the client error map with this one instead.
+            success_codes:
+                The status codes to consider a successful response. Overloads the
+                endpoint and client defaults.
+            compression:
+                The compression settings for the request body.  Overloads the client
+                default, and False disables compression for the request.
 
         Returns:
             Returns the HTTPX Response object if no response_model is specified. If a
             response_model _is_ specified, then the response will be coerced into the
-            response model and the instance of the model will be returned.
+            response model and the instance of the model will be returned. Successful
+            responses without any content (such as a 204) will return None instead.
         """
         return self._request(  # ty: ignore[invalid-return-type]
             method="PUT",
@@ -617,6 +1008,8 @@ class HTTPClientVerbs:
             request_model_kwargs=request_model_kwargs,
             max_retries=max_retries,
             error_map=error_map,
+            success_codes=success_codes,
+            compression=compression,
         )
 
     @overload
@@ -641,6 +1034,8 @@ class HTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
     ) -> Response: ...
 
     @overload
@@ -665,7 +1060,9 @@ class HTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
-    ) -> Model: ...
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Model | None: ...
 
     @overload
     def _patch(
@@ -689,7 +1086,35 @@ class HTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
-    ) -> list[Model]: ...
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> list[Model] | None: ...
+
+    @overload
+    def _patch(
+        self,
+        path: str = ...,
+        *,
+        response_model: RawModel,
+        params: QueryParamTypes | None = ...,
+        content: RequestContent | None = ...,
+        data: RequestData | None = ...,
+        files: RequestFiles | None = ...,
+        json: Model | Any | None = ...,
+        xml: XMLModel | str | bytes | None = ...,
+        response_model_kwargs: dict[str, Any] | None = ...,
+        request_model_kwargs: dict[str, Any] | None = ...,
+        headers: dict[str, str] | None = ...,
+        cookies: CookieTypes | None = ...,
+        auth: AuthTypes | UseClientDefault | None = ...,
+        follow_redirects: bool | UseClientDefault = ...,
+        timeout: TimeoutTypes | UseClientDefault = ...,
+        extensions: RequestExtensions | None = ...,
+        max_retries: int | None = ...,
+        error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Any: ...
 
     def _patch(
         self,
@@ -702,7 +1127,7 @@ class HTTPClientVerbs:
         json: Model | Any | None = None,
         xml: XMLModel | str | bytes | None = None,
         headers: dict[str, str] | None = None,
-        response_model: type[Model] | type[list[Model]] | None = None,
+        response_model: type[Model] | type[list[Model]] | RawModel | None = None,
         response_model_kwargs: dict[str, Any] | None = None,
         request_model_kwargs: dict[str, Any] | None = None,
         cookies: CookieTypes | None = None,
@@ -712,7 +1137,9 @@ class HTTPClientVerbs:
         extensions: RequestExtensions | None = None,
         max_retries: int | None = None,
         error_map: dict[int, ErrorStatus] | None = None,
-    ) -> Model | list[Model] | Response:
+        success_codes: Container[int] | None = None,
+        compression: Compression | Literal[False] | None = None,
+    ) -> Model | list[Model] | RawResponse | Response | None:
         """
         Construct and send an HTTP PATCH request.
 
@@ -720,7 +1147,9 @@ class HTTPClientVerbs:
             path:
                 URL to query.
             response_model:
-                Pydantic model to coerce the response into.
+                Pydantic model to coerce the response into.  Passing ``dict`` or
+                ``list`` returns the decoded JSON data and ``memoryview`` returns the
+                response body, skipping model construction entirely.
             response_model_kwargs:
                 Keyword arguments to pass to Pydantic/Pydantic-XML as part of
                 un-marshalling the response data.
@@ -758,11 +1187,18 @@ class HTTPClientVerbs:
                 the client default.
             error_map:
                 Replaces the client error map with this one instead.
+            success_codes:
+                The status codes to consider a successful response. Overloads the
+                endpoint and client defaults.
+            compression:
+                The compression settings for the request body.  Overloads the client
+                default, and False disables compression for the request.
 
         Returns:
             Returns the HTTPX Response object if no response_model is specified. If a
             response_model _is_ specified, then the response will be coerced into the
-            response model and the instance of the model will be returned.
+            response model and the instance of the model will be returned. Successful
+            responses without any content (such as a 204) will return None instead.
         """
         return self._request(  # ty: ignore[invalid-return-type]
             method="PATCH",
@@ -784,6 +1220,8 @@ class HTTPClientVerbs:
             request_model_kwargs=request_model_kwargs,
             max_retries=max_retries,
             error_map=error_map,
+            success_codes=success_codes,
+            compression=compression,
         )
 
     @overload
@@ -808,6 +1246,8 @@ class HTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
     ) -> Response: ...
 
     @overload
@@ -832,7 +1272,9 @@ class HTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
-    ) -> Model: ...
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Model | None: ...
 
     @overload
     def _delete(
@@ -856,7 +1298,35 @@ class HTTPClientVerbs:
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
-    ) -> list[Model]: ...
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> list[Model] | None: ...
+
+    @overload
+    def _delete(
+        self,
+        path: str = ...,
+        *,
+        response_model: RawModel,
+        params: QueryParamTypes | None = ...,
+        content: RequestContent | None = ...,
+        data: RequestData | None = ...,
+        files: RequestFiles | None = ...,
+        json: Model | Any | None = ...,
+        xml: XMLModel | str | bytes | None = ...,
+        response_model_kwargs: dict[str, Any] | None = ...,
+        request_model_kwargs: dict[str, Any] | None = ...,
+        headers: dict[str, str] | None = ...,
+        cookies: CookieTypes | None = ...,
+        auth: AuthTypes | UseClientDefault | None = ...,
+        follow_redirects: bool | UseClientDefault = ...,
+        timeout: TimeoutTypes | UseClientDefault = ...,
+        extensions: RequestExtensions | None = ...,
+        max_retries: int | None = ...,
+        error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Any: ...
 
     def _delete(
         self,
@@ -869,7 +1339,7 @@ class HTTPClientVerbs:
         json: Model | Any | None = None,
         xml: XMLModel | str | bytes | None = None,
         headers: dict[str, str] | None = None,
-        response_model: type[Model] | type[list[Model]] | None = None,
+        response_model: type[Model] | type[list[Model]] | RawModel | None = None,
         response_model_kwargs: dict[str, Any] | None = None,
         request_model_kwargs: dict[str, Any] | None = None,
         cookies: CookieTypes | None = None,
@@ -879,7 +1349,9 @@ class HTTPClientVerbs:
         extensions: RequestExtensions | None = None,
         max_retries: int | None = None,
         error_map: dict[int, ErrorStatus] | None = None,
-    ) -> Model | list[Model] | Response:
+        success_codes: Container[int] | None = None,
+        compression: Compression | Literal[False] | None = None,
+    ) -> Model | list[Model] | RawResponse | Response | None:
         """
         Construct and send an HTTP DELETE request.
 
@@ -887,7 +1359,9 @@ class HTTPClientVerbs:
             path:
                 URL to query.
             response_model:
-                Pydantic model to coerce the response into.
+                Pydantic model to coerce the response into.  Passing ``dict`` or
+                ``list`` returns the decoded JSON data and ``memoryview`` returns the
+                response body, skipping model construction entirely.
             response_model_kwargs:
                 Keyword arguments to pass to Pydantic/Pydantic-XML as part of
                 un-marshalling the response data.
@@ -925,11 +1399,18 @@ class HTTPClientVerbs:
                 the client default.
             error_map:
                 Replaces the client error map with this one instead.
+            success_codes:
+                The status codes to consider a successful response. Overloads the
+                endpoint and client defaults.
+            compression:
+                The compression settings for the request body.  Overloads the client
+                default, and False disables compression for the request.
 
         Returns:
             Returns the HTTPX Response object if no response_model is specified. If a
             response_model _is_ specified, then the response will be coerced into the
-            response model and the instance of the model will be returned.
+            response model and the instance of the model will be returned. Successful
+            responses without any content (such as a 204) will return None instead.
         """
         return self._request(  # ty: ignore[invalid-return-type]
             method="DELETE",
@@ -951,6 +1432,8 @@ class HTTPClientVerbs:
             request_model_kwargs=request_model_kwargs,
             max_retries=max_retries,
             error_map=error_map,
+            success_codes=success_codes,
+            compression=compression,
         )
 
 
@@ -983,7 +1466,10 @@ class APIEndpoint(APIBaseEndpoint, HTTPClientVerbs):
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        endpoint: str | None = ...,
         stream: bool = ...,
+        compression: Compression | Literal[False] | None = ...,
     ) -> Response: ...
 
     @overload
@@ -1009,8 +1495,11 @@ class APIEndpoint(APIBaseEndpoint, HTTPClientVerbs):
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        endpoint: str | None = ...,
         stream: bool = False,
-    ) -> Model: ...
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Model | None: ...
 
     @overload
     def _request(
@@ -1035,8 +1524,11 @@ class APIEndpoint(APIBaseEndpoint, HTTPClientVerbs):
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        endpoint: str | None = ...,
         stream: bool = False,
-    ) -> list[Model]: ...
+        compression: Compression | Literal[False] | None = ...,
+    ) -> list[Model] | None: ...
 
     @overload
     def _request(
@@ -1044,7 +1536,7 @@ class APIEndpoint(APIBaseEndpoint, HTTPClientVerbs):
         method: HTTPMethods,
         path: str = ...,
         *,
-        response_model: type[Model] | type[list[Model]] | None = ...,
+        response_model: RawModel,
         params: QueryParamTypes | None = ...,
         content: RequestContent | None = ...,
         data: RequestData | None = ...,
@@ -1061,8 +1553,40 @@ class APIEndpoint(APIBaseEndpoint, HTTPClientVerbs):
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        endpoint: str | None = ...,
+        stream: bool = False,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Any: ...
+
+    @overload
+    def _request(
+        self,
+        method: HTTPMethods,
+        path: str = ...,
+        *,
+        response_model: type[Model] | type[list[Model]] | RawModel | None = ...,
+        params: QueryParamTypes | None = ...,
+        content: RequestContent | None = ...,
+        data: RequestData | None = ...,
+        files: RequestFiles | None = ...,
+        json: Model | Any | None = ...,
+        xml: XMLModel | str | bytes | None = ...,
+        response_model_kwargs: dict[str, Any] | None = ...,
+        request_model_kwargs: dict[str, Any] | None = ...,
+        headers: dict[str, str] | None = ...,
+        cookies: CookieTypes | None = ...,
+        auth: AuthTypes | UseClientDefault | None = ...,
+        follow_redirects: bool | UseClientDefault = ...,
+        timeout: TimeoutTypes | UseClientDefault = ...,
+        extensions: RequestExtensions | None = ...,
+        max_retries: int | None = ...,
+        error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        endpoint: str | None = ...,
         stream: bool = ...,
-    ) -> Model | list[Model] | Response: ...
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Model | list[Model] | RawResponse | Response | None: ...
 
     @override
     def _request(
@@ -1077,7 +1601,7 @@ class APIEndpoint(APIBaseEndpoint, HTTPClientVerbs):
         headers: dict[str, str] | None = None,
         json: Model | Any | None = None,
         xml: XMLModel | str | bytes | None = None,
-        response_model: type[Model] | type[list[Model]] | None = None,
+        response_model: type[Model] | type[list[Model]] | RawModel | None = None,
         response_model_kwargs: dict[str, Any] | None = None,
         request_model_kwargs: dict[str, Any] | None = None,
         cookies: CookieTypes | None = None,
@@ -1087,8 +1611,11 @@ class APIEndpoint(APIBaseEndpoint, HTTPClientVerbs):
         extensions: RequestExtensions | None = None,
         max_retries: int | None = None,
         error_map: dict[int, ErrorStatus] | None = None,
+        success_codes: Container[int] | None = None,
+        endpoint: str | None = None,
         stream: bool = False,
-    ) -> Model | list[Model] | Response:
+        compression: Compression | Literal[False] | None = None,
+    ) -> Model | list[Model] | RawResponse | Response | None:
         """
         Construct and send an HTTP POST request.
 
@@ -1098,7 +1625,9 @@ class APIEndpoint(APIBaseEndpoint, HTTPClientVerbs):
             path:
                 URL to query.
             response_model:
-                Pydantic model to coerce the response into.
+                Pydantic model to coerce the response into.  Passing ``dict`` or
+                ``list`` returns the decoded JSON data and ``memoryview`` returns the
+                response body, skipping model construction entirely.
             response_model_kwargs:
                 Keyword arguments to pass to Pydantic/Pydantic-XML as part of
                 un-marshalling the response data.
@@ -1136,11 +1665,22 @@ class APIEndpoint(APIBaseEndpoint, HTTPClientVerbs):
                 the client default.
             error_map:
                 Replaces the client error map with this one instead.
+            success_codes:
+                The status codes to consider a successful response. Overloads the
+                endpoint and client defaults.
+            endpoint:
+                Label of the endpoint making the request, used when reporting metrics
+                and traces.
+                Endpoints will pass their path.
+            compression:
+                The compression settings for the request body.  Overloads the client
+                default, and False disables compression for the request.
 
         Returns:
             Returns the HTTPX Response object if no response_model is specified. If a
             response_model _is_ specified, then the response will be coerced into the
-            response model and the instance of the model will be returned.
+            response model and the instance of the model will be returned. Successful
+            responses without any content (such as a 204) will return None instead.
         """
         if self._path is not None:
             path = f"{self._path}{path}"
@@ -1165,15 +1705,25 @@ class APIEndpoint(APIBaseEndpoint, HTTPClientVerbs):
             response_model_kwargs=response_model_kwargs,
             request_model_kwargs=request_model_kwargs,
             error_map=error_map,
+            success_codes=(
+                self._success_codes if success_codes is None else success_codes
+            ),
+            endpoint=self._path if endpoint is None else endpoint,
             stream=stream,
+            compression=compression,
         )
 
 
 class APIClient(APIClientBase, HTTPClientVerbs):
     __client_class__: type[Client] = Client
     __endpoint_class__: type[APIEndpoint] = APIEndpoint
+    __transport_class__: type[HTTPTransport] = HTTPTransport  # ty: ignore[invalid-mutable-override]
+    __dns_transport_class__: type[DNSCachingTransport] = DNSCachingTransport  # ty: ignore[invalid-mutable-override]
     _client: Client
 
+    _keepalive: Event | None = None
+    """ Stop event of the background keep-alive thread started by ``_warmup()``. """
+
     @override
     def __assign_annotations__(self) -> None:
         """
@@ -1192,6 +1742,7 @@ class APIClient(APIClientBase, HTTPClientVerbs):
         """
         Context Manager __exit__ dunder. See PEP-343 for more details.
         """
+        self._stop_keepalive()
         return self._deauthenticate()
 
     def __init__(
@@ -1204,7 +1755,7 @@ class APIClient(APIClientBase, HTTPClientVerbs):
         verify: SSLContext | str | bool = True,
         cert: CertTypes | None = None,
         http1: bool = True,
-        http2: bool = False,
+        http2: bool | HTTP2Profile | None = None,
         proxy: ProxyTypes | None = None,
         mounts: (dict[str, BaseTransport | None]) | None = None,
         timeout: TimeoutTypes = DEFAULT_TIMEOUT_CONFIG,
@@ -1212,7 +1763,7 @@ class APIClient(APIClientBase, HTTPClientVerbs):
         limits: Limits = DEFAULT_LIMITS,
         max_redirects: int = DEFAULT_MAX_REDIRECTS,
         event_hooks: (dict[str, list[EventHook]]) | None = None,
-        base_url: str | None = None,
+        base_url: str | URL | list[str] | tuple[str, ...] | None = None,
         transport: BaseTransport | None = None,
         trust_env: bool = True,
         default_encoding: str | Callable[[bytes], str] = "utf-8",
@@ -1226,6 +1777,13 @@ class APIClient(APIClientBase, HTTPClientVerbs):
         xml_dump_kwargs: dict[str, Any] | None = None,
         error_map: dict[int, ErrorStatus] | None = None,
         error_class: type[APIError] | None = None,
+        metrics: MetricsHook | None = None,
+        tracer: Tracer | None = None,
+        json_codec: JSONCodec | None = None,
+        compression: Compression | None = None,
+        keepalive_expiry: float | None = None,
+        dns_cache: DNSCache | bool | None = None,
+        balance_policy: BalancePolicy | None = None,
     ) -> None:
         # Add the class event hooks to loop in the logging facilities.
         event_hooks = {} if event_hooks is None else event_hooks
@@ -1263,8 +1821,19 @@ class APIClient(APIClientBase, HTTPClientVerbs):
             xml_dump_kwargs=xml_dump_kwargs,
             error_map=error_map,
             error_class=error_class,
+            metrics=metrics,
+            tracer=tracer,
+            json_codec=json_codec,
+            compression=compression,
+            keepalive_expiry=keepalive_expiry,
+            dns_cache=dns_cache,
+            balance_policy=balance_policy,
         )
 
+        # Watch for servers not negotiating HTTP/2 when an HTTP/2 profile is in use.
+        if self._http2 is not None and not self._http2_fallback:
+            self._client.event_hooks["response"].append(self._check_protocol)
+
     def _deauthenticate(self):
         """
         De-authentication stub.  De-authentication is automatically run as part
@@ -1283,7 +1852,7 @@ class APIClient(APIClientBase, HTTPClientVerbs):
         Args:
             request: The request object.
         """
-        self._logger.debug(f"REQUESTING {request.method}: {request.url}")
+        self._logger.debug("REQUESTING %s: %s", request.method, request.url)
 
     def _response_hook(self, response: Response) -> None:
         """
@@ -1293,7 +1862,10 @@ class APIClient(APIClientBase, HTTPClientVerbs):
             response: The response object.
         """
         self._logger.info(
-            f"[{response.status_code}] {response.request.method}: {response.request.url}"
+            "[%s] %s: %s",
+            response.status_code,
+            response.request.method,
+            response.request.url,
         )
 
     def _retry_request(self, response: Response) -> Request:
@@ -1305,6 +1877,109 @@ class APIClient(APIClientBase, HTTPClientVerbs):
         """
         return response.request
 
+    def _warmup(
+        self,
+        n_connections: int = 1,
+        *,
+        path: str | None = None,
+        method: HTTPMethods = "HEAD",
+        keepalive: float | None = None,
+    ) -> int:
+        """
+        Opens pooled connections ahead of time, so that the first requests made through
+        the client land on connections that have already paid for the DNS lookup and
+        the TCP and TLS handshakes.  The warm-up requests are sent concurrently and
+        held open until all of them have been answered, so that each takes a connection
+        of its own, which is then returned to the pool.  When the client balances its
+        requests across several base URLs, the connections are spread across all of
+        them.  Failed connections are logged rather than raised.
+
+        The pool only keeps ``max_keepalive_connections`` idle connections (20 by
+        default) for ``keepalive_expiry`` seconds, so the limits may need raising along
+        with ``n_connections``.
+
+        Args:
+            n_connections: The number of connections to open.
+            path: The path to request.  Defaults to the ``_warmup_path`` of the client.
+            method: The HTTP method of the warm-up requests.
+            keepalive:
+                If set, the connections are warmed up again every ``keepalive`` seconds
+                from a background thread, keeping idle connections from expiring until
+                ``_stop_keepalive()`` is called or the client context is left.
+
+        Returns:
+            The number of connections opened.
+
+        Example:
+            >>> client = APIClient(base_url="https://example.com", keepalive_expiry=60)
+            >>> client._warmup(10, path="/health", keepalive=30)
+            10
+        """
+        if n_connections < 1:
+            raise ValueError("n_connections must be >= 1.")
+        path = self._warmup_path if path is None else path
+        self._stop_keepalive()
+        opened = self._open_connections(n_connections, path, method)
+        if keepalive:
+            self._keepalive = Event()
+            Thread(
+                target=self._keepalive_loop,
+                args=(self._keepalive, keepalive, n_connections, path, method),
+                name="restfly-keepalive",
+                daemon=True,
+            ).start()
+        return opened
+
+    def _stop_keepalive(self) -> None:
+        """
+        Stops the background keep-alive thread started by ``_warmup()`` (if any).
+        """
+        if self._keepalive is not None:
+            self._keepalive.set()
+            self._keepalive = None
+
+    def _open_connections(self, count: int, path: str, method: HTTPMethods) -> int:
+        """
+        Sends the warm-up requests concurrently, returning the number answered.
+        """
+        responses: list[Response] = []
+
+        def send(url: str) -> None:
+            try:
+                request = self._client.build_request(method, url)
+                responses.append(self._client.send(request, stream=True))
+            except TransportError as err:
+                self._logger.warning("Warm-up request to %r failed: %s", url, err)
+
+        try:
+            with ThreadPoolExecutor(max_workers=count) as pool:
+                urls = self._warmup_urls(count, path)
+                for future in [pool.submit(send, url) for url in urls]:
+                    future.result()
+        finally:
+            # Reading the (empty) bodies completes the exchanges, so that the
+            # connections are returned to the pool rather than discarded.
+            for response in responses:
+                try:
+                    response.read()
+                finally:
+                    response.close()
+        return len(responses)
+
+    def _keepalive_loop(
+        self,
+        stop: Event,
+        interval: float,
+        count: int,
+        path: str,
+        method: HTTPMethods,
+    ) -> None:
+        """
+        Warms up the connections every interval until the stop event is set.
+        """
+        while not stop.wait(interval) and not self._client.is_closed:
+            self._open_connections(count, path, method)
+
     @overload
     def _request(
         self,
@@ -1328,7 +2003,10 @@ class APIClient(APIClientBase, HTTPClientVerbs):
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        endpoint: str | None = ...,
         stream: bool = ...,
+        compression: Compression | Literal[False] | None = ...,
     ) -> Response: ...
 
     @overload
@@ -1354,8 +2032,11 @@ class APIClient(APIClientBase, HTTPClientVerbs):
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        endpoint: str | None = ...,
         stream: bool = False,
-    ) -> Model: ...
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Model | None: ...
 
     @overload
     def _request(
@@ -1380,8 +2061,11 @@ class APIClient(APIClientBase, HTTPClientVerbs):
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        endpoint: str | None = ...,
         stream: bool = False,
-    ) -> list[Model]: ...
+        compression: Compression | Literal[False] | None = ...,
+    ) -> list[Model] | None: ...
 
     @overload
     def _request(
@@ -1389,7 +2073,7 @@ class APIClient(APIClientBase, HTTPClientVerbs):
         method: HTTPMethods,
         path: str = ...,
         *,
-        response_model: type[Model] | type[list[Model]] | None = ...,
+        response_model: RawModel,
         params: QueryParamTypes | None = ...,
         content: RequestContent | None = ...,
         data: RequestData | None = ...,
@@ -1406,8 +2090,40 @@ class APIClient(APIClientBase, HTTPClientVerbs):
         extensions: RequestExtensions | None = ...,
         max_retries: int | None = ...,
         error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        endpoint: str | None = ...,
+        stream: bool = False,
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Any: ...
+
+    @overload
+    def _request(
+        self,
+        method: HTTPMethods,
+        path: str = ...,
+        *,
+        response_model: type[Model] | type[list[Model]] | RawModel | None = ...,
+        params: QueryParamTypes | None = ...,
+        content: RequestContent | None = ...,
+        data: RequestData | None = ...,
+        files: RequestFiles | None = ...,
+        json: Model | Any | None = ...,
+        xml: XMLModel | str | bytes | None = ...,
+        response_model_kwargs: dict[str, Any] | None = ...,
+        request_model_kwargs: dict[str, Any] | None = ...,
+        headers: dict[str, str] | None = ...,
+        cookies: CookieTypes | None = ...,
+        auth: AuthTypes | UseClientDefault | None = ...,
+        follow_redirects: bool | UseClientDefault = ...,
+        timeout: TimeoutTypes | UseClientDefault = ...,
+        extensions: RequestExtensions | None = ...,
+        max_retries: int | None = ...,
+        error_map: dict[int, ErrorStatus] | None = ...,
+        success_codes: Container[int] | None = ...,
+        endpoint: str | None = ...,
         stream: bool = ...,
-    ) -> Model | list[Model] | Response: ...
+        compression: Compression | Literal[False] | None = ...,
+    ) -> Model | list[Model] | RawResponse | Response | None: ...
 
     @override
     def _request(
@@ -1415,7 +2131,7 @@ class APIClient(APIClientBase, HTTPClientVerbs):
         method: HTTPMethods,
         path: str = "",
         *,
-        response_model: type[Model] | type[list[Model]] | None = None,
+        response_model: type[Model] | type[list[Model]] | RawModel | None = None,
         params: QueryParamTypes | None = None,
         content: RequestContent | None = None,
         data: RequestData | None = None,
@@ -1432,8 +2148,11 @@ class APIClient(APIClientBase, HTTPClientVerbs):
         extensions: RequestExtensions | None = None,
         max_retries: int | None = None,
         error_map: dict[int, ErrorStatus] | None = None,
+        success_codes: Container[int] | None = None,
+        endpoint: str | None = None,
         stream: bool = False,
-    ) -> Model | list[Model] | Response:
+        compression: Compression | Literal[False] | None = None,
+    ) -> Model | list[Model] | RawResponse | Response | None:
         """
         Construct and send an HTTP request.
 
@@ -1443,7 +2162,9 @@ class APIClient(APIClientBase, HTTPClientVerbs):
             path:
                 URL to query.
             response_model:
-                Pydantic model to coerce the response into.
+                Pydantic model to coerce the response into.  Passing ``dict`` or
+                ``list`` returns the decoded JSON data and ``memoryview`` returns the
+                response body, skipping model construction entirely.
             response_model_kwargs:
                 Keyword arguments to pass to Pydantic/Pydantic-XML as part of
                 un-marshalling the response data.
@@ -1481,84 +2202,251 @@ class APIClient(APIClientBase, HTTPClientVerbs):
                 the client default.
             error_map:
                 Replaces the client error map with this one instead.
+            success_codes:
+                The status codes to consider a successful response. Overloads the
+                endpoint and client defaults.
+            endpoint:
+                Label of the endpoint making the request, used when reporting metrics
+                and traces.
+                Endpoints will pass their path.
+            compression:
+                The compression settings for the request body.  Overloads the client
+                default, and False disables compression for the request.
 
         Returns:
             Returns the HTTPX Response object if no response_model is specified. If a
             response_model _is_ specified, then the response will be coerced into the
-            response model and the instance of the model will be returned.
+            response model and the instance of the model will be returned. Successful
+            responses without any content (such as a 204) will return None instead.
         """
         max_retries = max_retries if max_retries else self._retry_max
-        error_map = self._error_map if error_map is None else error_map
+        status_map = self._select_error_map(error_map)
+        success_codes = self._success_codes if success_codes is None else success_codes
         response_model_kwargs = (
             {} if response_model_kwargs is None else response_model_kwargs
         )
 
-        # Perform any pre-processing necessary on the request.
-        kwargs = self._request_pre_process(
-            method=method,
-            url=path,
-            params=params,
-            content=content,
-            data=data,
-            files=files,
-            json=json,
-            xml=xml,
-            headers=headers,
-            cookies=cookies,
-            timeout=timeout,
-            extensions=extensions,
-            request_model_kwargs=request_model_kwargs,
-        )
-
-        # Build the initial request and initialize the counter.
-        request = self._client.build_request(**kwargs)
-        request_counter = 0
-
-        # While the number of requests being performed is less than or equal to the
-        # maximum number allowed, then keep calling the API.
-        while request_counter <= max_retries:
-            request_counter += 1
-            response = self._client.send(
-                request, auth=auth, follow_redirects=follow_redirects, stream=stream
+        # Metrics and spans are only collected when a metrics hook or a tracer has
+        # been assigned to the client.  Otherwise the tracker is None and every
+        # measurement is skipped.
+        tracker = (
+            None
+            if self._metrics is None and self._tracer is None
+            else RequestTracker(
+                self._metrics,
+                method,
+                path,
+                endpoint,
+                tracer=self._tracer,
+                model=response_model,
             )
+        )
 
-            # If the response is ok, then we should return the response.  If a model is
-            # presented to us, then we will pass the model to the unmarshal utility to
-            # handle transitioning the data into the expected class.
-            if response.status_code == codes.OK and response_model:
-                return unmarshal(
-                    response=response,
-                    model=response_model,
-                    client=self,
-                    json_model_kwargs=self._json_load_kwargs | response_model_kwargs,
-                    xml_model_kwargs=self._xml_load_kwargs | response_model_kwargs,
-                )
-
-            # If no model was passed, then simply return the response object.
-            elif response.status_code == codes.OK:
-                return response
-
-            # As the response wasn't ok, let's grab the ErrorStatus object that relates
-            # to the status code that we got and determine the next steps.
-            status = error_map[response.status_code]
-
-            # If the status code is retryable, then pass the response to the retry
-            # handler to perform any optional transformation.  Then sleep the amount
-            # if time determined by the status code and then continue to the next
-            # iteration.
-            if status.retry:
-                request = self._retry_request(response)
-                timer = random.uniform(0, status.jitter) + (
-                    request_counter * status.backoff
-                )
-                sleep(timer)
-                continue
-
-            # Otherwise we will want to raise the error as specified by the error map
-            error_obj = None
-            raise status.exception(
-                response=response, template=status.template, obj=error_obj
+        body: Any = None
+        try:
+            # Perform any pre-processing necessary on the request.
+            kwargs = self._request_pre_process(
+                method=method,
+                url=path,
+                params=params,
+                content=content,
+                data=data,
+                files=files,
+                json=json,
+                xml=xml,
+                headers=headers,
+                cookies=cookies,
+                timeout=timeout,
+                extensions=extensions,
+                request_model_kwargs=request_model_kwargs,
+                compression=compression,
             )
 
-        # If too many attempts were made, then raise a retry error.
-        raise RetryError(url=str(path), method=method, attempts=request_counter)
+            # Streamed bodies wrapped for replaying are released once the request has
+            # finished.
+            if kwargs["content"] is not content:
+                body = kwargs["content"]
+
+            # Build the initial request and initialize the counter.  When balancing
+            # across several base URLs, the base URL that failed the last attempt is
+            # excluded from the next one.
+            request = self._client.build_request(**kwargs)
+            request_counter = 0
+            balancer = self._balancer
+            failed: int | None = None
+            if tracker is not None:
+                tracker.lap("pre_process")
+
+            # While the number of requests being performed is less than or equal to
+            # the maximum number allowed, then keep calling the API.
+            while request_counter <= max_retries:
+                request_counter += 1
+                upstream = None
+
+                # If a deadline has been set, then the timeouts of the attempt are
+                # shrunk to the time remaining until it.  The deadline is checked
+                # before routing, as the balancer counts routed attempts as outstanding.
+                cap_timeout(request, check_deadline(method=method, url=request.url))
+                if balancer is not None:
+                    request, upstream = balancer.route(request, exclude=failed)
+                    started = perf_counter()
+                if tracker is not None:
+                    tracker.attempt(request)
+                try:
+                    response = self._client.send(
+                        request,
+                        auth=auth,
+                        follow_redirects=follow_redirects,
+                        stream=stream,
+                    )
+                except BaseException as err:
+                    if balancer is not None and upstream is not None:
+                        balancer.release(upstream)
+
+                    # A timeout caused by the deadline passing ends the request.
+                    if isinstance(err, TimeoutException):
+                        check_deadline(method=method, url=request.url)
+
+                    # Transport failures are only retried when there is another base
+                    # URL to send the request to, and it's safe to resend it.
+                    if (
+                        balancer is None
+                        or upstream is None
+                        or not isinstance(err, TransportError)
+                    ):
+                        raise
+                    balancer.failed(upstream)
+                    if request_counter > max_retries or not balancer.can_failover(
+                        method, err
+                    ):
+                        raise
+                    self._logger.warning(
+                        "%s %s failed (%s), retrying on another base URL",
+                        method,
+                        request.url,
+                        err.__class__.__name__,
+                    )
+                    failed = upstream
+                    continue
+                if balancer is not None and upstream is not None:
+                    balancer.release(upstream, perf_counter() - started)
+                if tracker is not None:
+                    tracker.sent(response)
+
+                # If the response is successful and no model was passed, then simply
+                # return the response object.  If a model is presented to us, then we
+                # will pass the model to the unmarshal utility to handle transitioning
+                # the data into the expected class.  Responses without a body (such as
+                # 204 No Content) have nothing to unmarshal and return None instead.
+                if response.status_code in success_codes:
+                    if not response_model:
+                        return response
+                    if response.status_code == codes.NO_CONTENT or not response.content:
+                        return None
+                    obj = unmarshal(
+                        response=response,
+                        model=response_model,
+                        client=self,
+                        json_model_kwargs=self._json_load_kwargs
+                        | response_model_kwargs,
+                        xml_model_kwargs=self._xml_load_kwargs | response_model_kwargs,
+                    )
+                    if tracker is not None:
+                        tracker.unmarshalled(response, obj)
+                    return obj
+
+                # As the response wasn't ok, let's grab the ErrorStatus object that
+                # relates to the status code that we got and determine the next steps.
+                status = status_map[response.status_code]
+
+                # If the status code is retryable, then pass the response to the retry
+                # handler to perform any optional transformation.  Then sleep the
+                # amount if time determined by the status code and then continue to
+                # the next iteration.
+                if status.retry:
+                    if balancer is not None and upstream is not None:
+                        balancer.failed(upstream)
+                        failed = upstream
+                    request = self._retry_request(response)
+                    timer = random.uniform(0, status.jitter) + (
+                        request_counter * status.backoff
+                    )
+                    check_deadline(timer, method=method, url=request.url)
+                    if tracker is not None:
+                        tracker.backoff(timer)
+                    sleep(timer)
+                    continue
+
+                # Otherwise we will want to raise the error as specified by the error
+                # map.  The error model is passed along so that the body is only
+                # decoded if the caller actually inspects the exception object.
+                raise status.error(response)
+
+            # If too many attempts were made, then raise a retry error.
+            raise RetryError(url=str(path), method=method, attempts=request_counter)
+        except BaseException as err:
+            if tracker is not None:
+                tracker.fail(err)
+            raise
+        finally:
+            if isinstance(body, ReplayableBody):
+                body.close()
+            if tracker is not None:
+                tracker.finish()
+
+
+def _transfer(
+    send: Callable[[dict[str, str]], Response],
+    transfer: Download | Segment,
+    retries: int,
+) -> None:
+    """
+    Streams the response body into the transfer, resuming the transfer from its
+    current offset whenever the connection is interrupted.
+    """
+    attempt = 0
+    while True:
+        try:
+            response = send(transfer.headers)
+            try:
+                transfer.begin(response)
+                for chunk in response.iter_raw():
+                    transfer.write(chunk)
+            finally:
+                transfer.flush()
+                response.close()
+        except TransportError:
+            if attempt >= retries:
+                raise
+        else:
+            if transfer.complete or attempt >= retries:
+                return
+
+        # The transfer was interrupted, so we will wait before resuming the transfer
+        # from the current offset.
+        attempt += 1
+        delay = random.uniform(0, RESUME_JITTER) + attempt * RESUME_BACKOFF
+        check_deadline(delay)
+        sleep(delay)
+
+
+def _send_part(
+    client: Any, upload: ChunkedUpload, part: UploadPart, retries: int
+) -> None:
+    """
+    Uploads the part, retrying the part whenever the connection fails.
+    """
+    attempt = 0
+    while True:
+        try:
+            result = upload.upload_part(client, part)
+        except TransportError:
+            if attempt >= retries:
+                raise
+        else:
+            upload.record(part, result)
+            return
+        attempt += 1
+        delay = random.uniform(0, PART_JITTER) + attempt * PART_BACKOFF
+        check_deadline(delay)
+        sleep(delay)
@@ -0,0 +1,159 @@
+"""
+Request tracing instrumentation.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from typing import Any, Protocol
+
+from ._version import version as RESTFLY_VERSION
+
+AttributeValue = str | bool | int | float
+"""The value types that may be stored as a span attribute."""
+
+
+class Span(Protocol):
+    """
+    Interface of a single span created by a tracer.
+    """
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        """
+        Sets an attribute on the span.
+
+        Args:
+            key: The attribute name.
+            value: The attribute value.
+        """
+
+    def record_exception(self, error: BaseException) -> None:
+        """
+        Records the exception on the span and marks the span as failed.
+
+        Args:
+            error: The exception that was raised.
+        """
+
+    def end(self) -> None:
+        """
+        Ends the span.
+        """
+
+
+class Tracer(Protocol):
+    """
+    Interface for creating the tracing spans of the requests made through a client.
+
+    Spans are strictly nested: every span started is ended before its parent is, so a
+    tracer can treat a started span as the current span until it has ended.
+    """
+
+    def start_span(self, name: str, attributes: Mapping[str, AttributeValue]) -> Span:
+        """
+        Starts a new span as a child of the current span.
+
+        Args:
+            name: The name of the span.
+            attributes: The initial attributes of the span.
+
+        Returns:
+            The started span.
+        """
+        ...
+
+
+class OpenTelemetryTracer:
+    """
+    Tracer adapter for OpenTelemetry.  Each span is made the current span until it has
+    ended, so any spans created by other instrumentation (such as the HTTPX
+    instrumentation) are nested within the request attempt that made them.
+
+    Requires the ``opentelemetry-api`` package.
+
+    Args:
+        tracer:
+            The OpenTelemetry tracer to create the spans with.  If unspecified, the
+            tracer is fetched from the global tracer provider.
+        name:
+            The instrumentation name used when fetching the tracer.
+
+    Example:
+        >>> client = APIClient(tracer=OpenTelemetryTracer())
+    """
+
+    def __init__(self, tracer: Any | None = None, name: str = "restfly") -> None:
+        try:
+            from opentelemetry import context, trace
+        except ImportError as err:  # pragma: no cover
+            raise ImportError(
+                "OpenTelemetryTracer requires the opentelemetry-api package."
+            ) from err
+        self._context = context
+        self._trace = trace
+        self._tracer = (
+            tracer if tracer is not None else trace.get_tracer(name, RESTFLY_VERSION)
+        )
+
+    def start_span(
+        self, name: str, attributes: Mapping[str, AttributeValue]
+    ) -> OpenTelemetrySpan:
+        span = self._tracer.start_span(name, attributes=attributes)
+        token = self._context.attach(self._trace.set_span_in_context(span))
+        return OpenTelemetrySpan(span, self._context, token)
+
+
+class OpenTelemetrySpan:
+    """
+    Wrapper of an OpenTelemetry span that restores the previous context once ended.
+    """
+
+    __slots__ = ("_context", "_token", "span")
+
+    def __init__(self, span: Any, context: Any, token: object) -> None:
+        self.span = span
+        self._context = context
+        self._token = token
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        self.span.set_attribute(key, value)
+
+    def record_exception(self, error: BaseException) -> None:
+        from opentelemetry.trace import Status, StatusCode
+
+        self.span.record_exception(error)
+        self.span.set_status(Status(StatusCode.ERROR, error.__class__.__name__))
+
+    def end(self) -> None:
+        self._context.detach(self._token)
+        self.span.end()
+
+
+@contextmanager
+def traced(
+    tracer: Tracer | None, name: str, attributes: Mapping[str, AttributeValue]
+) -> Iterator[Span | None]:
+    """
+    Wraps the block within a span if a tracer is assigned.  Any exception raised within
+    the block is recorded on the span.
+
+    Args:
+        tracer: The tracer to create the span with (if any).
+        name: The name of the span.
+        attributes: The initial attributes of the span.
+
+    Yields:
+        The span, or None if no tracer was assigned.
+    """
+    if tracer is None:
+        yield None
+        return
+    span = tracer.start_span(name, attributes)
+    try:
+        yield span
+    except BaseException as err:
+        span.record_exception(err)
+        raise
+    finally:
+        span.end()
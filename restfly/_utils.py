@@ -1,12 +1,21 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, get_origin, get_type_hints, overload
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    get_origin,
+    get_type_hints,
+    is_typeddict,
+    overload,
+)
 
 from httpx import Response
 from pydantic import BaseModel, TypeAdapter
+from pydantic_core import from_json
 from pydantic_xml import BaseXmlModel
 
-from .types import Model, XMLModel
+from .types import Model, RawModel, RawResponse, XMLModel
 
 if TYPE_CHECKING:
     from ._async import AsyncAPIClient
@@ -24,6 +33,17 @@ def unmarshal(
 ) -> XMLModel: ...
 
 
+@overload
+def unmarshal(
+    response: Response,
+    *,
+    model: RawModel,
+    client: APIClient | AsyncAPIClient,
+    json_model_kwargs: dict[str, Any] | None = ...,
+    xml_model_kwargs: dict[str, Any] | None = ...,
+) -> RawResponse: ...
+
+
 @overload
 def unmarshal(
     response: Response,
@@ -49,11 +69,11 @@ def unmarshal(
 def unmarshal(
     response: Response,
     *,
-    model: type[Model] | type[XMLModel] | type[list[Model]],
+    model: type[Model] | type[XMLModel] | type[list[Model]] | RawModel,
     client: APIClient | AsyncAPIClient,
     json_model_kwargs: dict[str, Any] | None = None,
     xml_model_kwargs: dict[str, Any] | None = None,
-) -> XMLModel | Model | list[Model]:
+) -> XMLModel | Model | list[Model] | RawResponse:
     # initialize the mutables.
     ctx = {"restfly_client": client}
     json_model_kwargs = {} if json_model_kwargs is None else json_model_kwargs
@@ -62,14 +82,29 @@ def unmarshal(
     xml_model_kwargs = {} if xml_model_kwargs is None else xml_model_kwargs
     xml_model_kwargs["context"] = xml_model_kwargs.get("context", {}) | ctx
 
+    # Raw response models skip model construction entirely.  A memoryview of the body
+    # is returned as-is, and dict or list returns the JSON data decoded with the
+    # client's JSON codec (if one is assigned).
+    if model is memoryview:
+        return memoryview(response.content)
+    elif model is dict or model is list:
+        if client._json_codec is not None:
+            return client._json_codec.loads(response.content)
+        return from_json(response.content)
+
     # If the model has an origin or list, then we will need to wrap it in a type
     # adapter and return the model that way.  This allows us to handle things like
     # lists just like how FastAPI allows you to wrap models in list definitions.
     #
+    # Typed dictionaries (such as the models compiled by projection) are handled the
+    # same way.
+    #
     # NOTE: We could likely expand the type adapter to support more use cases, but
-    #       are purposefully keeping this constrained here.
-    if get_origin(model) is list:
-        return TypeAdapter(model).validate_json(response.content, **json_model_kwargs)
+    #       are purposefully keeping this constrained here.  Building the type adapter
+    #       is far more expensive than the validation itself, so the adapters are
+    #       cached per model.
+    if get_origin(model) is list or is_typeddict(model):
+        return _type_adapter(model).validate_json(response.content, **json_model_kwargs)
 
     # As Pydantic-XML base-classes the Pydantic BaseModel, we will first check to see
     # if the model passed to us is a Pydantic-XML model.  If it is, then unmarshal the
@@ -86,6 +121,14 @@ def unmarshal(
     raise TypeError(f"model {model} is not a valid type.")
 
 
+@lru_cache(maxsize=128)
+def _type_adapter(model: Any) -> TypeAdapter:
+    """
+    Returns the cached type adapter for the model.
+    """
+    return TypeAdapter(model)
+
+
 def assign_annotations(obj: Any, base_type: type[Any]) -> None:
     """
     Assigns public attributes that have an annotation of the base_type.
@@ -1,4 +1,4 @@
-from typing import Literal, TypeVar
+from typing import Any, Literal, TypeVar
 
 from httpx import (
     AsyncBaseTransport,
@@ -7,6 +7,8 @@ from httpx import (
     Client,
     Request,
     Response,
+    TimeoutException,
+    TransportError,
     codes,
 )
 from httpx import __version__ as HTTPX_VERSION
@@ -39,6 +41,15 @@ from pydantic_xml import BaseXmlModel
 Model = TypeVar("Model", bound=BaseModel)
 XMLModel = TypeVar("XMLModel", bound=BaseXmlModel)
 
+RawModel = type[dict] | type[list] | type[memoryview]
+"""
+Response model types that skip model construction.  ``dict`` and ``list`` return the
+decoded JSON data and ``memoryview`` returns a view of the response body.
+"""
+
+RawResponse = dict[str, Any] | list[Any] | memoryview
+""" The response types returned when a RawModel is used as the response model. """
+
 HTTPMethods = Literal["GET", "OPTIONS", "HEAD", "POST", "PUT", "PATCH", "DELETE"]
 QueryParamTypes = BaseModel | _QueryParamTypes
 
@@ -64,6 +75,8 @@ __all__ = [
     "Model",
     "ProxyTypes",
     "QueryParamTypes",
+    "RawModel",
+    "RawResponse",
     "Request",
     "RequestContent",
     "RequestData",
@@ -71,7 +84,9 @@ __all__ = [
     "RequestFiles",
     "Response",
     "UseClientDefault",
+    "TimeoutException",
     "TimeoutTypes",
+    "TransportError",
     "XMLModel",
     "codes",
 ]
@@ -73,3 +73,13 @@ async def test_async_model_save(httpx_mock: HTTPXMock):
 
     with pytest.raises(TypeError):
         await mdl.async_remove()
+
+
+def test_model_save_no_content(httpx_mock: HTTPXMock):
+    httpx_mock.add_response(
+        url="https://nourl.tld/test/1", method="put", status_code=204
+    )
+    mdl = ExModel.model_validate(
+        {"id": 1, "name": "Updated"}, context={"restfly_client": ExClient()}
+    )
+    assert mdl.save() is mdl
@@ -0,0 +1,215 @@
+import httpx
+import pytest
+from restfly import APIClient, AsyncAPIClient, ErrorStatus, URLBalancer
+
+URLS = ["https://us.example.com/api", "https://eu.example.com/api/", "https://ap.x"]
+NO_WAIT = {503: ErrorStatus(retry=True, backoff=0, jitter=0, log_level=None)}
+
+
+class Recorder:
+    def __init__(self, failing=(), status=None):
+        self.failing = dict.fromkeys(failing, status)
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.host in self.failing:
+            if self.failing[request.url.host] is None:
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(self.failing[request.url.host])
+        return httpx.Response(200, json={"url": str(request.url)})
+
+    @property
+    def hosts(self):
+        return [r.url.host.split(".")[0] for r in self.requests]
+
+
+def client(recorder, **kwargs):
+    return APIClient(
+        base_url=URLS,
+        transport=httpx.MockTransport(recorder),
+        error_map=NO_WAIT,
+        **kwargs,
+    )
+
+
+def test_balancer_round_robin():
+    balancer = URLBalancer(URLS)
+    assert balancer.urls[0] == "https://us.example.com/api/"
+    assert [balancer.select() for _ in range(4)] == [0, 1, 2, 0]
+    balancer.failed(1)
+    assert [balancer.select() for _ in range(3)] == [2, 0, 2]
+    assert balancer.select(exclude=0) == 2
+    assert balancer.upstreams[1].failures == 1
+    with pytest.raises(ValueError):
+        URLBalancer([])
+    with pytest.raises(ValueError):
+        URLBalancer(URLS, policy="random")
+
+
+def test_balancer_all_failing():
+    balancer = URLBalancer(URLS[:2])
+    balancer.failed(0)
+    balancer.failed(1)
+    assert balancer.select(exclude=0) == 1
+    assert URLBalancer(URLS[:1]).select(exclude=0) == 0
+
+
+def test_balancer_least_outstanding():
+    balancer = URLBalancer(URLS, policy="least_outstanding")
+    assert [balancer.select() for _ in range(3)] == [0, 1, 2]
+    balancer.release(1)
+    assert balancer.select() == 1
+    assert balancer.upstreams[1].outstanding == 1
+
+
+def test_balancer_latency():
+    balancer = URLBalancer(URLS, policy="latency", decay=0.5)
+    for idx, elapsed in enumerate([0.3, 0.1, 0.15]):
+        balancer.release(balancer.select(), elapsed)
+        assert balancer.upstreams[idx].latency == elapsed
+    assert balancer.select() == 1
+    # The in-flight request to the fastest host doubles its load.
+    assert balancer.select() == 2
+    balancer.release(1, 0.5)
+    assert balancer.upstreams[1].latency == pytest.approx(0.3)
+
+
+def test_balancer_route():
+    balancer = URLBalancer(URLS)
+    request = httpx.Request(
+        "POST", "https://us.example.com/api/items?page=2", content=b"data"
+    )
+    routed, index = balancer.route(request)
+    assert (routed, index) == (request, 0)
+    routed, index = balancer.route(request)
+    assert index == 1
+    assert str(routed.url) == "https://eu.example.com/api/items?page=2"
+    assert routed.headers["Host"] == "eu.example.com"
+    assert routed.read() == b"data"
+    other = httpx.Request("GET", "https://other.example.com/api/items")
+    assert balancer.route(other) == (other, None)
+
+
+def test_balancer_can_failover():
+    request = httpx.Request("POST", "https://example.com")
+    connect = httpx.ConnectError("refused", request=request)
+    read = httpx.ReadTimeout("timeout", request=request)
+    assert URLBalancer.can_failover("POST", connect)
+    assert not URLBalancer.can_failover("POST", read)
+    assert URLBalancer.can_failover("get", read)
+
+
+def test_client_balancing():
+    recorder = Recorder()
+    api = client(recorder)
+    assert api._base_url == "https://us.example.com/api/"
+    for _ in range(3):
+        api._get("items")
+    assert recorder.hosts == ["us", "eu", "ap"]
+    assert str(recorder.requests[2].url) == "https://ap.x/items"
+    api._get("https://other.example.com/items")
+    assert recorder.requests[-1].url.host == "other.example.com"
+    assert api._balancer.upstreams[0].latency is not None
+
+    assert APIClient(base_url="https://example.com")._balancer is None
+    api = APIClient(base_url=httpx.URL("https://example.com/api/"))
+    assert api._balancer is None
+    assert api._client.base_url == "https://example.com/api/"
+
+    class Client(APIClient):
+        _base_url = URLS
+        _balance_policy = "least_outstanding"
+
+    assert Client()._balancer.policy == "least_outstanding"
+    assert Client(balance_policy="latency")._balancer.policy == "latency"
+
+
+def test_client_balancing_retry_status():
+    recorder = Recorder(failing=["us.example.com"], status=503)
+    api = client(recorder)
+    assert api._get("items", response_model=dict) == {
+        "url": "https://eu.example.com/api/items"
+    }
+    assert recorder.hosts == ["us", "eu"]
+    api._get("items")
+    api._get("items")
+    assert recorder.hosts == ["us", "eu", "ap", "eu"]
+
+
+def test_client_balancing_transport_failover(caplog):
+    recorder = Recorder(failing=["us.example.com", "eu.example.com"])
+    api = client(recorder)
+    assert api._post("items", json={"a": 1}).status_code == 200
+    assert recorder.hosts == ["us", "eu", "ap"]
+    assert recorder.requests[2].read() == b'{"a":1}'
+    assert "retrying on another base URL" in caplog.text
+    assert all(upstream.outstanding == 0 for upstream in api._balancer.upstreams)
+
+    recorder.failing["ap.x"] = None
+    with pytest.raises(httpx.ConnectError):
+        api._get("items", max_retries=1)
+
+    recorder = Recorder()
+
+    def read_timeout(request):
+        recorder(request)
+        raise httpx.ReadTimeout("timeout", request=request)
+
+    api = APIClient(base_url=URLS, transport=httpx.MockTransport(read_timeout))
+    with pytest.raises(httpx.ReadTimeout):
+        api._post("items")
+    assert recorder.hosts == ["us"]
+    with pytest.raises(httpx.ReadTimeout):
+        api._get("items", max_retries=2)
+    assert recorder.hosts == ["us", "eu", "ap", "us"]
+
+
+def test_client_balancing_other_errors():
+    def interrupt(request):
+        raise KeyboardInterrupt
+
+    api = APIClient(base_url=URLS, transport=httpx.MockTransport(interrupt))
+    with pytest.raises(KeyboardInterrupt):
+        api._get("items")
+    assert api._balancer.upstreams[0].outstanding == 0
+    assert api._balancer.upstreams[0].failures == 0
+
+    api = APIClient(
+        base_url="https://example.com", transport=httpx.MockTransport(interrupt)
+    )
+    with pytest.raises(KeyboardInterrupt):
+        api._get("items")
+
+
+async def test_async_client_balancing():
+    recorder = Recorder(failing=["us.example.com"])
+
+    async def handler(request):
+        return recorder(request)
+
+    api = AsyncAPIClient(
+        base_url=URLS,
+        transport=httpx.MockTransport(handler),
+        error_map=NO_WAIT,
+        balance_policy="latency",
+    )
+    assert await api._get("items", response_model=dict) == {
+        "url": "https://eu.example.com/api/items"
+    }
+    recorder.failing = {"ap.x": 503}
+    await api._get("items")
+    assert recorder.hosts == ["us", "eu", "ap", "eu"]
+
+    recorder.failing = dict.fromkeys(["us.example.com", "eu.example.com", "ap.x"])
+    with pytest.raises(httpx.ConnectError):
+        await api._get("items", max_retries=1)
+    assert len(recorder.requests) == 6
+
+    async def interrupt(request):
+        raise KeyboardInterrupt
+
+    api = AsyncAPIClient(base_url=URLS, transport=httpx.MockTransport(interrupt))
+    with pytest.raises(KeyboardInterrupt):
+        await api._get("items")
+    assert api._balancer.upstreams[0].outstanding == 0
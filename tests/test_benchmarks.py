@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import pytest
+from benchmarks._harness import load, main, report, run, save
+from benchmarks.http2 import main as http2_main
+from benchmarks.load import main as load_main
+from benchmarks.pipeline import build_cases
+
+# The benchmarks are deselected by default, run them with ``just bench-tests`` (or
+# ``pytest -m benchmark``).
+pytestmark = pytest.mark.benchmark
+
+
+def test_pipeline_benchmarks(tmp_path: Path):
+    results = run(build_cases(), rounds=2, scale=0.001)
+    names = {r.name for r in results}
+    assert "request/retry" in names
+    assert "async/iterator" in names
+    assert "unmarshal/xml-list-1000" in names
+    assert all(r.rounds == 2 and r.iterations >= 1 for r in results)
+
+    path = tmp_path / "results.json"
+    save(results, path)
+    baseline = load(path)
+    assert set(baseline) == names
+    assert "+0.0%" in report(results, baseline)
+
+
+def test_pipeline_benchmarks_cli(tmp_path: Path, capsys):
+    path = tmp_path / "results.json"
+    results = main(
+        build_cases(),
+        ["-k", "unmarshal/json", "-r", "1", "-s", "0.001", "-o", str(path)],
+    )
+    assert {r.name for r in results} == set(load(path))
+    assert "unmarshal/json-model" in capsys.readouterr().out
+
+
+def test_load_benchmark(capsys):
+    report = load_main(["-n", "20", "-c", "4", "--fail-rate", "0.2"])
+    assert report.operations == 20
+    assert report.errors == 0
+    assert "RESTFly load test: 20 operations" in capsys.readouterr().out
+
+
+def test_load_benchmark_async():
+    report = load_main(["--async", "-n", "10", "-r", "500", "--no-memory"])
+    assert report.operations == 10
+    assert report.errors == 0
+    assert report.memory_growth is None
+
+
+def test_http2_benchmark(capsys):
+    http1, http2 = http2_main(["-n", "20", "--rounds", "1", "--delay", "0.01"])
+    assert http1.requests == http2.requests == 20
+    assert http2.connections == 1
+    assert "HTTP/2" in capsys.readouterr().out
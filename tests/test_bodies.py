@@ -0,0 +1,398 @@
+import io
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+from restfly import (
+    APIClient,
+    AsyncAPIClient,
+    AsyncFileUpload,
+    AsyncReplayableBody,
+    ErrorStatus,
+    FileUpload,
+    ReplayableBody,
+    ReplayError,
+)
+
+NO_WAIT = {503: ErrorStatus(retry=True, backoff=0, jitter=0)}
+
+
+def records(count: int = 3):
+    for idx in range(count):
+        yield f"record-{idx}\n".encode()
+
+
+async def arecords(count: int = 3):
+    for idx in range(count):
+        yield f"record-{idx}\n".encode()
+
+
+def test_replayable_body_generator():
+    body = ReplayableBody(records())
+    expected = b"record-0\nrecord-1\nrecord-2\n"
+    assert body.length is None
+    assert b"".join(body) == expected
+    assert b"".join(body) == expected
+
+
+def test_replayable_body_partial_replay():
+    body = ReplayableBody(records())
+    first = iter(body)
+    assert next(first) == b"record-0\n"
+    assert b"".join(body) == b"record-0\nrecord-1\nrecord-2\n"
+
+
+def test_replayable_body_spooled():
+    body = ReplayableBody(iter([b"x" * 100] * 10), max_size=256)
+    assert b"".join(body) == b"x" * 1000
+    assert body._buffer.chunks is None
+    assert body._buffer.spool._rolled
+    assert b"".join(body) == b"x" * 1000
+    body.close()
+    assert body._buffer.spool is None
+
+
+def test_replayable_body_spooled_partial_replay():
+    body = ReplayableBody(iter([b"a" * 100, b"b" * 100, b"c" * 100]), max_size=150)
+    first = iter(body)
+    assert next(first) + next(first) == b"a" * 100 + b"b" * 100
+    assert b"".join(body) == b"a" * 100 + b"b" * 100 + b"c" * 100
+
+
+@pytest.mark.parametrize("spool_limit", [512, 0, None])
+def test_replayable_body_too_large(spool_limit):
+    body = ReplayableBody(
+        iter([b"x" * 100] * 10), max_size=256, spool_limit=spool_limit
+    )
+    assert b"".join(body) == b"x" * 1000
+    assert not body._buffer.buffering
+    limit = spool_limit or 256
+    with pytest.raises(ReplayError, match=f"larger than {limit} bytes"):
+        b"".join(body)
+
+
+@pytest.mark.parametrize("max_size", [0, None])
+def test_replayable_body_buffering_disabled(max_size):
+    body = ReplayableBody(records(), max_size=max_size)
+    assert b"".join(body) == b"record-0\nrecord-1\nrecord-2\n"
+    with pytest.raises(ReplayError, match="not buffered"):
+        b"".join(body)
+
+
+def test_replayable_body_close():
+    body = ReplayableBody(records())
+    assert b"".join(body) == b"record-0\nrecord-1\nrecord-2\n"
+    body.close()
+    with pytest.raises(ReplayError):
+        b"".join(body)
+
+
+def test_replayable_body_seekable_file(tmp_path):
+    path = tmp_path / "upload.bin"
+    path.write_bytes(b"header" + b"y" * 100_000)
+    with path.open("rb") as fobj:
+        fobj.seek(6)
+        body = ReplayableBody(fobj)
+        assert body.length == 100_000
+        assert b"".join(body) == b"y" * 100_000
+        assert b"".join(body) == b"y" * 100_000
+
+
+def test_replayable_body_unseekable_file():
+    class Stream(io.RawIOBase):
+        def __init__(self):
+            self.data = io.BytesIO(b"streamed")
+
+        def readable(self):
+            return True
+
+        def read(self, size=-1):
+            return self.data.read(size)
+
+    body = ReplayableBody(Stream())
+    assert body.length is None
+    assert b"".join(body) == b"streamed"
+    assert b"".join(body) == b"streamed"
+
+
+def test_replayable_body_bytesio():
+    body = ReplayableBody(io.BytesIO(b"in memory"))
+    assert body.length == 9
+    assert b"".join(body) == b"in memory"
+
+
+def test_client_retries_generator_body(httpx_mock: HTTPXMock):
+    client = APIClient(base_url="https://httpbin.org", error_map=NO_WAIT)
+    httpx_mock.add_response(url="https://httpbin.org/post", status_code=503)
+    httpx_mock.add_response(url="https://httpbin.org/post", status_code=200)
+    client._post("/post", content=records())
+    requests = httpx_mock.get_requests()
+    assert len(requests) == 2
+    for request in requests:
+        assert request.content == b"record-0\nrecord-1\nrecord-2\n"
+
+
+def test_client_retries_file_body(httpx_mock: HTTPXMock, tmp_path):
+    path = tmp_path / "upload.bin"
+    path.write_bytes(b"z" * 1024)
+    client = APIClient(base_url="https://httpbin.org", error_map=NO_WAIT)
+    httpx_mock.add_response(url="https://httpbin.org/post", status_code=503)
+    httpx_mock.add_response(url="https://httpbin.org/post", status_code=200)
+    with path.open("rb") as fobj:
+        client._post("/post", content=fobj)
+    for request in httpx_mock.get_requests():
+        assert request.headers["Content-Length"] == "1024"
+        assert request.content == b"z" * 1024
+
+
+async def test_async_client_retries_generator_body(httpx_mock: HTTPXMock):
+    client = AsyncAPIClient(base_url="https://httpbin.org", error_map=NO_WAIT)
+    httpx_mock.add_response(url="https://httpbin.org/post", status_code=503)
+    httpx_mock.add_response(url="https://httpbin.org/post", status_code=200)
+    await client._post("/post", content=arecords())
+    requests = httpx_mock.get_requests()
+    assert len(requests) == 2
+    for request in requests:
+        assert request.content == b"record-0\nrecord-1\nrecord-2\n"
+
+
+class StreamingTransport(httpx.BaseTransport):
+    """
+    Transport consuming the request stream as the network transports do (the mock
+    transports read and cache the body on the request).
+    """
+
+    def __init__(self):
+        self.bodies = []
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.bodies.append(b"".join(request.stream))
+        return httpx.Response(503 if len(self.bodies) == 1 else 200)
+
+
+class AsyncStreamingTransport(httpx.AsyncBaseTransport):
+    def __init__(self):
+        self.bodies = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.bodies.append(b"".join([chunk async for chunk in request.stream]))
+        return httpx.Response(503 if len(self.bodies) == 1 else 200)
+
+
+LARGE = 3 * 1024 * 1024
+
+
+def large_body(chunk: bytes = b"z" * 65_536):
+    for _ in range(LARGE // len(chunk)):
+        yield chunk
+
+
+async def alarge_body():
+    for chunk in large_body():
+        yield chunk
+
+
+def test_client_generator_body_replayed():
+    transport = StreamingTransport()
+    client = APIClient(
+        base_url="https://httpbin.org", error_map=NO_WAIT, transport=transport
+    )
+    client._post("/post", content=records())
+    assert transport.bodies == [b"record-0\nrecord-1\nrecord-2\n"] * 2
+
+
+def test_client_large_generator_body_spooled():
+    transport = StreamingTransport()
+    client = APIClient(
+        base_url="https://httpbin.org", error_map=NO_WAIT, transport=transport
+    )
+    client._post("/post", content=large_body())
+    assert [len(body) for body in transport.bodies] == [LARGE, LARGE]
+
+
+async def test_async_client_large_generator_body_spooled():
+    transport = AsyncStreamingTransport()
+    client = AsyncAPIClient(
+        base_url="https://httpbin.org", error_map=NO_WAIT, transport=transport
+    )
+    await client._post("/post", content=alarge_body())
+    assert [len(body) for body in transport.bodies] == [LARGE, LARGE]
+    assert transport.bodies[0] == transport.bodies[1]
+
+
+def test_client_large_generator_body_not_retried():
+    class Client(APIClient):
+        _replay_buffer_size = 16
+        _replay_spool_limit = 20
+
+    transport = StreamingTransport()
+    client = Client(
+        base_url="https://httpbin.org", error_map=NO_WAIT, transport=transport
+    )
+    with pytest.raises(ReplayError):
+        client._post("/post", content=records())
+    assert len(transport.bodies) == 1
+
+
+def test_client_releases_replay_buffer(httpx_mock: HTTPXMock):
+    client = APIClient(base_url="https://httpbin.org")
+    httpx_mock.add_response(url="https://httpbin.org/post")
+    bodies = []
+    wrap = client._request_pre_process
+
+    def pre_process(**kwargs):
+        processed = wrap(**kwargs)
+        bodies.append(processed["content"])
+        return processed
+
+    client._request_pre_process = pre_process
+    client._post("/post", content=records())
+    assert bodies[0]._buffer.chunks is None
+
+
+def test_client_reused_headers(httpx_mock: HTTPXMock):
+    client = APIClient(base_url="https://httpbin.org")
+    httpx_mock.add_response(url="https://httpbin.org/post", is_reusable=True)
+    headers = {"X-Trace": "1"}
+    client._post("/post", content=io.BytesIO(b"x" * 10), headers=headers)
+    client._post("/post", content=io.BytesIO(b"y" * 50), headers=headers)
+    assert headers == {"X-Trace": "1"}
+    first, second = httpx_mock.get_requests()
+    assert first.headers["Content-Length"] == "10"
+    assert second.headers["Content-Length"] == "50"
+    assert second.content == b"y" * 50
+
+
+async def test_async_replayable_body_too_large():
+    body = AsyncReplayableBody(arecords(), max_size=10, spool_limit=20)
+    assert len(b"".join([chunk async for chunk in body])) == 27
+    with pytest.raises(ReplayError):
+        [chunk async for chunk in body]
+    body.close()
+    AsyncReplayableBody(io.BytesIO(b"sync")).close()
+
+
+async def test_async_replayable_body_sync_source():
+    body = AsyncReplayableBody(io.BytesIO(b"sync"))
+    assert body.length == 4
+    assert b"".join([chunk async for chunk in body]) == b"sync"
+    assert b"".join([chunk async for chunk in body]) == b"sync"
+
+
+def test_client_leaves_static_content():
+    client = APIClient(base_url="https://httpbin.org")
+    kwargs = client._request_pre_process("POST", "/post", content=b"static")
+    assert kwargs["content"] == b"static"
+    body = ReplayableBody(records())
+    kwargs = client._request_pre_process("POST", "/post", content=body)
+    assert kwargs["content"] is body
+    assert "Content-Length" not in kwargs["headers"]
+
+
+async def test_async_replayable_body_partial_replay():
+    body = AsyncReplayableBody(arecords())
+    first = aiter(body)
+    assert await anext(first) == b"record-0\n"
+    assert (
+        b"".join([chunk async for chunk in body]) == b"record-0\nrecord-1\nrecord-2\n"
+    )
+
+
+def test_replayable_body_reader_without_seekable():
+    class Reader:
+        def __init__(self):
+            self.data = io.BytesIO(b"reader")
+
+        def read(self, size=-1):
+            return self.data.read(size)
+
+    body = ReplayableBody(Reader())
+    assert b"".join(body) == b"reader"
+    assert b"".join(body) == b"reader"
+
+
+@pytest.fixture
+def upload_file(tmp_path):
+    path = tmp_path / "upload.bin"
+    path.write_bytes(bytes(range(256)) * 1000)
+    return path
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_file_upload_path(upload_file, use_mmap):
+    progress = []
+    body = FileUpload(
+        upload_file,
+        chunk_size=100_000,
+        progress=lambda sent, total: progress.append((sent, total)),
+        use_mmap=use_mmap,
+    )
+    assert body.length == 256_000
+    assert b"".join(body) == upload_file.read_bytes()
+    assert progress == [(100_000, 256_000), (200_000, 256_000), (256_000, 256_000)]
+    assert b"".join(body) == upload_file.read_bytes()
+
+
+def test_file_upload_empty_and_objects(tmp_path, upload_file):
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    assert b"".join(FileUpload(empty)) == b""
+    with upload_file.open("rb") as fobj:
+        fobj.seek(1000)
+        body = FileUpload(fobj, chunk_size=50_000)
+        assert body.length == 255_000
+        assert b"".join(body) == upload_file.read_bytes()[1000:]
+        assert b"".join(body) == upload_file.read_bytes()[1000:]
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+async def test_async_file_upload_empty(tmp_path, use_mmap):
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    progress = []
+    body = AsyncFileUpload(
+        empty,
+        progress=lambda sent, total: progress.append(sent),
+        use_mmap=use_mmap,
+    )
+    assert body.length == 0
+    assert [chunk async for chunk in body] == []
+    assert progress == []
+
+
+def test_client_upload_retry(httpx_mock: HTTPXMock, upload_file):
+    client = APIClient(base_url="https://httpbin.org", error_map=NO_WAIT)
+    httpx_mock.add_response(url="https://httpbin.org/files", status_code=503)
+    httpx_mock.add_response(url="https://httpbin.org/files", status_code=201)
+    progress = []
+    response = client._upload(
+        "/files",
+        upload_file,
+        method="PUT",
+        progress=lambda sent, total: progress.append(sent),
+    )
+    assert response.status_code == 201
+    for request in httpx_mock.get_requests():
+        assert request.method == "PUT"
+        assert request.headers["Content-Type"] == "application/octet-stream"
+        assert request.headers["Content-Length"] == "256000"
+        assert request.content == upload_file.read_bytes()
+    assert progress[-1] == 256_000
+
+
+async def test_async_client_upload(httpx_mock: HTTPXMock, upload_file):
+    client = AsyncAPIClient(base_url="https://httpbin.org", error_map=NO_WAIT)
+    httpx_mock.add_response(url="https://httpbin.org/files", status_code=503)
+    httpx_mock.add_response(url="https://httpbin.org/files")
+    progress = []
+    await client._upload(
+        "/files",
+        upload_file,
+        headers={"Content-Type": "application/x-tar"},
+        chunk_size=64_000,
+        progress=lambda sent, total: progress.append((sent, total)),
+    )
+    for request in httpx_mock.get_requests():
+        assert request.headers["Content-Type"] == "application/x-tar"
+        assert request.content == upload_file.read_bytes()
+    assert progress[:4] == [(64_000 * i, 256_000) for i in range(1, 5)]
@@ -0,0 +1,125 @@
+import gzip
+import json
+import time
+
+import httpx
+import pytest
+from restfly import (
+    APIClient,
+    AsyncAPIClient,
+    AsyncCassetteTransport,
+    CassetteError,
+    CassetteTransport,
+)
+
+BINARY = bytes(range(256)) * 10
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/items":
+        page = int(request.url.params.get("page", 1))
+        return httpx.Response(200, json={"page": page, "next": page < 3})
+    if request.url.path == "/counter":
+        handler.count = getattr(handler, "count", 0) + 1
+        return httpx.Response(200, json={"count": handler.count})
+    if request.url.path == "/echo":
+        return httpx.Response(201, content=request.read())
+    if request.url.path == "/compressed":
+        return httpx.Response(
+            200,
+            headers={"Content-Encoding": "gzip"},
+            content=gzip.compress(b"compressed body"),
+        )
+    return httpx.Response(200, content=BINARY)
+
+
+def exercise(client: APIClient) -> list:
+    results = [client._get("/items", params={"page": page}).json() for page in (1, 2)]
+    results += [client._get("/counter").json() for _ in range(2)]
+    results.append(client._post("/echo", content=b"one").content)
+    results.append(client._post("/echo", content=b"two").content)
+    results.append(client._get("/compressed").text)
+    results.append(client._get("/binary").content)
+    return results
+
+
+@pytest.fixture
+def cassette(tmp_path):
+    handler.count = 0
+    path = tmp_path / "api.cassette"
+    transport = CassetteTransport(
+        path, "record", transport=httpx.MockTransport(handler)
+    )
+    client = APIClient(base_url="https://example.com", transport=transport)
+    recorded = exercise(client)
+    client._client.close()
+    return path, recorded
+
+
+def test_cassette_replay(cassette):
+    path, recorded = cassette
+    assert recorded[2:4] == [{"count": 1}, {"count": 2}]
+    client = APIClient(
+        base_url="https://example.com", transport=CassetteTransport(path)
+    )
+    assert exercise(client) == recorded
+    # Requests recorded several times are served in order, starting over when every
+    # recorded response has been served.
+    assert client._get("/counter").json() == {"count": 1}
+    with pytest.raises(CassetteError, match="GET https://example.com/missing"):
+        client._get("/missing")
+
+
+def test_cassette_format(cassette):
+    path, _ = cassette
+    with gzip.open(path, "rt") as fobj:
+        lines = [json.loads(line) for line in fobj]
+    assert len(lines) == 8
+    assert lines[0]["url"] == "https://example.com/items?page=1"
+    assert lines[0]["digest"] == ""
+    assert lines[4]["digest"] != lines[5]["digest"]
+    assert "body64" in lines[6] and "body64" in lines[7]
+
+
+def test_cassette_latency_and_bandwidth(cassette):
+    path, _ = cassette
+    transport = CassetteTransport(path, latency=0.05, bandwidth=20_000)
+    client = APIClient(base_url="https://example.com", transport=transport)
+    start = time.perf_counter()
+    client._get("/items", params={"page": 1})
+    assert time.perf_counter() - start >= 0.05
+    start = time.perf_counter()
+    assert client._get("/binary").content == BINARY
+    assert time.perf_counter() - start >= 0.05 + len(BINARY) / 20_000
+    recorded = CassetteTransport(path, latency="recorded")
+    assert APIClient(base_url="https://example.com", transport=recorded)._get("/binary")
+
+
+def test_cassette_invalid_mode(tmp_path):
+    with pytest.raises(ValueError):
+        CassetteTransport(tmp_path / "api.cassette", "rewind")  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        AsyncCassetteTransport(tmp_path / "api.cassette", "rewind")  # type: ignore[arg-type]
+
+
+async def test_async_cassette(tmp_path):
+    path = tmp_path / "api.cassette"
+
+    async def ahandler(request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        return handler(request)
+
+    transport = AsyncCassetteTransport(
+        path, "record", transport=httpx.MockTransport(ahandler)
+    )
+    client = AsyncAPIClient(base_url="https://example.com", transport=transport)
+    recorded = await client._post("/echo", content=b"async")
+    await client._client.aclose()
+    assert recorded.content == b"async"
+
+    transport = AsyncCassetteTransport(path, latency=0.01, bandwidth=1_000_000)
+    client = AsyncAPIClient(base_url="https://example.com", transport=transport)
+    replayed = await client._post("/echo", content=b"async")
+    assert replayed.status_code == 201
+    assert replayed.content == b"async"
+    await client._client.aclose()
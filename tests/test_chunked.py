@@ -0,0 +1,215 @@
+import json
+
+import httpx
+import pytest
+from restfly import (
+    APIClient,
+    AsyncAPIClient,
+    AsyncChunkedUpload,
+    ChunkedUpload,
+    FileUpload,
+    UploadPart,
+)
+
+DATA = bytes(range(256)) * 1000
+
+
+class Server:
+    """
+    Mock server implementing an "initiate / upload part / complete" workflow.
+    """
+
+    def __init__(self, failures: dict[int, int] | None = None):
+        self.failures = dict(failures or {})
+        self.parts: dict[int, bytes] = {}
+        self.started = 0
+        self.uploaded: list[int] = []
+        self.assembled: bytes | None = None
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/uploads":
+            self.started += 1
+            return httpx.Response(201, json={"id": "u1"})
+        if path.startswith("/uploads/u1/parts/"):
+            number = int(path.rsplit("/", 1)[1])
+            if self.failures.get(number):
+                self.failures[number] -= 1
+                raise httpx.ConnectError("connection refused", request=request)
+            self.parts[number] = request.read()
+            self.uploaded.append(number)
+            return httpx.Response(200, headers={"ETag": f'"{number}"'})
+        etags = json.loads(request.read())["parts"]
+        assert etags == [f'"{num}"' for num in sorted(self.parts)]
+        self.assembled = b"".join(self.parts[num] for num in sorted(self.parts))
+        return httpx.Response(200, json={"size": len(self.assembled)})
+
+
+class VendorUpload(ChunkedUpload):
+    part_size = 100_000
+
+    def start(self, client):
+        return client._post("/uploads", json={"size": self.size}).json()
+
+    def upload_part(self, client, part):
+        resp = client._put(
+            f"/uploads/{self.session['id']}/parts/{part.number}",
+            content=self.body(part),
+        )
+        return resp.headers["ETag"]
+
+    def complete(self, client, results):
+        resp = client._post(
+            f"/uploads/{self.session['id']}/complete", json={"parts": results}
+        )
+        return resp.json()
+
+
+class AsyncVendorUpload(AsyncChunkedUpload):
+    part_size = 100_000
+
+    async def start(self, client):
+        return (await client._post("/uploads", json={"size": self.size})).json()
+
+    async def upload_part(self, client, part):
+        resp = await client._put(
+            f"/uploads/{self.session['id']}/parts/{part.number}",
+            content=self.body(part),
+        )
+        return resp.headers["ETag"]
+
+    async def complete(self, client, results):
+        resp = await client._post(
+            f"/uploads/{self.session['id']}/complete", json={"parts": results}
+        )
+        return resp.json()
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    async def asleep(seconds):
+        return None
+
+    monkeypatch.setattr("restfly._sync.sleep", lambda seconds: None)
+    monkeypatch.setattr("restfly._async.sleep", asleep)
+
+
+@pytest.fixture
+def upload_file(tmp_path):
+    path = tmp_path / "upload.bin"
+    path.write_bytes(DATA)
+    return path
+
+
+def client_for(server: Server) -> APIClient:
+    return APIClient(
+        base_url="https://example.com", transport=httpx.MockTransport(server)
+    )
+
+
+def test_chunked_upload(upload_file, tmp_path):
+    server = Server(failures={2: 1})
+    state = tmp_path / "state.json"
+    upload = VendorUpload(upload_file, state=state, workers=2)
+    assert upload.parts[-1] == UploadPart(3, 200_000, 56_000)
+    assert client_for(server)._chunked_upload(upload) == {"size": len(DATA)}
+    assert server.assembled == DATA
+    assert sorted(server.uploaded) == [1, 2, 3]
+    assert not state.exists()
+
+
+def test_chunked_upload_resumes(upload_file, tmp_path):
+    server = Server(failures={2: 3})
+    state = tmp_path / "state.json"
+    client = client_for(server)
+    with pytest.raises(httpx.ConnectError):
+        client._chunked_upload(
+            VendorUpload(upload_file, state=state, workers=1), max_retries=1
+        )
+    parts = json.loads(state.read_text())["parts"]
+    assert parts["1"] == '"1"'
+    assert "2" not in parts
+
+    upload = VendorUpload(upload_file, state=state)
+    assert upload.session == {"id": "u1"}
+    assert [part.number for part in upload.pending][0] == 2
+    assert client._chunked_upload(upload) == {"size": len(DATA)}
+    assert server.started == 1
+    assert server.uploaded.count(1) == 1
+    assert server.assembled == DATA
+
+
+def test_chunked_upload_stale_state(upload_file, tmp_path):
+    state = tmp_path / "state.json"
+    state.write_text(
+        json.dumps(
+            {
+                "size": len(DATA),
+                "mtime": 0,
+                "part_size": 100_000,
+                "session": {"id": "old"},
+                "parts": {"1": '"1"'},
+            }
+        )
+    )
+    upload = VendorUpload(upload_file, state=state, part_size=100_000)
+    assert upload.session is None
+    assert len(upload.pending) == 3
+
+
+def test_chunked_upload_empty_file(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    server = Server()
+    assert client_for(server)._chunked_upload(VendorUpload(path)) == {"size": 0}
+    assert server.uploaded == [1]
+
+
+def test_chunked_upload_abstract(upload_file):
+    with pytest.raises(TypeError):
+        ChunkedUpload(upload_file)  # type: ignore[abstract]
+    with pytest.raises(ValueError):
+        VendorUpload(upload_file, workers=0)
+
+
+async def test_async_chunked_upload(upload_file, tmp_path):
+    server = Server(failures={1: 1, 3: 1})
+    state = tmp_path / "state.json"
+    client = AsyncAPIClient(
+        base_url="https://example.com", transport=httpx.MockTransport(server)
+    )
+    upload = AsyncVendorUpload(upload_file, state=state, workers=2)
+    assert await client._chunked_upload(upload) == {"size": len(DATA)}
+    assert server.assembled == DATA
+    assert not state.exists()
+
+
+async def test_async_chunked_upload_gives_up(upload_file, tmp_path):
+    server = Server(failures={2: 5})
+    state = tmp_path / "state.json"
+    client = AsyncAPIClient(
+        base_url="https://example.com", transport=httpx.MockTransport(server)
+    )
+    with pytest.raises(httpx.ConnectError):
+        await client._chunked_upload(
+            AsyncVendorUpload(upload_file, state=state, workers=3), max_retries=2
+        )
+    assert "2" not in json.loads(state.read_text())["parts"]
+
+
+def test_async_chunked_upload_abstract(upload_file):
+    with pytest.raises(TypeError):
+        AsyncChunkedUpload(upload_file)  # type: ignore[abstract]
+
+
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_file_upload_range(upload_file, use_mmap):
+    body = FileUpload(
+        upload_file, chunk_size=30_000, offset=100_000, length=70_000, use_mmap=use_mmap
+    )
+    assert body.length == 70_000
+    assert b"".join(body) == DATA[100_000:170_000]
+    tail = FileUpload(upload_file, offset=250_000, length=10_000, use_mmap=use_mmap)
+    assert b"".join(tail) == DATA[250_000:]
+    with upload_file.open("rb") as fobj, pytest.raises(ValueError):
+        FileUpload(fobj, offset=10)
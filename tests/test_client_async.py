@@ -6,7 +6,7 @@ import pytest
 from httpx import Request, Response
 from pydantic import BaseModel
 from pytest_httpx import HTTPXMock
-from restfly import APIError, AsyncAPIClient, RetryError
+from restfly import APIError, AsyncAPIClient, ErrorStatus, RetryError
 from restfly._async import AsyncHTTPClientVerbs
 
 
@@ -30,6 +30,8 @@ async def test_http_methods_not_implemented():
     with pytest.raises(NotImplementedError):
         verbs = AsyncHTTPClientVerbs()
         await verbs._request("GET", "/")
+    with pytest.raises(NotImplementedError):
+        AsyncHTTPClientVerbs()._retry_max
 
 
 def test_client_pydantic_load_kwargs():
@@ -138,6 +140,20 @@ async def test_client_400_err(client: AsyncAPIClient, httpx_mock: HTTPXMock):
         _ = await client._request("GET", "/status/400")
 
 
+async def test_client_error_model(client: AsyncAPIClient, httpx_mock: HTTPXMock):
+    class ErrorBody(BaseModel):
+        detail: str
+
+    httpx_mock.add_response(
+        url="https://httpbin.org/status/422", status_code=422, json={"detail": "bad"}
+    )
+    with pytest.raises(APIError) as err:
+        _ = await client._request(
+            "GET", "/status/422", error_map={422: ErrorStatus(model=ErrorBody)}
+        )
+    assert err.value.obj == ErrorBody(detail="bad")
+
+
 async def test_client_unknown_err(client: AsyncAPIClient, httpx_mock: HTTPXMock):
     httpx_mock.add_response(url="https://httpbin.org/status/499", status_code=499)
     with pytest.raises(
@@ -151,10 +167,9 @@ async def test_client_retry_err(client: AsyncAPIClient, httpx_mock: HTTPXMock):
     httpx_mock.add_response(
         url="https://httpbin.org/status/429", status_code=429, is_reusable=True
     )
-    client._error_map[429].jitter = 0
-    client._error_map[429].backoff = 0
+    no_wait = ErrorStatus(retry=True, backoff=0, jitter=0)
     with pytest.raises(RetryError):
-        _ = await client._request("GET", "/status/429")
+        _ = await client._request("GET", "/status/429", error_map={429: no_wait})
 
 
 async def test_client_get_method(client: AsyncAPIClient, httpx_mock: HTTPXMock):
@@ -276,3 +291,44 @@ async def test_client_stream_method(client: AsyncAPIClient, httpx_mock: HTTPXMoc
             b.write(data)
         b.seek(0)
     assert json.load(b) == payload
+
+
+async def test_client_2xx_success(client: AsyncAPIClient, httpx_mock: HTTPXMock):
+    class Test(BaseModel):
+        a: int
+
+    httpx_mock.add_response(
+        url="https://httpbin.org/created", json={"a": 1}, status_code=201
+    )
+    httpx_mock.add_response(url="https://httpbin.org/accepted", status_code=202)
+    httpx_mock.add_response(
+        url="https://httpbin.org/deleted", status_code=204, is_reusable=True
+    )
+    assert await client._request("POST", "/created", response_model=Test) == Test(a=1)
+    assert await client._request("GET", "/accepted", response_model=Test) is None
+    assert await client._request("DELETE", "/deleted", response_model=Test) is None
+    resp = await client._request("DELETE", "/deleted")
+    assert isinstance(resp, Response)
+    assert resp.status_code == 204
+
+
+async def test_client_success_codes(client: AsyncAPIClient, httpx_mock: HTTPXMock):
+    httpx_mock.add_response(url="https://httpbin.org/status/202", status_code=202)
+    with pytest.raises(APIError):
+        _ = await client._request("GET", "/status/202", success_codes={200})
+
+
+async def test_client_raw_response_model(client: AsyncAPIClient, httpx_mock: HTTPXMock):
+    httpx_mock.add_response(url="https://httpbin.org/get", json={"a": 1})
+    httpx_mock.add_response(url="https://httpbin.org/bytes", content=b"abc")
+    assert await client._get("/get", response_model=dict) == {"a": 1}
+    view = await client._get("/bytes", response_model=memoryview)
+    assert bytes(view) == b"abc"
+
+
+async def test_client_verb_success_codes(client: AsyncAPIClient, httpx_mock: HTTPXMock):
+    httpx_mock.add_response(
+        url="https://httpbin.org/status/404", method="POST", status_code=404
+    )
+    resp = await client._post("/status/404", success_codes={404})
+    assert resp.status_code == 404
@@ -5,8 +5,9 @@ import pytest
 from httpx import Client, QueryParams
 from pydantic import BaseModel
 from pydantic_xml import BaseXmlModel
-from restfly import APIEndpoint
+from restfly import APIEndpoint, ErrorStatus
 from restfly._base import APIBaseEndpoint, APIClientBase
+from restfly._errors import build_error_map
 
 
 class HTTPBinResponse(BaseModel):
@@ -137,3 +138,14 @@ def test_base_endpoint_typerror_init():
         _ = Failpoint(None)  # ty: ignore[invalid-argument-type]
 
     assert err.match(r"Client \w+ is not a valid client type.")
+
+
+def test_client_select_error_map(client: APIClientBase):
+    assert client._select_error_map() is client._error_map
+    error_map = build_error_map(overloads={404: ErrorStatus(template="missing")})
+    assert client._select_error_map(error_map) is error_map
+    replaced = client._select_error_map({404: ErrorStatus(template="missing")})
+    assert replaced[404].template == "missing"
+    assert replaced[400] == client._error_map.default
+    assert replaced[520] == client._error_map[520]
+    assert replaced[520] is client._error_map.fallbacks[5]
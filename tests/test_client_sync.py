@@ -8,7 +8,7 @@ import pytest
 from httpx import Request, Response
 from pydantic import BaseModel
 from pytest_httpx import HTTPXMock
-from restfly import APIClient, APIError, RetryError
+from restfly import APIClient, APIError, ErrorStatus, RetryError
 from restfly._sync import HTTPClientVerbs
 
 
@@ -31,6 +31,8 @@ class HTTPBinResponse(BaseModel):
 def test_http_methods_not_implemented():
     with pytest.raises(NotImplementedError):
         HTTPClientVerbs()._request("GET", "/")
+    with pytest.raises(NotImplementedError):
+        HTTPClientVerbs()._retry_max
 
 
 def test_client_pydantic_model_kwargs():
@@ -170,6 +172,42 @@ def test_client_400_err(client: APIClient, httpx_mock: HTTPXMock):
         _ = client._request("GET", "/status/400")
 
 
+def test_client_error_model(client: APIClient, httpx_mock: HTTPXMock):
+    class ErrorBody(BaseModel):
+        detail: str
+
+    httpx_mock.add_response(
+        url="https://httpbin.org/status/422", status_code=422, json={"detail": "bad"}
+    )
+    with pytest.raises(APIError) as err:
+        _ = client._request(
+            "GET", "/status/422", error_map={422: ErrorStatus(model=ErrorBody)}
+        )
+    assert err.value.obj == ErrorBody(detail="bad")
+
+
+def test_client_legacy_error_class(httpx_mock: HTTPXMock):
+    class LegacyError(APIError):
+        def __init__(self, response: Response, template: str, obj: None = None):
+            super().__init__(response, template, obj)
+
+    class ErrorBody(BaseModel):
+        detail: str
+
+    client = APIClient(
+        base_url="https://httpbin.org",
+        error_class=LegacyError,
+        error_map={422: ErrorStatus(model=ErrorBody)},
+    )
+    httpx_mock.add_response(
+        url="https://httpbin.org/status/422", status_code=422, json={"detail": "bad"}
+    )
+    with pytest.raises(LegacyError) as err:
+        _ = client._request("GET", "/status/422")
+    assert err.value.obj == ErrorBody(detail="bad")
+    assert err.value.args == ("[422] Response from GET https://httpbin.org/status/422",)
+
+
 def test_client_unknown_err(client: APIClient, httpx_mock: HTTPXMock):
     httpx_mock.add_response(url="https://httpbin.org/status/499", status_code=499)
     with pytest.raises(
@@ -183,10 +221,9 @@ def test_client_retry_err(client: APIClient, httpx_mock: HTTPXMock):
     httpx_mock.add_response(
         url="https://httpbin.org/status/429", status_code=429, is_reusable=True
     )
-    client._error_map[429].jitter = 0
-    client._error_map[429].backoff = 0
+    no_wait = ErrorStatus(retry=True, backoff=0, jitter=0)
     with pytest.raises(RetryError):
-        _ = client._request("GET", "/status/429")
+        _ = client._request("GET", "/status/429", error_map={429: no_wait})
 
 
 def test_client_get_method(client: APIClient, httpx_mock: HTTPXMock):
@@ -308,3 +345,54 @@ def test_client_stream_method(client: APIClient, httpx_mock: HTTPXMock):
             b.write(data)
         b.seek(0)
     assert json.load(b) == payload
+
+
+def test_client_2xx_success(client: APIClient, httpx_mock: HTTPXMock):
+    class Test(BaseModel):
+        a: int
+
+    httpx_mock.add_response(
+        url="https://httpbin.org/created", json={"a": 1}, status_code=201
+    )
+    httpx_mock.add_response(url="https://httpbin.org/accepted", status_code=202)
+    httpx_mock.add_response(
+        url="https://httpbin.org/deleted", status_code=204, is_reusable=True
+    )
+    assert client._request("POST", "/created", response_model=Test) == Test(a=1)
+    assert client._request("GET", "/accepted", response_model=Test) is None
+    assert client._request("DELETE", "/deleted", response_model=Test) is None
+    resp = client._request("DELETE", "/deleted")
+    assert isinstance(resp, Response)
+    assert resp.status_code == 204
+
+
+def test_client_success_codes(client: APIClient, httpx_mock: HTTPXMock):
+    httpx_mock.add_response(url="https://httpbin.org/status/202", status_code=202)
+    with pytest.raises(APIError):
+        _ = client._request("GET", "/status/202", success_codes={200})
+
+
+def test_client_raw_response_model(client: APIClient, httpx_mock: HTTPXMock):
+    httpx_mock.add_response(url="https://httpbin.org/flaky", status_code=429)
+    httpx_mock.add_response(url="https://httpbin.org/flaky", json=[{"a": 1}])
+    httpx_mock.add_response(url="https://httpbin.org/get", json={"a": 1})
+    httpx_mock.add_response(url="https://httpbin.org/bytes", content=b"abc")
+    httpx_mock.add_response(url="https://httpbin.org/missing", status_code=404)
+    no_wait = {429: ErrorStatus(retry=True, backoff=0, jitter=0)}
+
+    assert client._get("/flaky", response_model=list, error_map=no_wait) == [{"a": 1}]
+    assert client._get("/get", response_model=dict) == {"a": 1}
+    view = client._get("/bytes", response_model=memoryview)
+    assert isinstance(view, memoryview)
+    assert bytes(view) == b"abc"
+    with pytest.raises(APIError):
+        client._get("/missing", response_model=dict)
+
+
+def test_client_verb_success_codes(client: APIClient, httpx_mock: HTTPXMock):
+    httpx_mock.add_response(url="https://httpbin.org/status/404", status_code=404)
+    httpx_mock.add_response(
+        url="https://httpbin.org/status/404", method="DELETE", status_code=404
+    )
+    assert client._get("/status/404", success_codes={404}).status_code == 404
+    assert client._delete("/status/404", success_codes=(200, 404)).status_code == 404
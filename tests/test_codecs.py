@@ -0,0 +1,69 @@
+import pytest
+from pytest_httpx import HTTPXMock
+from restfly import (
+    APIClient,
+    AsyncAPIClient,
+    MsgspecCodec,
+    OrjsonCodec,
+    PydanticJSONCodec,
+    StdlibJSONCodec,
+    default_json_codec,
+)
+
+PAYLOAD = {"name": "día", "values": [1, 2.5, None, True], "nested": {"a": "b"}}
+
+
+@pytest.fixture(
+    params=[
+        (StdlibJSONCodec, None),
+        (PydanticJSONCodec, None),
+        (OrjsonCodec, "orjson"),
+        (MsgspecCodec, "msgspec"),
+    ],
+    ids=["stdlib", "pydantic", "orjson", "msgspec"],
+)
+def codec(request):
+    codec_class, module = request.param
+    if module is not None:
+        pytest.importorskip(module)
+    return codec_class()
+
+
+def test_codec_roundtrip(codec):
+    encoded = codec.dumps(PAYLOAD)
+    assert isinstance(encoded, bytes)
+    assert b" " not in encoded.replace(b"d\xc3\xada", b"")
+    assert codec.loads(encoded) == PAYLOAD
+
+
+def test_default_json_codec():
+    pytest.importorskip("orjson")
+    assert isinstance(default_json_codec(), OrjsonCodec)
+
+
+def test_client_json_codec(codec, httpx_mock: HTTPXMock):
+    client = APIClient(base_url="https://httpbin.org", json_codec=codec)
+    httpx_mock.add_response(url="https://httpbin.org/post", json=[{"a": 1}])
+
+    assert client._post("/post", json=PAYLOAD, response_model=list) == [{"a": 1}]
+    request = httpx_mock.get_request()
+    assert request.headers["Content-Type"] == "application/json"
+    assert codec.loads(request.content) == PAYLOAD
+
+
+async def test_async_client_json_codec(httpx_mock: HTTPXMock):
+    client = AsyncAPIClient(
+        base_url="https://httpbin.org", json_codec=PydanticJSONCodec()
+    )
+    httpx_mock.add_response(url="https://httpbin.org/post", json={"a": 1})
+
+    assert await client._post("/post", json=[1, 2], response_model=dict) == {"a": 1}
+    assert httpx_mock.get_request().content == b"[1,2]"
+
+
+def test_client_without_codec(httpx_mock: HTTPXMock):
+    client = APIClient(base_url="https://httpbin.org")
+    httpx_mock.add_response(url="https://httpbin.org/post")
+
+    client._post("/post", json=PAYLOAD)
+    assert httpx_mock.get_request().content == StdlibJSONCodec().dumps(PAYLOAD)
@@ -0,0 +1,252 @@
+import gzip
+import io
+import json
+import os
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+from restfly import (
+    APIClient,
+    AsyncAPIClient,
+    AsyncFileUpload,
+    Compression,
+    ErrorStatus,
+    FileUpload,
+)
+
+NO_WAIT = {503: ErrorStatus(retry=True, backoff=0, jitter=0)}
+PAYLOAD = b"0123456789abcdef" * 256
+
+
+def chunks():
+    for idx in range(0, len(PAYLOAD), 1000):
+        yield PAYLOAD[idx : idx + 1000]
+
+
+async def achunks():
+    for chunk in chunks():
+        yield chunk
+
+
+def decompress(encoding: str, data: bytes) -> bytes:
+    if encoding == "zstd":
+        zstandard = pytest.importorskip("zstandard")
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return gzip.decompress(data)
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+def test_compression_roundtrip(encoding):
+    if encoding == "zstd":
+        pytest.importorskip("zstandard")
+    compression = Compression(encoding, level=1)
+    assert decompress(encoding, compression.compress(PAYLOAD)) == PAYLOAD
+    streamed = b"".join(compression.stream(chunks()))
+    assert decompress(encoding, streamed) == PAYLOAD
+
+
+def test_compression_validation():
+    with pytest.raises(ValueError):
+        Compression("brotli")  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        Compression(threshold=-1)
+
+
+def test_compression_threshold():
+    compression = Compression(threshold=1024)
+    assert compression.encode(b"small") is None
+    assert compression.encode("small") is None
+    assert compression.encode(io.BytesIO(b"small")) is None
+    assert compression.encode(object()) is None
+    assert gzip.decompress(compression.encode(PAYLOAD.decode())) == PAYLOAD
+    stream = compression.encode(io.BytesIO(PAYLOAD))
+    assert gzip.decompress(b"".join(stream)) == PAYLOAD
+
+
+def test_compression_reiterable(tmp_path):
+    compression = Compression()
+    for content in (io.BytesIO(PAYLOAD), [PAYLOAD]):
+        body = compression.encode(content)
+        assert gzip.decompress(b"".join(body)) == PAYLOAD
+        assert gzip.decompress(b"".join(body)) == PAYLOAD
+
+    class Reader:
+        def __init__(self):
+            self.data = io.BytesIO(PAYLOAD)
+
+        def read(self, size):
+            return self.data.read(size)
+
+    assert gzip.decompress(b"".join(compression.encode(Reader()))) == PAYLOAD
+    path = tmp_path / "small.bin"
+    path.write_bytes(b"small")
+    assert compression.encode(FileUpload(path)) is None
+
+
+class StreamingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    Transport consuming the request stream as the network transports do (the mock
+    transports read and cache the body on the request).
+    """
+
+    def __init__(self):
+        self.bodies = []
+
+    def respond(self) -> httpx.Response:
+        return httpx.Response(503 if len(self.bodies) == 1 else 200)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.bodies.append(b"".join(request.stream))
+        return self.respond()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.bodies.append(b"".join([chunk async for chunk in request.stream]))
+        return self.respond()
+
+
+class MemoryOnlyClient(APIClient):
+    # Without a disk spool, buffering the compressed output of a large file would
+    # fail the retry, so the file must be compressed again instead.
+    _replay_spool_limit = None
+
+
+class AsyncMemoryOnlyClient(AsyncAPIClient):
+    _replay_spool_limit = None
+
+
+def test_client_compressed_upload_retry(tmp_path):
+    path = tmp_path / "upload.bin"
+    path.write_bytes(os.urandom(3 * 1024 * 1024))
+    transport = StreamingTransport()
+    client = MemoryOnlyClient(
+        base_url="https://httpbin.org",
+        compression=Compression(level=1),
+        error_map=NO_WAIT,
+        transport=transport,
+    )
+    client._upload("/upload", path)
+    assert len(transport.bodies) == 2
+    assert all(gzip.decompress(b) == path.read_bytes() for b in transport.bodies)
+
+
+async def test_async_client_compressed_upload_retry(tmp_path):
+    path = tmp_path / "upload.bin"
+    path.write_bytes(os.urandom(3 * 1024 * 1024))
+    transport = StreamingTransport()
+    client = AsyncMemoryOnlyClient(
+        base_url="https://httpbin.org",
+        compression=Compression(level=1),
+        error_map=NO_WAIT,
+        transport=transport,
+    )
+    await client._post("/upload", content=AsyncFileUpload(path))
+    assert len(transport.bodies) == 2
+    assert all(gzip.decompress(b) == path.read_bytes() for b in transport.bodies)
+
+
+def test_client_compression(httpx_mock: HTTPXMock):
+    client = APIClient(base_url="https://httpbin.org", compression=Compression())
+    httpx_mock.add_response(url="https://httpbin.org/post")
+    httpx_mock.add_response(url="https://httpbin.org/post")
+    httpx_mock.add_response(url="https://httpbin.org/post")
+    client._post("/post", content=PAYLOAD)
+    client._post("/post", content=b"small")
+    client._request("POST", "/post", content=PAYLOAD, compression=False)
+    large, small, disabled = httpx_mock.get_requests()
+    assert large.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(large.content) == PAYLOAD
+    assert "Content-Encoding" not in small.headers
+    assert small.content == b"small"
+    assert "Content-Encoding" not in disabled.headers
+    assert disabled.content == PAYLOAD
+
+
+def test_client_verb_compression(httpx_mock: HTTPXMock):
+    client = APIClient(base_url="https://httpbin.org")
+    httpx_mock.add_response(url="https://httpbin.org/post")
+    httpx_mock.add_response(url="https://httpbin.org/post")
+    headers = {"X-Test": "1"}
+    client._post("/post", content=PAYLOAD, headers=headers, compression=Compression())
+    client._post("/post", content=PAYLOAD, headers=headers, compression=False)
+    assert headers == {"X-Test": "1"}
+    compressed, plain = httpx_mock.get_requests()
+    assert compressed.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(compressed.content) == PAYLOAD
+    assert "Content-Encoding" not in plain.headers
+    assert plain.headers["X-Test"] == "1"
+    assert plain.content == PAYLOAD
+
+
+def test_client_compression_json(httpx_mock: HTTPXMock):
+    client = APIClient(base_url="https://httpbin.org")
+    httpx_mock.add_response(url="https://httpbin.org/post")
+    records = [{"id": idx, "name": f"record-{idx}"} for idx in range(100)]
+    client._request("POST", "/post", json=records, compression=Compression(threshold=0))
+    request = httpx_mock.get_request()
+    assert request.headers["Content-Type"] == "application/json"
+    assert request.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(request.content)) == records
+
+
+def test_client_compression_stream_retry(httpx_mock: HTTPXMock):
+    client = APIClient(
+        base_url="https://httpbin.org",
+        compression=Compression(),
+        error_map=NO_WAIT,
+    )
+    httpx_mock.add_response(url="https://httpbin.org/post", status_code=503)
+    httpx_mock.add_response(url="https://httpbin.org/post")
+    client._post("/post", content=chunks())
+    first, second = httpx_mock.get_requests()
+    assert first.content == second.content
+    assert second.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(second.content) == PAYLOAD
+
+
+def test_client_compression_skips_forms():
+    client = APIClient(
+        base_url="https://httpbin.org", compression=Compression(threshold=0)
+    )
+    kwargs = client._request_pre_process("POST", "/post", data={"a": "b"})
+    assert "Content-Encoding" not in kwargs["headers"]
+    kwargs = client._request_pre_process(
+        "POST",
+        "/post",
+        content=b"already",
+        headers={"content-encoding": "br"},
+    )
+    assert kwargs["content"] == b"already"
+
+
+async def test_async_client_compression_stream(httpx_mock: HTTPXMock):
+    pytest.importorskip("zstandard")
+    client = AsyncAPIClient(
+        base_url="https://httpbin.org", compression=Compression("zstd")
+    )
+    httpx_mock.add_response(url="https://httpbin.org/post")
+    await client._post("/post", content=achunks())
+    request = httpx_mock.get_request()
+    assert request.headers["Content-Encoding"] == "zstd"
+    assert decompress("zstd", request.content) == PAYLOAD
+
+
+async def test_async_client_verb_compression(httpx_mock: HTTPXMock):
+    client = AsyncAPIClient(base_url="https://httpbin.org")
+    httpx_mock.add_response(url="https://httpbin.org/patch")
+    await client._patch("/patch", content=achunks(), compression=Compression())
+    request = httpx_mock.get_request()
+    assert request.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(request.content) == PAYLOAD
+
+
+async def test_compression_astream_large():
+    data = os.urandom(256 * 1024)
+
+    async def source():
+        for idx in range(0, len(data), 65536):
+            yield data[idx : idx + 65536]
+
+    compressed = [chunk async for chunk in Compression().astream(source())]
+    assert len(compressed) > 1
+    assert gzip.decompress(b"".join(compressed)) == data
@@ -0,0 +1,189 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from restfly import (
+    APIClient,
+    APIIterator,
+    AsyncAPIClient,
+    AsyncAPIIterator,
+    DeadlineExceeded,
+    ErrorStatus,
+    deadline,
+    time_remaining,
+)
+
+SLOW_RETRY = {503: ErrorStatus(retry=True, backoff=10, jitter=0, log_level=None)}
+
+
+class Recorder:
+    def __init__(self, status=200, delay=0.0, error=None):
+        self.status = status
+        self.delay = delay
+        self.error = error
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error("timed out", request=request)
+        return httpx.Response(self.status, json={"ok": True})
+
+
+def client(recorder, **kwargs):
+    return APIClient(
+        base_url="https://example.com",
+        transport=httpx.MockTransport(recorder),
+        **kwargs,
+    )
+
+
+def test_deadline_context():
+    assert time_remaining() is None
+    with deadline(10) as expires:
+        assert 9 < time_remaining() <= 10
+        assert expires == pytest.approx(time.monotonic() + 10, abs=0.1)
+        # Nested deadlines may shorten the deadline but never extend it.
+        with deadline(60) as nested:
+            assert nested == expires
+        with deadline(1):
+            assert time_remaining() <= 1
+        assert time_remaining() > 9
+    assert time_remaining() is None
+
+
+def test_deadline_thread_local():
+    seen = []
+    with deadline(10):
+        thread = threading.Thread(target=lambda: seen.append(time_remaining()))
+        thread.start()
+        thread.join()
+    assert seen == [None]
+
+
+def test_deadline_caps_timeouts():
+    recorder = Recorder()
+    api = client(recorder, timeout=httpx.Timeout(30, connect=0.5))
+    api._get("/")
+    assert recorder.requests[0].extensions["timeout"]["read"] == 30
+    with deadline(5):
+        api._get("/")
+    timeout = recorder.requests[1].extensions["timeout"]
+    assert timeout["connect"] == 0.5
+    assert 4 < timeout["read"] <= 5
+    assert timeout["read"] == timeout["write"] == timeout["pool"]
+
+    api = client(recorder, timeout=None)
+    with deadline(2):
+        api._get("/")
+    assert all(0 < v <= 2 for v in recorder.requests[2].extensions["timeout"].values())
+
+
+def test_deadline_passed():
+    recorder = Recorder()
+    with deadline(0), pytest.raises(DeadlineExceeded) as err:
+        client(recorder)._get("/items")
+    assert not recorder.requests
+    assert err.value.method == "GET"
+    assert err.value.url == "https://example.com/items"
+    assert str(err.value) == "Deadline exceeded for GET https://example.com/items"
+    assert isinstance(err.value, TimeoutError)
+    assert str(DeadlineExceeded()) == "Deadline exceeded"
+
+
+def test_deadline_skips_backoff():
+    recorder = Recorder(status=503)
+    start = time.monotonic()
+    with deadline(2), pytest.raises(DeadlineExceeded):
+        client(recorder, error_map=SLOW_RETRY)._get("/")
+    assert time.monotonic() - start < 1
+    assert len(recorder.requests) == 1
+
+
+def test_deadline_timeout():
+    recorder = Recorder(delay=0.05, error=httpx.ReadTimeout)
+    with deadline(0.02), pytest.raises(DeadlineExceeded) as err:
+        client(recorder)._get("/")
+    assert isinstance(err.value.__context__, httpx.ReadTimeout)
+
+    # Timeouts while there's still time remaining are raised as-is.
+    with deadline(10), pytest.raises(httpx.ReadTimeout):
+        client(recorder)._get("/")
+
+
+def test_deadline_balancer_release():
+    recorder = Recorder(delay=0.05, error=httpx.ConnectTimeout)
+    api = APIClient(
+        base_url=["https://us.example.com", "https://eu.example.com"],
+        transport=httpx.MockTransport(recorder),
+    )
+    with deadline(0.02), pytest.raises(DeadlineExceeded):
+        api._get("/")
+    assert len(recorder.requests) == 1
+    assert all(u.outstanding == 0 for u in api._balancer.upstreams)
+
+    # Attempts made once the deadline has passed are never routed.
+    for _ in range(3):
+        with deadline(0), pytest.raises(DeadlineExceeded):
+            api._get("/")
+    assert all(u.outstanding == 0 for u in api._balancer.upstreams)
+    assert len(recorder.requests) == 1
+
+
+class PageIterator(APIIterator):
+    def _get_page(self):
+        self.page = [self._client._get("/").json()] * 2
+
+
+def test_deadline_iterator():
+    recorder = Recorder(delay=0.03)
+    items = PageIterator(client(recorder))
+    with deadline(0.05), pytest.raises(DeadlineExceeded):
+        for _ in items:
+            pass
+    assert items.count in (2, 4)
+
+
+async def test_async_deadline():
+    async def respond(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.03)
+        return httpx.Response(503)
+
+    api = AsyncAPIClient(
+        base_url="https://example.com",
+        transport=httpx.MockTransport(respond),
+        error_map=SLOW_RETRY,
+    )
+    with deadline(1):
+        # Tasks created within the block inherit the deadline.
+        results = await asyncio.gather(
+            *(api._get("/") for _ in range(3)), return_exceptions=True
+        )
+    assert all(isinstance(r, DeadlineExceeded) for r in results)
+    with deadline(0), pytest.raises(DeadlineExceeded):
+        await api._get("/")
+    await api._client.aclose()
+
+
+async def test_async_deadline_timeout_and_iterator():
+    async def respond(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.05)
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    api = AsyncAPIClient(
+        base_url="https://example.com", transport=httpx.MockTransport(respond)
+    )
+    with deadline(0.02), pytest.raises(DeadlineExceeded):
+        await api._get("/")
+
+    class Pages(AsyncAPIIterator):
+        async def _get_page(self):
+            self.page = [1]
+
+    with deadline(0):
+        with pytest.raises(DeadlineExceeded):
+            await anext(Pages(api))
+    await api._client.aclose()
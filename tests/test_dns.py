@@ -0,0 +1,221 @@
+import socket
+
+import httpx
+import pytest
+from restfly import (
+    APIClient,
+    AsyncAPIClient,
+    AsyncDNSCachingTransport,
+    DNSCache,
+    DNSCachingTransport,
+    SystemResolver,
+)
+
+ADDRESSES = ["10.0.0.1", "10.0.0.2", "2001:db8::1"]
+
+
+class StubResolver:
+    def __init__(self, addresses=ADDRESSES):
+        self.addresses = addresses
+        self.calls = 0
+
+    def resolve(self, host, port):
+        self.calls += 1
+        if isinstance(self.addresses, Exception):
+            raise self.addresses
+        return self.addresses
+
+
+class Recorder:
+    def __init__(self, dead=()):
+        self.dead = set(dead)
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.host in self.dead:
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json={"host": request.url.host})
+
+    @property
+    def hosts(self):
+        return [r.url.host for r in self.requests]
+
+
+def test_dns_cache_rotation_and_ttl(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr("restfly._dns.time.monotonic", lambda: now[0])
+    resolver = StubResolver()
+    cache = DNSCache(resolver, ttl=10)
+    assert cache.lookup("example.com", 443) is None
+    assert cache.addresses("example.com", 443) == ADDRESSES
+    assert cache.addresses("example.com", 443)[0] == "10.0.0.2"
+    assert cache.addresses("example.com", 443)[0] == "2001:db8::1"
+    assert resolver.calls == 1
+
+    cache.failed("example.com", 443, "10.0.0.1")
+    assert cache.addresses("example.com", 443) == [
+        "10.0.0.2",
+        "2001:db8::1",
+        "10.0.0.1",
+    ]
+    now[0] = 31.0
+    assert resolver.calls == 1
+    assert cache.lookup("example.com", 443) is None
+    cache.addresses("example.com", 443)
+    assert cache.addresses("example.com", 443) == [
+        "2001:db8::1",
+        "10.0.0.1",
+        "10.0.0.2",
+    ]
+    assert resolver.calls == 2
+
+    now[0] = 50.0
+    resolver.addresses = OSError("resolver down")
+    assert set(cache.addresses("example.com", 443)) == set(ADDRESSES)
+    with pytest.raises(OSError):
+        cache.addresses("example.org", 443)
+    resolver.addresses = []
+    with pytest.raises(OSError, match="No addresses found"):
+        cache.addresses("example.org", 443)
+
+    resolver.addresses = ["10.0.0.9"]
+    assert cache.resolve("example.com", 443) == ["10.0.0.9"]
+    cache.clear()
+    cache.failed("example.com", 443, "10.0.0.9")
+    assert cache.lookup("example.com", 443) is None
+
+
+def test_dns_cache_no_rotation():
+    cache = DNSCache(StubResolver(), rotate=False)
+    assert cache.addresses("example.com", 80) == ADDRESSES
+    assert cache.addresses("example.com", 80) == ADDRESSES
+
+
+def test_system_resolver(monkeypatch):
+    infos = [
+        (socket.AF_INET6, 0, 0, "", ("2001:db8::1", 443, 0, 0)),
+        (socket.AF_INET6, 0, 0, "", ("2001:db8::2", 443, 0, 0)),
+        (socket.AF_INET6, 0, 0, "", ("2001:db8::1", 443, 0, 0)),
+        (socket.AF_INET, 0, 0, "", ("10.0.0.1", 443)),
+    ]
+    monkeypatch.setattr("socket.getaddrinfo", lambda *args, **kwargs: infos)
+    assert SystemResolver().resolve("example.com", 443) == [
+        "2001:db8::1",
+        "10.0.0.1",
+        "2001:db8::2",
+    ]
+    assert SystemResolver().resolve("localhost", 80)
+
+
+def test_dns_caching_transport():
+    resolver = StubResolver()
+    recorder = Recorder(dead={"10.0.0.1"})
+    client = APIClient(
+        base_url="https://example.com",
+        transport=httpx.MockTransport(recorder),
+        dns_cache=DNSCache(resolver),
+    )
+    assert isinstance(client._client._transport, DNSCachingTransport)
+    assert client._get("/a", response_model=dict) == {"host": "10.0.0.2"}
+    first, second = recorder.requests
+    assert first.url.host == "10.0.0.1"
+    assert first.extensions["timeout"]["connect"] == 1.0
+    assert second.extensions["timeout"]["connect"] == 1.0
+    assert second.extensions["sni_hostname"] == "example.com"
+    assert second.headers["host"] == "example.com"
+    assert str(second.url) == "https://10.0.0.2/a"
+
+    recorder.requests.clear()
+    for _ in range(3):
+        client._get("/b")
+    assert recorder.hosts == ["10.0.0.2", "2001:db8::1", "10.0.0.2"]
+    assert resolver.calls == 1
+
+    recorder.requests.clear()
+    client._get("http://127.0.0.1:8080/c")
+    assert recorder.hosts == ["127.0.0.1"]
+    assert resolver.calls == 1
+    client._client.close()
+
+
+def test_dns_caching_transport_failures():
+    recorder = Recorder(dead=ADDRESSES)
+    transport = DNSCachingTransport(
+        httpx.MockTransport(recorder), DNSCache(StubResolver())
+    )
+    client = httpx.Client(transport=transport)
+    with pytest.raises(httpx.ConnectError):
+        client.get("http://example.com:8080/")
+    assert len(recorder.requests) == 3
+    assert recorder.requests[0].url.port == 8080
+    assert recorder.requests[0].extensions["timeout"]["connect"] == 1.0
+    assert recorder.requests[2].extensions["timeout"]["connect"] == 5.0
+    assert "sni_hostname" not in recorder.requests[0].extensions
+
+    transport.cache.resolver = StubResolver(OSError("unknown host"))
+    with pytest.raises(httpx.ConnectError, match="unknown host"):
+        client.get("https://example.org/")
+    client.close()
+    assert isinstance(DNSCachingTransport().cache, DNSCache)
+
+
+def test_client_dns_cache_options():
+    assert APIClient()._dns_cache is None
+    assert isinstance(APIClient(dns_cache=True)._dns_cache, DNSCache)
+
+    class Client(APIClient):
+        _dns_cache = DNSCache(StubResolver())
+
+    assert Client()._dns_cache is Client()._dns_cache
+    assert Client(dns_cache=False)._dns_cache is None
+    assert not isinstance(
+        Client(dns_cache=False)._client._transport, DNSCachingTransport
+    )
+
+
+@pytest.mark.parametrize(
+    "client_class, transport_class",
+    [(APIClient, httpx.HTTPTransport), (AsyncAPIClient, httpx.AsyncHTTPTransport)],
+)
+def test_client_dns_cache_default_transport(client_class, transport_class):
+    pytest.importorskip("h2")
+    limits = httpx.Limits(max_connections=7, max_keepalive_connections=3)
+    client = client_class(dns_cache=True, limits=limits, http1=False, http2=True)
+    transport = client._client._transport
+    assert isinstance(transport, client_class.__dns_transport_class__)
+    assert transport.cache is client._dns_cache
+    inner = transport._transport
+    assert isinstance(inner, transport_class)
+    assert inner._pool._max_connections == 7
+    assert inner._pool._max_keepalive_connections == 3
+    assert not inner._pool._http1
+    assert inner._pool._http2
+
+
+async def test_async_dns_caching_transport():
+    resolver = StubResolver()
+    recorder = Recorder(dead={"10.0.0.1"})
+
+    async def handler(request):
+        return recorder(request)
+
+    client = AsyncAPIClient(
+        base_url="https://example.com",
+        transport=httpx.MockTransport(handler),
+        dns_cache=DNSCache(resolver),
+    )
+    assert isinstance(client._client._transport, AsyncDNSCachingTransport)
+    assert await client._get("/", response_model=dict) == {"host": "10.0.0.2"}
+    assert await client._get("/", response_model=dict) == {"host": "10.0.0.2"}
+    await client._get("https://10.0.0.2/")
+    assert resolver.calls == 1
+
+    recorder.dead = set(ADDRESSES)
+    with pytest.raises(httpx.ConnectError):
+        await client._client.get("/")
+    resolver.addresses = OSError("unknown host")
+    with pytest.raises(httpx.ConnectError, match="unknown host"):
+        await client._client.get("https://example.org/")
+    await client._client.aclose()
+    assert isinstance(AsyncDNSCachingTransport().cache, DNSCache)
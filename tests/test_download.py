@@ -0,0 +1,350 @@
+import asyncio
+import hashlib
+
+import httpx
+import pytest
+from restfly import APIClient, APIEndpoint, AsyncAPIClient, DownloadError
+from restfly._download import Download, Segment
+
+DATA = bytes(range(256)) * 400
+SHA256 = f"sha256:{hashlib.sha256(DATA).hexdigest()}"
+
+
+class Server:
+    """
+    Mock server for a single resource that can interrupt the transfer part-way.
+    """
+
+    def __init__(self, interrupt: list[int | None] | None = None, ranges: bool = True):
+        self.interrupt = list(interrupt or [])
+        self.ranges = ranges
+        self.etag = '"v1"'
+        self.requests: list[httpx.Request] = []
+
+    def body(self, data: bytes):
+        cut = self.interrupt.pop(0) if self.interrupt else None
+
+        def stream():
+            if cut is None:
+                yield data
+                return
+            yield data[:cut]
+            raise httpx.ReadError("connection reset")
+
+        return stream()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        headers = {"ETag": self.etag, "Accept-Ranges": "bytes"}
+        spec = request.headers.get("Range")
+        if (
+            spec
+            and self.ranges
+            and request.headers.get("If-Range", self.etag) == self.etag
+        ):
+            first, _, last = spec.removeprefix("bytes=").partition("-")
+            start, end = int(first), int(last) if last else len(DATA) - 1
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(DATA)}"
+            headers["Content-Length"] = str(end - start + 1)
+            return httpx.Response(
+                206, headers=headers, content=self.body(DATA[start : end + 1])
+            )
+        headers["Content-Length"] = str(len(DATA))
+        return httpx.Response(200, headers=headers, content=self.body(DATA))
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr("restfly._download.MIN_SEGMENT_SIZE", 10_000)
+
+    async def asleep(seconds):
+        return None
+
+    monkeypatch.setattr("restfly._sync.sleep", lambda seconds: None)
+    monkeypatch.setattr("restfly._async.sleep", asleep)
+
+
+def client_for(server: Server, **kwargs) -> APIClient:
+    return APIClient(
+        base_url="https://example.com", transport=httpx.MockTransport(server), **kwargs
+    )
+
+
+def test_download(tmp_path):
+    server = Server()
+    client = client_for(server)
+    dest = client._download("/report", tmp_path / "report.bin", checksum=SHA256)
+    assert dest.read_bytes() == DATA
+    assert server.requests[0].headers["Accept-Encoding"] == "identity"
+    assert "Range" not in server.requests[0].headers
+
+
+def test_download_resumes(tmp_path):
+    server = Server(interrupt=[10_000, 30_000])
+    client = client_for(server)
+    dest = client._download("/report", tmp_path / "report.bin", checksum=SHA256)
+    assert dest.read_bytes() == DATA
+    assert len(server.requests) == 3
+    assert server.requests[1].headers["Range"] == "bytes=10000-"
+    assert server.requests[1].headers["If-Range"] == '"v1"'
+    assert server.requests[2].headers["Range"] == "bytes=40000-"
+
+
+def test_download_restarts_without_ranges(tmp_path):
+    server = Server(interrupt=[10_000], ranges=False)
+    client = client_for(server)
+    dest = client._download("/report", tmp_path / "report.bin", checksum=SHA256)
+    assert dest.read_bytes() == DATA
+    assert len(server.requests) == 2
+
+
+def test_download_gives_up(tmp_path):
+    server = Server(interrupt=[100, 100, 100])
+    client = client_for(server)
+    with pytest.raises(httpx.ReadError):
+        client._download("/report", tmp_path / "report.bin", max_retries=2)
+    assert len(server.requests) == 3
+    assert not (tmp_path / "report.bin").exists()
+
+
+def test_download_checksum_mismatch(tmp_path):
+    client = client_for(Server())
+    with pytest.raises(DownloadError, match="sha256 checksum mismatch"):
+        client._download("/report", tmp_path / "report.bin", checksum="sha256:00")
+    assert not (tmp_path / "report.bin").exists()
+    with pytest.raises(ValueError):
+        client._download("/report", tmp_path / "report.bin", checksum="00")
+
+
+def test_download_short_body(tmp_path):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, headers={"Content-Length": "100"}, content=iter([b"a" * 50])
+        )
+
+    client = APIClient(
+        base_url="https://example.com", transport=httpx.MockTransport(handler)
+    )
+    with pytest.raises(DownloadError, match="received 50 of 100 bytes"):
+        client._download("/report", tmp_path / "report.bin", max_retries=1)
+
+
+def test_download_bad_range(tmp_path):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if "Range" in request.headers:
+            headers = {"Content-Range": "bytes 0-9/100", "Content-Length": "10"}
+            return httpx.Response(206, headers=headers, content=iter([b"b" * 10]))
+
+        def stream():
+            yield b"a" * 50
+            raise httpx.ReadError("connection reset")
+
+        return httpx.Response(200, headers={"Content-Length": "100"}, content=stream())
+
+    client = APIClient(
+        base_url="https://example.com", transport=httpx.MockTransport(handler)
+    )
+    with pytest.raises(DownloadError, match="does not match the requested range"):
+        client._download("/report", tmp_path / "report.bin")
+
+
+def test_download_length_mismatch(tmp_path):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if "Range" in request.headers:
+            headers = {"Content-Range": "bytes 50-99/100", "Content-Length": "10"}
+            return httpx.Response(206, headers=headers, content=iter([b"b" * 10]))
+
+        def stream():
+            yield b"a" * 50
+            raise httpx.ReadError("connection reset")
+
+        return httpx.Response(200, content=stream())
+
+    client = APIClient(
+        base_url="https://example.com", transport=httpx.MockTransport(handler)
+    )
+    with pytest.raises(DownloadError, match="Content-Length does not match"):
+        client._download("/report", tmp_path / "report.bin")
+
+
+def test_download_unknown_length(tmp_path):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            headers={"Last-Modified": "Mon, 19 Oct 2026 00:00:00 GMT"},
+            content=iter([DATA]),
+        )
+
+    client = APIClient(
+        base_url="https://example.com", transport=httpx.MockTransport(handler)
+    )
+    assert client._download("/report", tmp_path / "report.bin").read_bytes() == DATA
+
+
+def test_endpoint_download(tmp_path):
+    class Reports(APIEndpoint):
+        _path = "/reports"
+
+    server = Server(interrupt=[500])
+    client = client_for(server, retry_max=1)
+    reports = Reports(client)
+    assert reports._retry_max == 1
+    assert reports._download("/1", tmp_path / "report.bin").read_bytes() == DATA
+    assert server.requests[0].url.path == "/reports/1"
+
+
+def async_client_for(server: Server) -> AsyncAPIClient:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        response = server(request)
+        sync_stream = response.stream
+
+        async def stream():
+            for chunk in sync_stream:
+                yield chunk
+
+        return httpx.Response(
+            response.status_code, headers=response.headers, content=stream()
+        )
+
+    return AsyncAPIClient(
+        base_url="https://example.com", transport=httpx.MockTransport(handler)
+    )
+
+
+async def test_async_download_resumes(tmp_path):
+    server = Server(interrupt=[10_000])
+    client = async_client_for(server)
+    dest = await client._download("/report", tmp_path / "report.bin", checksum=SHA256)
+    assert dest.read_bytes() == DATA
+    assert server.requests[1].headers["Range"] == "bytes=10000-"
+
+
+async def test_async_download_gives_up(tmp_path):
+    server = Server(interrupt=[100, 100])
+    client = async_client_for(server)
+    with pytest.raises(httpx.ReadError):
+        await client._download("/report", tmp_path / "report.bin", max_retries=1)
+    assert not (tmp_path / "report.bin").exists()
+
+
+def test_segmented_download(tmp_path):
+    server = Server(interrupt=[None, None, 1000])
+    client = client_for(server)
+    dest = client._download(
+        "/report", tmp_path / "report.bin", checksum=SHA256, segments=4
+    )
+    assert dest.read_bytes() == DATA
+    ranges = sorted(r.headers["Range"] for r in server.requests)
+    assert ranges[0] == "bytes=0-0"
+    assert len(server.requests) == 6
+    assert "bytes=76800-102399" in ranges
+    assert all(r.headers["If-Range"] == '"v1"' for r in server.requests[1:])
+
+
+def test_segmented_download_without_ranges(tmp_path):
+    server = Server(ranges=False)
+    client = client_for(server)
+    dest = client._download("/report", tmp_path / "report.bin", segments=4)
+    assert dest.read_bytes() == DATA
+    assert len(server.requests) == 2
+
+
+def test_segmented_download_resource_changed(tmp_path):
+    server = Server()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        response = server(request)
+        server.etag = '"v2"'
+        return response
+
+    client = APIClient(
+        base_url="https://example.com", transport=httpx.MockTransport(handler)
+    )
+    with pytest.raises(DownloadError, match="resource changed"):
+        client._download("/report", tmp_path / "report.bin", segments=2)
+    assert not (tmp_path / "report.bin").exists()
+
+
+def test_segmented_download_gives_up(tmp_path):
+    server = Server(interrupt=[None, 100, 100, 100, 100])
+    client = client_for(server)
+    with pytest.raises(httpx.ReadError):
+        client._download("/report", tmp_path / "report.bin", segments=2, max_retries=1)
+    assert not (tmp_path / "report.bin").exists()
+
+
+@pytest.mark.parametrize(
+    "content_range, length, message",
+    [
+        ("bytes 0-60000/102400", "60001", "does not match the requested range"),
+        ("bytes 0-51199/102400", "10", "Content-Length does not match"),
+    ],
+)
+def test_segmented_download_bad_segment(tmp_path, content_range, length, message):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.headers["Range"] == "bytes=0-0":
+            headers = {"Content-Range": "bytes 0-0/102400", "Content-Length": "1"}
+            return httpx.Response(206, headers=headers, content=iter([b"a"]))
+        headers = {"Content-Range": content_range, "Content-Length": length}
+        return httpx.Response(206, headers=headers, content=iter([b""]))
+
+    client = APIClient(
+        base_url="https://example.com", transport=httpx.MockTransport(handler)
+    )
+    with pytest.raises(DownloadError, match=message):
+        client._download("/report", tmp_path / "report.bin", segments=2)
+
+
+async def test_async_segmented_download(tmp_path):
+    server = Server(interrupt=[None, 1000])
+    client = async_client_for(server)
+    dest = await client._download(
+        "/report", tmp_path / "report.bin", checksum=SHA256, segments=3
+    )
+    assert dest.read_bytes() == DATA
+    assert len(server.requests) == 5
+
+
+async def test_async_download_file_ops_off_loop(tmp_path, monkeypatch):
+    called = []
+
+    async def to_thread(func, *args):
+        called.append(func.__name__)
+        return await asyncio.to_thread(func, *args)
+
+    monkeypatch.setattr("restfly._async.to_thread", to_thread)
+    client = async_client_for(Server())
+    dest = await client._download(
+        "/report", tmp_path / "report.bin", checksum=SHA256, chunk_size=4096
+    )
+    assert dest.read_bytes() == DATA
+    assert called[0] == "begin"
+    assert called.count("flush") > 1
+    assert called[-1] == "finish"
+
+    called.clear()
+    dest = await client._download(
+        "/report", tmp_path / "report.bin", checksum=SHA256, segments=2
+    )
+    assert dest.read_bytes() == DATA
+    assert called[0] == "split"
+    assert called[-1] == "finish"
+
+
+async def test_async_segmented_download_gives_up(tmp_path):
+    server = Server(interrupt=[None, 100, 100, 100, 100])
+    client = async_client_for(server)
+    with pytest.raises(httpx.ReadError):
+        await client._download(
+            "/report", tmp_path / "report.bin", segments=2, max_retries=1
+        )
+    assert not (tmp_path / "report.bin").exists()
+
+
+def test_segment_cancelled(tmp_path):
+    with Download(tmp_path / "report.bin") as download:
+        segment = Segment(download, 0, 99)
+        download.segments.append(segment)
+        download.cancelled = True
+        with pytest.raises(DownloadError, match="cancelled"):
+            segment.write(b"a")
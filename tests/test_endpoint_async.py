@@ -4,7 +4,7 @@ import pytest
 from httpx import Response
 from pydantic import BaseModel
 from pytest_httpx import HTTPXMock
-from restfly import APIError, AsyncAPIClient, AsyncAPIEndpoint, RetryError
+from restfly import APIError, ErrorStatus, AsyncAPIClient, AsyncAPIEndpoint, RetryError
 
 
 class HTTPBinResponse(BaseModel):
@@ -124,8 +124,7 @@ async def test_endpoint_async_retry_err(client: ExClient, httpx_mock: HTTPXMock)
     httpx_mock.add_response(
         url="https://httpbin.org/status/429", status_code=429, is_reusable=True
     )
-    client._error_map[429].jitter = 0
-    client._error_map[429].backoff = 0
+    client = ExClient(error_map={429: ErrorStatus(retry=True, backoff=0, jitter=0)})
     with pytest.raises(RetryError):
         _ = await client.test._request("GET", "/status/429")
 
@@ -232,3 +231,20 @@ async def test_endpoint_async_delete_method(client: ExClient, httpx_mock: HTTPXM
     assert isinstance(resp2, HTTPBinResponse)
     assert resp1.json()["url"] == "https://httpbin.org/delete"
     assert resp2.url == "https://httpbin.org/delete"
+
+
+async def test_endpoint_success_codes(client: ExClient, httpx_mock: HTTPXMock):
+    class StrictEndpoint(AsyncAPIEndpoint):
+        _success_codes = {200}
+
+    httpx_mock.add_response(
+        url="https://httpbin.org/status/202", status_code=202, is_reusable=True
+    )
+    with pytest.raises(APIError):
+        _ = await StrictEndpoint(client)._get("/status/202")
+    resp = await StrictEndpoint(client)._request(
+        "GET", "/status/202", success_codes={202}
+    )
+    assert resp.status_code == 202
+    resp = await client.test._get("/status/202")
+    assert resp.status_code == 202
@@ -4,7 +4,7 @@ import pytest
 from httpx import Response
 from pydantic import BaseModel
 from pytest_httpx import HTTPXMock
-from restfly import APIClient, APIEndpoint, APIError, RetryError
+from restfly import APIClient, APIEndpoint, APIError, ErrorStatus, RetryError
 
 
 class HTTPBinResponse(BaseModel):
@@ -122,8 +122,7 @@ def test_endpoint_sync_retry_err(client: ExClient, httpx_mock: HTTPXMock):
     httpx_mock.add_response(
         url="https://httpbin.org/status/429", status_code=429, is_reusable=True
     )
-    client._error_map[429].jitter = 0
-    client._error_map[429].backoff = 0
+    client = ExClient(error_map={429: ErrorStatus(retry=True, backoff=0, jitter=0)})
     with pytest.raises(RetryError):
         _ = client.test._request("GET", "/status/429")
 
@@ -230,3 +229,18 @@ def test_endpoint_sync_delete_method(client: ExClient, httpx_mock: HTTPXMock):
     assert isinstance(resp2, HTTPBinResponse)
     assert resp1.json()["url"] == "https://httpbin.org/delete"
     assert resp2.url == "https://httpbin.org/delete"
+
+
+def test_endpoint_success_codes(client: ExClient, httpx_mock: HTTPXMock):
+    class StrictEndpoint(APIEndpoint):
+        _success_codes = {200}
+
+    httpx_mock.add_response(
+        url="https://httpbin.org/status/202", status_code=202, is_reusable=True
+    )
+    with pytest.raises(APIError):
+        _ = StrictEndpoint(client)._get("/status/202")
+    resp = StrictEndpoint(client)._request("GET", "/status/202", success_codes={202})
+    assert resp.status_code == 202
+    resp = client.test._get("/status/202")
+    assert resp.status_code == 202
@@ -1,4 +1,14 @@
-from restfly._errors import APIError, ErrorStatus, build_error_map
+import logging
+from dataclasses import FrozenInstanceError
+
+import pytest
+from httpx import Request, Response
+from pydantic import BaseModel
+from pydantic_xml import BaseXmlModel
+from restfly._errors import APIError, ErrorMap, ErrorStatus, build_error_map
+
+
+class RetryableError(APIError): ...
 
 
 def test_build_error_map_defaults():
@@ -27,3 +37,133 @@ def test_build_error_map_api_error_class_overload():
         template=r"[400] Bad Request {request.method} {request.url}",
     )
     assert error_map[699] == ErrorStatus(exception=ExampleError)
+
+
+def test_build_error_map_is_cached():
+    assert build_error_map() is build_error_map()
+    assert build_error_map(overloads={401: ErrorStatus(retry=True)}) is (
+        build_error_map(overloads={401: ErrorStatus(retry=True)})
+    )
+    assert build_error_map() is not build_error_map(error_class=RetryableError)
+
+
+def test_error_map_is_immutable():
+    error_map = build_error_map()
+    size = len(error_map)
+    assert error_map[499] == ErrorStatus()
+    assert error_map[599].retry is False
+    assert error_map[599].template.startswith("[{response.status_code}] Server Error")
+    assert len(error_map) == size
+    with pytest.raises(TypeError):
+        error_map[499] = ErrorStatus()  # ty: ignore[invalid-assignment]
+    with pytest.raises(FrozenInstanceError):
+        error_map[429].backoff = 0  # ty: ignore[invalid-assignment]
+
+
+def test_error_map_fallbacks():
+    error_map = ErrorMap(
+        {404: ErrorStatus(template="missing")},
+        fallbacks={5: ErrorStatus(retry=True)},
+        default=ErrorStatus(template="default"),
+    )
+    assert error_map[404].template == "missing"
+    assert error_map[503].retry is True
+    assert error_map[418].template == "default"
+    assert error_map.default.template == "default"
+    assert list(error_map) == [404]
+    assert "404" in repr(error_map)
+    assert error_map.fallbacks == {5: ErrorStatus(retry=True)}
+
+
+def test_error_map_membership():
+    error_map = build_error_map()
+    assert 404 in error_map
+    assert error_map.get(404) is error_map[404]
+    assert 520 in error_map
+    assert error_map.get(520) is error_map[520] is error_map.fallbacks[5]
+    assert error_map.get(499) is error_map.default
+    assert "404" not in error_map
+    assert error_map.get("404") is None
+    assert 520 not in list(error_map)
+
+
+class ErrorBody(BaseModel):
+    value: str
+
+
+class XmlErrorBody(BaseXmlModel, tag="error"):
+    value: str
+
+
+def error_response(content: bytes) -> Response:
+    return Response(
+        status_code=400,
+        content=content,
+        request=Request(method="GET", url="https://httpbin.org/status/400"),
+    )
+
+
+def test_api_error_obj_is_lazy():
+    err = APIError(error_response(b'{"value": "bad"}'), "{response}", model=ErrorBody)
+    assert "obj" not in err.__dict__
+    assert err.obj == ErrorBody(value="bad")
+    assert err.__dict__["obj"] is err.obj
+
+
+def test_api_error_obj_xml_model():
+    err = APIError(
+        error_response(b"<error>bad</error>"), "{response}", model=XmlErrorBody
+    )
+    assert err.obj == XmlErrorBody(value="bad")
+
+
+def test_api_error_obj_fallbacks():
+    resp = error_response(b"not json")
+    assert APIError(resp, "{response}").obj is None
+    assert APIError(resp, "{response}", model=ErrorBody).obj is None
+    obj = ErrorBody(value="given")
+    assert APIError(resp, "{response}", obj=obj, model=ErrorBody).obj is obj
+
+
+def test_api_error_message_is_lazy(caplog: pytest.LogCaptureFixture):
+    with caplog.at_level(logging.WARNING):
+        err = APIError(error_response(b""), "[{response.status_code}] {request.url}")
+    assert caplog.text == ""
+    assert "message" not in err.__dict__
+    assert str(err) == "[400] https://httpbin.org/status/400"
+    assert err.__dict__["message"] == "[400] https://httpbin.org/status/400"
+    assert err.args == ("[400] https://httpbin.org/status/400",)
+
+
+def test_api_error_log_is_lazy(caplog: pytest.LogCaptureFixture):
+    status = ErrorStatus(template="{request.url}", log_level=logging.DEBUG)
+    with caplog.at_level(logging.INFO):
+        err = status.error(error_response(b""))
+    assert "message" not in err.__dict__
+    assert caplog.text == ""
+
+
+def test_api_error_log_level(caplog: pytest.LogCaptureFixture):
+    resp = error_response(b"")
+    with caplog.at_level(logging.INFO):
+        ErrorStatus(template="logged {request.method}").error(resp)
+        ErrorStatus(template="silenced", log_level=None).error(resp)
+        ErrorStatus(template="informational", log_level=logging.INFO).error(resp)
+    assert "logged GET" in caplog.text
+    assert "silenced" not in caplog.text
+    assert "informational" in caplog.text
+
+
+class LegacyError(APIError):
+    def __init__(self, response, template, obj=None):
+        super().__init__(response, template, obj)
+
+
+def test_error_status_legacy_exception(caplog: pytest.LogCaptureFixture):
+    status = ErrorStatus(exception=LegacyError, model=ErrorBody, log_level=None)
+    with caplog.at_level(logging.DEBUG):
+        err = status.error(error_response(b'{"value": "bad"}'))
+    assert caplog.text == ""
+    assert isinstance(err, LegacyError)
+    assert err.log_level is None
+    assert err.obj == ErrorBody(value="bad")
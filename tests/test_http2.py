@@ -0,0 +1,127 @@
+import logging
+
+import httpx
+import pytest
+from restfly import APIClient, AsyncAPIClient, HTTP2Profile
+from restfly.types import Limits
+
+
+def pool(client) -> object:
+    return client._client._transport._pool
+
+
+def handler(version: bytes):
+    def respond(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, extensions={"http_version": version})
+
+    return respond
+
+
+def test_http2_profile():
+    profile = HTTP2Profile(concurrency=250, max_streams=100)
+    assert profile.connections == 3
+    assert profile.limits().max_connections == 100
+    assert profile.limits().max_keepalive_connections == 100
+    assert profile.limits().keepalive_expiry == 60.0
+    assert profile.limits(http2=False).max_connections == 100
+    assert HTTP2Profile(concurrency=10).limits(http2=False).max_connections == 10
+    profile = HTTP2Profile(concurrency=1000, max_streams=2, http1_max_connections=50)
+    assert profile.limits().max_connections == 500
+    assert profile.limits(http2=False).max_connections == 50
+    with pytest.raises(ValueError):
+        HTTP2Profile(max_streams=0)
+
+
+def test_client_http2_profile():
+    pytest.importorskip("h2")
+    client = APIClient(http2=HTTP2Profile(concurrency=500))
+    assert client._http2 == HTTP2Profile(concurrency=500)
+    assert not client._http2_fallback
+    assert pool(client)._http2
+    assert pool(client)._max_connections == 100
+    limits = Limits(max_connections=7)
+    client = APIClient(http2=HTTP2Profile(), limits=limits)
+    assert pool(client)._max_connections == 7
+
+
+def test_client_http2_class_profile():
+    pytest.importorskip("h2")
+
+    class Client(APIClient):
+        _http2 = HTTP2Profile(concurrency=1000)
+
+    assert pool(Client())._max_connections == 100
+    client = Client(http2=True)
+    assert client._http2 is Client._http2
+    assert pool(client)._http2
+    assert pool(client)._max_connections == 100
+    client = Client(http2=False)
+    assert client._http2 is None
+    assert not pool(client)._http2
+    assert pool(client)._max_connections == 100
+    profile = HTTP2Profile(concurrency=50)
+    assert Client(http2=profile)._http2 is profile
+    assert APIClient()._http2 is None
+    assert APIClient(http2=True)._http2 is None
+
+
+def test_client_http2_missing_h2(monkeypatch, caplog):
+    monkeypatch.setattr("restfly._base.h2_available", lambda: False)
+    with caplog.at_level(logging.WARNING):
+        client = APIClient(http2=HTTP2Profile(concurrency=50))
+    assert client._http2_fallback
+    assert not pool(client)._http2
+    assert pool(client)._max_connections == 50
+    assert "h2 package is not installed" in caplog.text
+
+
+def test_client_http2_negotiation(caplog):
+    client = APIClient(
+        base_url="https://example.com",
+        http2=HTTP2Profile(),
+        transport=httpx.MockTransport(handler(b"HTTP/2")),
+    )
+    client._get("/")
+    assert not client._http2_fallback
+
+    client = APIClient(
+        base_url="https://example.com",
+        http2=HTTP2Profile(),
+        transport=httpx.MockTransport(handler(b"HTTP/1.1")),
+    )
+    with caplog.at_level(logging.WARNING):
+        client._get("/")
+        client._get("/")
+    assert client._http2_fallback
+    assert caplog.text.count("example.com negotiated HTTP/1.1") == 1
+
+
+def test_client_http2_fallback_pool():
+    pytest.importorskip("h2")
+    profile = HTTP2Profile(concurrency=300, http1_max_connections=250)
+    client = APIClient(base_url="https://example.com", http2=profile)
+    assert pool(client)._http2
+    # A server negotiating HTTP/1.1 needs a connection per request in flight, which
+    # the pool allows for without being rebuilt.
+    assert pool(client)._max_connections == 250
+    assert pool(client)._max_keepalive_connections == 250
+    client._check_protocol(
+        httpx.Response(200, request=httpx.Request("GET", "https://example.com/"))
+    )
+    assert client._http2_fallback
+    assert pool(client)._max_connections == 250
+
+
+async def test_async_client_http2_negotiation(caplog):
+    async def respond(request: httpx.Request) -> httpx.Response:
+        return handler(b"HTTP/1.1")(request)
+
+    client = AsyncAPIClient(
+        base_url="https://example.com",
+        http2=HTTP2Profile(),
+        transport=httpx.MockTransport(respond),
+    )
+    with caplog.at_level(logging.WARNING):
+        await client._get("/")
+    assert client._http2_fallback
+    assert "negotiated HTTP/1.1" in caplog.text
@@ -0,0 +1,147 @@
+import httpx
+import pytest
+from restfly import (
+    APIClient,
+    AsyncAPIClient,
+    ErrorStatus,
+    LoadReport,
+    async_load_test,
+    load_test,
+)
+
+NO_WAIT = {503: ErrorStatus(retry=True, backoff=0, jitter=0, log_level=None)}
+
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+
+    def record(self, metrics):
+        self.events.append(metrics)
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path == "/flaky":
+        handler.calls = getattr(handler, "calls", 0) + 1
+        if handler.calls % 2:
+            return httpx.Response(503)
+    if request.url.path == "/missing":
+        return httpx.Response(404)
+    return httpx.Response(200, json={"ok": True})
+
+
+def test_load_test():
+    hook = Recorder()
+    client = APIClient(
+        base_url="https://example.com",
+        transport=httpx.MockTransport(handler),
+        error_map=NO_WAIT,
+        metrics=hook,
+    )
+    report = load_test(
+        client, lambda: client._get("/flaky"), concurrency=1, operations=20
+    )
+    assert report.operations == 20
+    assert report.requests == 20
+    assert report.retries == 20
+    assert report.errors == 0
+    assert report.throughput > 0
+    assert report.memory_growth is not None
+    assert len(hook.events) == 20
+    assert client._metrics is hook
+    latency = report.percentiles()
+    assert list(latency) == ["p50", "p90", "p95", "p99"]
+    assert latency["p50"] <= latency["p99"]
+    assert "20 operations" in report.report()
+    assert "Memory growth" in report.report()
+
+
+def test_load_test_rate_and_errors():
+    client = APIClient(
+        base_url="https://example.com", transport=httpx.MockTransport(handler)
+    )
+    report = load_test(
+        client,
+        lambda: client._get("/missing"),
+        concurrency=4,
+        rate=200,
+        operations=20,
+        trace_memory=False,
+    )
+    assert report.operations == 20
+    assert report.errors == 20
+    assert report.error_types == {"APIError": 20}
+    assert report.elapsed >= 19 / 200
+    assert report.memory_growth is None
+    assert "APIError: 20" in report.report()
+    assert client._metrics is None
+
+
+class Clock:
+    """
+    Stands in for the time module within the load harness.  Sleeping advances the
+    clock instead of waiting, so the schedule runs instantly and exactly.
+    """
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def perf_counter(self) -> float:
+        return self.now
+
+    def sleep(self, delay: float) -> None:
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+def test_load_test_duration(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr("restfly._load.time", clock)
+    client = APIClient(
+        base_url="https://example.com", transport=httpx.MockTransport(handler)
+    )
+    report = load_test(
+        client,
+        lambda: client._get("/ok"),
+        concurrency=1,
+        rate=100,
+        duration=0.1,
+        trace_memory=False,
+    )
+    assert report.operations == report.requests == 10
+    assert clock.sleeps == pytest.approx([0.01] * 9)
+    assert report.elapsed == pytest.approx(0.09)
+    assert report.latencies == pytest.approx([0.0] * 10)
+
+
+def test_load_test_validation():
+    client = APIClient(base_url="https://example.com")
+    with pytest.raises(ValueError):
+        load_test(client, lambda: None)
+    with pytest.raises(ValueError):
+        load_test(client, lambda: None, rate=0, operations=1)
+    assert LoadReport().throughput == 0
+    assert LoadReport().percentiles("pool_wait") == dict.fromkeys(
+        ("p50", "p90", "p95", "p99"), 0.0
+    )
+
+
+async def test_async_load_test():
+    async def ahandler(request: httpx.Request) -> httpx.Response:
+        return handler(request)
+
+    client = AsyncAPIClient(
+        base_url="https://example.com",
+        transport=httpx.MockTransport(ahandler),
+        error_map=NO_WAIT,
+    )
+    paths = iter(["/ok", "/missing"] * 10)
+    report = await async_load_test(
+        client, lambda: client._get(next(paths)), concurrency=5, rate=100, operations=20
+    )
+    assert report.operations == report.requests == 20
+    assert report.errors == 10
+    assert report.elapsed >= 19 / 100
+    assert report.memory_peak is not None
+    assert client._metrics is None
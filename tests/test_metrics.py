@@ -0,0 +1,184 @@
+import pytest
+from httpx import Request, Response
+from pydantic import BaseModel
+from pytest_httpx import HTTPXMock
+from restfly import (
+    APIClient,
+    APIEndpoint,
+    APIError,
+    AsyncAPIClient,
+    ErrorStatus,
+    HistogramMetrics,
+    RequestMetrics,
+    RetryError,
+)
+from restfly._metrics import RequestTracker, _percentile
+
+NO_WAIT = {503: ErrorStatus(retry=True, backoff=0, jitter=0)}
+
+
+class Item(BaseModel):
+    a: int
+
+
+class ItemsAPI(APIEndpoint):
+    _path = "/items"
+
+    def get(self, item_id: int) -> Item:
+        return self._get(f"/{item_id}", response_model=Item)
+
+
+class MetricsClient(APIClient):
+    _base_url = "https://httpbin.org"
+    items: ItemsAPI
+
+
+class Recorder:
+    def __init__(self):
+        self.events: list[RequestMetrics] = []
+
+    def record(self, metrics: RequestMetrics) -> None:
+        self.events.append(metrics)
+
+
+def test_metrics_disabled_by_default():
+    assert MetricsClient()._metrics is None
+
+
+def test_metrics_request_events(httpx_mock: HTTPXMock):
+    recorder = Recorder()
+    client = MetricsClient(metrics=recorder, error_map=NO_WAIT)
+    httpx_mock.add_response(url="https://httpbin.org/items/1", json={"a": 1})
+    httpx_mock.add_response(url="https://httpbin.org/flaky", status_code=503)
+    httpx_mock.add_response(url="https://httpbin.org/flaky", status_code=200)
+    httpx_mock.add_response(url="https://httpbin.org/missing", status_code=404)
+
+    assert client.items.get(1) == Item(a=1)
+    client._get("/flaky")
+    with pytest.raises(APIError):
+        client._get("/missing")
+
+    ok, flaky, missing = recorder.events
+    assert ok.endpoint == "/items"
+    assert ok.path == "/items/1"
+    assert ok.label == "/items"
+    assert ok.status_code == 200
+    assert ok.attempts == 1 and ok.retries == 0
+    assert {"pre_process", "send", "unmarshal"} <= set(ok.phases)
+    assert ok.duration >= sum(ok.phases.values())
+    assert ok.error is None
+
+    assert flaky.label == "/flaky"
+    assert flaky.retries == 1
+    assert flaky.status_code == 200
+    assert flaky.backoff >= 0
+
+    assert missing.status_code == 404
+    assert missing.error == "APIError"
+
+
+async def test_metrics_async_request_events(httpx_mock: HTTPXMock):
+    recorder = Recorder()
+
+    class AsyncMetricsClient(AsyncAPIClient):
+        _base_url = "https://httpbin.org"
+        _metrics = recorder
+
+    client = AsyncMetricsClient(error_map=NO_WAIT)
+    httpx_mock.add_response(url="https://httpbin.org/items/1", json={"a": 1})
+    httpx_mock.add_response(
+        url="https://httpbin.org/flaky", status_code=503, is_reusable=True
+    )
+    httpx_mock.add_response(url="https://httpbin.org/missing", status_code=404)
+    assert await client._get("/items/1", response_model=Item) == Item(a=1)
+    with pytest.raises(RetryError):
+        await client._get("/flaky", max_retries=1)
+    with pytest.raises(APIError):
+        await client._get("/missing")
+
+    ok, flaky, missing = recorder.events
+    assert ok.status_code == 200
+    assert "unmarshal" in ok.phases
+    assert flaky.retries == 1
+    assert flaky.error == "RetryError"
+    assert missing.error == "APIError"
+
+
+def test_tracker_trace_phases():
+    recorder = Recorder()
+    user_events = []
+    request = Request("GET", "https://httpbin.org/get")
+    request.extensions["trace"] = lambda name, info: user_events.append(name)
+
+    tracker = RequestTracker(recorder, "GET", "/get", None)
+    tracker.attempt(request)
+    assert request.extensions["trace"] == tracker.trace
+    for name in (
+        "connection.connect_tcp.started",
+        "connection.connect_tcp.complete",
+        "connection.start_tls.complete",
+        "http11.send_request_headers.started",
+        "http11.send_request_body.complete",
+        "http11.receive_response_headers.complete",
+    ):
+        request.extensions["trace"](name, {})
+    tracker.sent(Response(200))
+    tracker.finish()
+
+    metrics = recorder.events[0]
+    assert set(metrics.phases) == {"queue", "connect", "send", "ttfb", "read"}
+    assert all(v >= 0 for v in metrics.phases.values())
+    assert len(user_events) == 6
+
+
+async def test_tracker_async_trace_chaining():
+    user_events = []
+
+    async def user_trace(name, info):
+        user_events.append(name)
+
+    request = Request("GET", "https://httpbin.org/get")
+    request.extensions["trace"] = user_trace
+    tracker = RequestTracker(Recorder(), "GET", "/get", None)
+    tracker.attempt(request, is_async=True)
+    await request.extensions["trace"]("http11.send_request_headers.started", {})
+    assert user_events == ["http11.send_request_headers.started"]
+
+
+def test_histogram_metrics():
+    histogram = HistogramMetrics(size=100)
+    for i in range(1, 101):
+        histogram.record(
+            RequestMetrics(
+                method="GET",
+                path=f"/items/{i}",
+                endpoint="/items",
+                status_code=200 if i % 10 else 500,
+                attempts=2 if i % 25 == 0 else 1,
+                duration=i / 1000,
+                phases={"send": i / 2000},
+                error=None if i % 10 else "APIError",
+            )
+        )
+    assert histogram.endpoints == ["/items"]
+    assert histogram.percentiles("/items") == {
+        "p50": 0.05,
+        "p95": 0.095,
+        "p99": 0.099,
+    }
+    snapshot = histogram.snapshot()["/items"]
+    assert snapshot["requests"] == 100
+    assert snapshot["retries"] == 4
+    assert snapshot["errors"] == 10
+    assert snapshot["status_codes"] == {200: 90, 500: 10}
+    assert snapshot["phases"]["send"]["p50"] == 0.025
+    assert histogram.percentiles("/unknown") == {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    histogram.reset()
+    assert histogram.snapshot() == {}
+
+
+def test_percentile():
+    assert _percentile([], 50) == 0.0
+    assert _percentile([1.0], 99) == 1.0
+    assert _percentile([1.0, 2.0, 3.0, 4.0], 0) == 1.0
+    assert _percentile([1.0, 2.0, 3.0, 4.0], 100) == 4.0
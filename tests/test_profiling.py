@@ -0,0 +1,82 @@
+import pytest
+from pydantic import BaseModel
+from pytest_httpx import HTTPXMock
+from restfly import (
+    APIClient,
+    APIError,
+    AsyncAPIClient,
+    ErrorStatus,
+    Profiler,
+    RequestMetrics,
+)
+
+NO_WAIT = {503: ErrorStatus(retry=True, backoff=0, jitter=0)}
+
+
+class Item(BaseModel):
+    a: int
+
+
+class Recorder:
+    def __init__(self):
+        self.events: list[RequestMetrics] = []
+
+    def record(self, metrics: RequestMetrics) -> None:
+        self.events.append(metrics)
+
+
+def test_profile_context(httpx_mock: HTTPXMock, capsys):
+    client = APIClient(base_url="https://httpbin.org", error_map=NO_WAIT)
+    httpx_mock.add_response(url="https://httpbin.org/item", json={"a": 1})
+    httpx_mock.add_response(url="https://httpbin.org/items", json=[{"a": 1}, {"a": 2}])
+    httpx_mock.add_response(url="https://httpbin.org/flaky", status_code=503)
+    httpx_mock.add_response(url="https://httpbin.org/flaky", status_code=200)
+    httpx_mock.add_response(url="https://httpbin.org/missing", status_code=404)
+
+    with client._profile() as profiler:
+        assert client._metrics is profiler
+        client._get("/item", response_model=Item)
+        client._get("/items", response_model=list[Item])
+        client._get("/flaky")
+        with pytest.raises(APIError):
+            client._get("/missing")
+    assert client._metrics is None
+
+    assert profiler.requests == 4
+    assert profiler.retries == 1
+    assert profiler.errors == 1
+    assert set(profiler.models) == {"Item", str(list[Item])}
+    item = profiler.models["Item"]
+    assert item.requests == 1
+    assert item.bytes_decoded == 7
+    assert item.models == 1
+    assert item.wall > 0
+    assert profiler.models[str(list[Item])].models == 2
+    assert all(profiler.wall[phase] > 0 for phase in ("pre_process", "network"))
+    assert profiler.cpu["backoff"] == 0
+
+    output = capsys.readouterr().out
+    assert output.startswith("RESTFly profile: 4 requests, 1 retries, 1 errors")
+    for label in ("pre_process", "network", "unmarshal", "overhead", "total", "Item"):
+        assert label in output
+
+
+async def test_profile_async_forwarding(httpx_mock: HTTPXMock, capsys):
+    recorder = Recorder()
+    client = AsyncAPIClient(base_url="https://httpbin.org", metrics=recorder)
+    httpx_mock.add_response(url="https://httpbin.org/item", json={"a": 1})
+
+    with client._profile(report=False) as profiler:
+        await client._get("/item", response_model=Item)
+    assert client._metrics is recorder
+
+    assert profiler.requests == 1
+    assert recorder.events[0].model == "Item"
+    assert recorder.events[0].cpu_time > 0
+    assert capsys.readouterr().out == ""
+
+
+def test_profiler_empty_report():
+    report = Profiler().report()
+    assert "0 requests" in report
+    assert "Model" not in report
@@ -0,0 +1,62 @@
+import pytest
+from httpx import Response
+from pytest_httpx import HTTPXMock
+from restfly import APIClient, projection
+from restfly._utils import unmarshal
+
+ENVELOPE = {
+    "data": {
+        "items": [
+            {"id": 1, "name": "a", "blob": {"x": [1, 2, 3]}},
+            {"id": 2, "blob": {"x": []}},
+        ],
+        "cursor": "abc",
+    },
+    "meta": {"total": 2, "took": 5},
+}
+
+
+def test_projection_envelope(httpx_mock: HTTPXMock):
+    client = APIClient(base_url="https://httpbin.org")
+    httpx_mock.add_response(url="https://httpbin.org/items", json=ENVELOPE)
+    model = projection("data.items[*].{id, name}", "meta.total")
+    assert client._get("/items", response_model=model) == {
+        "data": {"items": [{"id": 1, "name": "a"}, {"id": 2}]},
+        "meta": {"total": 2},
+    }
+
+
+def test_projection_leaf_subtree():
+    resp = Response(200, json=ENVELOPE)
+    model = projection("data.items[*].blob", "data.items[*].blob.x")
+    result = unmarshal(resp, model=model, client=APIClient())
+    assert result == {
+        "data": {"items": [{"blob": {"x": [1, 2, 3]}}, {"blob": {"x": []}}]}
+    }
+
+
+def test_projection_root_list():
+    resp = Response(200, json=[{"id": 1, "name": "a"}, {"id": 2, "name": "b"}])
+    model = projection("[*].id")
+    assert unmarshal(resp, model=model, client=APIClient()) == [{"id": 1}, {"id": 2}]
+    assert projection("{id,name}") is projection("{id,name}")
+
+
+@pytest.mark.parametrize(
+    "paths",
+    [
+        (),
+        ("",),
+        ("[*]",),
+        (".a",),
+        ("a..b",),
+        ("a.{b,}",),
+        ("a{b}",),
+        ("a.b[0]",),
+        ("a[*].b", "a.c"),
+        ("[*].a", "b"),
+    ],
+)
+def test_projection_invalid(paths):
+    with pytest.raises(ValueError):
+        projection(*paths)
@@ -0,0 +1,235 @@
+import httpx
+import pytest
+from pydantic import BaseModel
+from pytest_httpx import HTTPXMock
+from restfly import (
+    APIClient,
+    APIEndpoint,
+    APIError,
+    APIIterator,
+    AsyncAPIClient,
+    AsyncAPIIterator,
+    ErrorStatus,
+    OpenTelemetryTracer,
+)
+
+NO_WAIT = {503: ErrorStatus(retry=True, backoff=0, jitter=0)}
+
+
+class Item(BaseModel):
+    a: int
+
+
+class ItemsAPI(APIEndpoint):
+    _path = "/items"
+
+    def get(self, item_id: int) -> Item:
+        return self._get(f"/{item_id}", response_model=Item)
+
+
+class TracingClient(APIClient):
+    _base_url = "https://httpbin.org"
+    items: ItemsAPI
+
+
+class RecordedSpan:
+    def __init__(self, tracer, name, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = dict(attributes)
+        self.parent = tracer.stack[-1] if tracer.stack else None
+        self.errors = []
+        self.ended = False
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def record_exception(self, error):
+        self.errors.append(error)
+
+    def end(self):
+        assert self.tracer.stack.pop() is self
+        self.ended = True
+
+
+class Recorder:
+    def __init__(self):
+        self.spans: list[RecordedSpan] = []
+        self.stack: list[RecordedSpan] = []
+
+    def start_span(self, name, attributes):
+        span = RecordedSpan(self, name, attributes)
+        self.spans.append(span)
+        self.stack.append(span)
+        return span
+
+
+class PageIterator(APIIterator):
+    def _get_page(self):
+        self.total = 2
+        self.page = [self._client._get("/page").json()]
+
+
+class AsyncPageIterator(AsyncAPIIterator):
+    async def _get_page(self):
+        self.total = 2
+        self.page = [(await self._client._get("/page")).json()]
+
+
+def test_tracing_disabled_by_default():
+    assert TracingClient()._tracer is None
+
+
+def test_tracing_request_spans(httpx_mock: HTTPXMock):
+    tracer = Recorder()
+    client = TracingClient(tracer=tracer, error_map=NO_WAIT)
+    httpx_mock.add_response(url="https://httpbin.org/items/1", json={"a": 1})
+    httpx_mock.add_response(url="https://httpbin.org/flaky", status_code=503)
+    httpx_mock.add_response(url="https://httpbin.org/flaky", status_code=200)
+    httpx_mock.add_response(url="https://httpbin.org/missing", status_code=404)
+
+    assert client.items.get(1) == Item(a=1)
+    client._post("/flaky", content=b"abc")
+    with pytest.raises(APIError):
+        client._get("/missing")
+
+    assert not tracer.stack
+    assert all(span.ended for span in tracer.spans)
+    names = [(s.name, s.parent.name if s.parent else None) for s in tracer.spans]
+    assert names == [
+        ("restfly.request", None),
+        ("restfly.attempt", "restfly.request"),
+        ("restfly.request", None),
+        ("restfly.attempt", "restfly.request"),
+        ("restfly.backoff", "restfly.request"),
+        ("restfly.attempt", "restfly.request"),
+        ("restfly.request", None),
+        ("restfly.attempt", "restfly.request"),
+    ]
+    item, attempt = tracer.spans[:2]
+    assert item.attributes == {
+        "http.request.method": "GET",
+        "url.path": "/items/1",
+        "restfly.endpoint": "/items",
+        "restfly.model": "Item",
+        "http.response.status_code": 200,
+        "restfly.attempts": 1,
+    }
+    assert attempt.attributes["http.response.body.size"] == 7
+    flaky = tracer.spans[2]
+    assert flaky.attributes["restfly.attempts"] == 2
+    assert tracer.spans[3].attributes["http.request.body.size"] == 3
+    assert tracer.spans[4].attributes == {"restfly.backoff": 0}
+    assert tracer.spans[5].attributes["restfly.attempt"] == 2
+    missing = tracer.spans[6]
+    assert missing.attributes["http.response.status_code"] == 404
+    assert isinstance(missing.errors[0], APIError)
+
+
+async def test_tracing_async_request_spans(httpx_mock: HTTPXMock):
+    tracer = Recorder()
+    client = AsyncAPIClient(
+        base_url="https://httpbin.org", tracer=tracer, error_map=NO_WAIT
+    )
+    httpx_mock.add_response(url="https://httpbin.org/flaky", status_code=503)
+    httpx_mock.add_response(url="https://httpbin.org/flaky", status_code=200)
+
+    await client._get("/flaky", response_model=list[Item])
+
+    assert not tracer.stack
+    assert [s.name for s in tracer.spans] == [
+        "restfly.request",
+        "restfly.attempt",
+        "restfly.backoff",
+        "restfly.attempt",
+    ]
+    assert tracer.spans[0].attributes["restfly.model"] == str(list[Item])
+
+
+def test_tracing_iterator_pages(httpx_mock: HTTPXMock):
+    tracer = Recorder()
+    client = TracingClient(tracer=tracer)
+    httpx_mock.add_response(url="https://httpbin.org/page", json={"a": 1})
+    httpx_mock.add_response(url="https://httpbin.org/page", status_code=500)
+
+    iterator = PageIterator(client)
+    assert next(iterator) == {"a": 1}
+    with pytest.raises(APIError):
+        next(iterator)
+
+    pages = [s for s in tracer.spans if s.name == "restfly.page"]
+    assert [p.attributes for p in pages] == [
+        {
+            "restfly.iterator": "PageIterator",
+            "restfly.page": 1,
+            "restfly.page.items": 1,
+        },
+        {"restfly.iterator": "PageIterator", "restfly.page": 2},
+    ]
+    assert isinstance(pages[1].errors[0], APIError)
+    requests = [s for s in tracer.spans if s.name == "restfly.request"]
+    assert [r.parent for r in requests] == pages
+
+
+async def test_tracing_async_iterator_pages(httpx_mock: HTTPXMock):
+    tracer = Recorder()
+    client = AsyncAPIClient(base_url="https://httpbin.org", tracer=tracer)
+    httpx_mock.add_response(url="https://httpbin.org/page", json={"a": 1})
+
+    iterator = AsyncPageIterator(client)
+    assert await anext(iterator) == {"a": 1}
+
+    assert [s.name for s in tracer.spans] == [
+        "restfly.page",
+        "restfly.request",
+        "restfly.attempt",
+    ]
+    assert tracer.spans[0].attributes["restfly.page.items"] == 1
+
+
+def test_tracing_transport_error(httpx_mock: HTTPXMock):
+    tracer = Recorder()
+    client = TracingClient(tracer=tracer)
+    httpx_mock.add_exception(httpx.ConnectError("refused"))
+
+    with pytest.raises(httpx.ConnectError):
+        client._get("/down")
+
+    request, attempt = tracer.spans
+    assert not tracer.stack
+    assert isinstance(request.errors[0], httpx.ConnectError)
+    assert attempt.errors == request.errors
+    assert "http.response.status_code" not in attempt.attributes
+
+
+def test_opentelemetry_tracer(httpx_mock: HTTPXMock):
+    sdk = pytest.importorskip("opentelemetry.sdk.trace")
+    export = pytest.importorskip(
+        "opentelemetry.sdk.trace.export.in_memory_span_exporter"
+    )
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+
+    exporter = export.InMemorySpanExporter()
+    provider = sdk.TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    tracer = OpenTelemetryTracer(provider.get_tracer("test"))
+    client = TracingClient(tracer=tracer)
+    httpx_mock.add_response(url="https://httpbin.org/items/1", json={"a": 1})
+    httpx_mock.add_response(url="https://httpbin.org/missing", status_code=404)
+
+    client.items.get(1)
+    with pytest.raises(APIError):
+        client._get("/missing")
+
+    spans = exporter.get_finished_spans()
+    assert [s.name for s in spans] == [
+        "restfly.attempt",
+        "restfly.request",
+        "restfly.attempt",
+        "restfly.request",
+    ]
+    assert spans[0].parent.span_id == spans[1].context.span_id
+    assert spans[1].parent is None
+    assert spans[1].attributes["restfly.model"] == "Item"
+    assert spans[3].status.status_code.name == "ERROR"
+    assert spans[3].events[0].name == "exception"
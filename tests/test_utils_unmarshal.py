@@ -3,7 +3,7 @@ from httpx import Response
 from pydantic import BaseModel
 from pydantic_xml import BaseXmlModel
 from restfly._sync import APIClient
-from restfly._utils import unmarshal
+from restfly._utils import _type_adapter, unmarshal
 
 
 @pytest.fixture
@@ -72,3 +72,18 @@ def test_unmarshal_typeerror(json_resp):
     client = APIClient()
     with pytest.raises(TypeError):
         unmarshal(json_resp, model=dict[str, str], client=client)
+
+
+def test_unmarshal_typeadapter_cached(json_list_resp, json_model):
+    client = APIClient()
+    unmarshal(json_list_resp, model=list[json_model], client=client)
+    assert _type_adapter(list[json_model]) is _type_adapter(list[json_model])
+
+
+def test_unmarshal_raw(json_resp, json_list_resp):
+    client = APIClient()
+    assert unmarshal(json_resp, model=dict, client=client) == {"a": 1}
+    assert unmarshal(json_list_resp, model=list, client=client) == [{"a": 1}, {"a": 2}]
+    view = unmarshal(json_resp, model=memoryview, client=client)
+    assert isinstance(view, memoryview)
+    assert view.tobytes() == b'{"a": 1}'
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from restfly import APIClient, AsyncAPIClient
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), Handler)
+        self.ports = set()
+        self.requests = 0
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: Server
+
+    def respond(self):
+        self.server.ports.add(self.client_address[1])
+        self.server.requests += 1
+        time.sleep(0.01)
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_GET = do_HEAD = respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve():
+    server = Server()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+server = pytest.fixture(serve, name="server")
+second = pytest.fixture(serve, name="second")
+
+
+def pool(client):
+    return client._client._transport._pool
+
+
+def test_keepalive_expiry():
+    assert pool(APIClient())._keepalive_expiry == 5.0
+    assert pool(APIClient(keepalive_expiry=90))._keepalive_expiry == 90
+
+    class Client(APIClient):
+        _keepalive_expiry = 30.0
+
+    assert pool(Client())._keepalive_expiry == 30.0
+    assert pool(Client())._max_connections == 100
+
+
+def test_warmup(server):
+    client = APIClient(base_url=server.url)
+    assert client._warmup(4) == 4
+    assert len(server.ports) == 4
+    assert len(pool(client).connections) == 4
+    for _ in range(4):
+        client._get("/")
+    assert len(server.ports) == 4
+    assert client._keepalive is None
+    with pytest.raises(ValueError):
+        client._warmup(0)
+    client._client.close()
+
+
+def test_warmup_balanced(server, second):
+    client = APIClient(base_url=[server.url, second.url])
+    assert client._warmup(4) == 4
+    assert len(server.ports) == len(second.ports) == 2
+    client._client.close()
+
+
+def test_warmup_keepalive(server):
+    class Client(APIClient):
+        _warmup_path = "/health"
+
+    with Client(base_url=server.url) as client:
+        client._warmup(2, keepalive=0.05)
+        stop = client._keepalive
+        time.sleep(0.3)
+        assert server.requests > 2
+        assert len(server.ports) == 2
+    assert stop.is_set()
+    assert client._keepalive is None
+    client._client.close()
+
+
+def test_warmup_failure(caplog):
+    client = APIClient(base_url="http://127.0.0.1:1")
+    with caplog.at_level(logging.WARNING):
+        assert client._warmup(2) == 0
+    assert caplog.text.count("Warm-up request to '' failed") == 2
+
+
+async def test_async_warmup(server):
+    client = AsyncAPIClient(base_url=server.url)
+    assert await client._warmup(4, method="GET", keepalive=0.05) == 4
+    task = client._keepalive
+    await asyncio.sleep(0.3)
+    assert server.requests > 4
+    assert len(server.ports) == 4
+    await client._warmup(1)
+    assert task.cancelling()
+    assert client._keepalive is None
+    client._stop_keepalive()
+    await client._client.aclose()
+
+
+async def test_async_warmup_balanced(server, second):
+    client = AsyncAPIClient(base_url=(server.url, second.url))
+    assert await client._warmup(3, path="/health") == 3
+    assert len(server.ports) == 2
+    assert len(second.ports) == 1
+    await client._client.aclose()
+
+
+async def test_async_warmup_closed(server):
+    client = AsyncAPIClient(base_url=server.url)
+    await client._warmup(1, keepalive=0.01)
+    task = client._keepalive
+    await client._client.aclose()
+    await asyncio.wait_for(task, 1)
+    assert task.done()
+    with pytest.raises(ValueError):
+        await client._warmup(0)
+
+
+async def test_async_warmup_failure(caplog):
+    client = AsyncAPIClient(base_url="http://127.0.0.1:1")
+    with caplog.at_level(logging.WARNING):
+        assert await client._warmup(2, path="/health") == 0
+    assert "Warm-up request to '/health' failed" in caplog.text